@@ -2,7 +2,7 @@
 from PyInstaller.utils.hooks import collect_all
 from PyInstaller.utils.hooks import copy_metadata
 
-datas = [('app.py', '.')]
+datas = [('app.py', '.'), ('src', 'src')]
 binaries = []
 hiddenimports = []
 datas += copy_metadata('streamlit')
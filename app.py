@@ -8,7 +8,10 @@ import tempfile
 import os
 import io
 import uuid
-import concurrent.futures
+import functools
+import heapq
+import queue
+import threading
 import random
 import sys
 import time
@@ -18,7 +21,6 @@ from openai import OpenAI
 from docx import Document
 from docx.oxml import OxmlElement
 from pptx import Presentation
-from difflib import SequenceMatcher
 import subprocess
 import shutil
 import base64
@@ -27,6 +29,114 @@ import xml.etree.ElementTree as ET
 import importlib.util
 import hashlib
 import requests
+from src.repositories import (
+    append_review_records,
+    delete_generation_files,
+    delete_generation_job,
+    delete_generation_payload,
+    generation_job_file,
+    iter_review_rows,
+    list_generation_jobs,
+    llm_cache_counters,
+    load_bank_event_file,
+    load_generation_job,
+    load_generation_payload,
+    load_json_file,
+    load_llm_cache_entry,
+    load_near_duplicate_file,
+    load_review_index,
+    load_search_index_file,
+    rekey_review_records,
+    save_bank_event_file,
+    save_generation_job,
+    save_generation_payload,
+    save_generation_source,
+    save_json_file,
+    save_llm_cache_entry,
+    save_near_duplicate_file,
+    save_search_index_file,
+)
+from src.services import (
+    CHARS_PER_TOKEN,
+    DEFAULT_LLM_CACHE_MAX_BYTES,
+    DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+    DEFAULT_PROVIDER_LIMITS,
+    DEFAULT_RELATED_K,
+    EXTRACTABLE_EXTENSIONS,
+    FORECAST_HORIZONS,
+    ACTIVE_JOB_STATUSES,
+    MAX_JOB_ATTEMPTS,
+    NEAR_DUPLICATE_INDEX_VERSION,
+    SEARCH_INDEX_VERSION,
+    GenerationCancelled,
+    allocate_items,
+    bm25_search,
+    apply_minhash_signatures,
+    bank_changes_since,
+    build_answer_keys,
+    build_dashboard_snapshot,
+    changed_ids,
+    chunk_fingerprint,
+    compact_search_index,
+    dashboard_heatmap,
+    dashboard_overall_accuracy,
+    estimate_tokens,
+    expand_upload_sources,
+    extract_review_rows,
+    facet_add,
+    facet_counts,
+    facet_query_keys,
+    facet_remove,
+    facet_subject_unit_map,
+    facet_subjects,
+    facet_values,
+    feed_chunk_stream,
+    feed_stream_parser,
+    finish_chunk_stream,
+    finish_stream_parser,
+    forecast_due_counts,
+    get_generation_engine,
+    get_generation_worker_pool,
+    is_cacheable_temperature,
+    llm_cache_key,
+    match_answer,
+    minhash_signature,
+    near_duplicate_add,
+    near_duplicate_pending,
+    near_duplicate_query,
+    new_bank_event_log,
+    new_chunk_stream,
+    new_facet_index,
+    new_generation_batch_id,
+    new_generation_job,
+    new_near_duplicate_index,
+    new_related_state,
+    new_search_index,
+    new_stream_parser,
+    ocr_image_bytes,
+    parse_accepted_answers,
+    plan_chunks,
+    rate_limit_details,
+    read_extracted_pages,
+    read_upload_source,
+    reconcile_generation_queue_items,
+    record_bank_event,
+    resumable_generation_jobs,
+    related_questions,
+    search_index_add,
+    search_index_remove,
+    split_pages,
+    submit_document_extraction,
+    submit_duplicate_clustering,
+    submit_fsrs_optimization,
+    submit_minhash_backfill,
+    summarize_generation_batch,
+    sync_facet_index,
+    sync_related_state,
+    sync_search_index,
+    text_signature,
+    update_generation_job,
+)
 
 # ============================================================================
 # 감사 로그 (append-only JSONL)
@@ -50,6 +160,23 @@ def append_audit_log(event: str, payload: dict):
         # 감사 로그 실패는 앱 실행을 막지 않음
         pass
 
+def append_audit_logs(event: str, payloads):
+    """같은 이벤트의 여러 행을 한 번의 파일 열기로 기록"""
+    rows = [p for p in (payloads or []) if isinstance(p, dict)]
+    if not rows:
+        return
+    try:
+        run_id = str(int(time.time() * 1000))
+        timestamp = datetime.now(timezone.utc).isoformat()
+        lines = []
+        for payload in rows:
+            row = {"run_id": run_id, "timestamp": timestamp, "event": event, **payload}
+            lines.append(json.dumps(row, ensure_ascii=False) + "\n")
+        with open(get_audit_log_file(), "a", encoding="utf-8") as f:
+            f.writelines(lines)
+    except Exception:
+        pass
+
 def _gemini_usage_tokens(response):
     usage = getattr(response, "usage_metadata", None)
     if not usage:
@@ -138,7 +265,16 @@ def is_valid_email(value):
     text = (value or "").strip()
     return bool(re.match(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", text))
 
+# 세션 밖 스레드(생성 작업 워커, 생성 엔진)는 st.session_state를 볼 수 없어 호출한 쪽의 사용자/모델을 넘겨 받는다
+_RUNTIME_CONTEXT = threading.local()
+
+def get_runtime_context():
+    return getattr(globals().get("_RUNTIME_CONTEXT"), "values", None) or {}
+
 def get_current_user_id():
+    context_user = get_runtime_context().get("user_id")
+    if context_user:
+        return sanitize_user_id(context_user)
     return sanitize_user_id(st.session_state.get("auth_user_id", "guest"))
 
 def get_user_data_dir(user_id=None):
@@ -162,6 +298,24 @@ def get_user_settings_file(user_id=None):
 def get_audit_log_file(user_id=None):
     return str(get_user_data_dir(user_id) / "audit_log.jsonl")
 
+def get_fsrs_review_rows_file(user_id=None):
+    return str(get_user_data_dir(user_id) / "fsrs_review_rows.json")
+
+def get_review_log_file(user_id=None):
+    return str(get_user_data_dir(user_id) / "review_log.bin")
+
+def get_search_index_file(user_id=None):
+    return str(get_user_data_dir(user_id) / "search_index.pkl")
+
+def get_near_duplicate_file(user_id=None):
+    return str(get_user_data_dir(user_id) / "near_duplicates.pkl")
+
+def get_bank_events_file(user_id=None):
+    return str(get_user_data_dir(user_id) / "bank_events.json")
+
+def get_llm_cache_file(user_id=None):
+    return str(get_user_data_dir(user_id) / "llm_cache.sqlite3")
+
 MODEL_PRICING_USD_PER_1M = {
     "gpt-4o-mini": {"input": 0.15, "output": 0.60, "blended": 0.30},
     "gemini-2.5-flash-lite": {"input": 0.10, "output": 0.40, "blended": 0.20},
@@ -443,6 +597,74 @@ def _get_llm_seed():
     except Exception:
         return None
 LLM_SEED = _get_llm_seed()
+def _get_llm_cache_max_bytes():
+    try:
+        return int(float(os.getenv("LLM_CACHE_MAX_MB", "")) * 1024 * 1024)
+    except Exception:
+        return DEFAULT_LLM_CACHE_MAX_BYTES
+LLM_CACHE_MAX_BYTES = _get_llm_cache_max_bytes()
+def get_provider_limits():
+    """제공자별 동시 요청 수/분당 요청 수/분당 토큰 수 (예: LLM_OPENAI_CONCURRENCY, LLM_GEMINI_RPM, LLM_GEMINI_TPM)"""
+    limits = {}
+    for provider, defaults in DEFAULT_PROVIDER_LIMITS.items():
+        limit = dict(defaults)
+        for key in limit:
+            raw = os.getenv(f"LLM_{provider.upper()}_{key.upper()}", "")
+            try:
+                if raw:
+                    limit[key] = max(1, int(raw))
+            except ValueError:
+                pass
+        limits[provider] = limit
+    return limits
+GENERATION_OUTPUT_TOKENS = 4000
+GENERATION_INPUT_CHARS = 30000
+def _get_generation_job_workers():
+    # 워커는 공용 엔진의 제공자 한도를 기다리기만 하므로, 일괄 생성 때 여러 파일의 청크가 함께 엔진에 들어가도록 넉넉히 둔다
+    try:
+        return max(1, int(os.getenv("GENERATION_JOB_WORKERS", "8")))
+    except ValueError:
+        return 8
+GENERATION_JOB_WORKERS = _get_generation_job_workers()
+GENERATION_JOBS_POLL_SECONDS = 2.0
+
+def cached_llm_call(kind, provider, model, prompt, call, seed=None, version=None, use_cache=True, validate=None):
+    """temperature 0 호출 응답을 디스크 LRU 캐시로 재사용.
+
+    call()은 (응답 텍스트, 사용 토큰 수)를 반환. 결과는 (텍스트, 사용 토큰 수, 캐시 적중 여부)이고
+    적중하면 API를 호출하지 않으므로 사용 토큰은 0. 조회마다 누적 hits/misses를 감사 로그에 남긴다.
+    use_cache=False면 캐시를 읽지 않고 API를 다시 부르되, 새로 받은 응답으로 저장된 항목을 갱신한다.
+    validate(text)가 False인 응답(잘리거나 파싱되지 않는 응답)은 저장하지 않고, 이미 저장된 것도 적중으로
+    보지 않아 재시도가 같은 나쁜 응답을 다시 받지 않는다.
+    """
+    if not is_cacheable_temperature(LLM_TEMPERATURE):
+        text, tokens = call()
+        return text, tokens, False
+    path = get_llm_cache_file()
+    key = llm_cache_key(provider, model, prompt, LLM_TEMPERATURE, seed, version or PROMPT_VERSION)
+    if use_cache:
+        cached = load_llm_cache_entry(path, key)
+        if cached is not None and validate is not None and not validate(cached):
+            cached = None
+        counters = llm_cache_counters(path)
+        append_audit_log("llm.cache", {
+            "kind": kind,
+            "provider": provider,
+            "model": model,
+            "hit": cached is not None,
+            "cache_key": key[:16],
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+            "entries": counters["entries"],
+            "bytes": counters["bytes"],
+        })
+        if cached is not None:
+            return cached, 0, True
+    text, tokens = call()
+    if text and (validate is None or validate(text)):
+        save_llm_cache_entry(path, key, text, LLM_CACHE_MAX_BYTES)
+    return text, tokens, False
+
 def get_query_param(name, default=None):
     try:
         params = st.query_params
@@ -479,6 +701,8 @@ resolved_theme_mode = resolve_theme_mode_from_query(theme_param, default="Light"
 MOBILE_CLIENT = resolve_mobile_flag_from_query(mobile_param)
 
 DEBUG_MODE = str(ping_param) == "1"
+# ping=1은 로드 확인 후 바로 멈추므로, 화면별 처리 시간은 debug=1에서 사이드바 패널로 표시
+PERF_DEBUG = str(get_query_param("debug", "0")) == "1"
 if DEBUG_MODE:
     st.write("✅ DEBUG: app.py loaded")
     st.write(f"Streamlit version: {st.__version__}")
@@ -524,6 +748,10 @@ if "exam_stats_applied" not in st.session_state:
     st.session_state.exam_stats_applied = False
 if "graded_questions" not in st.session_state:
     st.session_state.graded_questions = set()
+if "review_buffer" not in st.session_state:
+    st.session_state.review_buffer = []
+if "review_buffer_since" not in st.session_state:
+    st.session_state.review_buffer_since = None
 # (trend_days retained for future use)
 if "trend_days" not in st.session_state:
     st.session_state.trend_days = 14
@@ -606,17 +834,35 @@ def reset_runtime_state_for_auth_change():
         "user_answers",
         "revealed_answers",
         "graded_questions",
+        "review_buffer",
+        "review_buffer_since",
         "current_exam_meta",
         "exam_started",
         "exam_finished",
         "exam_history_saved",
         "generation_preview_items",
         "generation_failure",
+        "generation_last_result",
+        "generation_job_notices",
+        "generation_streamed_saved",
         "last_action_notice",
         "past_exam_items",
         "past_exam_images",
         "past_exam_text",
         "fsrs_settings_initialized",
+        "fsrs_scheduler_fingerprint",
+        "fsrs_optimizer_job",
+        "review_forecast_cache",
+        "bank_events",
+        "facet_index",
+        "search_index",
+        "near_duplicate_index",
+        "near_duplicate_backfill_job",
+        "near_duplicate_report",
+        "duplicate_cluster_job",
+        "related_questions",
+        "dashboard_analytics",
+        "debug_timings",
         "remote_bundle_cache",
         "user_data_cache",
     ]
@@ -646,6 +892,50 @@ def _set_user_data_cache(kind, value, user_id=None):
     st.session_state["user_data_cache"] = cache
     return value
 
+# 같은 사용자의 여러 세션(탭)이 한 bank_events.json을 번갈아 덮어쓰지 않도록 읽고-추가하고-쓰는 구간을 묶는다
+_BANK_EVENT_LOCK = threading.Lock()
+
+def get_bank_revision():
+    """사용자별 문제은행 revision (저장할 때마다 1씩 증가, 파생 캐시 무효화용)"""
+    return int(st.session_state.get("bank_revision", 0) or 0)
+
+def get_bank_event_log():
+    """현재 사용자의 revision/변경 이벤트 로그 (디스크에서 세션당 한 번 읽음)"""
+    log = st.session_state.get("bank_events")
+    if log is None:
+        log = load_bank_event_file(get_bank_events_file()) or new_bank_event_log()
+        st.session_state["bank_events"] = log
+        st.session_state["bank_revision"] = log["revision"]
+    return log
+
+def record_bank_change(change=None, user_id=None):
+    """저장된 변경({"added", "updated": {id: 필드}, "deleted"})을 이벤트로 남기고 revision을 올림.
+
+    change가 None이면 무엇이 바뀌었는지 모르는 저장으로 기록되어, 구독하는 캐시는 전체를 다시 맞춘다.
+    다른 세션이 그 사이에 남긴 이벤트를 지우지 않도록 디스크의 로그를 다시 읽어 그 뒤에 붙인다.
+    """
+    path = get_bank_events_file(user_id)
+    with _BANK_EVENT_LOCK:
+        log = load_bank_event_file(path)
+        if user_id is None:
+            session_log = get_bank_event_log()
+            if log is None or log["revision"] < session_log["revision"]:
+                log = session_log
+        log = log or new_bank_event_log()
+        event = record_bank_event(log, change)
+        save_bank_event_file(path, log)
+    if user_id is None:
+        st.session_state["bank_events"] = log
+        st.session_state["bank_revision"] = log["revision"]
+    return event
+
+def get_bank_changes(revision):
+    """revision 이후의 합쳐진 변경 내역. 이벤트 로그로 알 수 없으면 None (전체 재구성)"""
+    log = st.session_state.get("bank_events")
+    if log is None or revision is None:
+        return None
+    return bank_changes_since(log, revision)
+
 def _get_or_load_user_data(kind, loader, user_id=None, force=False):
     if not force:
         cached = _get_user_data_cache(kind, user_id=user_id)
@@ -727,6 +1017,8 @@ def load_questions(user_id=None) -> dict:
     cached = _get_user_data_cache("questions", user_id=user_id)
     if cached is not None:
         return ensure_question_ids(cached)
+    if user_id is None:
+        get_bank_event_log()
     if user_id is None and is_supabase_required():
         if use_remote_user_store():
             bundle = load_remote_bundle()
@@ -753,9 +1045,12 @@ def load_questions(user_id=None) -> dict:
                         migrate_old_format(data, user_id=user_id)
                         return load_questions(user_id=user_id)  # 다시 로드
                 data = ensure_question_ids(data)
-                return _set_user_data_cache("questions", data, user_id=user_id)
         except:
             return _set_user_data_cache("questions", {"text": [], "cloze": []}, user_id=user_id)
+        if use_review_log_store(user_id) and has_embedded_review_logs(data):
+            # 실패해도 읽은 문항(내장 기록 포함)은 그대로 쓴다
+            data = migrate_embedded_review_logs(data, user_id=user_id)
+        return _set_user_data_cache("questions", data, user_id=user_id)
     return _set_user_data_cache("questions", {"text": [], "cloze": []}, user_id=user_id)
 
 def migrate_old_format(data: dict, user_id=None):
@@ -802,8 +1097,8 @@ def migrate_old_format(data: dict, user_id=None):
         import sys
         print(f"[MIGRATION ERROR] {str(e)}", file=sys.stderr)
 
-def save_questions(data: dict, user_id=None):
-    """questions.json 파일 저장"""
+def save_questions(data: dict, user_id=None, change=None):
+    """questions.json 파일 저장. change는 record_bank_change에 넘길 변경 내역"""
     if user_id is None and is_supabase_required():
         if not use_remote_user_store():
             notify_remote_store_failure("⚠️ Supabase 로그인 상태가 아니어서 저장할 수 없습니다.")
@@ -811,6 +1106,7 @@ def save_questions(data: dict, user_id=None):
         bundle = load_remote_bundle() or _default_remote_bundle()
         bundle["questions"] = data
         if save_remote_bundle(bundle):
+            record_bank_change(change, user_id=user_id)
             _set_user_data_cache("questions", data, user_id=user_id)
             return True
         notify_remote_store_failure("⚠️ Supabase 저장 실패로 문항 저장이 취소되었습니다.")
@@ -819,11 +1115,13 @@ def save_questions(data: dict, user_id=None):
         bundle = load_remote_bundle() or _default_remote_bundle()
         bundle["questions"] = data
         if save_remote_bundle(bundle):
+            record_bank_change(change, user_id=user_id)
             _set_user_data_cache("questions", data, user_id=user_id)
             return True
     question_bank_file = get_question_bank_file(user_id)
     with open(question_bank_file, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+    record_bank_change(change, user_id=user_id)
     _set_user_data_cache("questions", data, user_id=user_id)
     return True
 
@@ -892,13 +1190,15 @@ def add_exam_history(session, user_id=None):
 
 def clear_question_bank(mode="all", user_id=None):
     data = load_questions(user_id=user_id)
+    cleared = {"mcq": ("text",), "cloze": ("cloze",)}.get(mode, ("text", "cloze"))
+    removed = [q.get("id") for key in cleared for q in data.get(key, [])]
     if mode == "mcq":
         data["text"] = []
     elif mode == "cloze":
         data["cloze"] = []
     else:
         data = {"text": [], "cloze": []}
-    save_questions(data, user_id=user_id)
+    save_questions(data, user_id=user_id, change={"deleted": removed})
     return data
 
 def clear_exam_history(user_id=None):
@@ -981,9 +1281,23 @@ def save_fsrs_settings(settings):
     data = load_user_settings()
     data["fsrs_settings"] = settings
     save_user_settings(data)
+    invalidate_fsrs_scheduler_cache()
 
 def get_gemini_model_id():
-    return st.session_state.get("gemini_model_id") or "gemini-2.5-flash"
+    context_model = get_runtime_context().get("gemini_model_id")
+    return context_model or st.session_state.get("gemini_model_id") or "gemini-2.5-flash"
+
+def capture_runtime_context():
+    return {"user_id": get_current_user_id(), "gemini_model_id": get_gemini_model_id()}
+
+def call_with_runtime_context(context, fn, *args, **kwargs):
+    """context의 사용자/모델로 fn을 실행 (워커 스레드에서 사용자별 캐시/감사 로그 경로를 지키기 위함)"""
+    previous = getattr(_RUNTIME_CONTEXT, "values", None)
+    _RUNTIME_CONTEXT.values = context
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _RUNTIME_CONTEXT.values = previous
 
 def _steps_to_timedelta(steps):
     out = []
@@ -996,10 +1310,23 @@ def _steps_to_timedelta(steps):
             continue
     return tuple(out)
 
-def get_fsrs_scheduler():
-    if not FSRS_AVAILABLE:
-        return None
-    settings = load_fsrs_settings()
+# 설정 fingerprint -> Scheduler (설정이 같으면 사용자 간에도 공유 가능)
+_FSRS_SCHEDULER_CACHE = {}
+_FSRS_SCHEDULER_CACHE_MAX = 32
+
+def fsrs_settings_fingerprint(settings):
+    settings = settings if isinstance(settings, dict) else {}
+    payload = {
+        "desired_retention": settings.get("desired_retention", 0.9),
+        "learning_steps": list(settings.get("learning_steps", [1, 10]) or []),
+        "relearning_steps": list(settings.get("relearning_steps", [10]) or []),
+        "maximum_interval": settings.get("maximum_interval", 36500),
+        "enable_fuzzing": bool(settings.get("enable_fuzzing", True)),
+        "parameters": list(settings.get("parameters") or FSRS_DEFAULT_PARAMETERS),
+    }
+    return _hash_text(json.dumps(payload, sort_keys=True, default=str))
+
+def build_fsrs_scheduler(settings):
     params = settings.get("parameters") or list(FSRS_DEFAULT_PARAMETERS)
     try:
         return Scheduler(
@@ -1013,6 +1340,107 @@ def get_fsrs_scheduler():
     except Exception:
         return Scheduler()
 
+def invalidate_fsrs_scheduler_cache():
+    """현재 세션의 scheduler fingerprint를 폐기해 다음 호출에서 설정을 다시 읽도록 함"""
+    st.session_state["fsrs_scheduler_fingerprint"] = None
+
+def get_fsrs_scheduler():
+    if not FSRS_AVAILABLE:
+        return None
+    fingerprint = st.session_state.get("fsrs_scheduler_fingerprint")
+    cached = _FSRS_SCHEDULER_CACHE.get(fingerprint) if fingerprint else None
+    if cached is not None:
+        return cached
+    settings = load_fsrs_settings()
+    fingerprint = fsrs_settings_fingerprint(settings)
+    scheduler = _FSRS_SCHEDULER_CACHE.get(fingerprint)
+    if scheduler is None:
+        scheduler = build_fsrs_scheduler(settings)
+        if len(_FSRS_SCHEDULER_CACHE) >= _FSRS_SCHEDULER_CACHE_MAX:
+            _FSRS_SCHEDULER_CACHE.pop(next(iter(_FSRS_SCHEDULER_CACHE)))
+        _FSRS_SCHEDULER_CACHE[fingerprint] = scheduler
+    st.session_state["fsrs_scheduler_fingerprint"] = fingerprint
+    return scheduler
+
+def collect_fsrs_review_rows(questions, user_id=None):
+    """전체 문항의 FSRS 로그 행 수집 (이전 추출 결과를 재사용하는 증분 방식)"""
+    cache_file = get_fsrs_review_rows_file(user_id)
+    cache = load_json_file(cache_file, {})
+    rows, next_cache, info = extract_review_rows(questions, cache=cache)
+    if info.get("parsed") or len(next_cache) != len(cache):
+        save_json_file(cache_file, next_cache)
+    if use_review_log_store(user_id):
+        stored = iter_review_rows(get_review_log_file(user_id), kind="fsrs")
+        rows = rows + stored
+        info = {**info, "stored": len(stored), "rows": len(rows)}
+    return rows, info
+
+def start_fsrs_optimizer_job():
+    """복습 로그 기반 파라미터 최적화를 워커 프로세스에서 시작"""
+    if not FSRS_AVAILABLE:
+        return False, "FSRS가 설치되어 있지 않습니다."
+    job = st.session_state.get("fsrs_optimizer_job")
+    if isinstance(job, dict) and job.get("status") == "running":
+        return False, "이미 최적화가 진행 중입니다."
+    bank = load_questions()
+    rows, info = collect_fsrs_review_rows(bank.get("text", []) + bank.get("cloze", []))
+    settings = load_fsrs_settings()
+    base_params = settings.get("parameters") or list(FSRS_DEFAULT_PARAMETERS)
+    try:
+        future = submit_fsrs_optimization(rows, base_params)
+    except Exception as exc:
+        return False, f"최적화 작업 시작 실패: {exc}"
+    st.session_state["fsrs_optimizer_job"] = {
+        "status": "running",
+        "future": future,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "review_count": len(rows),
+        "extract": info,
+    }
+    return True, f"복습 기록 {len(rows)}건으로 최적화를 시작했습니다."
+
+def update_fsrs_optimizer_job():
+    """완료된 최적화 결과를 save_fsrs_settings로 반영하고 상태를 반환"""
+    job = st.session_state.get("fsrs_optimizer_job")
+    if not isinstance(job, dict) or job.get("status") != "running":
+        return job
+    future = job.get("future")
+    if future is None or not future.done():
+        return job
+    try:
+        result = future.result()
+    except Exception as exc:
+        result = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+    job = {k: v for k, v in job.items() if k != "future"}
+    job["finished_at"] = datetime.now(timezone.utc).isoformat()
+    job["result"] = {k: v for k, v in result.items() if k != "parameters"}
+    if result.get("ok"):
+        settings = load_fsrs_settings()
+        settings["parameters"] = list(result.get("parameters") or settings.get("parameters") or [])
+        settings["optimization"] = {
+            "optimized_at": job["finished_at"],
+            "review_count": result.get("review_count", 0),
+            "card_count": result.get("card_count", 0),
+            "loss_before": result.get("loss_before"),
+            "loss_after": result.get("loss_after"),
+        }
+        save_fsrs_settings(settings)
+        st.session_state.fsrs_params_text = json.dumps(settings["parameters"])
+        job["status"] = "done"
+    else:
+        job["status"] = "failed"
+    append_audit_log("fsrs.optimize", {
+        "status": job["status"],
+        "review_count": result.get("review_count", 0),
+        "card_count": result.get("card_count", 0),
+        "loss_before": result.get("loss_before"),
+        "loss_after": result.get("loss_after"),
+        "elapsed_ms": result.get("elapsed_ms", 0),
+        "error": result.get("error", ""),
+    })
+    st.session_state["fsrs_optimizer_job"] = job
+    return job
+
 # FSRS settings -> session state (initialize once)
 if "fsrs_settings_initialized" not in st.session_state:
     _fsrs_settings = load_fsrs_settings()
@@ -1094,7 +1522,125 @@ def ensure_question_ids(data: dict) -> dict:
         save_questions(data)
     return data
 
-def add_questions_to_bank(questions_data, mode, subject="General", unit="미분류", quality_filter=True, min_length=20, batch_id=None):
+def _normalize_text_for_dedupe(text):
+    return " ".join(str(text or "").split()).lower()
+
+def build_question_dedupe_key(q):
+    """공백/대소문자만 다른 동일 문항을 찾기 위한 키"""
+    if q.get("front") and not q.get("problem"):
+        return "cloze:" + _normalize_text_for_dedupe(q.get("front")) + "|" + _normalize_text_for_dedupe(q.get("answer"))
+    options = "|".join(_normalize_text_for_dedupe(o) for o in (q.get("options") or []))
+    return "mcq:" + _normalize_text_for_dedupe(q.get("problem")) + "|" + options
+
+def question_dedupe_text(q):
+    """유사 중복 비교 대상: 문항(또는 빈칸 앞면) + 선지(또는 정답)"""
+    parts = [q.get("problem") or q.get("front") or ""]
+    options = q.get("options")
+    if isinstance(options, list):
+        parts.extend(str(o) for o in options)
+    elif q.get("front") and q.get("answer"):
+        parts.append(str(q.get("answer")))
+    return "\n".join(p for p in parts if p)
+
+def get_near_duplicate_index():
+    index = st.session_state.get("near_duplicate_index")
+    if index is None:
+        index = load_near_duplicate_file(get_near_duplicate_file(), NEAR_DUPLICATE_INDEX_VERSION) or new_near_duplicate_index()
+        st.session_state["near_duplicate_index"] = index
+    return index
+
+def prepare_near_duplicate_check(threshold=None, action=None):
+    """문항 추가 시 사용할 유사 중복 검사 상태 (사용 안 함이면 None)"""
+    if not st.session_state.get("near_dup_enabled", True):
+        return None
+    return {
+        "index": get_near_duplicate_index(),
+        "threshold": float(threshold or st.session_state.get("near_dup_threshold", DEFAULT_NEAR_DUPLICATE_THRESHOLD)),
+        "action": action or st.session_state.get("near_dup_action", "skip"),
+        "live_ids": None,
+        "hits": [],
+    }
+
+def screen_near_duplicate(check, item):
+    """item을 LSH 색인 후보와 비교. 건너뛸 문항이면 True, 통과한 문항은 색인에 추가"""
+    text = question_dedupe_text(item)
+    signature = minhash_signature(text)
+    index = check["index"]
+    live_ids = check["live_ids"]
+    matches = [
+        (key, sim) for key, sim in near_duplicate_query(index, signature, threshold=check["threshold"])
+        if live_ids is None or key in live_ids
+    ]
+    skip = bool(matches) and check["action"] == "skip"
+    if matches:
+        check["hits"].append({
+            "id": item.get("id"),
+            "match_id": matches[0][0],
+            "similarity": round(matches[0][1], 3),
+            "text": text[:80],
+            "skipped": skip,
+        })
+    if not skip:
+        near_duplicate_add(index, item.get("id"), signature, text_sig=text_signature(text))
+        if live_ids is not None:
+            live_ids.add(item.get("id"))
+    return skip
+
+def commit_near_duplicate_check(check):
+    save_near_duplicate_file(get_near_duplicate_file(), check["index"])
+    st.session_state["near_duplicate_report"] = list(check["hits"])
+
+def start_near_duplicate_backfill_job():
+    """기존 문항의 MinHash 서명을 워커 프로세스에서 생성"""
+    job = st.session_state.get("near_duplicate_backfill_job")
+    if isinstance(job, dict) and job.get("status") == "running":
+        return False, "이미 서명 생성이 진행 중입니다."
+    bank = load_questions()
+    texts = {q["id"]: question_dedupe_text(q) for q in bank.get("text", []) + bank.get("cloze", []) if q.get("id")}
+    index = get_near_duplicate_index()
+    pending = near_duplicate_pending(index, texts)
+    if not pending:
+        _, removed = apply_minhash_signatures(index, {}, live_keys=set(texts))
+        if removed:
+            save_near_duplicate_file(get_near_duplicate_file(), index)
+        return False, "모든 문항의 서명이 최신 상태입니다."
+    try:
+        future = submit_minhash_backfill(pending, num_perm=index["num_perm"], seed=index["seed"])
+    except Exception as exc:
+        return False, f"서명 생성 작업 시작 실패: {exc}"
+    st.session_state["near_duplicate_backfill_job"] = {
+        "status": "running",
+        "future": future,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "pending": len(pending),
+        "live_ids": set(texts),
+    }
+    return True, f"문항 {len(pending)}개의 서명 생성을 시작했습니다."
+
+def update_near_duplicate_backfill_job():
+    """완료된 서명 백필 결과를 색인에 반영하고 상태를 반환"""
+    job = st.session_state.get("near_duplicate_backfill_job")
+    if not isinstance(job, dict) or job.get("status") != "running":
+        return job
+    future = job.get("future")
+    if future is None or not future.done():
+        return job
+    try:
+        result = future.result()
+        index = get_near_duplicate_index()
+        applied, removed = apply_minhash_signatures(index, result, live_keys=job.get("live_ids"))
+        save_near_duplicate_file(get_near_duplicate_file(), index)
+        job_result = {"applied": applied, "removed": removed, "elapsed_ms": result.get("elapsed_ms", 0)}
+        status = "done"
+    except Exception as exc:
+        job_result = {"error": f"{type(exc).__name__}: {exc}"}
+        status = "failed"
+    job = {k: v for k, v in job.items() if k not in ("future", "live_ids")}
+    job.update({"status": status, "finished_at": datetime.now(timezone.utc).isoformat(), "result": job_result})
+    st.session_state["near_duplicate_backfill_job"] = job
+    return job
+
+def add_questions_to_bank(questions_data, mode, subject="General", unit="미분류", quality_filter=True, min_length=20, batch_id=None, near_dup=None):
     """생성된 문제를 question bank에 추가 (구조화된 JSON 형식)
     
     Args:
@@ -1105,11 +1651,16 @@ def add_questions_to_bank(questions_data, mode, subject="General", unit="미분
         subject: 과목명
         quality_filter: 품질 필터링 여부
         min_length: 최소 길이
+        near_dup: prepare_near_duplicate_check() 결과 (주면 유사 중복 문항을 보고/건너뜀)
     
     Returns:
         추가된 문제 개수
     """
     bank = load_questions()
+    existing = [q for q in bank.get("text", []) + bank.get("cloze", []) if isinstance(q, dict)]
+    existing_keys = {build_question_dedupe_key(q) for q in existing}
+    if near_dup is not None:
+        near_dup["live_ids"] = {q.get("id") for q in existing}
     
     # 문자열이면 파싱 (기존 호환성)
     if isinstance(questions_data, str):
@@ -1117,7 +1668,7 @@ def add_questions_to_bank(questions_data, mode, subject="General", unit="미분
     else:
         parsed_questions = questions_data if isinstance(questions_data, list) else [questions_data]
     
-    added_count = 0
+    added_ids = []
     if not batch_id:
         batch_id = datetime.now().strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
 
@@ -1135,6 +1686,10 @@ def add_questions_to_bank(questions_data, mode, subject="General", unit="미분
                 front_text = q_data.get("front", "")
                 if len(front_text) < min_length:
                     continue
+
+        dedupe_key = build_question_dedupe_key(q_data)
+        if dedupe_key in existing_keys:
+            continue
         
         # 메타데이터 추가
         q_data["subject"] = q_data.get("subject") or subject
@@ -1143,18 +1698,23 @@ def add_questions_to_bank(questions_data, mode, subject="General", unit="미분
         if "id" not in q_data:
             q_data["id"] = str(uuid.uuid4())
         q_data["batch_id"] = q_data.get("batch_id") or batch_id
+
+        if near_dup is not None and screen_near_duplicate(near_dup, q_data):
+            continue
+        existing_keys.add(dedupe_key)
         
         if mode == MODE_MCQ:
             bank["text"].append(q_data)
         else:
-            bank["cloze"].append(q_data)
+            bank["cloze"].append(refresh_answer_keys(q_data))
         
-        added_count += 1
+        added_ids.append(q_data["id"])
     
-    save_questions(bank)
-    return added_count
+    if save_questions(bank, change={"added": added_ids}) and near_dup is not None:
+        commit_near_duplicate_check(near_dup)
+    return len(added_ids)
 
-def add_questions_to_bank_auto(items, subject="General", unit="미분류", quality_filter=True, min_length=20, batch_id=None):
+def add_questions_to_bank_auto(items, subject="General", unit="미분류", quality_filter=True, min_length=20, batch_id=None, near_dup=None):
     """MCQ/Cloze 혼합 입력 자동 분류 후 저장"""
     if not batch_id:
         batch_id = datetime.now().strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
@@ -1172,9 +1732,9 @@ def add_questions_to_bank_auto(items, subject="General", unit="미분류", quali
             mcq_items.append(item)
     added = 0
     if mcq_items:
-        added += add_questions_to_bank(mcq_items, MODE_MCQ, subject, unit, quality_filter, min_length, batch_id=batch_id)
+        added += add_questions_to_bank(mcq_items, MODE_MCQ, subject, unit, quality_filter, min_length, batch_id=batch_id, near_dup=near_dup)
     if cloze_items:
-        added += add_questions_to_bank(cloze_items, MODE_CLOZE, subject, unit, quality_filter, min_length, batch_id=batch_id)
+        added += add_questions_to_bank(cloze_items, MODE_CLOZE, subject, unit, quality_filter, min_length, batch_id=batch_id, near_dup=near_dup)
     return added
 
 
@@ -1468,6 +2028,8 @@ def parse_cloze_content(q_data: dict) -> dict:
         "raw": q_data.get("front", ""),
         "front": q_data.get("front", ""),
         "answer": q_data.get("answer", ""),
+        "accepted_answers": q_data.get("accepted_answers", []),
+        "answer_keys": q_data.get("answer_keys"),
         "response_type": q_data.get("response_type", "cloze"),
         "explanation": q_data.get("explanation", ""),
         "subject": q_data.get("subject"),
@@ -1489,13 +2051,23 @@ def get_question_stats():
 
 def fuzzy_match(user_answer, correct_answer, threshold=0.8):
     """Cloze 답변 유사도 비교"""
-    user_clean = re.sub(r'[^\w가-힣]', '', str(user_answer).lower())
-    correct_clean = re.sub(r'[^\w가-힣]', '', correct_answer.lower())
-    
-    if user_clean == correct_clean:
-        return True
-    ratio = SequenceMatcher(None, user_clean, correct_clean).ratio()
-    return ratio >= threshold
+    return match_answer(user_answer, build_answer_keys(correct_answer), threshold=threshold)
+
+def get_answer_keys(q):
+    """저장 시 계산해 둔 정규화 정답 키 (없으면 정답 + 허용 답안으로 계산)"""
+    keys = q.get("answer_keys")
+    if isinstance(keys, list) and keys:
+        return keys
+    return build_answer_keys(q.get("answer"), q.get("accepted_answers"))
+
+def refresh_answer_keys(item):
+    """빈칸/단답 문항의 answer_keys를 현재 정답과 허용 답안 기준으로 다시 계산"""
+    item["answer_keys"] = build_answer_keys(item.get("answer"), item.get("accepted_answers"))
+    return item
+
+def grade_short_answer(q, user_ans):
+    correct_text = q.get("answer")
+    return bool(correct_text and isinstance(user_ans, str) and match_answer(user_ans, get_answer_keys(q)))
 
 def calculate_quality_score(item_text, mode):
     """항목의 품질 점수 계산 (0~1.0)"""
@@ -1576,8 +2148,7 @@ def is_answer_correct(q, user_ans):
     if response_type == "essay":
         ai_grade = q.get("_ai_grade")
         return bool(isinstance(ai_grade, dict) and ai_grade.get("is_correct") is True)
-    correct_text = q.get("answer")
-    return bool(correct_text and isinstance(user_ans, str) and fuzzy_match(user_ans, correct_text))
+    return grade_short_answer(q, user_ans)
 
 def parse_iso_datetime(value):
     if not value:
@@ -1592,6 +2163,144 @@ def parse_iso_datetime(value):
         return None
     return None
 
+# ============================================================================
+# 리뷰 기록 저장소 (문항 JSON에서 분리된 append-only 바이너리 로그)
+# ============================================================================
+def use_review_log_store(user_id=None):
+    """로컬 저장소는 리뷰 기록을 별도 로그로 분리. 원격 번들 저장은 기존처럼 문항에 내장."""
+    if is_supabase_required() or use_remote_user_store():
+        return False
+    return True
+
+def append_review_log_records(records, user_id=None):
+    if not records or not use_review_log_store(user_id):
+        return 0
+    return append_review_records(get_review_log_file(user_id), records)
+
+def rekey_review_log_records(mapping, user_id=None):
+    """{삭제된 문항 id: 남긴 문항 id}로 분리 저장된 리뷰 기록을 옮긴다 (복사하지 않으므로 중복 집계 없음)"""
+    if not mapping or not use_review_log_store(user_id):
+        return 0
+    return rekey_review_records(get_review_log_file(user_id), mapping)
+
+def get_review_log_index(user_id=None):
+    """{문항 id: [(kind, value, epoch, card_id, duration), ...]}"""
+    if not use_review_log_store(user_id):
+        return {}
+    return load_review_index(get_review_log_file(user_id))
+
+def _answer_log_record(q_id, is_correct, now_iso):
+    return {"id": q_id, "kind": "answer", "value": 1 if is_correct else 0, "time": now_iso}
+
+def _fsrs_log_record(q_id, log):
+    return {
+        "id": q_id,
+        "kind": "fsrs",
+        "value": int(log.rating),
+        "time": log.review_datetime.isoformat(),
+        "card_id": int(log.card_id),
+        "duration": log.review_duration,
+    }
+
+def get_question_history(q, log_index=None):
+    """문항 풀이 이력 [{"time", "correct"}] (문항 내장 이력 + 분리 저장소, 시간순)"""
+    hist = [e for e in ((q.get("stats") or {}).get("history") or []) if isinstance(e, dict)]
+    index = get_review_log_index() if log_index is None else log_index
+    rows = index.get(q.get("id")) if q.get("id") else None
+    if rows:
+        stored = [
+            {"time": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(), "correct": bool(value)}
+            for kind, value, ts, _, _ in sorted(rows, key=lambda r: r[2])
+            if kind == 0
+        ]
+        hist = hist + stored if hist else stored
+    return hist
+
+def get_question_fsrs_logs(q, log_index=None):
+    """FSRS 리뷰 로그 [{"card_id", "rating", "review_datetime", "review_duration"}] (시간순)"""
+    logs = []
+    for raw in ((q.get("fsrs") or {}).get("logs") or []):
+        try:
+            data = json.loads(raw) if isinstance(raw, str) else raw
+        except Exception:
+            continue
+        if isinstance(data, dict):
+            logs.append(data)
+    index = get_review_log_index() if log_index is None else log_index
+    rows = index.get(q.get("id")) if q.get("id") else None
+    for kind, value, ts, card_id, duration in sorted(rows or [], key=lambda r: r[2]):
+        if kind != 1:
+            continue
+        logs.append({
+            "card_id": card_id,
+            "rating": value,
+            "review_datetime": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(),
+            "review_duration": None if duration < 0 else duration,
+        })
+    return logs
+
+def has_embedded_review_logs(data):
+    for item in data.get("text", []) + data.get("cloze", []):
+        if not isinstance(item, dict):
+            continue
+        if (item.get("stats") or {}).get("history") or (item.get("fsrs") or {}).get("logs"):
+            return True
+    return False
+
+def migrate_embedded_review_logs(data, user_id=None):
+    """stats.history / fsrs.logs를 분리 저장소로 옮기고 문항에는 집계값만 남김.
+
+    기록 추가나 문항 저장이 실패하면 내장 기록이 있는 원래 data를 그대로 돌려준다 (다음 로드 때 다시 시도, 이미 옮긴 기록은 건너뜀).
+    """
+    try:
+        index = load_review_index(get_review_log_file(user_id))
+        records = []
+        touched = {}
+        for item in data.get("text", []) + data.get("cloze", []):
+            if not isinstance(item, dict) or not item.get("id"):
+                continue
+            existing = {(kind, round(ts, 3)) for kind, _, ts, _, _ in index.get(item["id"], [])}
+            for entry in (item.get("stats") or {}).get("history") or []:
+                dt = parse_iso_datetime(entry.get("time")) if isinstance(entry, dict) else None
+                if dt is None:
+                    continue
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                if (0, round(dt.timestamp(), 3)) not in existing:
+                    records.append(_answer_log_record(item["id"], entry.get("correct") is True, dt.isoformat()))
+            for raw in (item.get("fsrs") or {}).get("logs") or []:
+                try:
+                    log = ReviewLog.from_json(raw) if isinstance(raw, str) else ReviewLog.from_dict(raw)
+                except Exception:
+                    continue
+                if log.review_datetime.tzinfo is None:
+                    log.review_datetime = log.review_datetime.replace(tzinfo=timezone.utc)
+                if (1, round(log.review_datetime.timestamp(), 3)) not in existing:
+                    records.append(_fsrs_log_record(item["id"], log))
+            if (item.get("stats") or {}).get("history") or (item.get("fsrs") or {}).get("logs"):
+                touched[item["id"]] = ["stats", "fsrs"]
+        if records and append_review_records(get_review_log_file(user_id), records) == 0:
+            return data
+        migrated = dict(data)
+        for key in ("text", "cloze"):
+            items = []
+            for item in data.get(key, []):
+                if isinstance(item, dict):
+                    item = dict(item)
+                    if isinstance(item.get("stats"), dict):
+                        item["stats"] = {k: v for k, v in item["stats"].items() if k != "history"}
+                    if isinstance(item.get("fsrs"), dict):
+                        item["fsrs"] = {k: v for k, v in item["fsrs"].items() if k != "logs"}
+                items.append(item)
+            migrated[key] = items
+        if not save_questions(migrated, user_id=user_id, change={"updated": touched}):
+            return data
+    except Exception as e:
+        print(f"[MIGRATION] 리뷰 기록 분리 실패, 문항에 그대로 둠: {e}", file=sys.stderr)
+        return data
+    print(f"[MIGRATION] 리뷰 기록 {len(records)}건을 분리 저장소로 이동", file=sys.stderr)
+    return migrated
+
 def get_fsrs_report(questions, now=None):
     if not FSRS_AVAILABLE:
         return None
@@ -1602,6 +2311,7 @@ def get_fsrs_report(questions, now=None):
     rating_counts = {"Again": 0, "Hard": 0, "Good": 0, "Easy": 0}
     intervals = []
     last_review = None
+    log_index = get_review_log_index()
     for q in questions:
         fsrs = q.get("fsrs") or {}
         card_data = fsrs.get("card")
@@ -1618,7 +2328,7 @@ def get_fsrs_report(questions, now=None):
             rating_counts[last_rating] += 1
 
         # logs
-        for log in fsrs.get("logs", []) or []:
+        for log in get_question_fsrs_logs(q, log_index=log_index):
             if isinstance(log, dict):
                 for key in ("review_datetime", "reviewed_at", "time", "date", "review"):
                     dt = parse_iso_datetime(log.get(key))
@@ -1643,31 +2353,45 @@ def get_fsrs_report(questions, now=None):
         "rating_counts": rating_counts,
     }
 
+def _apply_answer_to_item(item, is_correct, now_iso, embed_history=True):
+    stats = item.get("stats") or {}
+    stats["right"] = int(stats.get("right", 0))
+    stats["wrong"] = int(stats.get("wrong", 0))
+    if is_correct:
+        stats["right"] += 1
+    else:
+        stats["wrong"] += 1
+        stats["last_wrong"] = now_iso
+        wrong_at = parse_iso_datetime(now_iso)
+        if wrong_at is not None:
+            stats["last_wrong_ts"] = wrong_at.timestamp()
+    stats["last_attempt"] = now_iso
+    if embed_history:
+        history = stats.get("history") or []
+        history.append({"time": now_iso, "correct": bool(is_correct)})
+        stats["history"] = history[-200:]
+    item["stats"] = stats
+    return stats, _answer_log_record(item.get("id"), is_correct, now_iso)
+
+def _grade_audit_payload(q_id, is_correct):
+    return {
+        "question_id": q_id,
+        "correct": bool(is_correct),
+        "score": 1 if is_correct else 0,
+        "grader_version": GRADER_VERSION,
+    }
+
 def update_question_stats(q_id, is_correct):
     bank = load_questions()
     now = datetime.now(timezone.utc).isoformat()
     for key in ("text", "cloze"):
         for item in bank.get(key, []):
             if item.get("id") == q_id:
-                stats = item.get("stats") or {}
-                stats["right"] = int(stats.get("right", 0))
-                stats["wrong"] = int(stats.get("wrong", 0))
-                if is_correct:
-                    stats["right"] += 1
-                else:
-                    stats["wrong"] += 1
-                stats["last_attempt"] = now
-                history = stats.get("history") or []
-                history.append({"time": now, "correct": bool(is_correct)})
-                stats["history"] = history[-200:]
-                item["stats"] = stats
-                save_questions(bank)
-                append_audit_log("grade.answer", {
-                    "question_id": q_id,
-                    "correct": bool(is_correct),
-                    "score": 1 if is_correct else 0,
-                    "grader_version": GRADER_VERSION,
-                })
+                embed = not use_review_log_store()
+                stats, record = _apply_answer_to_item(item, is_correct, now, embed_history=embed)
+                if save_questions(bank, change={"updated": {q_id: ["stats"]}}) and not embed:
+                    append_review_log_records([record])
+                append_audit_log("grade.answer", _grade_audit_payload(q_id, is_correct))
                 return stats
     return None
 
@@ -1677,7 +2401,7 @@ def update_question_note(q_id, note_text):
         for item in bank.get(key, []):
             if item.get("id") == q_id:
                 item["note"] = note_text
-                save_questions(bank)
+                save_questions(bank, change={"updated": {q_id: ["note"]}})
                 return True
     return False
 
@@ -1690,10 +2414,14 @@ def update_question_by_id(q_id, patch):
             if item.get("id") == q_id:
                 allowed = {
                     "subject", "unit", "problem", "options", "answer", "front",
-                    "explanation", "difficulty", "note", "image"
+                    "explanation", "difficulty", "note", "image", "accepted_answers"
                 }
-                item.update({k: v for k, v in patch.items() if k in allowed})
-                save_questions(bank)
+                fields = [k for k in patch if k in allowed]
+                item.update({k: patch[k] for k in fields})
+                if key == "cloze" and ("answer" in patch or "accepted_answers" in patch):
+                    refresh_answer_keys(item)
+                    fields.append("answer_keys")
+                save_questions(bank, change={"updated": {q_id: fields}})
                 return True
     return False
 
@@ -1701,19 +2429,141 @@ def delete_mcq_by_ids(ids):
     if not ids:
         return 0
     data = load_questions()
-    before = len(data.get("text", []))
+    removed = [q.get("id") for q in data.get("text", []) if q.get("id") in ids]
     data["text"] = [q for q in data.get("text", []) if q.get("id") not in ids]
-    save_questions(data)
-    return before - len(data.get("text", []))
+    save_questions(data, change={"deleted": removed})
+    return len(removed)
 
 def delete_mcq_by_batch(batch_id):
     if not batch_id:
         return 0
     data = load_questions()
-    before = len(data.get("text", []))
+    removed = [q.get("id") for q in data.get("text", []) if (q.get("batch_id") or "legacy") == batch_id]
     data["text"] = [q for q in data.get("text", []) if (q.get("batch_id") or "legacy") != batch_id]
-    save_questions(data)
-    return before - len(data.get("text", []))
+    save_questions(data, change={"deleted": removed})
+    return len(removed)
+
+def question_keep_priority(q, log_index=None):
+    """중복 병합 시 남길 문항 우선순위: 풀이/복습 기록 > FSRS 카드 유무 > 해설 길이"""
+    stats = q.get("stats") or {}
+    attempts = int(stats.get("right", 0) or 0) + int(stats.get("wrong", 0) or 0)
+    reviews = len(get_question_fsrs_logs(q, log_index=log_index))
+    has_card = 1 if (q.get("fsrs") or {}).get("card") else 0
+    return (attempts + reviews, has_card, len(str(q.get("explanation") or "")))
+
+def start_duplicate_cluster_job(threshold=None):
+    """문제은행 전체 중복 클러스터링을 백그라운드에서 시작"""
+    job = st.session_state.get("duplicate_cluster_job")
+    if isinstance(job, dict) and job.get("status") == "running":
+        return False, "이미 중복 검사가 진행 중입니다."
+    bank = load_questions()
+    questions = [q for q in bank.get("text", []) + bank.get("cloze", []) if q.get("id")]
+    if len(questions) < 2:
+        return False, "비교할 문항이 부족합니다."
+    log_index = get_review_log_index()
+    texts = {q["id"]: question_dedupe_text(q) for q in questions}
+    priorities = {q["id"]: question_keep_priority(q, log_index=log_index) for q in questions}
+    threshold = float(threshold or st.session_state.get("near_dup_threshold", DEFAULT_NEAR_DUPLICATE_THRESHOLD))
+    try:
+        future = submit_duplicate_clustering(texts, priorities, threshold=threshold)
+    except Exception as exc:
+        return False, f"중복 검사 시작 실패: {exc}"
+    st.session_state["duplicate_cluster_job"] = {
+        "status": "running",
+        "future": future,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "item_count": len(questions),
+        "threshold": threshold,
+        "bank_revision": get_bank_revision(),
+    }
+    return True, f"문항 {len(questions)}개의 중복 검사를 시작했습니다."
+
+def update_duplicate_cluster_job():
+    """완료된 중복 검사 결과(병합 계획)를 세션 상태에 반영"""
+    job = st.session_state.get("duplicate_cluster_job")
+    if not isinstance(job, dict) or job.get("status") != "running":
+        return job
+    future = job.get("future")
+    if future is None or not future.done():
+        return job
+    try:
+        result = future.result()
+        status = "done"
+    except Exception as exc:
+        result = {"error": f"{type(exc).__name__}: {exc}"}
+        status = "failed"
+    job = {k: v for k, v in job.items() if k != "future"}
+    job.update({"status": status, "finished_at": datetime.now(timezone.utc).isoformat(), "result": result})
+    st.session_state["duplicate_cluster_job"] = job
+    return job
+
+def merge_duplicate_items(keep, others):
+    """others의 풀이 통계/이력, 최신 FSRS 상태, 메모를 keep에 합친다 (keep을 수정해 반환)"""
+    stats = dict(keep.get("stats") or {})
+    history = list(stats.get("history") or [])
+    fsrs = keep.get("fsrs") or {}
+    notes = [keep.get("note")] if keep.get("note") else []
+    for other in others:
+        o_stats = other.get("stats") or {}
+        stats["right"] = int(stats.get("right", 0) or 0) + int(o_stats.get("right", 0) or 0)
+        stats["wrong"] = int(stats.get("wrong", 0) or 0) + int(o_stats.get("wrong", 0) or 0)
+        for field in ("last_attempt", "last_wrong"):
+            if str(o_stats.get(field) or "") > str(stats.get(field) or ""):
+                stats[field] = o_stats.get(field)
+                if field == "last_wrong":
+                    stats.pop("last_wrong_ts", None)
+                    if o_stats.get("last_wrong_ts") is not None:
+                        stats["last_wrong_ts"] = o_stats["last_wrong_ts"]
+        history.extend(e for e in (o_stats.get("history") or []) if isinstance(e, dict))
+        o_fsrs = other.get("fsrs") or {}
+        # 가장 최근에 복습한 카드의 스케줄을 이어가고, 내장 로그는 모두 모은다
+        if o_fsrs.get("card") and str(o_fsrs.get("last_review") or "") > str(fsrs.get("last_review") or ""):
+            fsrs = {**o_fsrs, "logs": list(fsrs.get("logs") or []) + list(o_fsrs.get("logs") or [])}
+        elif o_fsrs.get("logs"):
+            fsrs = {**fsrs, "logs": list(fsrs.get("logs") or []) + list(o_fsrs.get("logs") or [])}
+        if other.get("note") and other.get("note") not in notes:
+            notes.append(other.get("note"))
+    if history:
+        stats["history"] = sorted(history, key=lambda e: str(e.get("time") or ""))[-200:]
+    if fsrs.get("logs"):
+        fsrs["logs"] = fsrs["logs"][-50:]
+    if stats:
+        keep["stats"] = stats
+    if fsrs:
+        keep["fsrs"] = fsrs
+    if notes:
+        keep["note"] = "\n".join(notes)
+    return keep
+
+def apply_duplicate_merge_plan(clusters):
+    """병합 계획 [{"keep", "remove": [[id, 유사도], ...]}]을 적용. (병합된 클러스터 수, 삭제된 문항 수)"""
+    bank = load_questions()
+    by_id = {q.get("id"): q for key in ("text", "cloze") for q in bank.get(key, []) if q.get("id")}
+    removed_ids = set()
+    kept_ids = set()
+    rekey = {}
+    merged = 0
+    for cluster in clusters or []:
+        keep = by_id.get(cluster.get("keep"))
+        if keep is None or keep.get("id") in removed_ids:
+            continue
+        others = [by_id[r[0]] for r in cluster.get("remove") or [] if r[0] in by_id and r[0] not in removed_ids and r[0] != keep.get("id")]
+        if not others:
+            continue
+        merge_duplicate_items(keep, others)
+        kept_ids.add(keep.get("id"))
+        for other in others:
+            removed_ids.add(other.get("id"))
+            rekey[other.get("id")] = keep.get("id")
+        merged += 1
+    if not removed_ids:
+        return 0, 0
+    for key in ("text", "cloze"):
+        bank[key] = [q for q in bank.get(key, []) if q.get("id") not in removed_ids]
+    if not save_questions(bank, change={"updated": {k: None for k in kept_ids}, "deleted": removed_ids}):
+        return 0, 0
+    rekey_review_log_records(rekey)
+    return merged, len(removed_ids)
 
 def get_mcq_batches(questions):
     batches = {}
@@ -1722,61 +2572,78 @@ def get_mcq_batches(questions):
         batches[b] = batches.get(b, 0) + 1
     return batches
 
-def get_wrong_note_stats(questions):
-    wrong_items = []
-    total_wrong = 0
-    for q in questions:
-        stats = q.get("stats") or {}
-        wrong = int(stats.get("wrong", 0))
-        if wrong > 0:
-            wrong_items.append(q)
-            total_wrong += wrong
-    return wrong_items, total_wrong
-
-def sort_wrong_first(questions, mode="오답 횟수", weight_recent=0.7, weight_count=0.3):
-    def last_wrong_time(q):
-        stats = q.get("stats") or {}
-        hist = stats.get("history") or []
-        latest = None
-        for entry in hist:
-            if not isinstance(entry, dict):
-                continue
-            if entry.get("correct") is True:
+def question_wrong_aggregate(q, log_index=None, with_last_wrong=True):
+    """(오답 횟수, 오답률, 마지막 오답 epoch). 채점 때 갱신되는 stats를 쓰고, last_wrong이 없는 예전 문항만 이력에서 계산.
+
+    채점 때 함께 저장한 stats.last_wrong_ts(epoch)가 있으면 ISO 문자열을 다시 파싱하지 않는다.
+    """
+    stats = q.get("stats") or {}
+    wrong = int(stats.get("wrong", 0) or 0)
+    total = wrong + int(stats.get("right", 0) or 0)
+    rate = wrong / total if total > 0 else 0
+    if not with_last_wrong:
+        return wrong, rate, None
+    last_wrong = stats.get("last_wrong_ts")
+    if last_wrong is not None:
+        return wrong, rate, float(last_wrong)
+    last_dt = parse_iso_datetime(stats.get("last_wrong"))
+    if last_dt is None and wrong:
+        for entry in get_question_history(q, log_index=log_index):
+            if not isinstance(entry, dict) or entry.get("correct") is True:
                 continue
             dt = parse_iso_datetime(entry.get("time"))
-            if dt:
-                if latest is None or dt > latest:
-                    latest = dt
-        return latest or datetime.min.replace(tzinfo=timezone.utc)
+            if dt and (last_dt is None or dt > last_dt):
+                last_dt = dt
+    return wrong, rate, (last_dt.timestamp() if last_dt else None)
+
+def sort_wrong_first(questions, mode="오답 횟수", weight_recent=0.7, weight_count=0.3, related_k=0, bank=None, limit=None, now=None):
+    """오답 우선순위로 정렬 (limit을 주면 상위 limit개만 heap으로 선택).
+
+    related_k > 0이면 각 오답 뒤에 비슷한 문항을 최대 related_k개 끼워 넣는다.
+    """
+    recent = mode == "최근 오답"
+    log_index = get_review_log_index() if recent else None
+    now_epoch = (now or datetime.now(timezone.utc)).timestamp()
 
     def score(q):
-        stats = q.get("stats") or {}
-        wrong = int(stats.get("wrong", 0))
-        right = int(stats.get("right", 0))
-        total = wrong + right
-        rate = wrong / total if total > 0 else 0
+        wrong, rate, last_wrong = question_wrong_aggregate(q, log_index=log_index, with_last_wrong=recent)
         if mode == "오답률":
             return (rate, wrong)
-        if mode == "최근 오답":
+        if recent:
             # 최근 오답일수록 높은 점수
-            last_dt = last_wrong_time(q)
-            days_since = (datetime.now(timezone.utc) - last_dt).days if last_dt else 9999
-            recency_score = 1 / (1 + max(days_since, 0))
+            recency_score = 0.0
+            if last_wrong is not None:
+                days_since = int((now_epoch - last_wrong) // 86400)
+                recency_score = 1 / (1 + max(days_since, 0))
             combined = weight_recent * recency_score + weight_count * wrong
             return (combined, recency_score, wrong)
         return (wrong, rate)
 
-    return sorted(questions, key=score, reverse=True)
+    if limit is not None:
+        ordered = heapq.nlargest(limit, questions, key=score)
+    else:
+        ordered = sorted(questions, key=score, reverse=True)
+    if related_k <= 0:
+        return ordered
+    data = bank if bank is not None else load_questions()
+    # 순위 밖 오답도 보충 문항으로 끼워 넣지 않도록 후보 전체를 제외
+    seen = {q.get("id") for q in questions if q.get("id")}
+    out = []
+    for q in ordered:
+        out.append(q)
+        for related, _ in find_related_questions(q, k=related_k, bank=data, exclude_ids=seen):
+            seen.add(related.get("id"))
+            out.append(related)
+    return out
 
 def compute_recent_accuracy(questions, days=7, now=None):
     check_time = now or datetime.now(timezone.utc)
     cutoff = check_time - timedelta(days=days)
     correct = 0
     total = 0
+    log_index = get_review_log_index()
     for q in questions:
-        stats = q.get("stats") or {}
-        hist = stats.get("history") or []
-        for entry in hist:
+        for entry in get_question_history(q, log_index=log_index):
             if not isinstance(entry, dict):
                 continue
             dt = parse_iso_datetime(entry.get("time"))
@@ -1798,10 +2665,9 @@ def compute_accuracy_trend(questions, days=14, now=None):
     for i in range(days):
         d = start + timedelta(days=i)
         buckets[d.isoformat()] = {"correct": 0, "total": 0}
+    log_index = get_review_log_index()
     for q in questions:
-        stats = q.get("stats") or {}
-        hist = stats.get("history") or []
-        for entry in hist:
+        for entry in get_question_history(q, log_index=log_index):
             if not isinstance(entry, dict):
                 continue
             dt = parse_iso_datetime(entry.get("time"))
@@ -1821,48 +2687,31 @@ def compute_accuracy_trend(questions, days=14, now=None):
         series.append({"date": dkey, "accuracy": acc})
     return series
 
-def compute_overall_accuracy(questions):
-    right = 0
-    wrong = 0
-    for q in questions:
-        stats = q.get("stats") or {}
-        right += int(stats.get("right", 0))
-        wrong += int(stats.get("wrong", 0))
-    total = right + wrong
-    if total == 0:
-        return None
-    accuracy = right / total * 100
-    return {"correct": right, "wrong": wrong, "total": total, "accuracy": accuracy}
+def record_debug_timing(name, elapsed_ms):
+    if PERF_DEBUG:
+        st.session_state.setdefault("debug_timings", {})[name] = round(float(elapsed_ms), 1)
 
-def fsrs_group_report(questions, group_key, now=None):
-    if not FSRS_AVAILABLE:
-        return []
+def render_debug_timings():
+    timings = st.session_state.get("debug_timings") or {}
+    if not PERF_DEBUG or not timings:
+        return
+    with st.sidebar.expander("🐞 DEBUG: 처리 시간", expanded=True):
+        safe_dataframe([{"구간": k, "ms": v} for k, v in timings.items()], use_container_width=True, hide_index=True)
+
+def get_dashboard_snapshot(bank=None, now=None):
+    """홈 대시보드 집계 (bank revision과 날짜가 바뀔 때만 다시 계산)"""
     check_time = now or datetime.now(timezone.utc)
-    groups = {}
-    for q in questions:
-        key = (q.get(group_key) or "General")
-        g = groups.setdefault(key, {"due": 0, "overdue": 0, "future": 0, "new": 0, "total": 0})
-        g["total"] += 1
-        fsrs = q.get("fsrs") or {}
-        card_data = fsrs.get("card")
-        if not card_data:
-            g["new"] += 1
-            g["due"] += 1
-            continue
-        try:
-            card = Card.from_json(card_data)
-            if card.due <= check_time:
-                g["due"] += 1
-                if card.due < check_time:
-                    g["overdue"] += 1
-            else:
-                g["future"] += 1
-        except Exception:
-            g["due"] += 1
-    rows = []
-    for k, v in sorted(groups.items(), key=lambda x: x[0]):
-        rows.append({"그룹": k, **v})
-    return rows
+    today = int(check_time.timestamp() // 86400)
+    revision = get_bank_revision()
+    cached = st.session_state.get("dashboard_analytics")
+    if cached and cached["revision"] == revision and cached["today"] == today:
+        record_debug_timing("대시보드 집계 (캐시)", 0)
+        return cached["snapshot"]
+    data = bank if bank is not None else load_questions()
+    snapshot = build_dashboard_snapshot(data, log_index=get_review_log_index(), now=check_time)
+    st.session_state["dashboard_analytics"] = {"revision": revision, "today": today, "snapshot": snapshot}
+    record_debug_timing("대시보드 집계", snapshot["elapsed_ms"])
+    return snapshot
 
 def apply_mcq_shortcut(idx):
     val = (st.session_state.get(f"shortcut_{idx}") or "").strip().upper()
@@ -1890,6 +2739,7 @@ def goto_next_question():
 
 def finish_exam_session():
     st.session_state.exam_finished = True
+    commit_review_buffer()
 
 def get_unique_subjects(questions):
     subjects = sorted({(q.get("subject") or "General") for q in questions})
@@ -1953,6 +2803,211 @@ def collect_subject_unit_map(questions):
         mapping.setdefault(subj, set()).add(unit)
     return {k: sorted(v) for k, v in mapping.items()}
 
+def get_question_due_epoch(q):
+    """복습 예정 시각(epoch). 아직 카드/예정일이 없는 신규 문항은 None"""
+    due_dt = None
+    if FSRS_AVAILABLE:
+        fsrs = q.get("fsrs") or {}
+        if not fsrs.get("card"):
+            return None
+        due_dt = parse_iso_datetime(fsrs.get("due"))
+        if due_dt is None:
+            try:
+                due_dt = Card.from_json(fsrs["card"]).due
+            except Exception:
+                due_dt = None
+    else:
+        due_dt = parse_iso_datetime((q.get("srs") or {}).get("due"))
+    if due_dt is None:
+        return None
+    if due_dt.tzinfo is None:
+        due_dt = due_dt.replace(tzinfo=timezone.utc)
+    return due_dt.timestamp()
+
+def question_facet_row(q, qtype):
+    return {
+        "subject": q.get("subject") or "General",
+        "unit": get_unit_name(q),
+        "type": qtype,
+        "difficulty": q.get("difficulty") or "미지정",
+        "batch_id": q.get("batch_id") or "legacy",
+        "wrong": int((q.get("stats") or {}).get("wrong", 0) or 0) > 0,
+        "due": get_question_due_epoch(q),
+    }
+
+def question_positions(data):
+    """{문항 키: (순번, 유형, 목록 위치)} (id가 없으면 "유형:위치"를 키로 사용)"""
+    positions = {}
+    for qtype in ("text", "cloze"):
+        for i, q in enumerate(data.get(qtype, [])):
+            positions[q.get("id") or f"{qtype}:{i}"] = (len(positions), qtype, i)
+    return positions
+
+def get_facet_index(bank=None):
+    """분과→단원 facet index. bank revision이 바뀌면 변경 이벤트에 나온 문항만 반영 (알 수 없으면 전체 비교)"""
+    revision = get_bank_revision()
+    state = st.session_state.get("facet_index")
+    if not state:
+        state = {"revision": None, "index": new_facet_index()}
+    if state["revision"] != revision:
+        data = bank if bank is not None else load_questions()
+        change = get_bank_changes(state["revision"])
+        if change is None:
+            positions = question_positions(data)
+            rows = {key: question_facet_row(data[qtype][i], qtype) for key, (_, qtype, i) in positions.items()}
+            sync_facet_index(state["index"], rows)
+        else:
+            positions = question_positions(data) if change["added"] or change["deleted"] else state["positions"]
+            for key in change["deleted"]:
+                facet_remove(state["index"], key)
+            for key in changed_ids(change):
+                pos = positions.get(key)
+                if pos is not None:
+                    facet_add(state["index"], key, question_facet_row(data[pos[1]][pos[2]], pos[1]))
+        state["revision"] = get_bank_revision()
+        state["positions"] = positions
+        st.session_state["facet_index"] = state
+    return state["index"]
+
+def select_questions(spec, bank=None, now=None):
+    """facet index의 posting 비트셋 연산으로 조건에 맞는 문항을 고르고, 결과만 문제은행 순서로 꺼냄"""
+    data = bank if bank is not None else load_questions()
+    index = get_facet_index(data)
+    check_time = (now or datetime.now(timezone.utc)).timestamp()
+    positions = st.session_state["facet_index"]["positions"]
+    picked = sorted(positions[key] for key in facet_query_keys(index, spec, now_epoch=check_time) if key in positions)
+    return [data[qtype][i] for _, qtype, i in picked]
+
+def summarize_subject_review_status_from_index(index, now=None):
+    """분과별 복습 상태(총문항/복습대상/연체/미래/신규/오답문항)를 facet index 집계로 생성"""
+    check_time = (now or datetime.now(timezone.utc)).timestamp()
+    out = []
+    for subj in facet_subjects(index):
+        counts = facet_counts(index, check_time, subject=subj)
+        row = {
+            "분과": subj,
+            "총문항": counts["total"],
+            "복습대상": counts["due"],
+            "연체": counts["overdue"] if FSRS_AVAILABLE else 0,
+            "미래": counts["future"] if FSRS_AVAILABLE else 0,
+            "신규": counts["new"] if FSRS_AVAILABLE else 0,
+            "오답문항": counts["wrong"],
+        }
+        out.append(row)
+    return sorted(out, key=lambda x: (x["복습대상"], x["총문항"]), reverse=True)
+
+def question_search_text(q):
+    """전문 검색 대상 본문: 문항/빈칸 앞면/선지/해설/메모"""
+    parts = [q.get("problem"), q.get("front")]
+    options = q.get("options")
+    if isinstance(options, list):
+        parts.extend(str(o) for o in options)
+    parts.extend([q.get("explanation"), q.get("note")])
+    return "\n".join(str(p) for p in parts if p)
+
+SEARCH_TEXT_FIELDS = ("problem", "front", "options", "explanation", "note")
+
+def get_search_index(bank=None):
+    """문제은행 BM25 색인. 디스크에 저장해 두고 bank revision이 바뀐 뒤 검색할 때 변경분만 반영.
+
+    세션의 첫 동기화는 본문 해시로 전체를 비교하고, 이후에는 변경 이벤트에서 본문 필드가 바뀐 문항만 다시 색인한다.
+    """
+    revision = get_bank_revision()
+    state = st.session_state.get("search_index")
+    if not state:
+        index = load_search_index_file(get_search_index_file(), SEARCH_INDEX_VERSION) or new_search_index()
+        state = {"revision": None, "index": index}
+    if state["revision"] != revision:
+        data = bank if bank is not None else load_questions()
+        change = get_bank_changes(state["revision"])
+        if change is None:
+            texts = {key: question_search_text(data[qtype][i]) for key, (_, qtype, i) in question_positions(data).items()}
+            dirty = any(sync_search_index(state["index"], texts))
+        else:
+            dirty = False
+            for key in change["deleted"]:
+                dirty = search_index_remove(state["index"], key) or dirty
+            keys = changed_ids(change, SEARCH_TEXT_FIELDS)
+            if keys:
+                get_facet_index(data)
+                positions = st.session_state["facet_index"]["positions"]
+                for key in keys:
+                    pos = positions.get(key)
+                    if pos is None:
+                        continue
+                    text = question_search_text(data[pos[1]][pos[2]])
+                    entry = state["index"]["docs"].get(key)
+                    if entry is None or entry[1] != text_signature(text):
+                        search_index_add(state["index"], key, text)
+                        dirty = True
+        if dirty:
+            compact_search_index(state["index"])
+            save_search_index_file(get_search_index_file(), state["index"])
+        state["revision"] = get_bank_revision()
+        st.session_state["search_index"] = state
+    return state["index"]
+
+def search_questions(query, limit=50, bank=None, predicate=None):
+    """전문 검색 결과 [(문항, 점수)] (BM25 점수순)
+
+    predicate가 있으면 조건에 맞는 문항만 남긴 뒤 limit개로 자른다.
+    한 글자 한글·단어 일부도 색인 토큰 사전에서 부분 문자열로 찾는다 (bm25_search).
+    """
+    data = bank if bank is not None else load_questions()
+    hits = bm25_search(get_search_index(data), query, limit=None if predicate else limit)
+    if not hits:
+        return []
+    get_facet_index(data)
+    positions = st.session_state["facet_index"]["positions"]
+    out = []
+    for key, score in hits:
+        pos = positions.get(key)
+        if pos is None:
+            continue
+        q = data[pos[1]][pos[2]]
+        if predicate is None or predicate(q):
+            out.append((q, score))
+            if len(out) >= limit:
+                break
+    return out
+
+def get_related_state(bank=None):
+    """유사 문항 추천용 TF-IDF norm/이웃 캐시 (검색 색인과 같은 revision 기준으로 갱신)"""
+    data = bank if bank is not None else load_questions()
+    index = get_search_index(data)
+    state = st.session_state.get("related_questions") or new_related_state()
+    if state["stamp"] is None or state.get("revision") != get_bank_revision():
+        get_facet_index(data)
+        positions = st.session_state["facet_index"]["positions"]
+
+        def text_for_key(key):
+            pos = positions.get(key)
+            return question_search_text(data[pos[1]][pos[2]]) if pos is not None else ""
+
+        sync_related_state(state, index, text_for_key)
+        state["revision"] = get_bank_revision()
+        st.session_state["related_questions"] = state
+    return index, state
+
+def find_related_questions(q, k=DEFAULT_RELATED_K, bank=None, exclude_ids=None):
+    """q와 본문이 비슷한 문항 [(문항, 유사도)] (오답 보충 학습용)"""
+    q_id = q.get("id")
+    if not q_id:
+        return []
+    data = bank if bank is not None else load_questions()
+    index, state = get_related_state(data)
+    positions = st.session_state["facet_index"]["positions"]
+    pos = positions.get(q_id)
+    source = data[pos[1]][pos[2]] if pos is not None else q
+    hits = related_questions(index, state, q_id, question_search_text(source), k=k, exclude=set(exclude_ids or ()))
+    out = []
+    for key, score in hits:
+        pos = positions.get(key)
+        if pos is None:
+            continue
+        out.append((data[pos[1]][pos[2]], score))
+    return out
+
 def collect_export_questions(questions, selected_subjects, unit_filter_by_subject, include_all_units=True, randomize=False, random_seed=None):
     if include_all_units:
         if selected_subjects:
@@ -1967,59 +3022,19 @@ def collect_export_questions(questions, selected_subjects, unit_filter_by_subjec
         rng.shuffle(out)
     return out
 
+def select_export_questions(qtype, selected_subjects, unit_filter_by_subject, include_all_units=True, randomize=False, random_seed=None, bank=None):
+    """collect_export_questions와 같은 선택을 문제은행 전체(qtype 유형)에서 facet index로 바로 수행"""
+    spec = {"type": qtype}
+    if not include_all_units:
+        spec["subject_units"] = {s: unit_filter_by_subject.get(s) or [] for s in selected_subjects or []}
+    elif selected_subjects:
+        spec["subject"] = list(selected_subjects)
+    out = select_questions(spec, bank=bank)
+    if randomize and len(out) > 1:
+        rng = random.Random(random_seed)
+        rng.shuffle(out)
+    return out
 
-def summarize_subject_review_status(questions):
-    """분과별 복습 상태(복습대상/연체/단원 수) 요약"""
-    if not questions:
-        return []
-    now = datetime.now(timezone.utc)
-
-    # 오답문항(통계 기반)
-    wrong_by_subject = {}
-    for q in questions:
-        subj = q.get("subject") or "General"
-        if int((q.get("stats") or {}).get("wrong", 0)) > 0:
-            wrong_by_subject[subj] = wrong_by_subject.get(subj, 0) + 1
-
-    if FSRS_AVAILABLE:
-        rows = fsrs_group_report(questions, "subject", now=now)
-        out = []
-        for row in rows:
-            subject_name = row.get("그룹") or "General"
-            out.append({
-                "분과": subject_name,
-                "총문항": row.get("total", 0),
-                "복습대상": row.get("due", 0),
-                "연체": row.get("overdue", 0),
-                "미래": row.get("future", 0),
-                "신규": row.get("new", 0),
-                "오답문항": wrong_by_subject.get(subject_name, 0),
-            })
-        return sorted(out, key=lambda x: (x["복습대상"], x["총문항"]), reverse=True)
-
-    summary = {}
-    for q in questions:
-        subj = q.get("subject") or "General"
-        row = summary.setdefault(subj, {"분과": subj, "총문항": 0, "복습대상": 0, "연체": 0, "미래": 0, "신규": 0})
-        row["총문항"] += 1
-
-        due_at = (q.get("srs") or {}).get("due")
-        try:
-            if due_at:
-                due_dt = datetime.fromisoformat(str(due_at).replace("Z", "+00:00"))
-                if due_dt.tzinfo is None:
-                    due_dt = due_dt.replace(tzinfo=timezone.utc)
-                if due_dt <= now:
-                    row["복습대상"] += 1
-            else:
-                row["복습대상"] += 1
-        except Exception:
-            # 파싱 실패 시 기본적으로 복습 대상 처리(사용자에게 노출용으로는 안전한 기본값)
-            row["복습대상"] += 1
-
-        row["오답문항"] = wrong_by_subject.get(subj, row.get("오답문항", 0))
-    # 기본 SRS는 연체/미래/신규를 따로 추적하지 않음
-    return sorted(summary.values(), key=lambda x: (x["복습대상"], x["총문항"]), reverse=True)
 
 def build_exam_payload(raw_items, exam_type):
     """문항 목록을 시험 진행용 payload로 변환"""
@@ -2635,7 +3650,7 @@ def parse_pdf_layout(pdf_bytes):
         return []
     return clean_parsed_items(items_all)
 
-def parse_pdf_layout_ai(pdf_bytes, ai_model, api_key=None, openai_api_key=None, hint_text=""):
+def parse_pdf_layout_ai(pdf_bytes, ai_model, api_key=None, openai_api_key=None, hint_text="", use_cache=True):
     items_all = []
     try:
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
@@ -2673,7 +3688,8 @@ def parse_pdf_layout_ai(pdf_bytes, ai_model, api_key=None, openai_api_key=None,
                 ai_model=ai_model,
                 api_key=api_key,
                 openai_api_key=openai_api_key,
-                hint_text=hint_text
+                hint_text=hint_text,
+                use_cache=use_cache,
             )
             for it in ai_items:
                 it["page"] = page_idx + 1
@@ -3033,6 +4049,22 @@ def render_auth_landing_page():
     st.markdown("</div>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
+def show_near_duplicate_report():
+    hits = st.session_state.get("near_duplicate_report") or []
+    if not hits:
+        return
+    skipped = sum(1 for h in hits if h.get("skipped"))
+    if skipped:
+        st.warning(f"유사 중복 {skipped}개 문항을 건너뛰었습니다.")
+    if len(hits) > skipped:
+        st.info(f"기존 문항과 유사한 {len(hits) - skipped}개 문항이 저장되었습니다.")
+    with st.expander("유사 중복 상세", expanded=False):
+        safe_dataframe(
+            [{"문항": h.get("text"), "유사도": h.get("similarity"), "기존 문항 ID": h.get("match_id"), "건너뜀": h.get("skipped")} for h in hits],
+            use_container_width=True,
+            hide_index=True,
+        )
+
 def show_action_notice():
     msg = st.session_state.get("last_action_notice", "")
     if msg:
@@ -3058,52 +4090,20 @@ def render_generation_recovery_panel():
         st.markdown("### ⚠️ 문제 생성 실패")
         st.error(st.session_state.generation_failure)
         st.caption("아래 버튼으로 바로 복구/초기화를 할 수 있습니다.")
-        colr1, colr2 = st.columns(2)
+        colr1, colr2, colr3 = st.columns(3)
         with colr1:
             if st.button("🔁 동일 조건 재실행", use_container_width=True, key="failure_retry_btn"):
                 st.session_state.generation_failure = ""
                 st.rerun()
+        with colr3:
+            if st.button("🧊 캐시 무시 재실행", use_container_width=True, key="failure_retry_nocache_btn", help="저장된 응답 대신 모델을 다시 호출합니다."):
+                st.session_state.generation_failure = ""
+                st.session_state.gen_bypass_cache = True
+                st.rerun()
         with colr2:
             if st.button("🧹 알림 지우기", use_container_width=True, key="failure_clear_btn"):
                 st.session_state.generation_failure = ""
 
-def compute_activity_heatmap(questions, days=365, now=None):
-    check_time = now or datetime.now(timezone.utc)
-    start = (check_time - timedelta(days=days - 1)).date()
-    buckets = {}
-    for i in range(days):
-        d = start + timedelta(days=i)
-        buckets[d.isoformat()] = {"count": 0, "correct": 0, "total": 0}
-    for q in questions:
-        stats = q.get("stats") or {}
-        hist = stats.get("history") or []
-        for entry in hist:
-            if not isinstance(entry, dict):
-                continue
-            dt = parse_iso_datetime(entry.get("time"))
-            if not dt:
-                continue
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            dkey = dt.date().isoformat()
-            if dkey in buckets:
-                buckets[dkey]["count"] += 1
-                buckets[dkey]["total"] += 1
-                if entry.get("correct") is True:
-                    buckets[dkey]["correct"] += 1
-    rows = []
-    for dkey, val in buckets.items():
-        d = datetime.fromisoformat(dkey).date()
-        week_index = (d - start).days // 7
-        rows.append({
-            "date": d,
-            "dow": d.weekday(),
-            "week_index": week_index,
-            "count": val["count"],
-            "accuracy": (val["correct"] / val["total"] * 100) if val["total"] > 0 else 0
-        })
-    return rows
-
 def fsrs_due(item, now=None):
     if not FSRS_AVAILABLE:
         return True
@@ -3129,30 +4129,34 @@ def srs_due(item, now=None):
         return fsrs_due(item, now=now)
     return simple_srs_due(item, now=now)
 
+def _apply_simple_srs_to_item(item, rating_label, now):
+    # base intervals in days
+    base = {"Again": 1, "Hard": 2, "Good": 4, "Easy": 7}
+    srs = item.get("srs") or {}
+    interval = int(srs.get("interval", 1))
+    factor = {"Again": 0.5, "Hard": 1.2, "Good": 2.0, "Easy": 3.0}.get(rating_label, 2.0)
+    new_interval = max(1, int(interval * factor))
+    # if first time, use base
+    if not srs:
+        new_interval = base.get(rating_label, 4)
+    due = now + timedelta(days=new_interval)
+    srs.update({
+        "interval": new_interval,
+        "due": due.isoformat(),
+        "last_rating": rating_label,
+        "last_review": now.isoformat(),
+    })
+    item["srs"] = srs
+    return srs
+
 def apply_simple_srs_rating(q_id, rating_label):
     bank = load_questions()
     now = datetime.now(timezone.utc)
-    # base intervals in days
-    base = {"Again": 1, "Hard": 2, "Good": 4, "Easy": 7}
     for key in ("text", "cloze"):
         for item in bank.get(key, []):
             if item.get("id") == q_id:
-                srs = item.get("srs") or {}
-                interval = int(srs.get("interval", 1))
-                factor = {"Again": 0.5, "Hard": 1.2, "Good": 2.0, "Easy": 3.0}.get(rating_label, 2.0)
-                new_interval = max(1, int(interval * factor))
-                # if first time, use base
-                if not srs:
-                    new_interval = base.get(rating_label, 4)
-                due = now + timedelta(days=new_interval)
-                srs.update({
-                    "interval": new_interval,
-                    "due": due.isoformat(),
-                    "last_rating": rating_label,
-                    "last_review": now.isoformat(),
-                })
-                item["srs"] = srs
-                save_questions(bank)
+                srs = _apply_simple_srs_to_item(item, rating_label, now)
+                save_questions(bank, change={"updated": {q_id: ["srs"]}})
                 return srs
     return None
 
@@ -3216,6 +4220,85 @@ def get_fsrs_stats(questions, now=None):
         "new": new,
     }
 
+def _apply_fsrs_review_to_item(item, rating, now, scheduler, embed_logs=True):
+    card_data = (item.get("fsrs") or {}).get("card")
+    if card_data:
+        try:
+            card = Card.from_json(card_data)
+        except Exception:
+            card = Card()
+    else:
+        card = Card()
+    card, log = scheduler.review_card(card, rating, now)
+    fsrs = item.get("fsrs") or {}
+    fsrs["card"] = card.to_json()
+    fsrs["last_review"] = now.isoformat()
+    fsrs["last_rating"] = rating.name if hasattr(rating, "name") else str(rating)
+    fsrs["due"] = card.due.isoformat()
+    if embed_logs:
+        logs = fsrs.get("logs", [])
+        try:
+            logs.append(log.to_json())
+        except Exception:
+            pass
+        fsrs["logs"] = logs[-50:]
+    item["fsrs"] = fsrs
+    return fsrs, _fsrs_log_record(item.get("id"), log)
+
+def get_fsrs_forecast(questions, days=30, now=None, simulate=False):
+    """향후 days일 동안 분과별 일자별 복습 예정 수 (simulate=True면 기간 내 재복습까지 예측)"""
+    check_time = now or datetime.now(timezone.utc)
+    start = datetime(check_time.year, check_time.month, check_time.day, tzinfo=timezone.utc)
+    subjects = []
+    due_epochs = []
+    card_payloads = []
+    for q in questions:
+        subjects.append(q.get("subject") or "General")
+        due_epochs.append(get_question_due_epoch(q))
+        card_payloads.append((q.get("fsrs") or {}).get("card") if FSRS_AVAILABLE else None)
+
+    next_due_fn = None
+    if simulate and FSRS_AVAILABLE:
+        scheduler = build_fsrs_scheduler({**load_fsrs_settings(), "enable_fuzzing": False})
+        states = {}
+
+        def next_due_fn(idx, at_epoch):
+            at = datetime.fromtimestamp(at_epoch, tz=timezone.utc)
+            card = states.get(idx)
+            if card is None:
+                try:
+                    card = Card.from_json(card_payloads[idx]) if card_payloads[idx] else Card(card_id=idx + 1, due=at)
+                except Exception:
+                    card = Card(card_id=idx + 1, due=at)
+            card, _ = scheduler.review_card(card, Rating.Good, at)
+            states[idx] = card
+            return card.due.timestamp()
+
+    result = forecast_due_counts(subjects, due_epochs, start.timestamp(), days=days, next_due_fn=next_due_fn)
+    result["dates"] = [(start + timedelta(days=i)).date().isoformat() for i in range(result["days"])]
+    return result
+
+def get_review_forecast(days=30, simulate=False, now=None):
+    """전체 문제은행 복습 예측 (bank revision 단위 캐시)"""
+    check_time = now or datetime.now(timezone.utc)
+    revision = get_bank_revision()
+    key = ":".join([
+        str(revision),
+        str(int(days)),
+        "sim" if simulate else "due",
+        check_time.date().isoformat(),
+        str(st.session_state.get("fsrs_scheduler_fingerprint") or ""),
+    ])
+    cache = st.session_state.get("review_forecast_cache") or {}
+    if key in cache:
+        return cache[key]
+    bank = load_questions()
+    result = get_fsrs_forecast(bank.get("text", []) + bank.get("cloze", []), days=days, now=check_time, simulate=simulate)
+    cache = {k: v for k, v in cache.items() if k.split(":", 1)[0] == str(revision)}
+    cache[key] = result
+    st.session_state["review_forecast_cache"] = cache
+    return result
+
 def apply_fsrs_rating(q_id, rating):
     if not FSRS_AVAILABLE:
         return None
@@ -3224,43 +4307,105 @@ def apply_fsrs_rating(q_id, rating):
     for key in ("text", "cloze"):
         for item in bank.get(key, []):
             if item.get("id") == q_id:
-                card_data = (item.get("fsrs") or {}).get("card")
-                if card_data:
-                    try:
-                        card = Card.from_json(card_data)
-                    except Exception:
-                        card = Card()
-                else:
-                    card = Card()
                 scheduler = get_fsrs_scheduler() or Scheduler()
-                card, log = scheduler.review_card(card, rating, now)
-                fsrs = item.get("fsrs") or {}
-                fsrs["card"] = card.to_json()
-                fsrs["last_review"] = now.isoformat()
-                fsrs["last_rating"] = rating.name if hasattr(rating, "name") else str(rating)
-                fsrs["due"] = card.due.isoformat()
-                logs = fsrs.get("logs", [])
-                try:
-                    logs.append(log.to_json())
-                except Exception:
-                    pass
-                fsrs["logs"] = logs[-50:]
-                item["fsrs"] = fsrs
-                save_questions(bank)
+                embed = not use_review_log_store()
+                fsrs, record = _apply_fsrs_review_to_item(item, rating, now, scheduler, embed_logs=embed)
+                if save_questions(bank, change={"updated": {q_id: ["fsrs"]}}) and not embed:
+                    append_review_log_records([record])
                 return fsrs
     return None
 
 # ============================================================================
-# 텍스트 추출 함수
+# 세션 단위 복습 버퍼 (답안/평가를 모아 한 번에 저장)
 # ============================================================================
-@st.cache_resource(show_spinner=False)
-def get_easyocr_reader(langs):
-    try:
-        import easyocr
-    except Exception:
+REVIEW_BUFFER_FLUSH_SECONDS = 120
+
+def record_review_event(q_id, is_correct=None, rating=None, now=None):
+    """정오/복습 평가를 세션 버퍼에 기록 (저장은 commit_review_buffer에서 일괄 처리)"""
+    if not q_id or (is_correct is None and rating is None):
         return None
-    return easyocr.Reader(list(langs), gpu=False)
+    event_time = now or datetime.now(timezone.utc)
+    event = {"id": q_id, "time": event_time.isoformat()}
+    if is_correct is not None:
+        event["kind"] = "answer"
+        event["correct"] = bool(is_correct)
+    else:
+        event["kind"] = "rating"
+        event["rating"] = rating.name if hasattr(rating, "name") else str(rating)
+    buffer = st.session_state.get("review_buffer") or []
+    buffer.append(event)
+    st.session_state["review_buffer"] = buffer
+    if not st.session_state.get("review_buffer_since"):
+        st.session_state["review_buffer_since"] = time.time()
+    return event
+
+def apply_review_events(bank, events, scheduler=None, embed_logs=True):
+    """버퍼 이벤트를 문제은행에 순서대로 반영. 문항별 단건 경로와 같은 결과를 만든다."""
+    index = {}
+    for key in ("text", "cloze"):
+        for item in bank.get(key, []):
+            if isinstance(item, dict) and item.get("id"):
+                index.setdefault(item["id"], item)
+    touched = set()
+    audit_rows = []
+    log_records = []
+    for event in events or []:
+        item = index.get(event.get("id"))
+        if item is None:
+            continue
+        event_time = parse_iso_datetime(event.get("time")) or datetime.now(timezone.utc)
+        if event.get("kind") == "answer":
+            _, record = _apply_answer_to_item(item, event.get("correct"), event_time.isoformat(), embed_history=embed_logs)
+            log_records.append(record)
+            audit_rows.append(_grade_audit_payload(item["id"], event.get("correct")))
+        elif event.get("kind") == "rating":
+            label = str(event.get("rating") or "Good")
+            if FSRS_AVAILABLE:
+                if scheduler is None:
+                    scheduler = get_fsrs_scheduler() or Scheduler()
+                try:
+                    rating = Rating[label]
+                except KeyError:
+                    continue
+                _, record = _apply_fsrs_review_to_item(item, rating, event_time, scheduler, embed_logs=embed_logs)
+                log_records.append(record)
+            else:
+                _apply_simple_srs_to_item(item, label, event_time)
+        else:
+            continue
+        touched.add(item["id"])
+    return touched, audit_rows, log_records
 
+def commit_review_buffer():
+    """세션 버퍼를 한 번의 로드/저장/감사로그 기록으로 반영"""
+    events = list(st.session_state.get("review_buffer") or [])
+    if not events:
+        return 0
+    bank = load_questions()
+    embed = not use_review_log_store()
+    touched, audit_rows, log_records = apply_review_events(bank, events, embed_logs=embed)
+    if touched and not save_questions(bank, change={"updated": {q_id: ["stats", "fsrs", "srs"] for q_id in touched}}):
+        return 0
+    if not embed:
+        append_review_log_records(log_records)
+    append_audit_logs("grade.answer", audit_rows)
+    st.session_state["review_buffer"] = []
+    st.session_state["review_buffer_since"] = None
+    return len(events)
+
+def maybe_commit_review_buffer(interval_seconds=REVIEW_BUFFER_FLUSH_SECONDS, now_ts=None):
+    """장시간 세션 중 유실 방지를 위한 주기적 반영"""
+    since = st.session_state.get("review_buffer_since")
+    if not since:
+        return 0
+    current = now_ts if now_ts is not None else time.time()
+    if current - float(since) < interval_seconds:
+        return 0
+    return commit_review_buffer()
+
+# ============================================================================
+# 텍스트 추출 함수
+# ============================================================================
 def available_ocr_engines():
     engines = []
     if importlib.util.find_spec("easyocr") is not None:
@@ -3270,31 +4415,7 @@ def available_ocr_engines():
 def ocr_page_image_bytes(image_bytes, engine="easyocr", langs=("ko", "en")):
     if engine != "easyocr":
         raise ValueError(f"지원하지 않는 OCR 엔진: {engine}")
-    reader = get_easyocr_reader(tuple(langs))
-    if reader is None:
-        raise ValueError("easyocr 미설치")
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-        tmp.write(image_bytes)
-        tmp_path = tmp.name
-    try:
-        results = reader.readtext(tmp_path, detail=1, paragraph=False)
-    finally:
-        try:
-            os.unlink(tmp_path)
-        except Exception:
-            pass
-    if not results:
-        return ""
-    def bbox_key(item):
-        bbox = item[0] if isinstance(item, (list, tuple)) and item else None
-        if not bbox:
-            return (0, 0)
-        ys = [p[1] for p in bbox]
-        xs = [p[0] for p in bbox]
-        return (min(ys), min(xs))
-    results = sorted(results, key=bbox_key)
-    lines = [r[1].strip() for r in results if len(r) > 1 and str(r[1]).strip()]
-    return "\n".join(lines)
+    return ocr_image_bytes(image_bytes, langs=tuple(langs))
 
 def ocr_pdf_bytes(pdf_bytes, engine="easyocr", langs=("ko", "en"), max_pages=0, zoom=2.0):
     doc = fitz.open(stream=pdf_bytes, filetype="pdf")
@@ -3596,7 +4717,7 @@ def ai_match_images_to_items(items, images, ai_model, api_key=None, openai_api_k
 
     return items
 
-def generate_explanations_ai(items, ai_model, api_key=None, openai_api_key=None, max_items=20):
+def generate_explanations_ai(items, ai_model, api_key=None, openai_api_key=None, max_items=20, use_cache=True):
     if not items or max_items <= 0:
         return items
     count = 0
@@ -3636,16 +4757,22 @@ def generate_explanations_ai(items, ai_model, api_key=None, openai_api_key=None,
                     "temperature": LLM_TEMPERATURE,
                     "top_p": 1.0,
                 }
-                response = model.generate_content(prompt, generation_config=generation_config)
-                text = (response.text or "").strip()
+                model_id = get_gemini_model_id()
+
+                def call():
+                    response = model.generate_content(prompt, generation_config=generation_config)
+                    return (response.text or "").strip(), _gemini_usage_tokens(response)
+
+                text, usage_tokens, cache_hit = cached_llm_call("gen.explanation.batch", "gemini", model_id, prompt, call, use_cache=use_cache)
                 append_audit_log("gen.explanation.batch", {
-                    "model": get_gemini_model_id(),
+                    "model": model_id,
                     "temperature": LLM_TEMPERATURE,
                     "seed": None,
                     "prompt_hash": _hash_text(prompt),
                     "prompt_text": prompt,
                     "output_text": text,
-                    "usage_tokens": _gemini_usage_tokens(response),
+                    "usage_tokens": usage_tokens,
+                    "cache_hit": cache_hit,
                     "prompt_version": PROMPT_VERSION,
                 })
             else:
@@ -3660,8 +4787,13 @@ def generate_explanations_ai(items, ai_model, api_key=None, openai_api_key=None,
                 }
                 if LLM_SEED is not None:
                     openai_params["seed"] = LLM_SEED
-                response = client.chat.completions.create(**openai_params)
-                text = (response.choices[0].message.content or "").strip()
+                def call():
+                    response = client.chat.completions.create(**openai_params)
+                    return (response.choices[0].message.content or "").strip(), _openai_usage_tokens(response)
+
+                text, usage_tokens, cache_hit = cached_llm_call(
+                    "gen.explanation.batch", "openai", openai_params["model"], openai_params["messages"], call, seed=LLM_SEED, use_cache=use_cache
+                )
                 append_audit_log("gen.explanation.batch", {
                     "model": "gpt-4o-mini",
                     "temperature": LLM_TEMPERATURE,
@@ -3669,7 +4801,8 @@ def generate_explanations_ai(items, ai_model, api_key=None, openai_api_key=None,
                     "prompt_hash": _hash_text(prompt),
                     "prompt_text": prompt,
                     "output_text": text,
-                    "usage_tokens": _openai_usage_tokens(response),
+                    "usage_tokens": usage_tokens,
+                    "cache_hit": cache_hit,
                     "prompt_version": PROMPT_VERSION,
                 })
             if text:
@@ -3679,7 +4812,7 @@ def generate_explanations_ai(items, ai_model, api_key=None, openai_api_key=None,
             continue
     return items
 
-def generate_single_explanation_ai(item, ai_model, api_key=None, openai_api_key=None, return_error=False):
+def generate_single_explanation_ai(item, ai_model, api_key=None, openai_api_key=None, return_error=False, use_cache=True):
     if not item:
         return ("", "빈 문항") if return_error else ""
     stem = item.get("problem") or item.get("front") or item.get("raw") or ""
@@ -3712,16 +4845,22 @@ def generate_single_explanation_ai(item, ai_model, api_key=None, openai_api_key=
                 "temperature": LLM_TEMPERATURE,
                 "top_p": 1.0,
             }
-            response = model.generate_content(prompt, generation_config=generation_config)
-            text = (response.text or "").strip()
+            model_id = get_gemini_model_id()
+
+            def call():
+                response = model.generate_content(prompt, generation_config=generation_config)
+                return (response.text or "").strip(), _gemini_usage_tokens(response)
+
+            text, usage_tokens, cache_hit = cached_llm_call("gen.explanation.single", "gemini", model_id, prompt, call, use_cache=use_cache)
             append_audit_log("gen.explanation.single", {
-                "model": get_gemini_model_id(),
+                "model": model_id,
                 "temperature": LLM_TEMPERATURE,
                 "seed": None,
                 "prompt_hash": _hash_text(prompt),
                 "prompt_text": prompt,
                 "output_text": text,
-                "usage_tokens": _gemini_usage_tokens(response),
+                "usage_tokens": usage_tokens,
+                "cache_hit": cache_hit,
                 "prompt_version": PROMPT_VERSION,
             })
             return (text, "") if return_error else text
@@ -3737,8 +4876,13 @@ def generate_single_explanation_ai(item, ai_model, api_key=None, openai_api_key=
             }
             if LLM_SEED is not None:
                 openai_params["seed"] = LLM_SEED
-            response = client.chat.completions.create(**openai_params)
-            text = (response.choices[0].message.content or "").strip()
+            def call():
+                response = client.chat.completions.create(**openai_params)
+                return (response.choices[0].message.content or "").strip(), _openai_usage_tokens(response)
+
+            text, usage_tokens, cache_hit = cached_llm_call(
+                "gen.explanation.single", "openai", openai_params["model"], openai_params["messages"], call, seed=LLM_SEED, use_cache=use_cache
+            )
             append_audit_log("gen.explanation.single", {
                 "model": "gpt-4o-mini",
                 "temperature": LLM_TEMPERATURE,
@@ -3746,14 +4890,15 @@ def generate_single_explanation_ai(item, ai_model, api_key=None, openai_api_key=
                 "prompt_hash": _hash_text(prompt),
                 "prompt_text": prompt,
                 "output_text": text,
-                "usage_tokens": _openai_usage_tokens(response),
+                "usage_tokens": usage_tokens,
+                "cache_hit": cache_hit,
                 "prompt_version": PROMPT_VERSION,
             })
             return (text, "") if return_error else text
     except Exception as e:
         return ("", str(e)) if return_error else ""
 
-def grade_essay_answer_ai(item, user_answer, ai_model, api_key=None, openai_api_key=None):
+def grade_essay_answer_ai(item, user_answer, ai_model, api_key=None, openai_api_key=None, use_cache=True):
     question_text = (item.get("front") or item.get("problem") or "").strip()
     reference_answer = (item.get("answer") or "").strip()
     explanation = (item.get("explanation") or "").strip()
@@ -3773,13 +4918,18 @@ def grade_essay_answer_ai(item, user_answer, ai_model, api_key=None, openai_api_
                 return None, "Gemini API 키가 필요합니다."
             genai.configure(api_key=api_key)
             model = genai.GenerativeModel(get_gemini_model_id())
-            response = model.generate_content(
-                prompt,
-                generation_config={"temperature": LLM_TEMPERATURE, "top_p": 1.0}
-            )
-            raw = response.text or ""
-            usage_tokens = _gemini_usage_tokens(response)
             model_name = get_gemini_model_id()
+
+            def call():
+                response = model.generate_content(
+                    prompt,
+                    generation_config={"temperature": LLM_TEMPERATURE, "top_p": 1.0}
+                )
+                return response.text or "", _gemini_usage_tokens(response)
+
+            raw, usage_tokens, cache_hit = cached_llm_call(
+                "grade.essay", "gemini", model_name, prompt, call, version=GRADER_VERSION, use_cache=use_cache
+            )
         else:
             if not openai_api_key:
                 return None, "OpenAI API 키가 필요합니다."
@@ -3795,10 +4945,15 @@ def grade_essay_answer_ai(item, user_answer, ai_model, api_key=None, openai_api_
             }
             if LLM_SEED is not None:
                 params["seed"] = LLM_SEED
-            response = client.chat.completions.create(**params)
-            raw = (response.choices[0].message.content or "").strip()
-            usage_tokens = _openai_usage_tokens(response)
             model_name = "gpt-4o-mini"
+
+            def call():
+                response = client.chat.completions.create(**params)
+                return (response.choices[0].message.content or "").strip(), _openai_usage_tokens(response)
+
+            raw, usage_tokens, cache_hit = cached_llm_call(
+                "grade.essay", "openai", model_name, params["messages"], call, seed=LLM_SEED, version=GRADER_VERSION, use_cache=use_cache
+            )
         parsed = _parse_json_from_text(raw)
         if not isinstance(parsed, dict):
             return None, "채점 응답 파싱 실패"
@@ -3822,6 +4977,7 @@ def grade_essay_answer_ai(item, user_answer, ai_model, api_key=None, openai_api_
             "prompt_text": prompt,
             "output_text": raw,
             "usage_tokens": usage_tokens,
+            "cache_hit": cache_hit,
             "grader_version": GRADER_VERSION,
         })
         return result, ""
@@ -3836,7 +4992,7 @@ def update_question_explanation(q_id, explanation_text):
         for item in bank.get(key, []):
             if item.get("id") == q_id:
                 item["explanation"] = explanation_text
-                save_questions(bank)
+                save_questions(bank, change={"updated": {q_id: ["explanation"]}})
                 return True
     return False
 
@@ -3866,7 +5022,37 @@ def _parse_json_from_text(raw):
             continue
     return None
 
-def ai_parse_exam_layout(left_text, right_text, ai_model, api_key=None, openai_api_key=None, hint_text=""):
+def run_parse_llm(kind, prompt, ai_model, api_key=None, openai_api_key=None, max_tokens=4000, use_cache=True):
+    """문항 추출(레이아웃 파싱) 호출. 생성과 같은 temperature로 고정해 응답 캐시를 함께 쓴다"""
+    if ai_model == "🔵 Google Gemini":
+        genai.configure(api_key=api_key)
+        model_id = get_gemini_model_id()
+        model = genai.GenerativeModel(model_id)
+
+        def call():
+            response = model.generate_content(prompt, generation_config={"temperature": LLM_TEMPERATURE, "top_p": 1.0})
+            return response.text or "", _gemini_usage_tokens(response)
+
+        raw, _, _ = cached_llm_call(kind, "gemini", model_id, prompt, call, use_cache=use_cache)
+        return raw
+    client = OpenAI(api_key=openai_api_key)
+    params = {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": LLM_TEMPERATURE,
+        "max_tokens": max_tokens,
+    }
+    if LLM_SEED is not None:
+        params["seed"] = LLM_SEED
+
+    def call():
+        response = client.chat.completions.create(**params)
+        return response.choices[0].message.content or "", _openai_usage_tokens(response)
+
+    raw, _, _ = cached_llm_call(kind, "openai", params["model"], params["messages"], call, seed=LLM_SEED, use_cache=use_cache)
+    return raw
+
+def ai_parse_exam_layout(left_text, right_text, ai_model, api_key=None, openai_api_key=None, hint_text="", use_cache=True):
     if not left_text or len(left_text.strip()) < 20:
         return []
     prompt = (
@@ -3890,24 +5076,9 @@ def ai_parse_exam_layout(left_text, right_text, ai_model, api_key=None, openai_a
         prompt = f"[문서 구조 힌트]\n{hint_text}\n\n" + prompt
     prompt += left_text[:20000] + "\n\n[RIGHT]\n" + (right_text[:20000] if right_text else "")
     try:
-        if ai_model == "🔵 Google Gemini":
-            if not api_key:
-                return []
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel(get_gemini_model_id())
-            response = model.generate_content(prompt)
-            raw = response.text or ""
-        else:
-            if not openai_api_key:
-                return []
-            client = OpenAI(api_key=openai_api_key)
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2,
-                max_tokens=4000
-            )
-            raw = response.choices[0].message.content or ""
+        if not (api_key if ai_model == "🔵 Google Gemini" else openai_api_key):
+            return []
+        raw = run_parse_llm("parse.layout", prompt, ai_model, api_key, openai_api_key, max_tokens=4000, use_cache=use_cache)
         data = _parse_json_from_text(raw)
         if isinstance(data, dict):
             data = data.get("items") or data.get("questions") or data.get("data") or []
@@ -3917,7 +5088,7 @@ def ai_parse_exam_layout(left_text, right_text, ai_model, api_key=None, openai_a
     except Exception:
         return []
 
-def ai_parse_exam_text(text, ai_model, api_key=None, openai_api_key=None, max_items=60, hint_text="", return_raw=False):
+def ai_parse_exam_text(text, ai_model, api_key=None, openai_api_key=None, max_items=60, hint_text="", return_raw=False, use_cache=True):
     if not text or len(text.strip()) < 20:
         return ([], "") if return_raw else []
     prompt = (
@@ -3940,24 +5111,9 @@ def ai_parse_exam_text(text, ai_model, api_key=None, openai_api_key=None, max_it
     if hint_text:
         prompt = f"[문서 구조 힌트]\n{hint_text}\n\n" + prompt
     try:
-        if ai_model == "🔵 Google Gemini":
-            if not api_key:
-                return ([], "") if return_raw else []
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel(get_gemini_model_id())
-            response = model.generate_content(prompt + text[:30000])
-            raw = response.text or ""
-        else:
-            if not openai_api_key:
-                return ([], "") if return_raw else []
-            client = OpenAI(api_key=openai_api_key)
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt + text[:30000]}],
-                temperature=0.2,
-                max_tokens=4000
-            )
-            raw = response.choices[0].message.content or ""
+        if not (api_key if ai_model == "🔵 Google Gemini" else openai_api_key):
+            return ([], "") if return_raw else []
+        raw = run_parse_llm("parse.text", prompt + text[:30000], ai_model, api_key, openai_api_key, max_tokens=4000, use_cache=use_cache)
 
         data = _parse_json_from_text(raw)
         if data is None:
@@ -3971,7 +5127,7 @@ def ai_parse_exam_text(text, ai_model, api_key=None, openai_api_key=None, max_it
     except Exception:
         return ([], "") if return_raw else []
 
-def ai_parse_exam_block(block_text, ai_model, api_key=None, openai_api_key=None, hint_text="", return_raw=False):
+def ai_parse_exam_block(block_text, ai_model, api_key=None, openai_api_key=None, hint_text="", return_raw=False, use_cache=True):
     if not block_text or len(block_text.strip()) < 10:
         return (None, "") if return_raw else None
     prompt = (
@@ -3990,24 +5146,9 @@ def ai_parse_exam_block(block_text, ai_model, api_key=None, openai_api_key=None,
         prompt += f"\n[문서 구조 힌트]\n{hint_text}\n"
     prompt += "\n[원문]\n"
     try:
-        if ai_model == "🔵 Google Gemini":
-            if not api_key:
-                return (None, "") if return_raw else None
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel(get_gemini_model_id())
-            response = model.generate_content(prompt + block_text[:15000])
-            raw = response.text or ""
-        else:
-            if not openai_api_key:
-                return (None, "") if return_raw else None
-            client = OpenAI(api_key=openai_api_key)
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt + block_text[:15000]}],
-                temperature=0.2,
-                max_tokens=1200
-            )
-            raw = response.choices[0].message.content or ""
+        if not (api_key if ai_model == "🔵 Google Gemini" else openai_api_key):
+            return (None, "") if return_raw else None
+        raw = run_parse_llm("parse.block", prompt + block_text[:15000], ai_model, api_key, openai_api_key, max_tokens=1200, use_cache=use_cache)
         data = _parse_json_from_text(raw)
         if not isinstance(data, dict):
             return (None, raw) if return_raw else None
@@ -4586,8 +5727,8 @@ def build_style_instructions(style_text):
 {term_rule}
 """
 
-def generate_content_gemini(text_content, selected_mode, num_items=5, api_key=None, style_text=None):
-    """Gemini를 이용해 콘텐츠 생성"""
+def generate_content_gemini(text_content, selected_mode, num_items=5, api_key=None, style_text=None, use_cache=True, usage_out=None, raise_rate_limit=False, on_delta=None, validate=None):
+    """Gemini를 이용해 콘텐츠 생성 (on_delta를 주면 스트리밍으로 받으며 조각마다 호출)"""
     if not api_key:
         return "⚠️ 왼쪽 사이드바에 Gemini API 키를 먼저 입력해주세요."
     
@@ -4617,25 +5758,49 @@ def generate_content_gemini(text_content, selected_mode, num_items=5, api_key=No
             "temperature": LLM_TEMPERATURE,
             "top_p": 1.0,
         }
-        response = model.generate_content(prompt_text, generation_config=generation_config)
-        result_text = response.text
+        model_id = get_gemini_model_id()
+
+        def call():
+            if on_delta is None:
+                response = model.generate_content(prompt_text, generation_config=generation_config)
+                return response.text, _gemini_usage_tokens(response)
+            response = model.generate_content(prompt_text, generation_config=generation_config, stream=True)
+            parts = []
+            for piece in response:
+                try:
+                    delta = piece.text
+                except ValueError:
+                    delta = ""
+                if delta:
+                    parts.append(delta)
+                    on_delta(delta)
+            return "".join(parts), _gemini_usage_tokens(response)
+
+        result_text, usage_tokens, cache_hit = cached_llm_call("gen.question", "gemini", model_id, prompt_text, call, use_cache=use_cache, validate=validate)
+        if cache_hit and on_delta is not None:
+            on_delta(result_text)
+        if usage_out is not None:
+            usage_out["tokens"] = 0 if cache_hit else usage_tokens
         append_audit_log("gen.question", {
-            "model": get_gemini_model_id(),
+            "model": model_id,
             "temperature": LLM_TEMPERATURE,
             "seed": None,
             "prompt_hash": _hash_text(prompt_text),
             "prompt_text": prompt_text,
             "input_hash": _hash_text(text_content[:30000]),
             "output_text": result_text,
-            "usage_tokens": _gemini_usage_tokens(response),
+            "usage_tokens": usage_tokens,
+            "cache_hit": cache_hit,
             "prompt_version": PROMPT_VERSION,
         })
         return result_text
     except Exception as e:
+        if raise_rate_limit and rate_limit_details(e) is not None:
+            raise
         return f"❌ Gemini 생성 실패: {str(e)}"
 
-def generate_content_openai(text_content, selected_mode, num_items=5, openai_api_key=None, style_text=None):
-    """ChatGPT를 이용해 콘텐츠 생성"""
+def generate_content_openai(text_content, selected_mode, num_items=5, openai_api_key=None, style_text=None, use_cache=True, usage_out=None, raise_rate_limit=False, on_delta=None, validate=None):
+    """ChatGPT를 이용해 콘텐츠 생성 (on_delta를 주면 스트리밍으로 받으며 조각마다 호출)"""
     if not openai_api_key:
         return "⚠️ 왼쪽 사이드바에 OpenAI API 키를 먼저 입력해주세요."
     
@@ -4677,12 +5842,37 @@ def generate_content_openai(text_content, selected_mode, num_items=5, openai_api
         }
         if LLM_SEED is not None:
             openai_params["seed"] = LLM_SEED
-        response = openai_client.chat.completions.create(
-            **openai_params
+        def call():
+            if on_delta is None:
+                response = openai_client.chat.completions.create(
+                    **openai_params
+                )
+                return response.choices[0].message.content, _openai_usage_tokens(response)
+            stream = openai_client.chat.completions.create(**openai_params, stream=True, stream_options={"include_usage": True})
+            parts = []
+            stream_usage = None
+            for event in stream:
+                if event.choices:
+                    delta = event.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        on_delta(delta)
+                if getattr(event, "usage", None) is not None:
+                    stream_usage = _openai_usage_tokens(event)
+            return "".join(parts), stream_usage
+
+        # 캐시에는 변환 전 JSON이 들어가므로 검증은 호출자가 받을 변환 결과로 한다
+        validate_raw = None
+        if validate is not None:
+            validate_raw = lambda raw: validate(convert_json_mcq_to_text(raw, num_items) if selected_mode == mode_mcq else raw)
+        result, usage_tokens, cache_hit = cached_llm_call(
+            "gen.question", "openai", openai_params["model"], openai_params["messages"], call, seed=LLM_SEED, use_cache=use_cache, validate=validate_raw
         )
-        
-        result = response.choices[0].message.content
+        if cache_hit and on_delta is not None:
+            on_delta(result)
         print(f"[OPENAI DEBUG] 응답 길이: {len(result)}", file=sys.stderr)
+        if usage_out is not None:
+            usage_out["tokens"] = 0 if cache_hit else usage_tokens
         
         # MCQ는 JSON으로 파싱, Cloze는 그대로 반환
         if selected_mode == mode_mcq:
@@ -4696,11 +5886,14 @@ def generate_content_openai(text_content, selected_mode, num_items=5, openai_api
             "prompt_text": prompt_text,
             "input_hash": _hash_text(text_content[:30000]),
             "output_text": result,
-            "usage_tokens": _openai_usage_tokens(response),
+            "usage_tokens": usage_tokens,
+            "cache_hit": cache_hit,
             "prompt_version": PROMPT_VERSION,
         })
         return result
     except Exception as e:
+        if raise_rate_limit and rate_limit_details(e) is not None:
+            raise
         import traceback
         error_msg = f"❌ ChatGPT 생성 실패: {str(e)}\n\n스택 트레이스:\n{traceback.format_exc()}"
         print(error_msg, file=sys.stderr)
@@ -4758,12 +5951,18 @@ def convert_json_mcq_to_text(json_text, num_items):
         return json_text
 
 
-def generate_content(text_content, selected_mode, ai_model, num_items=5, api_key=None, openai_api_key=None, style_text=None):
-    """선택된 AI 모델을 사용해 콘텐츠 생성"""
+def generate_content(text_content, selected_mode, ai_model, num_items=5, api_key=None, openai_api_key=None, style_text=None, use_cache=True, usage_out=None, raise_rate_limit=False, on_delta=None, validate=None):
+    """선택된 AI 모델을 사용해 콘텐츠 생성 (use_cache=False면 응답 캐시를 건너뜀)
+
+    usage_out(dict)을 주면 실제 사용 토큰("tokens", 캐시 적중이면 0)을 채우고,
+    raise_rate_limit=True면 429/쿼터 초과를 오류 문자열 대신 예외로 올려 생성 엔진이 재시도하게 한다.
+    on_delta를 주면 응답을 스트리밍으로 받아 조각마다 호출한다 (캐시 적중이면 전체 응답 한 번).
+    validate(응답)가 False인 응답은 캐시에 남기지 않는다.
+    """
     if ai_model == "🔵 Google Gemini":
-        return generate_content_gemini(text_content, selected_mode, num_items=num_items, api_key=api_key, style_text=style_text)
+        return generate_content_gemini(text_content, selected_mode, num_items=num_items, api_key=api_key, style_text=style_text, use_cache=use_cache, usage_out=usage_out, raise_rate_limit=raise_rate_limit, on_delta=on_delta, validate=validate)
     else:  # ChatGPT
-        return generate_content_openai(text_content, selected_mode, num_items=num_items, openai_api_key=openai_api_key, style_text=style_text)
+        return generate_content_openai(text_content, selected_mode, num_items=num_items, openai_api_key=openai_api_key, style_text=style_text, use_cache=use_cache, usage_out=usage_out, raise_rate_limit=raise_rate_limit, on_delta=on_delta, validate=validate)
 
 def split_text_into_chunks(text, chunk_size=8000, overlap=500):
     """문자 단위로 텍스트를 분할 (중첩 포함)"""
@@ -4781,48 +5980,225 @@ def split_text_into_chunks(text, chunk_size=8000, overlap=500):
         start = end - overlap if end - overlap > start else end
     return chunks
 
-def generate_content_in_chunks(text_content, selected_mode, ai_model, num_items=5, chunk_size=8000, overlap=500, api_key=None, openai_api_key=None, style_text=None):
+def generate_content_in_chunks(text_content, selected_mode, ai_model, num_items=5, chunk_size=8000, overlap=500, api_key=None, openai_api_key=None, style_text=None, use_cache=True, on_event=None, near_dup_threshold=None, near_dup_enabled=None, checkpoint=None, pages=None, group=None):
     """텍스트를 청크로 나누어 모델 호출을 여러 번 수행
+
+    응답은 스트리밍으로 받아 문항이 완성될 때마다 미리보기에 띄운다. 반환값은 전체 응답을 다시 파싱/중복 제거한 결과다.
+    on_event를 주면 화면을 그리지 않고 진행/문항/실패 이벤트를 on_event로 넘긴다 (백그라운드 작업용).
+    checkpoint({청크 내용 해시: 응답})를 주면 문항이 나온 청크 응답을 기록하고, 이미 기록된 청크는
+    다시 호출하지 않는다 (재시도 때 실패/빈 청크만 다시 요청하고 병합/중복 제거는 전체에 대해 수행).
+    pages에 (페이지 텍스트, 전체 페이지 수) 이터러블을 주면 text_content 대신 페이지가 도착하는 대로
+    청크를 확정해 바로 제출한다 (뒤쪽 페이지를 추출하는 동안 앞쪽 청크를 생성). 이때 문항 수는
+    청크가 끝나는 페이지 위치까지 누적 배분한다. 끝나면 단계별 소요 시간을 timings 이벤트로 남긴다.
+    group(작업 id 등)을 주면 엔진이 다른 group의 청크와 동시 요청 슬롯을 번갈아 배정한다.
     
     Returns:
         - 객관식: 구조화된 dict 리스트 (각 dict는 {type, problem, options, answer, explanation})
         - 빈칸/단답/서술: 구조화된 dict 리스트 (각 dict는 {type, response_type, front, answer, explanation})
     """
     import sys
-    chunks = split_text_into_chunks(text_content, chunk_size=chunk_size, overlap=overlap)
-    total_chunks = len(chunks)
-    
-    print(f"[CHUNKS DEBUG] 총 청크 수: {total_chunks}", file=sys.stderr)
-    
-    if total_chunks == 0:
-        return []
-    
-    base = num_items // total_chunks
-    rem = num_items % total_chunks
-    items_per_chunk = [base + (1 if i < rem else 0) for i in range(total_chunks)]
+    max_tokens = min(chunk_size, GENERATION_INPUT_CHARS) // CHARS_PER_TOKEN
+    overlap_tokens = overlap // CHARS_PER_TOKEN
+    events = queue.Queue()
+    stop = threading.Event()
+    started = time.perf_counter()
+    if pages is None:
+        # 페이지/슬라이드/문단을 통째로 토큰 예산까지 묶고, 문항 수는 청크의 용어 밀도에 비례해 배분
+        # (문항이 0개로 배정된 청크는 호출하지 않는다)
+        plan = plan_chunks(text_content, max_tokens=max_tokens, overlap_tokens=overlap_tokens)
+        print(f"[CHUNKS DEBUG] 총 청크 수: {len(plan)}", file=sys.stderr)
+        if not plan:
+            return []
+        for chunk, n in zip(plan, allocate_items([c["density"] for c in plan], num_items)):
+            chunk["items"] = n
+        events.put({"kind": "chunks", "chunks": plan})
+        events.put({"kind": "planned"})
+    else:
+        def feed():
+            # 추출(페이지 대기)은 이 스레드에서, 청크 제출/체크포인트 기록은 호출한 스레드에서 한다
+            state = new_chunk_stream(max_tokens, overlap_tokens, total_items=num_items)
+            try:
+                for count, (page_text, total_pages) in enumerate(pages, 1):
+                    if stop.is_set():
+                        return
+                    ready = feed_chunk_stream(state, page_text, total_pages=total_pages)
+                    events.put({"kind": "extract", "pages": count, "total": total_pages})
+                    if ready:
+                        events.put({"kind": "chunks", "chunks": ready})
+                events.put({"kind": "chunks", "chunks": finish_chunk_stream(state)})
+                events.put({"kind": "planned"})
+            except Exception as exc:
+                events.put({"kind": "feed_error", "error": exc})
+
+        threading.Thread(target=feed, name="generation-feed", daemon=True).start()
+
+    chunks = []
+    chunk_keys = []
+    results = []
+    provider = "gemini" if ai_model == "🔵 Google Gemini" else "openai"
+    line_mode = selected_mode == MODE_CLOZE
+    headless = on_event is not None
+    context = capture_runtime_context()
+    model_key = context["gemini_model_id"] if provider == "gemini" else ai_model
+    engine = get_generation_engine(get_provider_limits())
+
+    def chunk_ok(res):
+        return (
+            isinstance(res, str)
+            and bool(res.strip())
+            and not res.lstrip().startswith(("❌", "⚠️"))
+            and bool(parse_generated_text_to_structured(res, selected_mode))
+        )
 
-    results = [None] * total_chunks
-    progress_bar = st.progress(0)
+    def run_chunk(idx, chunk, n, usage):
+        # 재시도마다 새 파서로 시작해 같은 문항을 두 번 내보내지 않는다
+        parser = new_stream_parser(line_mode=line_mode)
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=min(4, total_chunks)) as ex:
-        futures = {}
-        for idx, chunk in enumerate(chunks):
-            n = items_per_chunk[idx]
+        def emit(pieces):
+            items = [item for piece in pieces for item in parse_generated_text_to_structured(piece, selected_mode)]
+            if items:
+                events.put({"kind": "items", "chunk": idx, "items": items})
+
+        res = generate_content(
+            chunk, selected_mode, ai_model, n, api_key, openai_api_key, style_text, use_cache,
+            usage_out=usage, raise_rate_limit=True, on_delta=lambda delta: emit(feed_stream_parser(parser, delta)),
+            validate=chunk_ok,
+        )
+        emit(finish_stream_parser(parser))
+        return res
+
+    # 프로세스 공용 엔진이 제공자별 동시 요청/분당 예산을 모든 사용자에 걸쳐 지킨다.
+    # 진행/문항 이벤트는 엔진 스레드에서 오므로 큐로 받아 스크립트 스레드에서 화면을 갱신
+    progress_bar = None if headless else st.progress(0)
+    stream_preview = None if headless else st.empty()
+    reused_notice = None if headless else st.empty()
+    submitted = []
+    task_chunks = []
+    finished = 0
+    reused = 0
+    planned = False
+    timings = {}
+    streamed = []
+
+    def elapsed_ms():
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    def schedule(new_chunks):
+        nonlocal reused
+        tasks = []
+        owners = []
+        reused_before = reused
+        for chunk in new_chunks:
+            idx = len(chunks)
+            n = chunk["items"]
+            chunks.append(chunk["text"])
+            chunk_keys.append(chunk_fingerprint(chunk["text"], n, selected_mode, provider, model_key, style_text or ""))
+            results.append("")
             if n <= 0:
-                results[idx] = ""
                 continue
-            futures[ex.submit(generate_content, chunk, selected_mode, ai_model, n, api_key, openai_api_key, style_text)] = idx
+            if checkpoint is not None and chunk_ok(checkpoint.get(chunk_keys[idx])):
+                results[idx] = checkpoint[chunk_keys[idx]]
+                reused += 1
+                continue
+            usage = {}
+            tasks.append({
+                "provider": provider,
+                "group": group,
+                "tokens": estimate_tokens(chunk["text"], GENERATION_OUTPUT_TOKENS),
+                "call": functools.partial(call_with_runtime_context, context, run_chunk, idx, chunk["text"], n, usage),
+                "usage": lambda _result, usage=usage: usage.get("tokens"),
+            })
+            owners.append(idx)
+        if reused > reused_before:
+            print(f"[CHUNKS DEBUG] 체크포인트 재사용 {reused}/{len(chunks)}개 청크", file=sys.stderr)
+            if headless:
+                on_event({"kind": "checkpoint", "reused": reused, "total": len(chunks)})
+            else:
+                reused_notice.caption(f"♻️ 이전 시도에서 완료된 청크 {reused}/{len(chunks)}개를 재사용합니다.")
+        if tasks:
+            timings.setdefault("t_first_request_ms", elapsed_ms())
+            future = engine.submit(tasks, on_progress=lambda event, owners=owners: events.put({**event, "kind": "result", "chunk": owners[event["index"]]}))
+            submitted.append((future, owners))
+            task_chunks.extend(owners)
 
-        completed = 0
-        for fut in concurrent.futures.as_completed(futures):
-            idx = futures[fut]
+    try:
+        while True:
+            settled = planned and all(future.done() for future, _ in submitted)
             try:
-                res = fut.result()
-            except Exception as e:
-                res = f"❌ 청크 처리 실패: {str(e)}"
+                event = events.get_nowait() if settled else events.get(timeout=0.2)
+            except queue.Empty:
+                if settled:
+                    break
+                if headless:
+                    # 추출/생성이 오래 걸려도 작업 쪽에서 취소 여부를 확인할 수 있게 주기적으로 알린다
+                    on_event({"kind": "heartbeat"})
+                continue
+            kind = event["kind"]
+            if kind == "feed_error":
+                raise event["error"]
+            if kind == "chunks":
+                schedule(event["chunks"])
+                continue
+            if kind == "planned":
+                planned = True
+                if pages is not None:
+                    timings["t_extract_raw_ms"] = elapsed_ms()
+                    print(f"[CHUNKS DEBUG] 총 청크 수: {len(chunks)}", file=sys.stderr)
+                continue
+            if kind == "result":
+                finished += 1
+                if checkpoint is not None and not event["error"] and chunk_ok(event["result"]):
+                    # 호출한 스레드에서만 checkpoint를 바꾸므로 on_event가 저장하는 시점의 내용이 일관된다
+                    checkpoint[chunk_keys[event["chunk"]]] = event["result"]
+                event = {**event, "kind": "progress", "done": finished, "total": len(task_chunks)}
+            if headless:
+                on_event(event)
+            if kind == "items":
+                if not streamed:
+                    timings["t_first_item_ms"] = elapsed_ms()
+                streamed.extend(event["items"])
+                latest = streamed[-1]
+                if stream_preview is not None:
+                    stream_preview.caption(f"⚡ 도착한 문항 {len(streamed)}개 · 최근: {(latest.get('problem') or latest.get('front') or '')[:80]}")
+            elif progress_bar is not None and kind == "progress":
+                progress_bar.progress(int(event["done"] / event["total"] * 100), text=f"청크 {event['done']}/{event['total']} 완료")
+    finally:
+        stop.set()
+        # 취소/실패로 빠져나오면 아직 보내지 않은 청크는 요청하지 않는다 (정상 종료 때는 모두 끝나 있음)
+        for future, _ in submitted:
+            future.cancel()
+    total_chunks = len(chunks)
+    if total_chunks == 0:
+        return []
+
+    for future, owners in submitted:
+        for idx, res in zip(owners, future.result()):
+            if isinstance(res, BaseException):
+                res = f"❌ 청크 처리 실패: {str(res)}"
             results[idx] = res if isinstance(res, str) else str(res)
-            completed += 1
-            progress_bar.progress(int(completed / total_chunks * 100))
+    if progress_bar is not None:
+        progress_bar.progress(100)
+    if "t_first_request_ms" in timings:
+        timings["t_generate_ms"] = round(elapsed_ms() - timings["t_first_request_ms"], 1)
+    timings["t_total_ms"] = elapsed_ms()
+    if headless:
+        on_event({"kind": "timings", **timings})
+    else:
+        for name, value in timings.items():
+            record_debug_timing(f"generation.{name[2:-3]}", value)
+
+    # 실패/경고 문자열과 문항이 없는 응답은 병합하지 않고 따로 알린다 (체크포인트가 있으면 재시도 대상)
+    missing = {idx for idx in task_chunks if not chunk_ok(results[idx])}
+    failed = [results[idx] for idx in sorted(missing) if results[idx].lstrip().startswith(("❌", "⚠️"))]
+    if missing:
+        detail = failed[0].splitlines()[0][:200] if failed else "응답에서 문항을 찾지 못함"
+        print(f"[CHUNKS DEBUG] 실패 청크 {len(missing)}개: {detail}", file=sys.stderr)
+        message = f"{len(missing)}/{total_chunks}개 청크 생성 실패: {detail}"
+        if headless:
+            on_event({"kind": "warning", "message": message})
+        else:
+            st.warning(message)
+    results = [r for idx, r in enumerate(results) if idx not in missing]
 
     # 모든 청크 결과 결합
     combined = "\n".join([r for r in results if r])
@@ -4832,18 +6208,547 @@ def generate_content_in_chunks(text_content, selected_mode, ai_model, num_items=
     # 결합된 텍스트를 구조화된 형식으로 파싱
     structured_list = parse_generated_text_to_structured(combined, selected_mode)
     
-    # 중복 제거
+    # 중복 제거: 정규화 키로 동일 문항, MinHash로 청크 중첩 구간에서 다시 나온 유사 문항 제거 (유사 중복 검사를 끄면 동일 문항만)
+    if near_dup_enabled is None:
+        near_dup_enabled = st.session_state.get("near_dup_enabled", True)
     seen = set()
     deduped = []
-    for item in structured_list:
-        key = str(item)  # 또는 더 정교한 키 생성
-        if key not in seen:
-            seen.add(key)
-            deduped.append(item)
+    batch_index = new_near_duplicate_index() if near_dup_enabled else None
+    threshold = float(near_dup_threshold if near_dup_threshold is not None else st.session_state.get("near_dup_threshold", DEFAULT_NEAR_DUPLICATE_THRESHOLD))
+    for pos, item in enumerate(structured_list):
+        key = build_question_dedupe_key(item)
+        if key in seen:
+            continue
+        seen.add(key)
+        if batch_index is not None:
+            signature = minhash_signature(question_dedupe_text(item))
+            if near_duplicate_query(batch_index, signature, threshold=threshold):
+                continue
+            near_duplicate_add(batch_index, pos, signature)
+        deduped.append(item)
     
     # 필요한 개수만 반환
     return deduped[:num_items]
 
+# ============================================================================
+# 백그라운드 생성 작업 (디스크 큐 + 워커 풀, 새로고침/재시작 후에도 이어짐)
+# ============================================================================
+def get_generation_jobs_dir(user_id=None):
+    return get_user_data_dir(user_id) / "generation_jobs"
+
+def enqueue_generation_job(raw_text, source_name, params, source_bytes=None):
+    """원문(또는 추출 전 원본 파일)과 생성 설정을 디스크 큐에 넣는다 (실행은 resume_generation_jobs가 워커 풀에 맡김)"""
+    jobs_dir = get_generation_jobs_dir()
+    job = new_generation_job(params, source_name)
+    job["params"]["source_size"] = len(source_bytes) if source_bytes is not None else len((raw_text or "").encode("utf-8"))
+    if source_bytes is not None:
+        # 페이지 단위로 추출되는 원본은 추출과 생성을 겹쳐 실행한다 (run_generation_job)
+        job["params"]["paged"] = True
+        save_generation_source(jobs_dir, job["id"], source_bytes, Path(source_name).suffix.lower())
+    else:
+        save_generation_payload(jobs_dir, job["id"], raw_text)
+    save_generation_job(jobs_dir, job)
+    return job
+
+def get_batch_upload_sources(uploaded_files):
+    """일괄 업로드 파일을 zip 목록까지 펼친 [(경로, 크기, 파일 번호, zip 항목명)]. 같은 업로드(파일 id/크기)면 rerun마다 다시 읽지 않는다
+
+    세션에는 내용 없이 위치만 남기고, 내용은 작업을 등록할 때 read_upload_source로 꺼낸다.
+    """
+    key = tuple((getattr(f, "file_id", None) or f.name, f.size) for f in uploaded_files)
+    cached = st.session_state.get("gen_batch_sources")
+    if cached and cached["key"] == key:
+        return cached["sources"]
+    sources = expand_upload_sources(
+        [(f.name, f.getvalue()) for f in uploaded_files],
+        EXTRACTABLE_EXTENSIONS + (".hwp",),
+    )
+    st.session_state["gen_batch_sources"] = {"key": key, "sources": sources}
+    return sources
+
+def enqueue_generation_batch(sources, params):
+    """여러 파일을 한 묶음(batch_id)으로 대기열에 넣는다. sources: [{"name", "data", "subject", "unit"}]
+
+    파일마다 작업 하나로 들어가 과목/단원별로 저장되고, 청크는 공용 엔진에서 파일끼리 번갈아 요청된다.
+    HWP는 워커 프로세스에서 추출할 수 없어 여기서 추출한다. Returns: (작업 목록, [(파일명, 오류)])
+    """
+    batch_id = new_generation_batch_id()
+    jobs = []
+    errors = []
+    for source in sources:
+        name = source["name"]
+        job_params = {**params, "subject": source["subject"], "unit": source["unit"], "batch_id": batch_id, "batch_size": len(sources)}
+        try:
+            if Path(name).suffix.lower() in EXTRACTABLE_EXTENSIONS:
+                jobs.append(enqueue_generation_job(None, name, job_params, source_bytes=source["data"]))
+                continue
+            raw_text = extract_text_from_hwp(source["data"])
+            if not raw_text.strip():
+                raise ValueError("텍스트 추출 결과가 비어 있습니다.")
+            jobs.append(enqueue_generation_job(raw_text, name, job_params))
+        except Exception as e:
+            errors.append((name, str(e)))
+    return jobs, errors
+
+def generation_job_source_file(jobs_dir, job):
+    return generation_job_file(jobs_dir, job["id"], f".source{Path(job.get('source_name') or '').suffix.lower()}")
+
+def iter_generation_source_pages(jobs_dir, job, stop):
+    """원본 파일을 별도 프로세스에서 페이지 단위로 추출하며 (페이지 텍스트, 전체 페이지 수)를 낸다.
+
+    프로세스는 페이지마다 JSONL 한 줄을 쓰고, 이 제너레이터는 그 파일을 읽어 끝난 페이지부터 넘긴다.
+    stop이 설정되면 취소 표시 파일을 만들어 프로세스도 다음 페이지 전에 멈추게 한다.
+    끝까지 읽으면 원문을 저장하고 원본을 지워 재개/재시도 때 다시 추출하지 않는다.
+    """
+    job_id = job["id"]
+    pages_path = generation_job_file(jobs_dir, job_id, ".pages.jsonl")
+    cancel_path = generation_job_file(jobs_dir, job_id, ".cancel")
+    delete_generation_files(jobs_dir, job_id, [".pages.jsonl", ".cancel"])
+    future = submit_document_extraction(generation_job_source_file(jobs_dir, job), pages_path, cancel_path)
+    pages = []
+    offset = 0
+    while True:
+        if stop.is_set():
+            cancel_path.touch()
+            raise GenerationCancelled(job_id)
+        finished = future.done()
+        records, offset = read_extracted_pages(pages_path, offset)
+        for record in records:
+            if record.get("error"):
+                raise ValueError(f"문서 처리 실패: {record['error']}")
+            if "page" in record:
+                pages.append(record["text"])
+                yield record["text"], record["total"]
+        if finished:
+            break
+        time.sleep(0.2)
+    future.result()
+    delete_generation_files(jobs_dir, job_id, [".pages.jsonl", ".cancel"])
+    text = "\n".join(pages)
+    if not text.strip():
+        raise ValueError("텍스트 추출 결과가 비어 있습니다. 스캔 PDF 또는 이미지 중심 파일인 경우 OCR/원문 품질을 확인해 주세요.")
+    save_generation_payload(jobs_dir, job_id, text)
+    generation_job_source_file(jobs_dir, job).unlink(missing_ok=True)
+
+def run_generation_job(jobs_dir, job_id, context, api_key=None, openai_api_key=None):
+    """워커 스레드에서 작업 하나를 실행하고 진행 상황/도착한 문항/결과를 작업 파일에 기록.
+
+    진행 기록은 최대 1초 간격이며, 그때마다 작업 파일이 취소 상태로 바뀌었는지 확인해 중단한다.
+    문항이 나온 청크 응답은 작업의 chunks에 내용 해시로 남아, 재개/재시도 때 실패·빈 청크만 다시 요청한다.
+    """
+    job = load_generation_job(jobs_dir, job_id)
+    if not job or job["status"] not in ACTIVE_JOB_STATUSES:
+        return
+    text = load_generation_payload(jobs_dir, job_id)
+    if text is None and not generation_job_source_file(jobs_dir, job).exists():
+        save_generation_job(jobs_dir, update_generation_job(job, status="failed", error="작업 원문이 없어 실행할 수 없습니다."))
+        return
+    params = job.get("params") or {}
+    update_generation_job(job, status="running", attempts=int(job.get("attempts", 0)) + 1, error="", warning="", streamed=[], timings={})
+    checkpoint = job.setdefault("chunks", {})
+    save_generation_job(jobs_dir, job)
+    last_write = [time.monotonic()]
+
+    def on_event(event):
+        if event["kind"] == "items":
+            job["streamed"].extend(event["items"])
+            job["progress"]["items"] = len(job["streamed"])
+        elif event["kind"] == "progress":
+            job["progress"].update(done=event["done"], total=event["total"])
+        elif event["kind"] == "extract":
+            job["progress"].update(pages=event["pages"], pages_total=event["total"])
+        elif event["kind"] == "checkpoint":
+            job["progress"]["reused"] = event["reused"]
+        elif event["kind"] == "warning":
+            job["warning"] = event["message"]
+        elif event["kind"] == "timings":
+            job["timings"] = {key: value for key, value in event.items() if key != "kind"}
+        if time.monotonic() - last_write[0] < 1.0:
+            return
+        last_write[0] = time.monotonic()
+        current = load_generation_job(jobs_dir, job_id)
+        if current is None or current["status"] == "cancelled":
+            raise GenerationCancelled(job_id)
+        save_generation_job(jobs_dir, update_generation_job(job))
+
+    # 업로드 원본은 추출되는 페이지부터 바로 생성에 넘기고, 이미 추출된 원문도 같은 페이지 순서로 다시 넣어
+    # 청크 계획(과 체크포인트 키)이 처음 실행 때와 같게 한다
+    stop = threading.Event()
+    if text is None:
+        pages = iter_generation_source_pages(jobs_dir, job, stop)
+    elif params.get("paged"):
+        sections = split_pages(text)
+        pages = [(section, len(sections)) for section in sections]
+    else:
+        pages = None
+    result = None
+    error = ""
+    try:
+        result = call_with_runtime_context(
+            context,
+            generate_content_in_chunks,
+            text,
+            params.get("mode", MODE_MCQ),
+            params.get("ai_model", "🔵 Google Gemini"),
+            num_items=int(params.get("num_items", 5)),
+            chunk_size=int(params.get("chunk_size", 8000)),
+            overlap=int(params.get("overlap", 0)),
+            api_key=api_key,
+            openai_api_key=openai_api_key,
+            style_text=params.get("style_text"),
+            use_cache=bool(params.get("use_cache", True)),
+            on_event=on_event,
+            near_dup_threshold=params.get("near_dup_threshold"),
+            near_dup_enabled=params.get("near_dup_enabled", True),
+            checkpoint=checkpoint,
+            pages=pages,
+            group=job_id,
+        )
+    except GenerationCancelled:
+        return
+    except Exception as e:
+        error = f"❌ 오류: {str(e)}"
+    finally:
+        stop.set()
+    current = load_generation_job(jobs_dir, job_id)
+    if current is None or current["status"] == "cancelled":
+        return
+    if result:
+        # 일부 청크가 실패한 작업만 체크포인트를 남겨 실패 청크 재시도에 쓴다
+        update_generation_job(job, status="done", result=result, error="", chunks=checkpoint if job.get("warning") else {})
+    else:
+        update_generation_job(job, status="failed", error=error or "생성 결과가 비어 있어 저장되지 않았습니다.")
+    save_generation_job(jobs_dir, job)
+
+def resume_generation_jobs(api_key=None, openai_api_key=None):
+    """이 프로세스에서 돌고 있지 않은 대기/실행 중 작업을 워커 풀에 넣는다.
+
+    서버 재시작으로 끊긴 작업도 여기서 다시 시작한다. API 키는 디스크에 남기지 않으므로
+    해당 제공자 키가 입력된 세션에서만 재개하고, MAX_JOB_ATTEMPTS번 시도한 작업은 실패로 닫는다.
+    """
+    jobs_dir = get_generation_jobs_dir()
+    pool = get_generation_worker_pool(GENERATION_JOB_WORKERS)
+    user_id = get_current_user_id()
+    submitted = 0
+    for job in resumable_generation_jobs(list_generation_jobs(jobs_dir), pool.is_active):
+        params = job.get("params") or {}
+        gemini = params.get("ai_model", "🔵 Google Gemini") == "🔵 Google Gemini"
+        if not (api_key if gemini else openai_api_key):
+            continue
+        if int(job.get("attempts", 0)) >= MAX_JOB_ATTEMPTS:
+            save_generation_job(jobs_dir, update_generation_job(job, status="failed", error=f"{MAX_JOB_ATTEMPTS}번 시도했지만 완료하지 못했습니다."))
+            continue
+        context = {"user_id": user_id, "gemini_model_id": params.get("gemini_model_id") or get_gemini_model_id()}
+        keys = (api_key, None) if gemini else (None, openai_api_key)
+        if pool.submit(job["id"], run_generation_job, jobs_dir, job["id"], context, *keys):
+            submitted += 1
+    return submitted
+
+def sync_generation_jobs():
+    """끝난 작업의 결과를 문제은행에 저장 (작업 파일에 saved를 남겨 한 번만 저장).
+
+    "도착하는 대로 저장"을 켠 작업은 실행 중에도 새로 도착한 문항을 저장한다.
+    알림은 generation_job_notices에 쌓고 문제 생성 화면에서 보여 준다.
+    """
+    jobs_dir = get_generation_jobs_dir()
+    streamed_saved = st.session_state.setdefault("generation_streamed_saved", {})
+    notices = st.session_state.setdefault("generation_job_notices", [])
+    for job in list_generation_jobs(jobs_dir):
+        if job.get("saved"):
+            continue
+        params = job.get("params") or {}
+        mode = params.get("mode", MODE_MCQ)
+        subject = params.get("subject", "General")
+        unit = params.get("unit", "미분류")
+        quality_filter = bool(params.get("quality_filter", True))
+        min_len = int(params.get("min_length", 30))
+        near_dup_check = prepare_near_duplicate_check()
+        if params.get("save_streamed"):
+            already = streamed_saved.get(job["id"], 0)
+            fresh = (job.get("streamed") or [])[already:max(already, int(params.get("num_items", 0)))]
+            if fresh:
+                add_questions_to_bank(fresh, mode, subject, unit, quality_filter=quality_filter, min_length=min_len, near_dup=near_dup_check)
+                streamed_saved[job["id"]] = already + len(fresh)
+        if job["status"] in ACTIVE_JOB_STATUSES:
+            continue
+
+        def add_fn(items, item_mode, item_subject, item_unit, quality_filter=True, min_length=30):
+            if params.get("save_streamed"):
+                # 도착하는 대로 저장한 문항은 빼고, 합쳐서 요청한 개수를 넘지 않게 남은 만큼만 저장
+                already = streamed_saved.get(job["id"], 0)
+                stored = {build_question_dedupe_key(q) for q in (job.get("streamed") or [])[:already]}
+                room = max(0, int(params.get("num_items", 0)) - already)
+                items = [q for q in items if build_question_dedupe_key(q) not in stored][:room]
+                if not items:
+                    return 0
+            return add_questions_to_bank(items, item_mode, item_subject, item_unit, quality_filter=quality_filter, min_length=min_length, near_dup=near_dup_check)
+
+        def drop_payload(target):
+            # 실패/취소 작업과 일부 청크가 실패한 작업은 다시 시도할 수 있도록 원문을 남긴다
+            if target.get("status") == "done" and not job.get("warning"):
+                delete_generation_payload(jobs_dir, job["id"])
+            return target
+
+        queue_item = {
+            "id": job["id"],
+            "source_name": job.get("source_name", ""),
+            "mode": mode,
+            "subject": subject,
+            "unit": unit,
+            "quality_filter": quality_filter,
+            "min_length": min_len,
+        }
+        items, _, job_notices = reconcile_generation_queue_items(
+            [queue_item],
+            {"queue_id": job["id"], "status": job["status"], "result": job.get("result"), "error": job.get("error")},
+            add_fn,
+            drop_payload,
+            now_iso=datetime.now(timezone.utc).isoformat(),
+            default_min_length=min_len,
+            mode_mcq=MODE_MCQ,
+        )
+        outcome = items[0]
+        saved_count = int(outcome.get("saved_count", 0)) + streamed_saved.pop(job["id"], 0)
+        save_generation_job(jobs_dir, update_generation_job(job, saved=True, saved_count=saved_count, error=outcome.get("error", job.get("error", ""))))
+        notices.extend(job_notices)
+        if params.get("batch_id"):
+            # 일괄 생성은 파일별 알림과 묶음 진행 표시로 보여 주고 마지막 결과 미리보기는 바꾸지 않는다
+            continue
+        if outcome.get("status") == "done":
+            st.session_state.generation_failure = ""
+            st.session_state.generation_preview_items = job["result"]
+            st.session_state.generation_preview_mode = mode
+            st.session_state.generation_preview_subject = subject
+            st.session_state.generation_preview_unit = unit
+            st.session_state.generation_last_result = {"job_id": job["id"], "items": job["result"], "mode": mode, "saved_count": saved_count}
+        elif outcome.get("status") == "failed":
+            st.session_state.generation_failure = outcome.get("error") or "생성 실패"
+    return notices
+
+def generation_job_retryable(job):
+    return job["status"] in ("failed", "cancelled") or (job["status"] == "done" and bool(job.get("warning")))
+
+def cancel_generation_job(job_id):
+    jobs_dir = get_generation_jobs_dir()
+    job = load_generation_job(jobs_dir, job_id)
+    if not job or job["status"] not in ACTIVE_JOB_STATUSES:
+        return False
+    return save_generation_job(jobs_dir, update_generation_job(job, status="cancelled", error="사용자 취소"))
+
+def cancel_generation_batch(batch_id):
+    jobs = list_generation_jobs(get_generation_jobs_dir())
+    return sum(1 for job in jobs if (job.get("params") or {}).get("batch_id") == batch_id and cancel_generation_job(job["id"]))
+
+def retry_generation_job(job_id):
+    """실패/취소된 작업(또는 일부 청크가 실패한 작업)을 같은 원문과 설정으로 다시 대기열에 넣는다.
+
+    체크포인트(chunks)는 그대로 두어 이미 문항이 나온 청크는 다시 요청하지 않는다.
+    """
+    jobs_dir = get_generation_jobs_dir()
+    job = load_generation_job(jobs_dir, job_id)
+    if not job or not generation_job_retryable(job):
+        return False
+    if load_generation_payload(jobs_dir, job_id) is None and not generation_job_source_file(jobs_dir, job).exists():
+        return False
+    st.session_state.setdefault("generation_streamed_saved", {}).pop(job_id, None)
+    update_generation_job(
+        job,
+        status="pending",
+        attempts=0,
+        error="",
+        warning="",
+        saved=False,
+        result=None,
+        streamed=[],
+        progress={"done": 0, "total": 0, "items": 0},
+    )
+    return save_generation_job(jobs_dir, job)
+
+def format_eta_seconds(seconds):
+    if seconds is None:
+        return "계산 중"
+    minutes = int(seconds // 60)
+    if minutes >= 60:
+        return f"약 {minutes // 60}시간 {minutes % 60}분"
+    if minutes:
+        return f"약 {minutes}분"
+    return f"약 {max(1, int(seconds))}초"
+
+def render_generation_job_row(job):
+    labels = {"pending": "⏳ 대기", "running": "⚙️ 진행 중", "done": "✅ 완료", "failed": "❌ 실패", "cancelled": "🚫 취소"}
+    progress = job.get("progress") or {}
+    active = job["status"] in ACTIVE_JOB_STATUSES
+    params = job.get("params") or {}
+    col_info, col_action = st.columns([4, 1])
+    with col_info:
+        target = f" → {params.get('subject', 'General')} / {params.get('unit', '미분류')}" if params.get("batch_id") else ""
+        st.markdown(f"**{labels.get(job['status'], job['status'])}** · {job.get('source_name') or job['id']}{target}")
+        if active and progress.get("pages_total") and not progress.get("total"):
+            pages = int(progress.get("pages") or 0)
+            pages_total = int(progress["pages_total"])
+            st.progress(int(pages / pages_total * 100), text=f"자료 추출 중 · 페이지 {pages}/{pages_total}")
+        elif active:
+            done = int(progress.get("done") or 0)
+            total = int(progress.get("total") or 0)
+            reused = int(progress.get("reused") or 0)
+            reused_note = f" · 재사용 {reused}개" if reused else ""
+            # 추출과 생성이 겹쳐 도는 동안에는 청크 수가 아직 늘어나는 중이다
+            pages_total = int(progress.get("pages_total") or 0)
+            extracting = f" · 추출 페이지 {int(progress.get('pages') or 0)}/{pages_total}" if pages_total and int(progress.get("pages") or 0) < pages_total else ""
+            st.progress(int(done / total * 100) if total else 0, text=f"청크 {done}/{total or '?'}{'+' if extracting else ''}{reused_note}{extracting} · 도착한 문항 {int(progress.get('items') or 0)}개")
+        elif job["status"] == "done":
+            timings = job.get("timings") or {}
+            timing_note = f" · {timings['t_total_ms'] / 1000:.1f}초" if timings.get("t_total_ms") else ""
+            if timings.get("t_extract_raw_ms"):
+                timing_note += f" (추출 {timings['t_extract_raw_ms'] / 1000:.1f}초와 생성 {timings.get('t_generate_ms', 0) / 1000:.1f}초 병행)"
+            st.caption(f"생성 {len(job.get('result') or [])}개 / 저장 {int(job.get('saved_count') or 0)}개{timing_note}")
+        elif job.get("error"):
+            st.caption(job["error"])
+        if job.get("warning"):
+            st.caption(f"⚠️ {job['warning']}")
+    with col_action:
+        if active:
+            if st.button("중단", key=f"gen_job_cancel_{job['id']}", use_container_width=True):
+                cancel_generation_job(job["id"])
+                st.rerun()
+        elif generation_job_retryable(job):
+            retry_label = "실패 청크 재시도" if job["status"] == "done" else "다시 시도"
+            if st.button(retry_label, key=f"gen_job_retry_{job['id']}", use_container_width=True):
+                if retry_generation_job(job["id"]):
+                    st.rerun()
+                st.warning("원문이 남아 있지 않아 다시 시도할 수 없습니다. 파일을 다시 업로드해 주세요.")
+
+def render_generation_batch(batch_id, batch_jobs):
+    """일괄 생성 묶음: 합계 진행률/남은 시간과 파일별 작업"""
+    summary = summarize_generation_batch(batch_jobs)
+    active = summary["finished"] < summary["files"]
+    failed_note = f" · 실패/취소 {summary['failed']}개" if summary["failed"] else ""
+    st.markdown(f"**📦 일괄 생성** · 파일 {summary['finished']}/{summary['files']} 완료{failed_note}")
+    eta_note = f" · 남은 시간 {format_eta_seconds(summary['eta_seconds'])}" if active else f" · {format_eta_seconds(summary['elapsed_seconds'])} 걸림"
+    st.progress(
+        int(summary["fraction"] * 100),
+        text=f"청크 {summary['done']}/{summary['total'] or '?'} · 문항 {summary['items']}개{eta_note}",
+    )
+    if active and st.button("묶음 전체 중단", key=f"gen_batch_cancel_{batch_id}"):
+        cancel_generation_batch(batch_id)
+        st.rerun()
+    with st.expander(f"파일별 진행 ({summary['files']}개)", expanded=False):
+        for job in sorted(batch_jobs, key=lambda job: job.get("source_name") or ""):
+            render_generation_job_row(job)
+
+def render_generation_jobs_panel():
+    """생성 작업 목록. 대기/진행 중인 작업이 있고 자동 새로고침이 켜져 있으면 True (호출한 쪽이 페이지 끝에서 다시 실행)"""
+    for notice in st.session_state.pop("generation_job_notices", None) or []:
+        (st.success if notice.startswith("생성 완료") else st.warning)(notice)
+    jobs = list_generation_jobs(get_generation_jobs_dir())
+    if not jobs:
+        return False
+    st.markdown("### 🗂️ 생성 작업")
+    st.caption("작업은 서버에서 계속 진행됩니다. 페이지를 새로고침하거나 다시 접속해도 이어서 확인할 수 있습니다.")
+    # 일괄 생성 작업은 묶음 하나로 모아 보여 준다
+    entries = []
+    batches = {}
+    for job in jobs:
+        batch_id = (job.get("params") or {}).get("batch_id")
+        if not batch_id:
+            entries.append((job["id"], [job]))
+        elif batch_id in batches:
+            batches[batch_id].append(job)
+        else:
+            batches[batch_id] = [job]
+            entries.append((batch_id, batches[batch_id]))
+    for key, entry_jobs in reversed(entries[-10:]):
+        if key in batches:
+            render_generation_batch(key, entry_jobs)
+        else:
+            render_generation_job_row(entry_jobs[0])
+    active = any(job["status"] in ACTIVE_JOB_STATUSES for job in jobs)
+    col_refresh, col_clean = st.columns(2)
+    with col_refresh:
+        if st.button("🔄 상태 새로고침", key="gen_jobs_refresh_btn", use_container_width=True):
+            st.rerun()
+        auto_refresh = st.checkbox(
+            f"진행 중에는 {GENERATION_JOBS_POLL_SECONDS:g}초마다 자동 새로고침",
+            value=True,
+            key="gen_jobs_auto_refresh",
+            disabled=not active,
+        )
+    with col_clean:
+        if st.button("🧹 끝난 작업 정리", key="gen_jobs_clean_btn", use_container_width=True):
+            for job in jobs:
+                if job["status"] not in ACTIVE_JOB_STATUSES and job.get("saved"):
+                    delete_generation_job(get_generation_jobs_dir(), job["id"])
+            st.rerun()
+    return active and auto_refresh
+
+def render_generation_result(result, mode, saved_count):
+    """완료된 생성 결과: 저장 통계, 미리보기, JSON 다운로드, 바로 풀기"""
+    st.success(f"✅ **{saved_count}개 문제** 생성 및 저장 완료!")
+    show_near_duplicate_report()
+
+    # 통계 업데이트
+    stats = get_question_stats()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("저장된 객관식", stats["total_text"], delta="+" + str(saved_count) if "객관식" in mode else None)
+    with col2:
+        st.metric("저장된 빈칸/단답/서술", stats["total_cloze"], delta="+" + str(saved_count) if mode != MODE_MCQ else None)
+
+    st.markdown("---")
+
+    # 미리보기
+    with st.expander("📋 생성된 문제 미리보기 (상위 5개)", expanded=True):
+        if not result:
+            st.warning("파싱된 문제가 없습니다.")
+        else:
+            st.info(f"전체: {len(result)}개 | 저장됨: {saved_count}개")
+            for i, item_data in enumerate(result[:5], 1):
+                if item_data.get('type') == 'mcq':
+                    st.markdown(f"**문제 {i}** (객관식)")
+                    st.write(f"**문항:** {item_data.get('problem', '')[:150]}...")
+                    st.write(f"**선지:** {', '.join(item_data.get('options', [])[:3])}...")
+                    st.write(f"**정답:** {item_data.get('answer', '?')} 번")
+                else:
+                    resp_type = item_data.get("response_type", "cloze")
+                    label = "빈칸" if resp_type == "cloze" else ("단답형" if resp_type == "short" else "서술형")
+                    st.markdown(f"**문제 {i}** ({label})")
+                    st.write(f"**내용:** {item_data.get('front', '')[:150]}...")
+                    st.write(f"**정답:** {item_data.get('answer', '?')}")
+                st.divider()
+
+    # 다운로드 - 구조화된 JSON으로 다운로드
+    download_data = json.dumps(result, ensure_ascii=False, indent=2)
+    st.download_button(
+        label="📥 JSON으로 다운로드",
+        data=download_data,
+        file_name="questions.json",
+        mime="application/json",
+        use_container_width=True,
+        key="download_generated_json"
+    )
+    quick_exam_type = "객관식" if mode == MODE_MCQ else "빈칸"
+    st.markdown("### 바로 풀기")
+    st.caption("아래에서 생성 결과를 즉시 시험/학습 세션으로 바꿔볼 수 있습니다.")
+    col_a, col_b, col_c = st.columns([1, 1, 1])
+    with col_a:
+        if st.button("📝 시험모드 바로 시작", key="start_gen_exam_now", use_container_width=True):
+            started = start_exam_session_from_items(result, quick_exam_type, "시험모드")
+            if started:
+                st.session_state.last_action_notice = f"생성 문항 {started}개로 시험 모드 세션이 준비됐습니다. 실전 시험 탭에서 이어서 진행하세요."
+                st.session_state.exam_mode_entry_anchor = "시험"
+                st.rerun()
+    with col_b:
+        if st.button("📖 학습모드 바로 시작", key="start_gen_study_now", use_container_width=True):
+            started = start_exam_session_from_items(result, quick_exam_type, "학습모드")
+            if started:
+                st.session_state.last_action_notice = f"생성 문항 {started}개로 학습 모드 세션이 준비됐습니다. 실전 시험 탭에서 이어서 진행하세요."
+                st.session_state.exam_mode_entry_anchor = "학습"
+                st.rerun()
+    with col_c:
+        if st.button("🔁 즉시 재생성", key="regen_generated", use_container_width=True):
+            st.session_state.generation_failure = "원문/모드/옵션으로 재생성하려면 실패 알림의 재실행 버튼을 이용하거나 위 조건에서 다시 생성해주세요."
+            st.rerun()
+
 # ============================================================================
 # 사이드바 설정
 # ============================================================================
@@ -4856,6 +6761,7 @@ with st.sidebar:
         if is_admin_user():
             st.caption("운영자 권한: 활성")
         if st.button("로그아웃", key="auth_logout_btn"):
+            commit_review_buffer()
             reset_runtime_state_for_auth_change()
             st.session_state.auth_user_id = ""
             st.session_state.auth_access_token = ""
@@ -4889,13 +6795,22 @@ with st.sidebar:
             st.session_state.openai_api_key = st.text_input("OpenAI API Key 입력", type="password")
 
         st.markdown("---")
-        st.session_state.chunk_size = st.slider("청크 크기 (문자 수)", 2000, 30000, 8000, 500)
-        st.session_state.overlap = st.slider("청크 중첩 (문자 수)", 0, 5000, 500, 100)
+        st.session_state.chunk_size = st.slider("청크 크기 (문자 수)", 2000, 30000, 8000, 500, help="페이지/슬라이드/문단을 자르지 않고 이 크기까지 묶습니다.")
+        st.session_state.overlap = st.slider("청크 중첩 (문자 수)", 0, 5000, 0, 100, help="직전 청크의 마지막 페이지/문단이 이 크기 이하면 다음 청크 앞에 다시 붙입니다. 중첩분은 두 번 과금됩니다.")
 
         st.markdown("---")
         st.subheader("⚙️ 필터링 옵션")
         st.session_state.enable_filter = st.checkbox("품질 필터 사용", value=True)
         st.session_state.min_length = st.slider("최소 문자 수", 10, 200, 30)
+        st.session_state.near_dup_enabled = st.checkbox("유사 중복 문항 검사", value=True)
+        if st.session_state.near_dup_enabled:
+            st.session_state.near_dup_threshold = st.slider("유사도 기준 (Jaccard)", 0.5, 0.95, DEFAULT_NEAR_DUPLICATE_THRESHOLD, 0.05)
+            st.session_state.near_dup_action = st.radio(
+                "유사 중복 처리",
+                ["skip", "report"],
+                format_func=lambda v: "건너뛰기" if v == "skip" else "저장 후 표시만",
+                horizontal=True,
+            )
         st.session_state.auto_tag_enabled = st.checkbox("자동 난이도/카테고리 태깅", value=True)
         st.session_state.explanation_default = st.checkbox("해설 기본 열기", value=st.session_state.explanation_default)
     else:
@@ -4910,7 +6825,7 @@ ai_model = st.session_state.get("ai_model", "🔵 Google Gemini")
 api_key = st.session_state.get("api_key")
 openai_api_key = st.session_state.get("openai_api_key")
 chunk_size = st.session_state.get("chunk_size", 8000)
-overlap = st.session_state.get("overlap", 500)
+overlap = st.session_state.get("overlap", 0)
 enable_filter = st.session_state.get("enable_filter", True)
 min_length = st.session_state.get("min_length", 30)
 auto_tag_enabled = st.session_state.get("auto_tag_enabled", True)
@@ -4929,6 +6844,10 @@ if not st.session_state.get("auth_user_id"):
     render_auth_landing_page()
     st.stop()
 
+# 백그라운드 생성 작업: 끊긴 작업을 이어 받고 끝난 작업의 결과를 저장 (어느 페이지에서든)
+resume_generation_jobs(api_key, openai_api_key)
+sync_generation_jobs()
+
 def get_main_page_config(admin_mode):
     pages = [
         ("home", "🏠 홈"),
@@ -4958,11 +6877,15 @@ active_page = label_to_page.get(active_label, "home")
 if active_page == "home":
     st.title("🏠 홈")
     show_action_notice()
+    home_started = time.perf_counter()
 
-    stats = get_question_stats()
     bank = load_questions()
     all_questions = bank.get("text", []) + bank.get("cloze", [])
-    acc = compute_overall_accuracy(all_questions)
+    facets = get_facet_index(bank)
+    # 문항 수/정답률/오답/히트맵은 한 번 순회한 집계에서 꺼냄 (revision 단위 캐시)
+    dashboard = get_dashboard_snapshot(bank)
+    stats = {"total_text": dashboard["total_text"], "total_cloze": dashboard["total_cloze"]}
+    acc = dashboard_overall_accuracy(dashboard)
     acc_text = f"{acc['accuracy']:.1f}%" if acc else "—"
 
     if not st.session_state.get("theme_enabled"):
@@ -5001,7 +6924,7 @@ if active_page == "home":
     st.markdown("---")
     st.subheader("빠른 시작 (분과/단원)")
     if all_questions:
-        quick_subject_unit_map = collect_subject_unit_map(all_questions)
+        quick_subject_unit_map = facet_subject_unit_map(facets)
         quick_subjects_all = sorted(quick_subject_unit_map.keys())
         quick_subjects = st.multiselect(
             "학습할 분과",
@@ -5034,7 +6957,10 @@ if active_page == "home":
         quick_mode = st.radio("모드", ["시험모드", "학습모드"], horizontal=True, key="home_quick_mode")
         quick_type = st.selectbox("문항 유형", ["객관식", "빈칸"], key="home_quick_type")
 
-        filtered = filter_questions_by_subject_unit_hierarchy(all_questions, quick_subjects, quick_unit_filter)
+        filtered = select_questions(
+            {"subject_units": {s: quick_unit_filter.get(s) or [] for s in quick_subjects}},
+            bank=bank,
+        )
         if filtered:
             quick_max = min(50, len(filtered))
             quick_min = 1 if quick_max < 5 else 5
@@ -5064,8 +6990,8 @@ if active_page == "home":
     st.markdown("---")
     st.subheader("분과/단원 한눈에 보기")
     if all_questions:
-        subject_overview = summarize_subject_review_status(all_questions)
-        subject_unit_map = collect_subject_unit_map(all_questions)
+        subject_overview = summarize_subject_review_status_from_index(facets)
+        subject_unit_map = facet_subject_unit_map(facets)
         subject_rows = []
         for row in subject_overview:
             subj = row.get("분과", "General")
@@ -5084,18 +7010,18 @@ if active_page == "home":
 
     st.markdown("---")
     st.subheader("학습 대시보드")
-    wrong_items, total_wrong = get_wrong_note_stats(all_questions)
+    wrong_count = dashboard["wrong_items"]
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("오답 누적 문항", len(wrong_items))
+        st.metric("오답 누적 문항", wrong_count)
     with col2:
-        st.metric("오답 누적 횟수", total_wrong)
+        st.metric("오답 누적 횟수", dashboard["wrong"])
     with col3:
         st.metric("전체 문항", len(all_questions))
 
     # 오답노트 필터
-    subjects_all = sorted({(q.get("subject") or "General") for q in all_questions}) if all_questions else []
-    diffs_all = sorted({(q.get("difficulty") or "미지정") for q in all_questions}) if all_questions else []
+    subjects_all = facet_subjects(facets) if all_questions else []
+    diffs_all = facet_values(facets, "difficulty") if all_questions else []
     sel_subjects = st.multiselect("오답노트 분과 필터", subjects_all, default=subjects_all)
     sel_diffs = st.multiselect("오답노트 난이도 필터", diffs_all, default=diffs_all)
     st.session_state.wrong_priority = st.selectbox(
@@ -5110,13 +7036,18 @@ if active_page == "home":
         )
         st.session_state.wrong_weight_count = 1.0 - st.session_state.wrong_weight_recent
         st.caption(f"오답 횟수 가중치: {st.session_state.wrong_weight_count:.2f}")
-    filtered_wrong = [
-        q for q in wrong_items
-        if (q.get("subject") or "General") in sel_subjects
-        and (q.get("difficulty") or "미지정") in sel_diffs
-    ]
+    # 오답 문항만 facet index의 wrong 비트셋으로 꺼내므로 정답만 있는 문항 수와 무관
+    filtered_wrong = select_questions(
+        {"wrong": True, "subject": sel_subjects, "difficulty": sel_diffs}, bank
+    ) if wrong_count else []
 
     if filtered_wrong:
+        wrong_related_k = st.selectbox(
+            "오답마다 비슷한 문항 함께 풀기",
+            [0, 1, 2, 3],
+            format_func=lambda n: "사용 안 함" if n == 0 else f"{n}개",
+            key="wrong_related_k",
+        )
         if st.button("📌 오답노트 세션 준비", use_container_width=True, key="prepare_wrong_session"):
             # 오답 문항으로 학습 세션 준비 (실전 시험 탭에서 진행)
             parsed_selected = []
@@ -5124,7 +7055,10 @@ if active_page == "home":
                 filtered_wrong,
                 mode=st.session_state.wrong_priority,
                 weight_recent=st.session_state.wrong_weight_recent,
-                weight_count=st.session_state.wrong_weight_count
+                weight_count=st.session_state.wrong_weight_count,
+                related_k=wrong_related_k,
+                bank=bank,
+                limit=50,
             ):
                 if raw.get("type") == "cloze":
                     parsed_selected.append(parse_cloze_content(raw))
@@ -5149,7 +7083,7 @@ if active_page == "home":
 
     if all_questions:
         with st.expander("📊 분과별 복습 큐(기본 화면)", expanded=False):
-            subject_rows = summarize_subject_review_status(all_questions)
+            subject_rows = summarize_subject_review_status_from_index(facets)
             if subject_rows:
                 safe_dataframe(subject_rows, use_container_width=True, hide_index=True)
     elif not FSRS_AVAILABLE:
@@ -5245,20 +7179,87 @@ if active_page == "home":
             st.rerun()
 
         st.markdown("---")
-        subjects = sorted({(q.get("subject") or "General") for q in all_questions}) if all_questions else []
+        subjects = facet_subjects(get_facet_index()) if all_questions else []
         sel_subjects_del = st.multiselect("분과별 삭제", subjects)
         if sel_subjects_del:
             if st.button("선택 분과 삭제", use_container_width=True, disabled=not confirm):
                 data = load_questions()
-                before_text = len(data.get("text", []))
-                before_cloze = len(data.get("cloze", []))
+                removed = [
+                    q.get("id") for key in ("text", "cloze") for q in data.get(key, [])
+                    if (q.get("subject") or "General") in sel_subjects_del
+                ]
                 data["text"] = [q for q in data.get("text", []) if (q.get("subject") or "General") not in sel_subjects_del]
                 data["cloze"] = [q for q in data.get("cloze", []) if (q.get("subject") or "General") not in sel_subjects_del]
-                save_questions(data)
-                deleted = (before_text - len(data.get("text", []))) + (before_cloze - len(data.get("cloze", [])))
+                save_questions(data, change={"deleted": removed})
+                deleted = len(removed)
                 st.session_state.last_action_notice = f"{deleted}개 문항 삭제됨 (분과: {', '.join(sel_subjects_del)})"
                 st.rerun()
 
+    with st.expander("🧬 유사 중복 색인", expanded=False):
+        st.caption("새 문항 저장 시 기존 문항과 MinHash 서명을 비교합니다. 예전에 저장한 문항은 서명을 한 번 생성해야 비교 대상이 됩니다.")
+        backfill_job = update_near_duplicate_backfill_job()
+        if st.button("🧮 기존 문항 서명 생성", use_container_width=True, key="near_dup_backfill_btn"):
+            ok, msg = start_near_duplicate_backfill_job()
+            (st.info if ok else st.warning)(msg)
+            backfill_job = st.session_state.get("near_duplicate_backfill_job")
+        if isinstance(backfill_job, dict):
+            status = backfill_job.get("status")
+            if status == "running":
+                st.info(f"서명 생성 중… (문항 {backfill_job.get('pending', 0)}개)")
+                if st.button("🔄 상태 새로고침", key="near_dup_refresh_btn"):
+                    st.rerun()
+            elif status == "done":
+                res = backfill_job.get("result") or {}
+                st.success(f"서명 {res.get('applied', 0)}개 반영 / 삭제 문항 {res.get('removed', 0)}개 정리 ({res.get('elapsed_ms', 0) / 1000:.1f}초)")
+            else:
+                st.warning(f"서명 생성 실패: {(backfill_job.get('result') or {}).get('error') or '알 수 없는 오류'}")
+        st.caption(f"색인된 문항: {len(get_near_duplicate_index()['signatures'])}개")
+
+    with st.expander("🧩 중복 문항 정리", expanded=False):
+        st.caption("문제은행 전체를 유사도 기준으로 묶어, 풀이 기록이 가장 많은 문항에 나머지 문항의 통계/FSRS 기록을 합치고 삭제합니다.")
+        cluster_job = update_duplicate_cluster_job()
+        if st.button("🔍 전체 중복 검사", use_container_width=True, key="dup_cluster_btn"):
+            ok, msg = start_duplicate_cluster_job()
+            (st.info if ok else st.warning)(msg)
+            cluster_job = st.session_state.get("duplicate_cluster_job")
+        if isinstance(cluster_job, dict):
+            status = cluster_job.get("status")
+            res = cluster_job.get("result") or {}
+            if status == "running":
+                st.info(f"중복 검사 중… (문항 {cluster_job.get('item_count', 0)}개)")
+                if st.button("🔄 상태 새로고침", key="dup_cluster_refresh_btn"):
+                    st.rerun()
+            elif status == "failed":
+                st.warning(f"중복 검사 실패: {res.get('error') or '알 수 없는 오류'}")
+            elif not res.get("clusters"):
+                st.success(f"중복 문항이 없습니다. ({res.get('elapsed_ms', 0) / 1000:.1f}초)")
+            else:
+                clusters = res["clusters"]
+                st.success(
+                    f"중복 묶음 {len(clusters)}개 / 삭제 대상 {res.get('duplicate_count', 0)}개"
+                    f" ({res.get('elapsed_ms', 0) / 1000:.1f}초, 비교 {res.get('pair_checks', 0)}쌍)"
+                )
+                preview_bank = load_questions()
+                preview_by_id = {q.get("id"): q for key in ("text", "cloze") for q in preview_bank.get(key, [])}
+                rows = []
+                for cluster in clusters[:100]:
+                    keep_q = preview_by_id.get(cluster["keep"]) or {}
+                    for qid, sim in cluster["remove"]:
+                        rows.append({
+                            "남길 문항": (keep_q.get("problem") or keep_q.get("front") or "")[:60],
+                            "삭제 문항": ((preview_by_id.get(qid) or {}).get("problem") or (preview_by_id.get(qid) or {}).get("front") or "")[:60],
+                            "유사도": sim,
+                        })
+                safe_dataframe(rows, use_container_width=True, hide_index=True)
+                if cluster_job.get("bank_revision") != get_bank_revision():
+                    st.caption("검사 이후 문제은행이 바뀌었습니다. 이미 없는 문항은 건너뛰고 병합합니다.")
+                confirm_merge = st.checkbox("중복 병합 확인", key="confirm_dup_merge")
+                if st.button("병합 적용", disabled=not confirm_merge, key="dup_merge_apply_btn"):
+                    merged, removed = apply_duplicate_merge_plan(clusters)
+                    st.session_state.pop("duplicate_cluster_job", None)
+                    st.session_state.last_action_notice = f"중복 묶음 {merged}개 병합, {removed}개 문항 삭제됨"
+                    st.rerun()
+
     with st.expander("🗑️ 객관식 선택 삭제", expanded=False):
         bank_now = load_questions()
         mcq_list = bank_now.get("text", [])
@@ -5269,7 +7270,7 @@ if active_page == "home":
             st.markdown("---")
             subj = st.selectbox(
                 "분과 필터",
-                ["전체"] + sorted({(q.get("subject") or "General") for q in mcq_list})
+                ["전체"] + facet_subjects(get_facet_index(bank_now), qtype="text")
             )
             search = st.text_input("문항 검색", value="")
             filtered = []
@@ -5365,25 +7366,34 @@ if active_page == "home":
         if not source:
             st.info("수정 가능한 문항이 없습니다.")
         else:
-            subjects = sorted({(q.get("subject") or "General") for q in source})
-            subject_filter = st.selectbox("분과 필터", ["전체"] + subjects, key="edit_subject_filter")
+            edit_qtype = "text" if edit_type == "객관식" else "cloze"
+            edit_facets = get_facet_index(bank_edit)
+            edit_unit_map = facet_subject_unit_map(edit_facets, qtype=edit_qtype)
+            subject_filter = st.selectbox("분과 필터", ["전체"] + sorted(edit_unit_map), key="edit_subject_filter")
             unit_filter = st.selectbox(
                 "단원 필터",
-                ["전체"] + sorted({(q.get("unit") or "미분류") for q in source if (q.get("subject") or "General") == subject_filter or subject_filter == "전체"}),
+                ["전체"] + sorted({u for subj, units in edit_unit_map.items() if subject_filter in ("전체", subj) for u in units}),
                 key="edit_unit_filter"
             )
-            keyword = st.text_input("문항 검색", value="", key="edit_keyword")
+            keyword = st.text_input("문항 검색 (본문/선지/해설/메모)", value="", key="edit_keyword")
 
-            candidates = []
-            for q in source:
-                if subject_filter != "전체" and (q.get("subject") or "General") != subject_filter:
-                    continue
-                if unit_filter != "전체" and (q.get("unit") or "미분류") != unit_filter:
-                    continue
-                text = q.get("problem") if edit_type == "객관식" else q.get("front", "")
-                if keyword and keyword.lower() not in (text or "").lower():
-                    continue
-                candidates.append(q)
+            if keyword.strip():
+                # 전문 검색 결과를 관련도 순으로 보여줌
+                source_ids = {id(q) for q in source}
+
+                def _edit_filter(q):
+                    if id(q) not in source_ids:
+                        return False
+                    if subject_filter != "전체" and (q.get("subject") or "General") != subject_filter:
+                        return False
+                    return unit_filter == "전체" or get_unit_name(q) == unit_filter
+
+                candidates = [q for q, _ in search_questions(keyword, limit=200, bank=bank_edit, predicate=_edit_filter)]
+            else:
+                edit_spec = {"type": edit_qtype, "subject": None if subject_filter == "전체" else subject_filter}
+                if unit_filter != "전체":
+                    edit_spec["subject_units"] = {subj: [unit_filter] for subj, units in edit_unit_map.items() if unit_filter in units}
+                candidates = select_questions(edit_spec, bank=bank_edit)
 
             if not candidates:
                 st.info("필터 조건에 맞는 문항이 없습니다.")
@@ -5426,6 +7436,11 @@ if active_page == "home":
                     else:
                         edited_problem = st.text_area("문항", value=selected.get("front", ""), height=180, key=f"edit_front_{selected_id}")
                         edited_answer = st.text_area("정답", value=selected.get("answer", ""), height=80, key=f"edit_answer_cloze_{selected_id}")
+                        edited_accepted = st.text_input(
+                            "허용 답안 (쉼표 구분)",
+                            value=", ".join(selected.get("accepted_answers") or []),
+                            key=f"edit_accepted_{selected_id}",
+                        )
                     edited_explanation = st.text_area(
                         "해설",
                         value=selected.get("explanation", ""),
@@ -5455,6 +7470,7 @@ if active_page == "home":
                         else:
                             patch["front"] = edited_problem
                             patch["answer"] = edited_answer
+                            patch["accepted_answers"] = parse_accepted_answers(edited_accepted)
                         if update_question_by_id(selected_id, patch):
                             st.success("문항이 저장되었습니다.")
                             st.rerun()
@@ -5499,8 +7515,7 @@ if active_page == "home":
                 st.session_state.last_action_notice = "프로필 설정을 저장했습니다."
 
         st.caption("프리셋은 히트맵 구간/색상 등 개인 설정을 저장해두는 기능입니다.")
-        acc = compute_overall_accuracy(all_questions)
-        heat = compute_activity_heatmap(all_questions, days=365)
+        heat = dashboard_heatmap(dashboard, days=365)
         with st.expander("히트맵 구간/색상 설정", expanded=False):
             st.caption("문항 수 구간을 조정하면 색 농도가 바뀝니다.")
             b1 = st.number_input("구간 1 (1회)", min_value=1, value=1)
@@ -5582,6 +7597,9 @@ if active_page == "home":
                 except Exception:
                     safe_dataframe(heat, use_container_width=True, hide_index=True)
 
+    record_debug_timing("홈 렌더", (time.perf_counter() - home_started) * 1000)
+    render_debug_timings()
+
 if active_page == "admin" and admin_mode:
         st.title("🛠️ 운영자 콘솔")
         st.caption("사용자별 API 사용량, 호출 건수, 추정 비용을 확인합니다.")
@@ -5659,10 +7677,25 @@ if active_page == "generate":
     st.markdown("---")
 
     # 파일 업로드
-    uploaded_file = st.file_uploader("강의 자료 업로드", type=["pdf", "docx", "pptx", "hwp"])
+    batch_mode = st.checkbox(
+        "📦 여러 파일 일괄 생성",
+        key="gen_batch_mode",
+        help="한 학기 강의 자료처럼 여러 파일(또는 폴더를 압축한 zip)을 한 번에 올리면 파일마다 과목/단원을 나눠 생성합니다.",
+    )
+    uploaded_file = None
+    uploaded_files = []
+    if batch_mode:
+        uploaded_files = st.file_uploader(
+            "강의 자료 일괄 업로드 (폴더는 zip으로 압축해 올리세요)",
+            type=["pdf", "docx", "pptx", "hwp", "zip"],
+            accept_multiple_files=True,
+            key="gen_batch_upload",
+        ) or []
+    else:
+        uploaded_file = st.file_uploader("강의 자료 업로드", type=["pdf", "docx", "pptx", "hwp"])
     style_file = st.file_uploader("기출문제 스타일 업로드 (선택)", type=["pdf", "docx", "pptx", "hwp", "txt", "tsv", "json"], key="style_upload")
     gen_copyright_ok = render_copyright_ack("gen")
-    if (uploaded_file or style_file) and not gen_copyright_ok:
+    if (uploaded_file or uploaded_files or style_file) and not gen_copyright_ok:
         st.warning("파일 분석/문제 생성을 시작하려면 저작권 확인 체크를 완료하세요.")
     style_text = None
     if style_file and gen_copyright_ok:
@@ -5688,8 +7721,22 @@ if active_page == "generate":
             label = f"혼용 ({pattern})"
         st.caption(f"스타일 자동 감지: 용어 표기 = {label}")
     
-    if uploaded_file:
-        st.info(f"📄 **{uploaded_file.name}** ({uploaded_file.size:,} bytes)")
+    batch_sources = []
+    if uploaded_files:
+        try:
+            batch_sources = get_batch_upload_sources(uploaded_files)
+        except zipfile.BadZipFile as e:
+            st.error(f"zip 파일을 열 수 없습니다: {str(e)}")
+        except ValueError as e:
+            st.error(str(e))
+        if batch_sources:
+            st.info(f"📦 **파일 {len(batch_sources)}개** ({sum(size for _, size, _, _ in batch_sources):,} bytes)")
+        else:
+            st.warning("지원하는 강의 자료(PDF/DOCX/PPTX/HWP)가 없습니다.")
+
+    if uploaded_file or batch_sources:
+        if uploaded_file:
+            st.info(f"📄 **{uploaded_file.name}** ({uploaded_file.size:,} bytes)")
         
         # 생성 설정
         st.markdown("### 설정")
@@ -5697,14 +7744,42 @@ if active_page == "generate":
         with col1:
             mode = st.radio("모드", [MODE_MCQ, MODE_CLOZE, MODE_SHORT, MODE_ESSAY])
         with col2:
-            num_items = st.slider("생성 개수", 1, 50, 10)
+            num_items = st.slider("파일당 생성 개수" if batch_sources else "생성 개수", 1, 50, 10)
         
         # 저장할 과목/단원명
-        col_subj, col_unit = st.columns(2)
-        with col_subj:
-            subject_input = st.text_input("과목명 (예: 순환기내과)", value="General")
-        with col_unit:
-            unit_input = st.text_input("단원명 (선택)", value="미분류")
+        if batch_sources:
+            # 파일마다 과목(zip 안 폴더명, 없으면 기본 과목)/단원(파일명)으로 나눠 저장
+            subject_input = st.text_input("기본 과목명 (zip 안 폴더명이 있으면 폴더명)", value="General")
+            batch_targets = [
+                {"파일": name, "과목": Path(name).parent.name or subject_input, "단원": Path(name).stem}
+                for name, *_ in batch_sources
+            ]
+            if hasattr(st, "data_editor"):
+                batch_targets = st.data_editor(
+                    batch_targets,
+                    use_container_width=True,
+                    hide_index=True,
+                    disabled=["파일"],
+                    key="gen_batch_targets",
+                )
+            else:
+                safe_dataframe(batch_targets, use_container_width=True, hide_index=True)
+        else:
+            col_subj, col_unit = st.columns(2)
+            with col_subj:
+                subject_input = st.text_input("과목명 (예: 순환기내과)", value="General")
+            with col_unit:
+                unit_input = st.text_input("단원명 (선택)", value="미분류")
+        bypass_llm_cache = st.checkbox(
+            "응답 캐시 무시하고 새로 생성",
+            key="gen_bypass_cache",
+            help="같은 자료/설정으로 다시 생성하면 저장된 응답을 재사용해 API를 다시 호출하지 않습니다.",
+        )
+        save_while_streaming = st.checkbox(
+            "도착하는 대로 저장",
+            key="gen_stream_save",
+            help="문항이 완성될 때마다 문제은행에 바로 저장합니다. 생성이 중간에 실패해도 도착한 문항은 남습니다.",
+        )
         
         if not ai_model_key_ready:
             st.button("🚀 문제 생성 시작", use_container_width=True, disabled=True, help="API 키를 먼저 입력해 주세요.")
@@ -5712,105 +7787,65 @@ if active_page == "generate":
             st.button("🚀 문제 생성 시작", use_container_width=True, disabled=True, help="저작권 확인 체크를 완료해 주세요.")
         elif st.button("🚀 문제 생성 시작", use_container_width=True):
             try:
-                with st.spinner("📖 강의 자료 분석 중..."):
-                    raw_text = extract_text_from_file(uploaded_file)
-                    st.caption(f"✅ 추출됨: {len(raw_text):,} 글자")
-                    if not raw_text.strip():
-                        st.error("텍스트 추출 결과가 비어 있습니다. 스캔 PDF 또는 이미지 중심 파일인 경우 OCR/원문 품질을 확인해 주세요.")
-                        st.stop()
-                
-                with st.spinner("⚙️ AI가 문제 생성 중... (1~2분 소요)"):
-                    result = generate_content_in_chunks(
-                        raw_text,
-                        mode,
-                        ai_model,
-                        num_items=num_items,
-                        chunk_size=chunk_size,
-                        overlap=overlap,
-                        api_key=api_key,
-                        openai_api_key=openai_api_key,
-                        style_text=style_text,
-                    )
-                
-                # result는 이제 구조화된 dict 리스트
-                if result and isinstance(result, list) and len(result) > 0:
+                job_params = {
+                    "mode": mode,
+                    "ai_model": ai_model,
+                    "gemini_model_id": get_gemini_model_id(),
+                    "num_items": num_items,
+                    "chunk_size": chunk_size,
+                    "overlap": overlap,
+                    "style_text": style_text,
+                    "use_cache": not bypass_llm_cache,
+                    "save_streamed": bool(save_while_streaming),
+                    "quality_filter": enable_filter,
+                    "min_length": min_length,
+                    "near_dup_threshold": st.session_state.get("near_dup_threshold", DEFAULT_NEAR_DUPLICATE_THRESHOLD),
+                    "near_dup_enabled": bool(st.session_state.get("near_dup_enabled", True)),
+                }
+                if batch_sources:
+                    with st.spinner("📦 일괄 생성 작업 등록 중..."):
+                        upload_files = [(f.name, f.getvalue()) for f in uploaded_files]
+                        batch_jobs, batch_errors = enqueue_generation_batch(
+                            [
+                                {
+                                    "name": source[0],
+                                    "data": read_upload_source(upload_files, source),
+                                    "subject": target["과목"] or subject_input,
+                                    "unit": target["단원"] or "미분류",
+                                }
+                                for source, target in zip(batch_sources, batch_targets)
+                            ],
+                            job_params,
+                        )
+                    for name, error in batch_errors:
+                        st.warning(f"{name}: {error}")
                     st.session_state.generation_failure = ""
-                    st.session_state.generation_preview_items = result
-                    st.session_state.generation_preview_mode = mode
-                    st.session_state.generation_preview_subject = subject_input
-                    st.session_state.generation_preview_unit = unit_input
-
-                    # JSON에 저장
-                    saved_count = add_questions_to_bank(result, mode, subject_input, unit_input, quality_filter=enable_filter, min_length=min_length)
-                    st.success(f"✅ **{saved_count}개 문제** 생성 및 저장 완료!")
-                    
-                    # 통계 업데이트
-                    stats = get_question_stats()
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("저장된 객관식", stats["total_text"], delta="+" + str(saved_count) if "객관식" in mode else None)
-                    with col2:
-                        st.metric("저장된 빈칸/단답/서술", stats["total_cloze"], delta="+" + str(saved_count) if mode != MODE_MCQ else None)
-                    
-                    st.markdown("---")
-                    
-                    # 미리보기
-                    with st.expander("📋 생성된 문제 미리보기 (상위 5개)", expanded=True):
-                        if not result:
-                            st.warning("파싱된 문제가 없습니다.")
-                        else:
-                            st.info(f"전체: {len(result)}개 | 저장됨: {saved_count}개")
-                            for i, item_data in enumerate(result[:5], 1):
-                                if item_data.get('type') == 'mcq':
-                                    st.markdown(f"**문제 {i}** (객관식)")
-                                    st.write(f"**문항:** {item_data.get('problem', '')[:150]}...")
-                                    st.write(f"**선지:** {', '.join(item_data.get('options', [])[:3])}...")
-                                    st.write(f"**정답:** {item_data.get('answer', '?')} 번")
-                                else:
-                                    resp_type = item_data.get("response_type", "cloze")
-                                    label = "빈칸" if resp_type == "cloze" else ("단답형" if resp_type == "short" else "서술형")
-                                    st.markdown(f"**문제 {i}** ({label})")
-                                    st.write(f"**내용:** {item_data.get('front', '')[:150]}...")
-                                    st.write(f"**정답:** {item_data.get('answer', '?')}")
-                                st.divider()
-                    
-                # 다운로드 - 구조화된 JSON으로 다운로드
-                    download_data = json.dumps(result, ensure_ascii=False, indent=2)
-                    st.download_button(
-                        label="📥 JSON으로 다운로드",
-                        data=download_data,
-                        file_name="questions.json",
-                        mime="application/json",
-                        use_container_width=True,
-                        key="download_generated_json"
-                    )
-                    quick_exam_type = "객관식" if mode == MODE_MCQ else "빈칸"
-                    st.markdown("### 바로 풀기")
-                    st.caption("아래에서 생성 결과를 즉시 시험/학습 세션으로 바꿔볼 수 있습니다.")
-                    col_a, col_b, col_c = st.columns([1, 1, 1])
-                    with col_a:
-                        if st.button("📝 시험모드 바로 시작", key="start_gen_exam_now", use_container_width=True):
-                            started = start_exam_session_from_items(result, quick_exam_type, "시험모드")
-                            if started:
-                                st.session_state.last_action_notice = f"생성 문항 {started}개로 시험 모드 세션이 준비됐습니다. 실전 시험 탭에서 이어서 진행하세요."
-                                st.session_state.exam_mode_entry_anchor = "시험"
-                                st.rerun()
-                    with col_b:
-                        if st.button("📖 학습모드 바로 시작", key="start_gen_study_now", use_container_width=True):
-                            started = start_exam_session_from_items(result, quick_exam_type, "학습모드")
-                            if started:
-                                st.session_state.last_action_notice = f"생성 문항 {started}개로 학습 모드 세션이 준비됐습니다. 실전 시험 탭에서 이어서 진행하세요."
-                                st.session_state.exam_mode_entry_anchor = "학습"
-                                st.rerun()
-                    with col_c:
-                        if st.button("🔁 즉시 재생성", key="regen_generated", use_container_width=True):
-                            st.session_state.generation_failure = "원문/모드/옵션으로 재생성하려면 실패 알림의 재실행 버튼을 이용하거나 위 조건에서 다시 생성해주세요."
-                            st.rerun()
+                    resume_generation_jobs(api_key, openai_api_key)
+                    if batch_jobs:
+                        st.success(f"⏳ 파일 {len(batch_jobs)}개의 일괄 생성을 시작했습니다 (아래 생성 작업에서 전체 진행과 남은 시간을 확인하세요)")
                 else:
-                    st.error(f"❌ 생성 실패! 결과를 확인할 수 없습니다.")
-                    st.write(f"반환값: {result}")
-                    st.session_state.generation_failure = "생성 결과가 비어 있어 저장되지 않았습니다."
-                    
+                    # PDF/PPTX/DOCX는 원본을 작업 폴더에 넘기고 추출/OCR은 워커 프로세스가 맡는다
+                    raw_text = None
+                    source_bytes = None
+                    if Path(uploaded_file.name).suffix.lower() in EXTRACTABLE_EXTENSIONS:
+                        source_bytes = uploaded_file.getvalue()
+                    else:
+                        with st.spinner("📖 강의 자료 분석 중..."):
+                            raw_text = extract_text_from_file(uploaded_file)
+                            st.caption(f"✅ 추출됨: {len(raw_text):,} 글자")
+                            if not raw_text.strip():
+                                st.error("텍스트 추출 결과가 비어 있습니다. 스캔 PDF 또는 이미지 중심 파일인 경우 OCR/원문 품질을 확인해 주세요.")
+                                st.stop()
+
+                    job = enqueue_generation_job(raw_text, uploaded_file.name, {
+                        **job_params,
+                        "subject": subject_input,
+                        "unit": unit_input,
+                    }, source_bytes=source_bytes)
+                    st.session_state.generation_failure = ""
+                    st.session_state.generation_last_result = None
+                    resume_generation_jobs(api_key, openai_api_key)
+                    st.success(f"⏳ 생성 작업을 시작했습니다: {job['source_name']} (아래 생성 작업에서 진행 상황을 확인하세요)")
             except Exception as e:
                 import traceback
                 err_msg = f"❌ 오류: {str(e)}"
@@ -5818,8 +7853,18 @@ if active_page == "generate":
                 st.error(f"상세 오류:\n{traceback.format_exc()}")
                 st.session_state.generation_failure = err_msg
 
+    poll_generation_jobs = render_generation_jobs_panel()
+    last_result = st.session_state.get("generation_last_result")
+    if last_result:
+        st.markdown("---")
+        render_generation_result(last_result["items"], last_result["mode"], last_result["saved_count"])
+
     st.markdown("---")
     st.info("기출문제 파일 변환은 **🧾 기출문제 변환** 탭에서 진행합니다.")
+    if poll_generation_jobs:
+        # st.fragment가 없는 버전이라 페이지를 다 그린 뒤 잠시 기다렸다가 다시 실행해 작업 상태를 갱신
+        time.sleep(GENERATION_JOBS_POLL_SECONDS)
+        st.rerun()
 
 # ============================================================================
 # PAGE: 기출문제 변환
@@ -6408,9 +8453,11 @@ if active_page == "convert":
                         subject=exam_subject,
                         unit=exam_unit,
                         quality_filter=enable_filter,
-                        min_length=min_length
+                        min_length=min_length,
+                        near_dup=prepare_near_duplicate_check(),
                     )
                     st.success(f"✅ {added}개 문항 저장 완료")
+                    show_near_duplicate_report()
             with col_down:
                 download_data = json.dumps(items, ensure_ascii=False, indent=2)
                 st.download_button(
@@ -6486,8 +8533,9 @@ if active_page == "exam":
                     key="image_display_width_slider"
                 )
 
-        questions_all = bank["text"] if exam_type == "객관식" else bank["cloze"]
-        subject_unit_map = collect_subject_unit_map(questions_all)
+        exam_qtype = "text" if exam_type == "객관식" else "cloze"
+        questions_all = bank[exam_qtype]
+        subject_unit_map = facet_subject_unit_map(get_facet_index(bank), qtype=exam_qtype)
         all_subjects = sorted(subject_unit_map.keys())
         if all_subjects:
             subject_keyword = st.text_input("분과 검색", value="", placeholder="분과명 입력", key="exam_subject_search")
@@ -6531,18 +8579,23 @@ if active_page == "exam":
             else:
                 unit_filter_by_subject = {}
                 selected_units = []
-            filtered_questions = filter_questions_by_subject_unit_hierarchy(questions_all, selected_subjects, unit_filter_by_subject)
+            exam_filter_spec = {
+                "type": exam_qtype,
+                "subject_units": {s: unit_filter_by_subject.get(s) or [] for s in selected_subjects},
+            }
+            filtered_questions = select_questions(exam_filter_spec, bank=bank)
         else:
             selected_subjects = []
             selected_units = []
+            exam_filter_spec = None
             filtered_questions = []
 
 
         if mode_choice == "학습모드":
             due_only = st.checkbox("오늘 복습만", value=False)
             st.session_state.auto_next = st.checkbox("자동 다음 문제", value=st.session_state.auto_next)
-            if due_only:
-                filtered_questions = [q for q in filtered_questions if srs_due(q)]
+            if due_only and exam_filter_spec:
+                filtered_questions = select_questions({**exam_filter_spec, "due": True}, bank=bank)
             if not FSRS_AVAILABLE:
                 st.info("FSRS 미설치: 기본 복습 주기(SRS)로 동작합니다.")
         else:
@@ -6565,6 +8618,30 @@ if active_page == "exam":
                             with col4:
                                 st.metric("신규", stats["new"])
 
+                        fc_col1, fc_col2 = st.columns([1, 1])
+                        with fc_col1:
+                            forecast_days = st.radio("복습 예측 기간", list(FORECAST_HORIZONS), index=1, horizontal=True, key="fsrs_forecast_days", format_func=lambda d: f"{d}일")
+                        with fc_col2:
+                            forecast_simulate = st.checkbox("기간 내 재복습 포함(Good 가정)", value=False, key="fsrs_forecast_simulate")
+                        forecast = get_review_forecast(days=forecast_days, simulate=forecast_simulate)
+                        forecast_subjects = {q.get("subject") or "General" for q in filtered_questions}
+                        forecast_rows = []
+                        for day_idx, day_label in enumerate(forecast["dates"]):
+                            row = {"날짜": day_label}
+                            for subj, counts in forecast["subjects"].items():
+                                if subj in forecast_subjects:
+                                    row[subj] = counts[day_idx]
+                            forecast_rows.append(row)
+                        if forecast_rows and len(forecast_rows[0]) > 1:
+                            try:
+                                import pandas as pd
+
+                                st.bar_chart(pd.DataFrame(forecast_rows).set_index("날짜"))
+                            except Exception:
+                                st.caption(f"향후 {forecast_days}일 복습 예정: {sum(forecast['total'])}건")
+                            with st.expander("일자별 복습 예정(분과별)", expanded=False):
+                                safe_dataframe(forecast_rows, use_container_width=True, hide_index=True)
+
                         due_list = get_fsrs_queue(filtered_questions, limit=20)
                         if not due_list:
                             st.info("오늘 복습할 문항이 없습니다.")
@@ -6638,7 +8715,7 @@ if active_page == "exam":
                             steps = [s.strip() for s in learning_steps_text.split(",") if s.strip()]
                             relearn_steps = [s.strip() for s in relearning_steps_text.split(",") if s.strip()]
                             try:
-                                params = json.loads(params_text) if advanced and params_text else list(FSRS_DEFAULT_PARAMETERS)
+                                params = json.loads(params_text if advanced and params_text else st.session_state.fsrs_params_text)
                                 if not isinstance(params, list) or len(params) < 10:
                                     params = list(FSRS_DEFAULT_PARAMETERS)
                             except Exception:
@@ -6670,6 +8747,34 @@ if active_page == "exam":
                             st.session_state.fsrs_params_text = json.dumps(settings["parameters"])
                             st.success("FSRS 기본값으로 초기화했습니다.")
 
+                    st.markdown("**개인화 파라미터 최적화**")
+                    st.caption("누적된 복습 기록으로 FSRS 파라미터를 맞춥니다. 별도 프로세스에서 실행되어 화면을 막지 않습니다.")
+                    optimizer_job = update_fsrs_optimizer_job()
+                    if st.button("🧮 복습 기록으로 최적화", use_container_width=True, key="fsrs_optimize_btn"):
+                        ok, msg = start_fsrs_optimizer_job()
+                        (st.info if ok else st.warning)(msg)
+                        optimizer_job = st.session_state.get("fsrs_optimizer_job")
+                    if isinstance(optimizer_job, dict):
+                        status = optimizer_job.get("status")
+                        if status == "running":
+                            st.info(f"최적화 진행 중… (복습 기록 {optimizer_job.get('review_count', 0)}건)")
+                            if st.button("🔄 상태 새로고침", key="fsrs_optimize_refresh_btn"):
+                                st.rerun()
+                        else:
+                            fit = optimizer_job.get("result") or {}
+                            if status == "done":
+                                loss_before = fit.get("loss_before")
+                                loss_after = fit.get("loss_after")
+                                loss_text = ""
+                                if loss_after is not None:
+                                    loss_text = f" | 손실 {loss_before:.4f} → {loss_after:.4f}" if loss_before is not None else f" | 손실 {loss_after:.4f}"
+                                st.success(
+                                    f"최적화 완료: 복습 {fit.get('review_count', 0)}건 / 카드 {fit.get('card_count', 0)}개"
+                                    f" / {fit.get('elapsed_ms', 0) / 1000:.1f}초{loss_text}"
+                                )
+                            else:
+                                st.warning(f"최적화 실패: {fit.get('error') or '알 수 없는 오류'}")
+
             with st.expander("📈 복습 리포트", expanded=False):
                 show_report = st.checkbox("리포트 표시", value=False, key="show_fsrs_report")
                 if show_report:
@@ -6723,13 +8828,14 @@ if active_page == "exam":
                 if export_randomize:
                     export_seed = st.number_input("랜덤 시드", min_value=0, value=42, step=1, key="export_random_seed")
                 if export_subjects:
-                    export_candidates = collect_export_questions(
-                        questions_all,
+                    export_candidates = select_export_questions(
+                        exam_qtype,
                         export_subjects,
                         export_unit_filter_by_subject,
                         include_all_units=export_include_all_units,
                         randomize=export_randomize,
-                        random_seed=export_seed
+                        random_seed=export_seed,
+                        bank=bank,
                     )
                 else:
                     export_candidates = []
@@ -6795,6 +8901,7 @@ if active_page == "exam":
                 }
 
         # 시험/학습 진행
+        maybe_commit_review_buffer()
         if st.session_state.exam_started and st.session_state.exam_questions:
             exam_qs = st.session_state.exam_questions
             idx = st.session_state.current_question_idx
@@ -6826,8 +8933,9 @@ if active_page == "exam":
                                 continue
                             user_ans = st.session_state.user_answers[i]
                             is_correct = is_answer_correct(q, user_ans)
-                            update_question_stats(q["id"], is_correct)
+                            record_review_event(q["id"], is_correct=is_correct)
                             st.session_state.graded_questions.add(q.get("id"))
+                    commit_review_buffer()
                     st.session_state.exam_stats_applied = True
 
                 # 시험 기록 저장 (시험모드만)
@@ -6880,6 +8988,7 @@ if active_page == "exam":
 
                 # 상세 보기
                 letters = ['A', 'B', 'C', 'D', 'E']
+                result_bank = load_questions() if wrong_indices else None
                 for i, q in enumerate(exam_qs, 1):
                     user_ans = st.session_state.user_answers.get(i - 1, None)
                     is_correct = False
@@ -6900,7 +9009,7 @@ if active_page == "exam":
                             ai_grade = q.get("_ai_grade") if isinstance(q.get("_ai_grade"), dict) else {}
                             is_correct = bool(ai_grade.get("is_correct", False))
                         else:
-                            is_correct = fuzzy_match(user_ans, correct_text) if user_ans and correct_text else False
+                            is_correct = grade_short_answer(q, user_ans) if user_ans else False
                         user_ans_display = user_ans if user_ans else "응답 없음"
 
                     status_icon = "✅" if is_correct else "❌"
@@ -6936,6 +9045,13 @@ if active_page == "exam":
                             st.caption(f"단원: {q.get('unit')}")
                         if q.get("difficulty"):
                             st.caption(f"난이도: {q.get('difficulty', '?')}")
+                        if q.get("id") and not is_correct:
+                            related = find_related_questions(q, k=3, bank=result_bank)
+                            if related:
+                                st.markdown("**🔗 비슷한 문항**")
+                                for rq, sim in related:
+                                    title = (rq.get("problem") or rq.get("front") or "")[:80]
+                                    st.caption(f"{title} · {rq.get('subject') or 'General'} · 유사도 {sim:.2f}")
                         if q.get("id"):
                             note_key = f"review_note_{i}"
                             st.text_area("메모", value=q.get("note", ""), key=note_key, height=80)
@@ -6947,8 +9063,18 @@ if active_page == "exam":
 
                 # 오답노트
                 if wrong_indices:
+                    retry_related = st.checkbox("비슷한 문항도 함께 풀기", value=False, key="retry_with_related")
                     if st.button("📌 오답노트로 다시 풀기"):
                         wrong_qs = [exam_qs[i] for i in wrong_indices]
+                        if retry_related:
+                            seen_ids = {q.get("id") for q in wrong_qs if q.get("id")}
+                            with_related = []
+                            for q in wrong_qs:
+                                with_related.append(q)
+                                for rq, _ in find_related_questions(q, k=2, bank=result_bank, exclude_ids=seen_ids):
+                                    seen_ids.add(rq.get("id"))
+                                    with_related.append(parse_cloze_content(rq) if rq.get("type") == "cloze" else parse_mcq_content(rq))
+                            wrong_qs = with_related
                         st.session_state.exam_questions = wrong_qs
                         st.session_state.user_answers = {}
                         st.session_state.current_question_idx = 0
@@ -7145,7 +9271,7 @@ if active_page == "exam":
                                                 st.warning(f"AI 채점 실패: {err}")
                                     is_correct = bool(isinstance(q.get("_ai_grade"), dict) and q["_ai_grade"].get("is_correct"))
                                 else:
-                                    is_correct = fuzzy_match(st.session_state.user_answers[idx], correct_text) if correct_text else False
+                                    is_correct = grade_short_answer(q, st.session_state.user_answers[idx])
                                 correct_display = correct_text
 
                             answer_color = "🟢" if is_correct else "🔴"
@@ -7160,7 +9286,7 @@ if active_page == "exam":
                                     st.info("서술형은 AI 채점 실행 후 정오 판정이 반영됩니다.")
                             # 학습모드 통계 업데이트 (1회)
                             if q.get("id") and q.get("id") not in st.session_state.graded_questions:
-                                update_question_stats(q["id"], is_correct)
+                                record_review_event(q["id"], is_correct=is_correct)
                                 st.session_state.graded_questions.add(q.get("id"))
                             explanation_text = q.get("explanation") or q.get("rationale") or q.get("analysis") or ""
                             show_exp = st.checkbox("해설 보기", value=st.session_state.explanation_default, key=f"learn_exp_{idx}")
@@ -7199,29 +9325,17 @@ if active_page == "exam":
                                 st.markdown("**복습 평가**")
                                 cols = st.columns(4)
                                 if cols[0].button("Again", key=f"srs_again_{idx}"):
-                                    rating = Rating.Again if FSRS_AVAILABLE else "Again"
-                                    srs = apply_srs_rating(q["id"], rating)
-                                    if srs:
-                                        q["fsrs"] = srs if FSRS_AVAILABLE else q.get("fsrs")
-                                        st.success(f"다음 복습: {srs.get('due')}")
+                                    record_review_event(q["id"], rating="Again")
+                                    st.success("복습 평가 기록: Again (세션 종료 시 일괄 반영)")
                                 if cols[1].button("Hard", key=f"srs_hard_{idx}"):
-                                    rating = Rating.Hard if FSRS_AVAILABLE else "Hard"
-                                    srs = apply_srs_rating(q["id"], rating)
-                                    if srs:
-                                        q["fsrs"] = srs if FSRS_AVAILABLE else q.get("fsrs")
-                                        st.success(f"다음 복습: {srs.get('due')}")
+                                    record_review_event(q["id"], rating="Hard")
+                                    st.success("복습 평가 기록: Hard (세션 종료 시 일괄 반영)")
                                 if cols[2].button("Good", key=f"srs_good_{idx}"):
-                                    rating = Rating.Good if FSRS_AVAILABLE else "Good"
-                                    srs = apply_srs_rating(q["id"], rating)
-                                    if srs:
-                                        q["fsrs"] = srs if FSRS_AVAILABLE else q.get("fsrs")
-                                        st.success(f"다음 복습: {srs.get('due')}")
+                                    record_review_event(q["id"], rating="Good")
+                                    st.success("복습 평가 기록: Good (세션 종료 시 일괄 반영)")
                                 if cols[3].button("Easy", key=f"srs_easy_{idx}"):
-                                    rating = Rating.Easy if FSRS_AVAILABLE else "Easy"
-                                    srs = apply_srs_rating(q["id"], rating)
-                                    if srs:
-                                        q["fsrs"] = srs if FSRS_AVAILABLE else q.get("fsrs")
-                                        st.success(f"다음 복습: {srs.get('due')}")
+                                    record_review_event(q["id"], rating="Easy")
+                                    st.success("복습 평가 기록: Easy (세션 종료 시 일괄 반영)")
 
                     # 학습모드 자동 다음 문제
                     if st.session_state.exam_mode == "학습모드" and st.session_state.auto_next:
@@ -0,0 +1,30 @@
+import ast
+import types
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parents[1] / "app.py"
+
+
+class SessionState(dict):
+    def __getattr__(self, key):
+        return self.get(key)
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def load_app_functions(names, extra=None):
+    """app.py에서 지정한 함수만 추출해 Streamlit 없이 실행 가능한 네임스페이스로 로드"""
+    source = APP_PATH.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(APP_PATH))
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    missing = sorted(wanted - {node.name for node in selected})
+    if missing:
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {"st": types.SimpleNamespace(session_state=SessionState())}
+    namespace.update(extra or {})
+    exec(compile(module, str(APP_PATH), "exec"), namespace)
+    return namespace
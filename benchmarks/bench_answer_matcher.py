@@ -0,0 +1,140 @@
+"""단답/빈칸 채점: 기존 SequenceMatcher 방식과 비트 병렬 편집 거리 매처 비교
+
+매처는 정규화 편집 거리로 판정하고 두 기준이 갈릴 수 있는 구간에서만 SequenceMatcher를 부르므로,
+그 호출 비율과 기존 채점과의 일치율을 함께 출력한다.
+
+실행: python benchmarks/bench_answer_matcher.py [--bank users/<id>/questions.json] [--rounds 20]
+--bank를 주면 실제 문제은행의 빈칸 정답을, 없으면 내장 의학 용어 목록을 사용한다.
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.services import answer_matcher  # noqa: E402
+from src.services.answer_matcher import build_answer_keys, match_answer  # noqa: E402
+
+SAMPLE_ANSWERS = [
+    "심근경색", "급성 췌장염", "갑상선기능항진증", "Addison disease", "Cushing syndrome", "폐색전증",
+    "대동맥 박리", "신증후군", "사구체신염", "만성폐쇄성폐질환", "Kawasaki disease", "Guillain-Barré syndrome",
+    "베타차단제", "ACE inhibitor", "안지오텐신 수용체 차단제", "metformin", "insulin glargine", "heparin",
+    "좌심실 비대", "ST분절 상승", "Troponin I", "HbA1c", "BNP", "procalcitonin", "요추천자",
+    "Streptococcus pneumoniae", "Mycoplasma pneumoniae", "Helicobacter pylori", "결핵균", "대장균",
+    "Wernicke encephalopathy", "부신피질 자극호르몬", "항이뇨호르몬 부적절 분비 증후군", "저나트륨혈증",
+    "고칼륨혈증", "대사성 산증", "호흡성 알칼리증", "혈소판 감소증", "철결핍성 빈혈", "거대적아구성 빈혈",
+]
+
+
+def legacy_fuzzy_match(user_answer, correct_answer, threshold=0.8):
+    """변경 전 app.fuzzy_match (비교 기준)"""
+    user_clean = re.sub(r'[^\w가-힣]', '', str(user_answer).lower())
+    correct_clean = re.sub(r'[^\w가-힣]', '', correct_answer.lower())
+    if user_clean == correct_clean:
+        return True
+    ratio = SequenceMatcher(None, user_clean, correct_clean).ratio()
+    return ratio >= threshold
+
+
+def load_answers(bank_path):
+    if not bank_path:
+        return SAMPLE_ANSWERS
+    with open(bank_path, encoding="utf-8") as f:
+        bank = json.load(f)
+    answers = [str(q.get("answer") or "").strip() for q in bank.get("cloze", [])]
+    return [a for a in answers if a] or SAMPLE_ANSWERS
+
+
+def make_attempts(answers, seed=3):
+    """정답 그대로 / 띄어쓰기·대소문자 변형 / 오타(바꿈) 1~2개 / 글자 빠짐·추가 1~2개 / 접두·접미어 / 전혀 다른 답"""
+    rng = random.Random(seed)
+    attempts = []
+    for answer in answers:
+        attempts.append((answer, answer))
+        attempts.append((answer, answer.upper().replace(" ", "")))
+        chars = list(answer)
+        for _ in range(rng.choice([1, 2])):
+            i = rng.randrange(len(chars))
+            chars[i] = rng.choice("가나다라abcde")
+        attempts.append((answer, "".join(chars)))
+        chars = list(answer)
+        for _ in range(rng.choice([1, 2])):
+            if len(chars) > 1:
+                del chars[rng.randrange(len(chars))]
+        attempts.append((answer, "".join(chars)))
+        chars = list(answer)
+        for _ in range(rng.choice([1, 2])):
+            chars.insert(rng.randrange(len(chars) + 1), rng.choice("가나다라abcde1"))
+        attempts.append((answer, "".join(chars)))
+        attempts.append((answer, rng.choice(["급성 ", "만성 "]) + answer))
+        attempts.append((answer, answer + rng.choice(["증", "I", "1"])))
+        attempts.append((answer, rng.choice(answers)))
+    return attempts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bank", default="")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    answers = load_answers(args.bank)
+    attempts = make_attempts(answers)
+    keys = {answer: build_answer_keys(answer) for answer in answers}
+    print(f"answers={len(answers)} attempts={len(attempts)} rounds={args.rounds}")
+
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        legacy = [legacy_fuzzy_match(user, answer) for answer, user in attempts]
+    legacy_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        fast = [match_answer(user, keys[answer]) for answer, user in attempts]
+    fast_s = time.perf_counter() - started
+
+    fallback = []
+
+    class _CountingMatcher(SequenceMatcher):
+        def ratio(self):
+            fallback.append(1)
+            return super().ratio()
+
+    answer_matcher.SequenceMatcher = _CountingMatcher
+    try:
+        for answer, user in attempts:
+            match_answer(user, keys[answer])
+    finally:
+        answer_matcher.SequenceMatcher = SequenceMatcher
+
+    per_call = 1e6 / (len(attempts) * args.rounds)
+    agree = sum(1 for a, b in zip(legacy, fast) if a == b) / len(attempts)
+    print(f"legacy SequenceMatcher: {legacy_s * per_call:.1f} us/answer")
+    print(f"bit-parallel matcher:   {fast_s * per_call:.1f} us/answer ({legacy_s / fast_s:.1f}x)")
+    disagreements = [(answer, user) for (answer, user), a, b in zip(attempts, legacy, fast) if a != b]
+    print(f"agreement: {agree:.1%} ({len(attempts) - len(disagreements)}/{len(attempts)})")
+    print(f"SequenceMatcher fallback: {len(fallback) / len(attempts):.1%} of answers ({len(fallback)}/{len(attempts)})")
+    for answer, user in disagreements[:10]:
+        print(f"  differs: {answer!r} <- {user!r}")
+
+    long_answer = "좌심실 박출률이 감소한 심부전 환자에서 사망률을 낮추는 약물 " * 6
+    long_user = long_answer.replace("감소", "저하", 2)
+    long_keys = build_answer_keys(long_answer)
+    started = time.perf_counter()
+    for _ in range(200):
+        legacy_fuzzy_match(long_user, long_answer)
+    legacy_long = (time.perf_counter() - started) / 200
+    started = time.perf_counter()
+    for _ in range(200):
+        match_answer(long_user, long_keys)
+    fast_long = (time.perf_counter() - started) / 200
+    print(f"long answer ({len(long_answer)} chars): legacy {legacy_long * 1e6:.0f} us, matcher {fast_long * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
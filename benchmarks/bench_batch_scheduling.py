@@ -0,0 +1,64 @@
+"""일괄 생성 스케줄링 비교: 파일 하나씩 vs 한꺼번에(FIFO) vs 한꺼번에(파일별 번갈아)
+
+가상 LLM 호출(고정 지연)로 전체 소요 시간과 파일별 완료 시각을 잰다.
+실행: python benchmarks/bench_batch_scheduling.py [--files 12] [--big-chunks 40] [--chunks 4] [--latency 0.05] [--concurrency 8]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.services.generation_engine import GenerationEngine  # noqa: E402
+
+
+def _tasks(file_idx, count, latency, grouped):
+    def call():
+        time.sleep(latency)
+        return "문항"
+
+    return [{"provider": "openai", "group": file_idx if grouped else None, "call": call} for _ in range(count)]
+
+
+def run(strategy, sizes, latency, concurrency):
+    engine = GenerationEngine(limits={"openai": {"concurrency": concurrency, "rpm": 10**6, "tpm": 10**9}})
+    started = time.perf_counter()
+    finished = {}
+    if strategy == "serial":
+        for idx, count in enumerate(sizes):
+            engine.submit(_tasks(idx, count, latency, False)).result()
+            finished[idx] = time.perf_counter() - started
+    else:
+        futures = [engine.submit(_tasks(idx, count, latency, strategy == "fair")) for idx, count in enumerate(sizes)]
+        for idx, future in enumerate(futures):
+            future.add_done_callback(lambda _f, idx=idx: finished.setdefault(idx, time.perf_counter() - started))
+        for future in futures:
+            future.result()
+    total = time.perf_counter() - started
+    small = [finished[idx] for idx in range(1, len(sizes))]
+    return total, statistics.median(small), max(small)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=12)
+    parser.add_argument("--big-chunks", type=int, default=40)
+    parser.add_argument("--chunks", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    # 첫 파일만 큰 교재, 나머지는 짧은 강의 자료
+    sizes = [args.big_chunks] + [args.chunks] * (args.files - 1)
+    ideal = sum(sizes) * args.latency / args.concurrency
+    print(f"files={args.files} chunks={sum(sizes)} concurrency={args.concurrency} ideal={ideal:.2f}s")
+    print(f"{'strategy':<8} {'total':>7} {'small p50':>10} {'small max':>10}")
+    for strategy in ("serial", "fifo", "fair"):
+        total, p50, worst = run(strategy, sizes, args.latency, args.concurrency)
+        print(f"{strategy:<8} {total:>6.2f}s {p50:>9.2f}s {worst:>9.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""청크 분할: 기존 글자 수 분할(균등 배분) vs 구조 기반 토큰 예산 계획(밀도 비례 배분)
+
+문항 하나당 과금 토큰(프롬프트 + 청크 본문 + 출력)을 비교한다. 실제 호출은 하지 않는다.
+실행: python benchmarks/bench_chunk_planner.py [--file extracted.txt] [--items 30]
+--file을 주면 추출된 강의록 텍스트('=== 슬라이드 N ===' 표기 포함)를, 없으면 합성 강의록을 사용한다.
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from _app_loader import load_app_functions  # noqa: E402
+from src.services.chunk_planner import allocate_items, plan_chunks  # noqa: E402
+from src.services.generation_engine import CHARS_PER_TOKEN, estimate_tokens  # noqa: E402
+
+TERMS = [
+    "급성 심근경색", "불안정 협심증", "troponin I", "ST분절 상승", "관상동맥 조영술", "beta-blocker", "aspirin",
+    "heparin", "심부전", "BNP", "좌심실 박출률", "ACE inhibitor", "이뇨제", "심방세동", "warfarin", "CHA2DS2-VASc",
+    "대동맥 판막 협착", "감염성 심내막염", "Duke criteria", "심낭염", "심장눌림증", "고혈압 응급", "nitroprusside",
+]
+FILLER = ["환자는", "내원하였다", "다음 중", "가장 적절한", "소견은", "검사에서", "확인되었다", "치료로"]
+
+
+def build_lecture(slides=80, seed=7):
+    rng = random.Random(seed)
+    parts = []
+    for n in range(1, slides + 1):
+        kind = rng.random()
+        if kind < 0.2:
+            body = rng.choice(["목차", "Summary", "Questions?", "감사합니다", "Case discussion"])
+        elif kind < 0.35:
+            rows = [" | ".join(rng.choice(TERMS) for _ in range(4)) for _ in range(rng.randint(4, 10))]
+            body = "\n".join(rows)
+        else:
+            paragraphs = []
+            for _ in range(rng.randint(2, 5)):
+                sentences = [
+                    " ".join(rng.choice(TERMS + FILLER * 2) for _ in range(rng.randint(8, 16))) + "."
+                    for _ in range(rng.randint(3, 8))
+                ]
+                paragraphs.append(" ".join(sentences))
+            body = "\n\n".join(paragraphs)
+        parts.append(f"=== 슬라이드 {n} ===\n{body}")
+    return "\n\n".join(parts)
+
+
+def bill(chunks, counts, prompt_tokens, item_tokens):
+    calls = [(c, n) for c, n in zip(chunks, counts) if n > 0]
+    input_tokens = sum(prompt_tokens + estimate_tokens(c) for c, _ in calls)
+    output_tokens = sum(n * item_tokens for _, n in calls)
+    return len(calls), input_tokens, output_tokens
+
+
+def mid_sentence_starts(text, chunks):
+    """원문에서 청크 시작 직전 글자가 문장/줄 끝이 아닌 청크 수"""
+    count = 0
+    for chunk in chunks[1:]:
+        pos = text.find(chunk[:40])
+        before = text[:pos].rstrip(" \t")
+        if pos > 0 and before and before[-1] not in ".!?\n":
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file")
+    parser.add_argument("--slides", type=int, default=80)
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--chunk-size", type=int, default=8000, help="문자 수 (사이드바 슬라이더와 같은 단위)")
+    parser.add_argument("--overlap", type=int, default=500, help="기존 분할기의 중첩 문자 수")
+    parser.add_argument("--prompt-tokens", type=int, default=700, help="청크마다 반복되는 시스템 프롬프트 토큰")
+    parser.add_argument("--item-tokens", type=int, default=350, help="문항 하나의 출력 토큰")
+    args = parser.parse_args()
+
+    text = Path(args.file).read_text(encoding="utf-8") if args.file else build_lecture(args.slides)
+    split_text_into_chunks = load_app_functions(["split_text_into_chunks"])["split_text_into_chunks"]
+
+    legacy = split_text_into_chunks(text, chunk_size=args.chunk_size, overlap=args.overlap)
+    base, rem = divmod(args.items, len(legacy))
+    legacy_counts = [base + (1 if i < rem else 0) for i in range(len(legacy))]
+
+    plan = plan_chunks(text, max_tokens=args.chunk_size // CHARS_PER_TOKEN)
+    planned = [c["text"] for c in plan]
+    planned_counts = allocate_items([c["density"] for c in plan], args.items)
+
+    print(f"text={len(text):,} chars (~{estimate_tokens(text):,} tokens) items={args.items}")
+    print(f"{'splitter':<10} {'chunks':>6} {'calls':>5} {'input':>8} {'output':>8} {'tok/item':>9} {'cut starts':>10}")
+    for name, chunks, counts in (("legacy", legacy, legacy_counts), ("planner", planned, planned_counts)):
+        calls, input_tokens, output_tokens = bill(chunks, counts, args.prompt_tokens, args.item_tokens)
+        cut = mid_sentence_starts(text, chunks)
+        per_item = (input_tokens + output_tokens) / max(1, sum(counts))
+        print(f"{name:<10} {len(chunks):>6} {calls:>5} {input_tokens:>8,} {output_tokens:>8,} {per_item:>9.0f} {cut:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""문제은행 전체 중복 클러스터링 시간 측정
+
+실행: python benchmarks/bench_duplicate_clusters.py [--bank 100000] [--dup-rate 0.1] [--workers 4]
+"""
+import argparse
+import concurrent.futures
+import multiprocessing
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.services.duplicate_clusters import find_duplicate_clusters  # noqa: E402
+
+KO_TERMS = [
+    "심근경색", "협심증", "부정맥", "심부전", "고혈압", "당뇨병", "갑상선", "부신", "신부전", "사구체신염",
+    "폐렴", "천식", "만성폐쇄성폐질환", "결핵", "간경변", "췌장염", "담낭염", "위궤양", "빈혈", "백혈병",
+    "환자", "내원", "검사", "소견", "진단", "치료", "가장", "적절한", "다음", "중", "통증", "발열", "호흡곤란",
+]
+EN_TERMS = ["troponin", "ECG", "beta-blocker", "insulin", "TSH", "cortisol", "creatinine", "CRP", "aspirin", "heparin"]
+
+
+def _perturb(text, rng):
+    words = text.split()
+    for _ in range(max(1, len(words) // 15)):
+        i = rng.randrange(len(words))
+        words[i] = rng.choice(KO_TERMS)
+    return " ".join(words)
+
+
+def build_texts(size, dup_rate, seed=5):
+    """dup_rate 비율만큼 앞선 문항을 그대로 또는 일부 단어만 바꿔 다시 넣은 가상 문제은행"""
+    rng = random.Random(seed)
+    texts = {}
+    originals = []
+    for i in range(size):
+        if originals and rng.random() < dup_rate:
+            base = rng.choice(originals)
+            texts[f"q{i}"] = base if rng.random() < 0.5 else _perturb(base, rng)
+            continue
+        stem = " ".join(rng.choice(KO_TERMS) for _ in range(18)) + " " + " ".join(rng.choice(EN_TERMS) for _ in range(3))
+        options = "\n".join(rng.choice(KO_TERMS + EN_TERMS) for _ in range(5))
+        texts[f"q{i}"] = f"{stem}\n{options}"
+        originals.append(texts[f"q{i}"])
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bank", type=int, default=100_000)
+    parser.add_argument("--dup-rate", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    texts = build_texts(args.bank, args.dup_rate)
+    print(f"bank={len(texts)} dup_rate={args.dup_rate}")
+
+    for workers in sorted({1, args.workers}):
+        pool = None
+        if workers > 1:
+            pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        started = time.perf_counter()
+        result = find_duplicate_clusters(texts, pool=pool)
+        elapsed = time.perf_counter() - started
+        if pool is not None:
+            pool.shutdown()
+        print(
+            f"workers={workers}: {elapsed:.1f}s  clusters={len(result['clusters'])} duplicates={result['duplicate_count']}"
+            f" blocks={result['block_count']} pair_checks={result['pair_checks']} stages={result['stage_ms']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
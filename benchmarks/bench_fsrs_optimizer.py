@@ -0,0 +1,74 @@
+"""FSRS 파라미터 최적화: 로그 수 대비 추출/적합 시간
+
+실행: python benchmarks/bench_fsrs_optimizer.py [--sizes 1000,5000,20000]
+적합 단계는 fsrs[optimizer](torch) 설치 시에만 측정한다.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.services.fsrs_optimizer import extract_review_rows, fit_fsrs_parameters  # noqa: E402
+
+
+def build_bank(total_logs, logs_per_card=20, seed=3):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    bank = []
+    cards = max(1, total_logs // logs_per_card)
+    for card_id in range(cards):
+        t = start + timedelta(minutes=card_id)
+        logs = []
+        interval = 1
+        for _ in range(logs_per_card):
+            rating = rng.choices([1, 2, 3, 4], weights=[15, 10, 60, 15])[0]
+            logs.append(json.dumps({
+                "card_id": card_id + 1,
+                "rating": rating,
+                "review_datetime": t.isoformat(),
+                "review_duration": None,
+            }))
+            interval = 1 if rating == 1 else min(365, int(interval * (1.5 + rating / 2)) + 1)
+            t += timedelta(days=interval)
+        bank.append({"id": f"q{card_id}", "fsrs": {"logs": logs}})
+    return bank
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,5000,20000")
+    parser.add_argument("--skip-fit", action="store_true")
+    args = parser.parse_args()
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    print(f"{'logs':>8} {'extract cold(ms)':>17} {'extract warm(ms)':>17} {'fit(ms)':>10} {'loss':>16}")
+    for size in sizes:
+        bank = build_bank(size)
+        t0 = time.perf_counter()
+        rows, cache, _ = extract_review_rows(bank)
+        cold = (time.perf_counter() - t0) * 1000
+        # 1% 문항만 새 로그가 추가된 상황의 증분 재추출
+        for q in bank[: max(1, len(bank) // 100)]:
+            q["fsrs"]["logs"].append(q["fsrs"]["logs"][-1])
+        t0 = time.perf_counter()
+        rows, cache, _ = extract_review_rows(bank, cache=cache)
+        warm = (time.perf_counter() - t0) * 1000
+        fit_ms = "-"
+        loss = "-"
+        if not args.skip_fit:
+            result = fit_fsrs_parameters(rows, base_parameters=None)
+            if result["ok"]:
+                fit_ms = str(result["elapsed_ms"])
+                loss = f"{result['loss_after']:.4f}" if result["loss_after"] is not None else "-"
+            else:
+                fit_ms = "n/a"
+                loss = result["error"].splitlines()[0][:16]
+        print(f"{len(rows):>8} {cold:>17.1f} {warm:>17.1f} {fit_ms:>10} {loss:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""세션 복습 버퍼 일괄 반영 vs 문항별 즉시 저장 비교
+
+실행: python benchmarks/bench_review_commit.py [--bank 5000]
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+from _app_loader import load_app_functions
+
+try:
+    from fsrs import Scheduler, Card, Rating, ReviewLog
+    FSRS_INSTALLED = True
+except Exception:
+    FSRS_INSTALLED = False
+
+FUNCTIONS = [
+    "parse_iso_datetime",
+    "_answer_log_record",
+    "_fsrs_log_record",
+    "_apply_answer_to_item",
+    "_grade_audit_payload",
+    "update_question_stats",
+    "_apply_simple_srs_to_item",
+    "apply_simple_srs_rating",
+    "_apply_fsrs_review_to_item",
+    "apply_fsrs_rating",
+    "apply_srs_rating",
+    "record_review_event",
+    "apply_review_events",
+    "commit_review_buffer",
+]
+
+
+def build_bank(size):
+    return {
+        "text": [{"id": f"q{i}", "problem": f"문항 {i} " * 20, "options": ["A", "B", "C", "D", "E"], "subject": "S"} for i in range(size)],
+        "cloze": [],
+    }
+
+
+def make_namespace(bank, workdir):
+    bank_file = Path(workdir) / "questions.json"
+    audit_file = Path(workdir) / "audit_log.jsonl"
+
+    def save_questions(data, user_id=None):
+        with open(bank_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return True
+
+    def append_audit_log(event, payload):
+        with open(audit_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"event": event, **payload}, ensure_ascii=False) + "\n")
+
+    def append_audit_logs(event, payloads):
+        with open(audit_file, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps({"event": event, **p}, ensure_ascii=False) + "\n" for p in payloads)
+
+    extra = {
+        "datetime": datetime,
+        "timezone": timezone,
+        "timedelta": timedelta,
+        "time": time,
+        "GRADER_VERSION": "v1",
+        "FSRS_AVAILABLE": FSRS_INSTALLED,
+        "load_questions": lambda user_id=None: bank,
+        "save_questions": save_questions,
+        "append_audit_log": append_audit_log,
+        "append_audit_logs": append_audit_logs,
+        "use_review_log_store": lambda user_id=None: False,
+        "append_review_log_records": lambda records, user_id=None: len(records),
+    }
+    if FSRS_INSTALLED:
+        extra.update({
+            "Scheduler": Scheduler,
+            "Card": Card,
+            "Rating": Rating,
+            "ReviewLog": ReviewLog,
+            "get_fsrs_scheduler": lambda: Scheduler(),
+        })
+    return load_app_functions(FUNCTIONS, extra=extra)
+
+
+def run(bank_size, session_size, seed=7):
+    rng = random.Random(seed)
+    ids = [f"q{i}" for i in rng.sample(range(bank_size), session_size)]
+    answers = [(q_id, rng.random() < 0.7) for q_id in ids]
+    labels = ["Again", "Hard", "Good", "Easy"]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        ns = make_namespace(build_bank(bank_size), workdir)
+        start = time.perf_counter()
+        for q_id, ok in answers:
+            ns["update_question_stats"](q_id, ok)
+            rating = Rating[rng.choice(labels)] if FSRS_INSTALLED else rng.choice(labels)
+            ns["apply_srs_rating"](q_id, rating)
+        per_answer = time.perf_counter() - start
+
+    rng = random.Random(seed + 1)
+    with tempfile.TemporaryDirectory() as workdir:
+        ns = make_namespace(build_bank(bank_size), workdir)
+        for q_id, ok in answers:
+            ns["record_review_event"](q_id, is_correct=ok)
+            ns["record_review_event"](q_id, rating=rng.choice(labels))
+        start = time.perf_counter()
+        ns["commit_review_buffer"]()
+        buffered = time.perf_counter() - start
+    return per_answer, buffered
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bank", type=int, default=5000)
+    args = parser.parse_args()
+    print(f"bank={args.bank} fsrs={'on' if FSRS_INSTALLED else 'off'}")
+    print(f"{'session':>8} {'per-answer(s)':>14} {'buffered(s)':>12} {'speedup':>8}")
+    for session_size in (100, 500):
+        per_answer, buffered = run(args.bank, min(session_size, args.bank))
+        print(f"{session_size:>8} {per_answer:>14.3f} {buffered:>12.3f} {per_answer / max(buffered, 1e-9):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""문제은행 전문 검색(BM25) 색인/질의 시간 측정
+
+실행: python benchmarks/bench_text_search.py [--bank 100000]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.services.text_search import (  # noqa: E402
+    bm25_search,
+    compact_search_index,
+    new_search_index,
+    sync_search_index,
+)
+
+KO_TERMS = [
+    "심근경색", "협심증", "부정맥", "심부전", "고혈압", "당뇨병", "갑상선", "부신", "신부전", "사구체신염",
+    "폐렴", "천식", "만성폐쇄성폐질환", "결핵", "간경변", "췌장염", "담낭염", "위궤양", "빈혈", "백혈병",
+    "환자", "내원", "검사", "소견", "진단", "치료", "가장", "적절한", "다음", "중", "통증", "발열", "호흡곤란",
+]
+EN_TERMS = [
+    "troponin", "ECG", "ST elevation", "beta-blocker", "ACE inhibitor", "insulin", "TSH", "cortisol",
+    "creatinine", "CRP", "CT", "MRI", "aspirin", "heparin", "warfarin", "metformin", "NSAID",
+]
+QUERIES = ["심근경색 troponin", "급성 췌장염 CT", "갑상선 TSH 검사", "환자", "beta-blocker 부정맥 치료", "사구체신염 creatinine"]
+# 한 글자 한글·단어 일부: 토큰 사전 부분 문자열 확장 경로
+SHORT_QUERIES = ["췌", "심", "tropo", "metfor"]
+
+
+def build_texts(size, seed=11):
+    rng = random.Random(seed)
+    texts = {}
+    for i in range(size):
+        stem = " ".join(rng.choice(KO_TERMS) for _ in range(14)) + " " + " ".join(rng.choice(EN_TERMS) for _ in range(3))
+        options = "\n".join(rng.choice(KO_TERMS + EN_TERMS) for _ in range(5))
+        explanation = " ".join(rng.choice(KO_TERMS) for _ in range(8))
+        texts[f"q{i}"] = f"{stem}\n{options}\n{explanation}"
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bank", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = build_texts(args.bank)
+    index = new_search_index()
+    start = time.perf_counter()
+    sync_search_index(index, texts)
+    build_s = time.perf_counter() - start
+    print(f"bank={args.bank} terms={len(index['postings'])} build={build_s:.1f}s")
+
+    # 1% 문항 수정 후 증분 반영
+    for key in list(texts)[: args.bank // 100]:
+        texts[key] += " 수정됨"
+    start = time.perf_counter()
+    sync_search_index(index, texts)
+    compact_search_index(index)
+    print(f"incremental update (1% edited): {time.perf_counter() - start:.2f}s")
+
+    print(f"{'query':<28} {'p50(ms)':>8} {'p95(ms)':>8} {'hits':>5}")
+    for query in QUERIES + SHORT_QUERIES:
+        samples = []
+        hits = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            hits = bm25_search(index, query, limit=50)
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(f"{query:<28} {statistics.median(samples):>8.1f} {p95:>8.1f} {len(hits):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 import traceback
 from datetime import datetime
@@ -71,4 +72,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 번들 실행 시 워커 프로세스(spawn)가 런처를 다시 실행하지 않도록 처리
+    multiprocessing.freeze_support()
     main()
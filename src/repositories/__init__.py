@@ -1,9 +1,59 @@
+from .bank_event_store import load_bank_event_file, save_bank_event_file
+from .generation_job_store import (
+    delete_generation_files,
+    delete_generation_job,
+    delete_generation_payload,
+    generation_job_file,
+    list_generation_jobs,
+    load_generation_job,
+    load_generation_payload,
+    save_generation_job,
+    save_generation_payload,
+    save_generation_source,
+)
 from .json_store import load_json_file, save_json_file
+from .llm_cache_store import llm_cache_counters, load_llm_cache_entry, save_llm_cache_entry
+from .near_duplicate_store import load_near_duplicate_file, save_near_duplicate_file
+from .pickle_store import load_pickle_file, save_pickle_file
 from .prewarm_cache_store import load_prewarm_cache_file, save_prewarm_cache_file
+from .search_index_store import load_search_index_file, save_search_index_file
+from .review_log_store import (
+    append_review_records,
+    iter_review_rows,
+    load_review_index,
+    read_review_records,
+    rekey_review_records,
+)
 
 __all__ = [
+    "load_bank_event_file",
+    "save_bank_event_file",
+    "delete_generation_files",
+    "delete_generation_job",
+    "delete_generation_payload",
+    "generation_job_file",
+    "list_generation_jobs",
+    "load_generation_job",
+    "load_generation_payload",
+    "save_generation_job",
+    "save_generation_payload",
+    "save_generation_source",
     "load_json_file",
     "save_json_file",
+    "llm_cache_counters",
+    "load_llm_cache_entry",
+    "save_llm_cache_entry",
+    "load_near_duplicate_file",
+    "save_near_duplicate_file",
+    "load_pickle_file",
+    "save_pickle_file",
     "load_prewarm_cache_file",
     "save_prewarm_cache_file",
+    "append_review_records",
+    "iter_review_rows",
+    "load_review_index",
+    "read_review_records",
+    "rekey_review_records",
+    "load_search_index_file",
+    "save_search_index_file",
 ]
@@ -0,0 +1,12 @@
+from .json_store import load_json_file, save_json_file
+
+
+def load_bank_event_file(path):
+    data = load_json_file(path, {})
+    if not isinstance(data.get("revision"), int) or not isinstance(data.get("events"), list):
+        return None
+    return data
+
+
+def save_bank_event_file(path, log):
+    return save_json_file(path, log)
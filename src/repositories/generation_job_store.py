@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from .json_store import load_json_file
+
+
+def _job_path(root, job_id):
+    return Path(root) / f"{job_id}.json"
+
+
+def _payload_path(root, job_id):
+    return Path(root) / f"{job_id}.txt"
+
+
+def generation_job_file(root, job_id, suffix):
+    """작업에 딸린 부가 파일 경로 (원본 업로드, 추출 페이지 JSONL, 취소 표시 등)"""
+    return Path(root) / f"{job_id}{suffix}"
+
+
+def _atomic_write(path, text):
+    # 워커 스레드가 쓰는 동안 UI가 읽어도 반쯤 쓴 파일을 보지 않도록 임시 파일 후 교체
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return False
+
+
+def save_generation_job(root, job):
+    return _atomic_write(_job_path(root, job["id"]), json.dumps(job, ensure_ascii=False))
+
+
+def load_generation_job(root, job_id):
+    data = load_json_file(_job_path(root, job_id), {})
+    if not data.get("id") or not data.get("status"):
+        return None
+    return data
+
+
+def list_generation_jobs(root):
+    """작업 목록 (오래된 것부터)"""
+    folder = Path(root)
+    if not folder.is_dir():
+        return []
+    jobs = [load_generation_job(root, path.stem) for path in folder.glob("*.json")]
+    return sorted((job for job in jobs if job), key=lambda job: job.get("created_at") or "")
+
+
+def save_generation_payload(root, job_id, text):
+    return _atomic_write(_payload_path(root, job_id), text or "")
+
+
+def load_generation_payload(root, job_id):
+    try:
+        return _payload_path(root, job_id).read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def save_generation_source(root, job_id, data, suffix):
+    """추출 전 원본 파일을 작업 폴더에 저장하고 경로를 반환"""
+    path = generation_job_file(root, job_id, f".source{suffix}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def delete_generation_files(root, job_id, suffixes):
+    for suffix in suffixes:
+        try:
+            generation_job_file(root, job_id, suffix).unlink()
+        except OSError:
+            pass
+
+
+def delete_generation_payload(root, job_id):
+    try:
+        _payload_path(root, job_id).unlink()
+    except OSError:
+        pass
+
+
+def delete_generation_job(root, job_id):
+    for path in Path(root).glob(f"{job_id}.*"):
+        if path.suffix != ".json":
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    try:
+        _job_path(root, job_id).unlink()
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,78 @@
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+def _connect(path):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=10)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _bump(conn, name):
+    conn.execute(
+        "INSERT INTO counters (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+        (name,),
+    )
+
+
+def load_llm_cache_entry(path, key):
+    """캐시된 응답 (없으면 None). 조회할 때마다 hits/misses 카운터와 LRU 사용 시각을 갱신"""
+    try:
+        with closing(_connect(path)) as conn, conn:
+            row = conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            _bump(conn, "hits" if row is not None else "misses")
+            return row[0] if row is not None else None
+    except sqlite3.Error:
+        return None
+
+
+def save_llm_cache_entry(path, key, value, max_bytes):
+    """응답을 저장하고, 전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 지운다. 지운 개수를 반환"""
+    size = len(value.encode("utf-8"))
+    if size > max_bytes:
+        return 0
+    try:
+        with closing(_connect(path)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            evicted = []
+            if total > max_bytes:
+                for old_key, old_size in conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+                    if total <= max_bytes:
+                        break
+                    evicted.append((old_key,))
+                    total -= old_size
+                conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+            return len(evicted)
+    except sqlite3.Error:
+        return 0
+
+
+def llm_cache_counters(path):
+    """{"hits", "misses", "entries", "bytes"}"""
+    try:
+        with closing(_connect(path)) as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+    except sqlite3.Error:
+        counters, entries, total = {}, 0, 0
+    return {"hits": counters.get("hits", 0), "misses": counters.get("misses", 0), "entries": entries, "bytes": total}
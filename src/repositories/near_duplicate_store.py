@@ -0,0 +1,11 @@
+from .pickle_store import load_pickle_file, save_pickle_file
+
+
+def load_near_duplicate_file(path, version):
+    return load_pickle_file(path, version)
+
+
+def save_near_duplicate_file(path, index):
+    """LSH 버킷은 서명에서 다시 만들 수 있으므로 서명만 저장"""
+    payload = {k: v for k, v in index.items() if k != "buckets"}
+    return save_pickle_file(path, payload)
@@ -0,0 +1,31 @@
+import os
+import pickle
+from pathlib import Path
+
+
+def load_pickle_file(path, version):
+    """파생 색인 파일을 읽음. 없거나 버전이 다르거나 손상되면 None"""
+    file_path = Path(path)
+    if not file_path.exists():
+        return None
+    try:
+        with file_path.open("rb") as f:
+            data = pickle.load(f)
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+
+def save_pickle_file(path, data):
+    file_path = Path(path)
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    try:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, file_path)
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,191 @@
+import os
+import struct
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+# kind(u8) | value(u8) | question index(u32) | epoch seconds(f64) | card_id(i64) | duration ms(i32, -1=None)
+RECORD_STRUCT = struct.Struct("<BBIdqi")
+RECORD_SIZE = RECORD_STRUCT.size
+
+KIND_ANSWER = 0
+KIND_FSRS = 1
+KIND_CODES = {"answer": KIND_ANSWER, "fsrs": KIND_FSRS}
+KIND_NAMES = {v: k for k, v in KIND_CODES.items()}
+
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def _ids_path(path):
+    p = Path(path)
+    return p.with_name(p.stem + "_ids.txt")
+
+
+def _to_epoch(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except Exception:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _empty_state():
+    return {"offset": 0, "ids_offset": 0, "ids": [], "index": {}, "by_id": {}}
+
+
+def _refresh(path):
+    """파일에 새로 붙은 꼬리 부분만 읽어 메모리 인덱스를 갱신"""
+    key = str(path)
+    state = _CACHE.get(key) or _empty_state()
+    data_path = Path(path)
+    ids_path = _ids_path(path)
+    data_size = data_path.stat().st_size if data_path.exists() else 0
+    ids_size = ids_path.stat().st_size if ids_path.exists() else 0
+    if data_size < state["offset"] or ids_size < state["ids_offset"]:
+        state = _empty_state()
+
+    if ids_size > state["ids_offset"]:
+        with ids_path.open("rb") as f:
+            f.seek(state["ids_offset"])
+            chunk = f.read(ids_size - state["ids_offset"])
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            state["index"].setdefault(line, len(state["ids"]))
+            state["ids"].append(line)
+        state["ids_offset"] += len(complete)
+
+    usable = data_size - (data_size - state["offset"]) % RECORD_SIZE
+    if usable > state["offset"]:
+        with data_path.open("rb") as f:
+            f.seek(state["offset"])
+            chunk = f.read(usable - state["offset"])
+        ids = state["ids"]
+        by_id = state["by_id"]
+        for kind, value, q_idx, ts, card_id, duration in RECORD_STRUCT.iter_unpack(chunk):
+            if q_idx >= len(ids):
+                continue
+            by_id.setdefault(ids[q_idx], []).append((kind, value, ts, card_id, duration))
+        state["offset"] = usable
+    _CACHE[key] = state
+    return state
+
+
+def append_review_records(path, records):
+    """리뷰 기록을 고정폭 레코드로 append. records: {"id", "kind", "value", "time", "card_id", "duration"}"""
+    rows = [r for r in (records or []) if isinstance(r, dict) and r.get("id") and r.get("kind") in KIND_CODES]
+    if not rows:
+        return 0
+    with _LOCK:
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            state = _refresh(path)
+            new_ids = []
+            packed = []
+            for row in rows:
+                ts = _to_epoch(row.get("time"))
+                if ts is None:
+                    continue
+                q_id = str(row["id"]).replace("\n", " ")
+                q_idx = state["index"].get(q_id)
+                if q_idx is None:
+                    q_idx = len(state["ids"]) + len(new_ids)
+                    state["index"][q_id] = q_idx
+                    new_ids.append(q_id)
+                duration = row.get("duration")
+                packed.append(RECORD_STRUCT.pack(
+                    KIND_CODES[row["kind"]],
+                    int(row.get("value") or 0) & 0xFF,
+                    q_idx,
+                    ts,
+                    int(row.get("card_id") or 0),
+                    -1 if duration is None else int(duration),
+                ))
+            if new_ids:
+                with _ids_path(path).open("a", encoding="utf-8") as f:
+                    f.write("".join(q_id + "\n" for q_id in new_ids))
+            if packed:
+                with Path(path).open("ab") as f:
+                    f.write(b"".join(packed))
+            # 방금 쓴 꼬리를 반영
+            for q_id in new_ids:
+                state["index"].pop(q_id, None)
+            _refresh(path)
+            return len(packed)
+        except Exception:
+            _CACHE.pop(str(path), None)
+            return 0
+
+
+def rekey_review_records(path, mapping):
+    """{이전 id: 새 id}에 따라 기존 기록의 문항 id를 바꾼다 (중복 병합 시 지운 문항의 기록을 남긴 문항으로 옮김).
+
+    레코드는 id 목록의 위치만 가리키므로 id 목록 파일만 다시 쓰고, 같은 id가 여러 줄이어도 한 문항으로 모인다.
+    Returns: 바뀐 id 수
+    """
+    mapping = {str(k): str(v) for k, v in (mapping or {}).items() if k and v and k != v}
+    for key in list(mapping):
+        # a→b, b→c 처럼 이어진 병합은 마지막 id로 바로 옮긴다
+        seen = {key}
+        while mapping[key] in mapping and mapping[key] not in seen:
+            seen.add(mapping[key])
+            mapping[key] = mapping[mapping[key]]
+    ids_path = _ids_path(path)
+    if not mapping or not ids_path.exists():
+        return 0
+    tmp = ids_path.with_name(ids_path.name + ".tmp")
+    with _LOCK:
+        try:
+            lines = ids_path.read_text(encoding="utf-8").split("\n")
+            changed = sum(1 for line in lines if line in mapping)
+            if not changed:
+                return 0
+            tmp.write_text("\n".join(mapping.get(line, line) for line in lines), encoding="utf-8")
+            os.replace(tmp, ids_path)
+            return changed
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return 0
+        finally:
+            # id 목록 길이가 바뀌었으므로 다음 조회 때 처음부터 다시 읽는다
+            _CACHE.pop(str(path), None)
+
+
+def load_review_index(path):
+    """{문항 id: [(kind, value, epoch, card_id, duration), ...]} (append 순서, 읽기 전용으로 사용)"""
+    with _LOCK:
+        return _refresh(path)["by_id"]
+
+
+def read_review_records(path, q_id=None, kind=None):
+    """(kind, value, epoch, card_id, duration) 튜플 목록. q_id를 주면 해당 문항만 시간순으로 반환"""
+    with _LOCK:
+        state = _refresh(path)
+        kind_code = KIND_CODES.get(kind) if kind else None
+        if q_id is not None:
+            rows = sorted(state["by_id"].get(str(q_id), []), key=lambda r: r[2])
+            return [r for r in rows if kind_code is None or r[0] == kind_code]
+        return {
+            key: [r for r in rows if kind_code is None or r[0] == kind_code]
+            for key, rows in state["by_id"].items()
+        }
+
+
+def iter_review_rows(path, kind="fsrs"):
+    """모든 문항의 기록을 [card_id, value, epoch, duration] 배열로 반환 (FSRS 최적화 입력용)"""
+    kind_code = KIND_CODES[kind]
+    with _LOCK:
+        state = _refresh(path)
+        out = []
+        for rows in state["by_id"].values():
+            for r in rows:
+                if r[0] == kind_code:
+                    out.append([r[3], r[1], r[2], None if r[4] < 0 else r[4]])
+        return out
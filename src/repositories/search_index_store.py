@@ -0,0 +1,9 @@
+from .pickle_store import load_pickle_file, save_pickle_file
+
+
+def load_search_index_file(path, version):
+    return load_pickle_file(path, version)
+
+
+def save_search_index_file(path, index):
+    return save_pickle_file(path, index)
@@ -1,3 +1,207 @@
+from .answer_matcher import (
+    DEFAULT_MATCH_THRESHOLD,
+    bounded_edit_distance,
+    build_answer_keys,
+    match_answer,
+    normalize_answer,
+    parse_accepted_answers,
+)
+from .bank_events import (
+    BANK_EVENT_LIMIT,
+    bank_change,
+    bank_changes_since,
+    changed_ids,
+    new_bank_event_log,
+    record_bank_event,
+)
+from .chunk_planner import (
+    allocate_items,
+    chunk_fingerprint,
+    feed_chunk_stream,
+    finish_chunk_stream,
+    new_chunk_stream,
+    plan_chunks,
+    split_pages,
+    split_sections,
+)
+from .dashboard_analytics import (
+    build_dashboard_snapshot,
+    dashboard_heatmap,
+    dashboard_overall_accuracy,
+)
+from .document_extraction import (
+    EXTRACTABLE_EXTENSIONS,
+    expand_upload_sources,
+    iter_document_pages,
+    ocr_image_bytes,
+    read_extracted_pages,
+    read_upload_source,
+    run_document_extraction,
+    submit_document_extraction,
+)
+from .duplicate_clusters import CLUSTER_BANDS, build_lsh_blocks, find_duplicate_clusters, submit_duplicate_clustering
+from .facet_index import (
+    facet_add,
+    facet_counts,
+    facet_query,
+    facet_query_keys,
+    facet_remove,
+    facet_subject_unit_map,
+    facet_subjects,
+    facet_values,
+    new_facet_index,
+    sync_facet_index,
+)
+from .fsrs_optimizer import extract_review_rows, fit_fsrs_parameters, submit_fsrs_optimization
+from .generation_engine import CHARS_PER_TOKEN, DEFAULT_PROVIDER_LIMITS, GenerationEngine, estimate_tokens, get_generation_engine
+from .generation_jobs import (
+    ACTIVE_JOB_STATUSES,
+    JOB_STATUSES,
+    MAX_JOB_ATTEMPTS,
+    GenerationCancelled,
+    GenerationWorkerPool,
+    get_generation_worker_pool,
+    new_generation_batch_id,
+    new_generation_job,
+    resumable_generation_jobs,
+    summarize_generation_batch,
+    update_generation_job,
+)
 from .generation_pipeline import reconcile_generation_queue_items
+from .llm_cache import DEFAULT_LLM_CACHE_MAX_BYTES, is_cacheable_temperature, llm_cache_key
+from .near_duplicates import (
+    DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+    NEAR_DUPLICATE_INDEX_VERSION,
+    apply_minhash_signatures,
+    compute_minhash_signatures,
+    minhash_signature,
+    near_duplicate_add,
+    near_duplicate_pending,
+    near_duplicate_query,
+    near_duplicate_remove,
+    new_near_duplicate_index,
+    submit_minhash_backfill,
+)
+from .rate_limiter import AdaptiveTokenBucket, parse_duration, rate_limit_details
+from .related_index import (
+    DEFAULT_RELATED_K,
+    new_related_state,
+    related_questions,
+    sync_related_state,
+)
+from .review_forecast import FORECAST_HORIZONS, forecast_due_counts
+from .stream_parser import feed_stream_parser, finish_stream_parser, new_stream_parser
+from .text_search import (
+    SEARCH_INDEX_VERSION,
+    bm25_search,
+    compact_search_index,
+    new_search_index,
+    search_index_add,
+    search_index_remove,
+    sync_search_index,
+    text_signature,
+    tokenize,
+)
 
-__all__ = ["reconcile_generation_queue_items"]
+__all__ = [
+    "DEFAULT_MATCH_THRESHOLD",
+    "bounded_edit_distance",
+    "build_answer_keys",
+    "match_answer",
+    "normalize_answer",
+    "parse_accepted_answers",
+    "BANK_EVENT_LIMIT",
+    "bank_change",
+    "bank_changes_since",
+    "changed_ids",
+    "new_bank_event_log",
+    "record_bank_event",
+    "allocate_items",
+    "chunk_fingerprint",
+    "feed_chunk_stream",
+    "finish_chunk_stream",
+    "new_chunk_stream",
+    "plan_chunks",
+    "split_pages",
+    "split_sections",
+    "build_dashboard_snapshot",
+    "dashboard_heatmap",
+    "dashboard_overall_accuracy",
+    "EXTRACTABLE_EXTENSIONS",
+    "expand_upload_sources",
+    "iter_document_pages",
+    "ocr_image_bytes",
+    "read_extracted_pages",
+    "read_upload_source",
+    "run_document_extraction",
+    "submit_document_extraction",
+    "CLUSTER_BANDS",
+    "build_lsh_blocks",
+    "find_duplicate_clusters",
+    "submit_duplicate_clustering",
+    "facet_add",
+    "facet_counts",
+    "facet_query",
+    "facet_query_keys",
+    "facet_remove",
+    "facet_subject_unit_map",
+    "facet_subjects",
+    "facet_values",
+    "new_facet_index",
+    "sync_facet_index",
+    "extract_review_rows",
+    "fit_fsrs_parameters",
+    "submit_fsrs_optimization",
+    "CHARS_PER_TOKEN",
+    "DEFAULT_PROVIDER_LIMITS",
+    "GenerationEngine",
+    "estimate_tokens",
+    "get_generation_engine",
+    "ACTIVE_JOB_STATUSES",
+    "JOB_STATUSES",
+    "MAX_JOB_ATTEMPTS",
+    "GenerationCancelled",
+    "GenerationWorkerPool",
+    "get_generation_worker_pool",
+    "new_generation_batch_id",
+    "new_generation_job",
+    "resumable_generation_jobs",
+    "summarize_generation_batch",
+    "update_generation_job",
+    "reconcile_generation_queue_items",
+    "DEFAULT_LLM_CACHE_MAX_BYTES",
+    "is_cacheable_temperature",
+    "llm_cache_key",
+    "DEFAULT_NEAR_DUPLICATE_THRESHOLD",
+    "NEAR_DUPLICATE_INDEX_VERSION",
+    "apply_minhash_signatures",
+    "compute_minhash_signatures",
+    "minhash_signature",
+    "near_duplicate_add",
+    "near_duplicate_pending",
+    "near_duplicate_query",
+    "near_duplicate_remove",
+    "new_near_duplicate_index",
+    "submit_minhash_backfill",
+    "AdaptiveTokenBucket",
+    "parse_duration",
+    "rate_limit_details",
+    "DEFAULT_RELATED_K",
+    "new_related_state",
+    "related_questions",
+    "sync_related_state",
+    "FORECAST_HORIZONS",
+    "forecast_due_counts",
+    "feed_stream_parser",
+    "finish_stream_parser",
+    "new_stream_parser",
+    "SEARCH_INDEX_VERSION",
+    "bm25_search",
+    "compact_search_index",
+    "new_search_index",
+    "search_index_add",
+    "search_index_remove",
+    "sync_search_index",
+    "text_signature",
+    "tokenize",
+]
@@ -0,0 +1,105 @@
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+DEFAULT_MATCH_THRESHOLD = 0.8
+_NON_WORD_RE = re.compile(r"[^\w가-힣]")
+
+
+def normalize_answer(text):
+    """채점 비교용 정규화: NFC, 소문자화, 공백/문장부호 제거"""
+    return _NON_WORD_RE.sub("", unicodedata.normalize("NFC", str(text or "")).lower())
+
+
+def build_answer_keys(answer, synonyms=None):
+    """정답과 허용 답안을 정규화한 키 목록 (저장 시 한 번 계산해 문항에 넣어 둔다)"""
+    keys = []
+    for value in [answer] + list(synonyms or []):
+        key = normalize_answer(value)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def parse_accepted_answers(raw):
+    """쉼표/줄바꿈으로 구분된 허용 답안 입력을 목록으로"""
+    if isinstance(raw, (list, tuple)):
+        values = raw
+    else:
+        values = re.split(r"[,\n]", str(raw or ""))
+    return [str(v).strip() for v in values if str(v).strip()]
+
+
+@lru_cache(maxsize=4096)
+def _pattern_masks(pattern):
+    masks = {}
+    for i, ch in enumerate(pattern):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    return masks
+
+
+def bounded_edit_distance(a, b, max_dist):
+    """a, b의 Levenshtein 거리. max_dist를 넘는 것이 확실해지면 바로 max_dist + 1을 반환.
+
+    Myers/Hyyrö 비트 병렬 알고리즘: a의 각 위치를 정수 비트 하나로 두고 b를 한 글자씩 읽으며
+    DP 열 전체를 몇 번의 정수 연산으로 갱신한다 (Python 정수라 길이 제한이 없다).
+    """
+    if a == b:
+        return 0
+    m, n = len(a), len(b)
+    if abs(m - n) > max_dist:
+        return max_dist + 1
+    if not m or not n:
+        return max(m, n)
+    peq = _pattern_masks(a)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv = full
+    mv = 0
+    score = m
+    for j, ch in enumerate(b):
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        # 남은 글자로 줄일 수 있는 거리는 글자당 1이 최대
+        if score - (n - j - 1) > max_dist:
+            return max_dist + 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score if score <= max_dist else max_dist + 1
+
+
+def match_answer(user_answer, answer_keys, threshold=DEFAULT_MATCH_THRESHOLD):
+    """사용자 답이 정답 키 중 하나와 충분히 비슷하면 True.
+
+    유사도는 bounded_edit_distance로 구한 정규화 편집 거리 1 - d/max(|a|,|b|)를 쓴다. 편집 경로에서 맞은 글자는
+    최소 max(|a|,|b|) - d개라 이 값이 threshold 이상이면 기존 SequenceMatcher 기준(2M/(|a|+|b|))으로도 통과하고,
+    d > (1 - threshold)(|a|+|b|)이면 어느 기준으로도 떨어진다. 두 기준이 갈릴 수 있는 그 사이(주로 글자가
+    빠지거나 더해진 답)에서만 SequenceMatcher로 판정한다.
+    """
+    user = normalize_answer(user_answer)
+    if not user:
+        return False
+    for key in answer_keys or []:
+        if user == key:
+            return True
+        max_dist = int((1.0 - threshold) * (len(user) + len(key)) + 1e-9)
+        if not max_dist:
+            continue
+        dist = bounded_edit_distance(key, user, max_dist)
+        if dist > max_dist:
+            continue
+        if 1.0 - dist / max(len(user), len(key)) >= threshold - 1e-9:
+            return True
+        if SequenceMatcher(None, user, key).ratio() >= threshold:
+            return True
+    return False
@@ -0,0 +1,75 @@
+BANK_EVENT_LIMIT = 256
+
+
+def new_bank_event_log(revision=0):
+    """사용자별 문제은행 revision과 최근 변경 이벤트 목록"""
+    return {"revision": int(revision or 0), "events": []}
+
+
+def bank_change(added=(), updated=None, deleted=()):
+    """변경 내역 정규화. updated는 {문항 id: 바뀐 필드 목록} ("*"는 필드를 모르는 변경)"""
+    return {
+        "added": sorted({str(k) for k in added or () if k}),
+        "updated": {str(k): sorted({str(f) for f in (fields or ("*",))}) for k, fields in (updated or {}).items() if k},
+        "deleted": sorted({str(k) for k in deleted or () if k}),
+    }
+
+
+def record_bank_event(log, change=None, limit=BANK_EVENT_LIMIT):
+    """revision을 1 올리고 이벤트를 남긴다. change가 None이면 무엇이 바뀌었는지 모르는 저장(reset)"""
+    log["revision"] = int(log.get("revision", 0) or 0) + 1
+    event = {"revision": log["revision"], "reset": change is None}
+    event.update(bank_change(**(change or {})))
+    events = log.setdefault("events", [])
+    events.append(event)
+    del events[:-limit]
+    return event
+
+
+def bank_changes_since(log, revision):
+    """revision 이후의 이벤트를 합친 변경 내역.
+
+    로그가 그 시점까지 거슬러 올라가지 못하거나 중간에 reset이 있으면 None을 반환한다
+    (구독하는 캐시는 이때 전체를 다시 맞춘다).
+    """
+    if log is None or revision is None:
+        return None
+    current = int(log.get("revision", 0) or 0)
+    if revision == current:
+        return bank_change()
+    if revision > current:
+        return None
+    events = [e for e in log.get("events") or [] if e["revision"] > revision]
+    if not events or events[0]["revision"] != revision + 1 or any(e["reset"] for e in events):
+        return None
+    added = set()
+    updated = {}
+    deleted = set()
+    for event in events:
+        for key in event["added"]:
+            if key in deleted:
+                # 지웠다가 같은 id로 다시 들어온 문항은 내용 전체가 바뀐 것으로 취급
+                deleted.discard(key)
+                updated[key] = {"*"}
+            else:
+                added.add(key)
+        for key, fields in event["updated"].items():
+            if key not in added:
+                updated.setdefault(key, set()).update(fields)
+        for key in event["deleted"]:
+            updated.pop(key, None)
+            if key in added:
+                added.discard(key)
+            else:
+                deleted.add(key)
+    return bank_change(added, updated, deleted)
+
+
+def changed_ids(change, fields=None):
+    """추가됐거나 fields 중 하나가 바뀐 문항 id 집합 (fields가 None이면 모든 수정 포함)"""
+    out = set(change["added"])
+    wanted = set(fields) if fields is not None else None
+    for key, changed in change["updated"].items():
+        if wanted is None or "*" in changed or wanted.intersection(changed):
+            out.add(key)
+    return out
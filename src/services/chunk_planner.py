@@ -0,0 +1,184 @@
+import hashlib
+import json
+import re
+
+from .generation_engine import estimate_tokens
+from .text_search import tokenize
+
+_MARKER = re.compile(r"^=== (?:페이지|슬라이드) \d+ ===[ \t]*$", re.M)
+_SPLITTERS = (
+    re.compile(r"\n[ \t]*\n"),
+    re.compile(r"\n"),
+    re.compile(r"(?<=[.!?。])\s+"),
+)
+
+
+def split_sections(text):
+    """추출기가 남긴 '=== 페이지 N ===' / '=== 슬라이드 N ===' 단위로 나눈다 (표기가 없으면 문단 단위).
+
+    본문 없이 표기만 있는 페이지(이미지 슬라이드 등)는 버린다.
+    """
+    text = text or ""
+    starts = [m.start() for m in _MARKER.finditer(text)]
+    if not starts:
+        return [p.strip() for p in _SPLITTERS[0].split(text) if p.strip()]
+    bounds = ([0] if starts[0] > 0 else []) + starts + [len(text)]
+    sections = []
+    for start, end in zip(bounds, bounds[1:]):
+        section = text[start:end].strip()
+        if _MARKER.sub("", section).strip():
+            sections.append(section)
+    return sections
+
+
+def _fit(unit, max_tokens, estimate, level=0):
+    """예산을 넘는 단위를 문단 → 줄 → 문장 → 글자 순으로 쪼갠다"""
+    if estimate(unit) <= max_tokens:
+        return [unit]
+    if level >= len(_SPLITTERS):
+        step = max(1, len(unit) * max_tokens // max(1, estimate(unit)))
+        return [unit[i:i + step] for i in range(0, len(unit), step)]
+    parts = [p.strip() for p in _SPLITTERS[level].split(unit) if p and p.strip()]
+    if len(parts) <= 1:
+        return _fit(unit, max_tokens, estimate, level + 1)
+    out = []
+    current = ""
+    heading = ""
+    for part in parts:
+        if _MARKER.fullmatch(part):
+            # 페이지 표기는 뒤따르는 본문 첫 조각과 같은 청크에 둔다
+            heading = part
+            continue
+        pieces = _fit(part, max(1, max_tokens - estimate(heading + "\n")) if heading else max_tokens, estimate, level + 1)
+        if heading:
+            pieces[0] = f"{heading}\n{pieces[0]}"
+            heading = ""
+        for piece in pieces:
+            joined = f"{current}\n{piece}" if current else piece
+            if current and estimate(joined) > max_tokens:
+                out.append(current)
+                current = piece
+            else:
+                current = joined
+    if current:
+        out.append(current)
+    return out
+
+
+def split_pages(text):
+    """'=== 페이지 N ===' 표기마다 자른 페이지 목록. 본문 없는 페이지도 남겨 문서 내 위치를 보존한다 (표기가 없으면 한 덩어리)"""
+    text = text or ""
+    starts = [m.start() for m in _MARKER.finditer(text)]
+    if not starts:
+        return [text] if text.strip() else []
+    bounds = ([0] if starts[0] > 0 else []) + starts + [len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def new_chunk_stream(max_tokens, overlap_tokens=0, total_items=0, total_pages=0, estimate=estimate_tokens):
+    """페이지가 도착하는 대로 청크를 확정하는 계획기 상태 (plan_chunks의 점진 버전).
+
+    total_items를 주면 확정된 청크마다 문서 내 위치(끝난 페이지 비율)까지의 문항 수를 누적 배분한다.
+    합계는 finish_chunk_stream에서 정확히 total_items가 된다.
+    """
+    return {
+        "max_tokens": max(1, int(max_tokens)),
+        "overlap_tokens": overlap_tokens,
+        "estimate": estimate,
+        "group": [],
+        "size": 0,
+        "pages": 0,
+        "total_pages": int(total_pages or 0),
+        "total_items": int(total_items or 0),
+        "allocated": 0,
+    }
+
+
+def _close_group(state, final=False):
+    group = state["group"]
+    chunk_text = "\n\n".join(unit for unit, _, _ in group)
+    chunk = {"text": chunk_text, "tokens": state["estimate"](chunk_text), "density": len(set(tokenize(chunk_text)))}
+    total_items = state["total_items"]
+    if total_items:
+        if final:
+            target = total_items
+        else:
+            target = min(total_items, int(total_items * group[-1][2] / max(1, state["total_pages"]) + 0.5))
+        chunk["items"] = max(0, target - state["allocated"])
+        state["allocated"] += chunk["items"]
+    return chunk
+
+
+def feed_chunk_stream(state, section, total_pages=None):
+    """페이지(또는 문단) 하나를 넣고 이번에 확정된 청크 목록을 반환 (다음 단위가 예산을 넘칠 때 확정)"""
+    if total_pages:
+        state["total_pages"] = int(total_pages)
+    page_index = state["pages"]
+    state["pages"] += 1
+    section = (section or "").strip()
+    if not _MARKER.sub("", section).strip():
+        return []
+    max_tokens = state["max_tokens"]
+    estimate = state["estimate"]
+    units = _fit(section, max_tokens, estimate)
+    out = []
+    for k, unit in enumerate(units):
+        tokens = estimate(unit)
+        position = page_index + (k + 1) / len(units)
+        group = state["group"]
+        if group and state["size"] + tokens > max_tokens:
+            out.append(_close_group(state))
+            carry = group[-1]
+            overlap_tokens = state["overlap_tokens"]
+            if overlap_tokens and len(group) > 1 and carry[1] <= overlap_tokens and carry[1] + tokens <= max_tokens:
+                state["group"], state["size"] = [carry], carry[1]
+            else:
+                state["group"], state["size"] = [], 0
+        state["group"].append((unit, tokens, position))
+        state["size"] += tokens
+    return out
+
+
+def finish_chunk_stream(state):
+    """남은 단위를 마지막 청크로 확정"""
+    if not state["group"]:
+        return []
+    chunk = _close_group(state, final=True)
+    state["group"], state["size"] = [], 0
+    return [chunk]
+
+
+def plan_chunks(text, max_tokens, overlap_tokens=0, estimate=estimate_tokens):
+    """페이지/슬라이드/문단을 통째로 max_tokens까지 채운 청크 목록.
+
+    overlap_tokens > 0이면 직전 청크의 마지막 단위가 그 크기 이하일 때만 다음 청크 앞에 다시 붙인다
+    (글자 수로 자른 중첩과 달리 문장 중간에서 시작하지 않는다).
+    Returns: [{"text", "tokens", "density"}] (density는 서로 다른 용어 수)
+    """
+    state = new_chunk_stream(max_tokens, overlap_tokens, estimate=estimate)
+    chunks = []
+    for section in split_sections(text):
+        chunks.extend(feed_chunk_stream(state, section))
+    return chunks + finish_chunk_stream(state)
+
+
+def allocate_items(weights, total):
+    """total개 문항을 weights 비율로 나눈다 (최대 잉여 방식, 합계는 항상 total)"""
+    weights = [max(0.0, float(w or 0)) for w in weights]
+    if total <= 0 or not weights:
+        return [0] * len(weights)
+    if sum(weights) == 0:
+        weights = [1.0] * len(weights)
+    scale = total / sum(weights)
+    quotas = [w * scale for w in weights]
+    counts = [int(q) for q in quotas]
+    order = sorted(range(len(weights)), key=lambda i: (counts[i] - quotas[i], i))
+    for i in order[: total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def chunk_fingerprint(text, *params):
+    """청크 원문과 생성 조건(문항 수/모드/모델 등)의 내용 해시. 청크 체크포인트의 키로 쓴다"""
+    payload = json.dumps([text, *params], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
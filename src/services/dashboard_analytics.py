@@ -0,0 +1,118 @@
+import time
+from datetime import date, datetime, timedelta, timezone
+
+HEATMAP_DAYS = 365
+_EPOCH_DATE = date(1970, 1, 1)
+
+
+def _epoch(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def build_dashboard_snapshot(bank, log_index=None, now=None, window_days=HEATMAP_DAYS, recent_days=7):
+    """홈 대시보드 지표를 문제은행 한 번 순회로 집계.
+
+    문항 수/정답률/오답 집계와, 풀이 이력(문항 내장 + 분리 로그)을 UTC 일자별 [정답, 전체]로 모은
+    days를 만든다. 히트맵/추이/최근 정답률은 days에서 바로 계산한다.
+    """
+    started = time.perf_counter()
+    check_time = now or datetime.now(timezone.utc)
+    now_epoch = check_time.timestamp()
+    today = int(now_epoch // 86400)
+    first_day = today - window_days + 1
+    recent_cutoff = now_epoch - recent_days * 86400
+    log_index = log_index or {}
+
+    right = wrong = wrong_items = 0
+    recent_correct = recent_total = 0
+    days = {}
+    counts = {}
+    for qtype in ("text", "cloze"):
+        questions = bank.get(qtype, []) or []
+        counts[qtype] = len(questions)
+        for q in questions:
+            stats = q.get("stats") or {}
+            q_wrong = int(stats.get("wrong", 0) or 0)
+            right += int(stats.get("right", 0) or 0)
+            wrong += q_wrong
+            if q_wrong > 0:
+                wrong_items += 1
+            entries = [
+                (_epoch(e.get("time")), e.get("correct") is True)
+                for e in (stats.get("history") or [])
+                if isinstance(e, dict)
+            ]
+            rows = log_index.get(q.get("id")) if q.get("id") else None
+            if rows:
+                entries.extend((ts, value == 1) for kind, value, ts, _, _ in rows if kind == 0)
+            for ts, correct in entries:
+                if ts is None:
+                    continue
+                if ts >= recent_cutoff:
+                    recent_total += 1
+                    recent_correct += int(correct)
+                day = int(ts // 86400)
+                if first_day <= day <= today:
+                    bucket = days.get(day)
+                    if bucket is None:
+                        bucket = days[day] = [0, 0]
+                    bucket[0] += int(correct)
+                    bucket[1] += 1
+    return {
+        "today": today,
+        "window_days": window_days,
+        "total_text": counts["text"],
+        "total_cloze": counts["cloze"],
+        "right": right,
+        "wrong": wrong,
+        "wrong_items": wrong_items,
+        "recent_days": recent_days,
+        "recent": {
+            "correct": recent_correct,
+            "total": recent_total,
+            "accuracy": (recent_correct / recent_total * 100) if recent_total else None,
+        },
+        "days": days,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def dashboard_overall_accuracy(snapshot):
+    """{"correct", "wrong", "total", "accuracy"} (풀이 기록이 없으면 None)"""
+    total = snapshot["right"] + snapshot["wrong"]
+    if total == 0:
+        return None
+    return {"correct": snapshot["right"], "wrong": snapshot["wrong"], "total": total, "accuracy": snapshot["right"] / total * 100}
+
+
+def _day_range(snapshot, days):
+    days = min(days, snapshot["window_days"])
+    start = snapshot["today"] - days + 1
+    return start, [start + i for i in range(days)]
+
+
+def dashboard_heatmap(snapshot, days=HEATMAP_DAYS):
+    """최근 days일의 {"date", "dow", "week_index", "count", "accuracy"} 행 (히트맵용)"""
+    start, ordinals = _day_range(snapshot, days)
+    rows = []
+    for ordinal in ordinals:
+        correct, total = snapshot["days"].get(ordinal, (0, 0))
+        d = _EPOCH_DATE + timedelta(days=ordinal)
+        rows.append({
+            "date": d,
+            "dow": d.weekday(),
+            "week_index": (ordinal - start) // 7,
+            "count": total,
+            "accuracy": (correct / total * 100) if total > 0 else 0,
+        })
+    return rows
@@ -0,0 +1,229 @@
+import concurrent.futures
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+EXTRACTABLE_EXTENSIONS = (".pdf", ".pptx", ".docx")
+# zip 폭탄 방지: 풀었을 때의 합계(선언된 file_size 기준)와 항목 수 상한
+MAX_UPLOAD_EXPANDED_BYTES = 512 * 1024 * 1024
+MAX_ZIP_MEMBERS = 2000
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+_OCR_READERS = {}
+
+
+def get_ocr_reader(langs):
+    """easyocr Reader (언어 조합별로 프로세스마다 한 번만 모델을 올린다). 미설치면 None"""
+    langs = tuple(langs)
+    if langs not in _OCR_READERS:
+        try:
+            import easyocr
+        except Exception:
+            _OCR_READERS[langs] = None
+        else:
+            _OCR_READERS[langs] = easyocr.Reader(list(langs), gpu=False)
+    return _OCR_READERS[langs]
+
+
+def ocr_image_bytes(image_bytes, langs=("ko", "en")):
+    """이미지(PNG 등) bytes를 OCR해 위→아래, 왼쪽→오른쪽 순서의 줄 텍스트로"""
+    reader = get_ocr_reader(langs)
+    if reader is None:
+        raise ValueError("easyocr 미설치")
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
+        tmp.write(image_bytes)
+        tmp_path = tmp.name
+    try:
+        results = reader.readtext(tmp_path, detail=1, paragraph=False)
+    finally:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+    def bbox_key(item):
+        bbox = item[0] if isinstance(item, (list, tuple)) and item else None
+        if not bbox:
+            return (0, 0)
+        return (min(p[1] for p in bbox), min(p[0] for p in bbox))
+
+    lines = [str(r[1]).strip() for r in sorted(results or [], key=bbox_key) if len(r) > 1 and str(r[1]).strip()]
+    return "\n".join(lines)
+
+
+def iter_pdf_pages(data, ocr=True, ocr_langs=("ko", "en"), ocr_max_pages=0, min_text_len=200, zoom=2.0):
+    """PDF 페이지별 (번호, 전체 페이지 수, 텍스트).
+
+    텍스트 레이어가 min_text_len 미만인 스캔 PDF는 페이지마다 OCR해 끝나는 대로 낸다.
+    """
+    import fitz
+
+    doc = fitz.open(stream=data, filetype="pdf")
+    try:
+        texts = [page.get_text() for page in doc]
+        scanned = len("".join(texts).strip()) < min_text_len
+        if not scanned or not ocr or importlib.util.find_spec("easyocr") is None:
+            for i, text in enumerate(texts):
+                yield i + 1, len(texts), text
+            return
+        limit = len(texts) if not ocr_max_pages else min(len(texts), ocr_max_pages)
+        for i in range(limit):
+            try:
+                pix = doc.load_page(i).get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                text = ocr_image_bytes(pix.tobytes("png"), ocr_langs) or texts[i]
+            except Exception:
+                text = texts[i]
+            yield i + 1, limit, text
+    finally:
+        doc.close()
+
+
+def iter_pptx_slides(data):
+    from pptx import Presentation
+
+    slides = list(Presentation(io.BytesIO(data)).slides)
+    for number, slide in enumerate(slides, 1):
+        text = "".join(shape.text + "\n" for shape in slide.shapes if hasattr(shape, "text"))
+        yield number, len(slides), text
+
+
+def iter_docx_text(data):
+    from docx import Document
+
+    doc = Document(io.BytesIO(data))
+    lines = [p.text for p in doc.paragraphs]
+    for table in doc.tables:
+        for row in table.rows:
+            lines.extend(cell.text for cell in row.cells)
+    yield 1, 1, "".join(line + "\n" for line in lines)
+
+
+def iter_document_pages(data, ext, **options):
+    if ext == ".pdf":
+        return iter_pdf_pages(data, **options)
+    if ext == ".pptx":
+        return iter_pptx_slides(data)
+    if ext == ".docx":
+        return iter_docx_text(data)
+    raise ValueError(f"지원하지 않는 파일 형식: {ext}")
+
+
+def expand_upload_sources(files, extensions=EXTRACTABLE_EXTENSIONS, max_bytes=MAX_UPLOAD_EXPANDED_BYTES, max_members=MAX_ZIP_MEMBERS):
+    """[(파일명, bytes)] 중 zip은 목록만 읽어 extensions에 해당하는 파일을 [(상대 경로, 크기, 파일 번호, zip 항목명)]로 (폴더째 올릴 때)
+
+    내용은 읽지 않으므로 read_upload_source로 필요할 때 꺼낸다 (zip이 아닌 파일은 zip 항목명이 None).
+    항목 수가 max_members를 넘거나 풀었을 때 합계가 max_bytes를 넘는 zip은 ValueError.
+    """
+    sources = []
+    expanded = 0
+    for index, (name, data) in enumerate(files):
+        if Path(name).suffix.lower() != ".zip":
+            if Path(name).suffix.lower() in extensions:
+                sources.append((name, len(data), index, None))
+            continue
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            infos = archive.infolist()
+            if len(infos) > max_members:
+                raise ValueError(f"{name}: zip 안 항목이 너무 많습니다 ({len(infos):,}개, 최대 {max_members:,}개)")
+            for info in sorted(infos, key=lambda info: info.filename):
+                parts = Path(info.filename).parts
+                if info.is_dir() or any(part.startswith((".", "__MACOSX")) for part in parts):
+                    continue
+                if Path(info.filename).suffix.lower() in extensions:
+                    expanded += info.file_size
+                    if expanded > max_bytes:
+                        raise ValueError(f"{name}: 압축을 푼 크기가 너무 큽니다 (최대 {max_bytes // (1024 * 1024):,}MB)")
+                    sources.append((info.filename, info.file_size, index, info.filename))
+    return sources
+
+
+def read_upload_source(files, source):
+    """expand_upload_sources가 돌려준 항목의 내용 (files는 목록을 만들 때와 같은 [(파일명, bytes)])"""
+    _, _, index, member = source
+    data = files[index][1]
+    if member is None:
+        return data
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return archive.read(member)
+
+
+def format_page(ext, number, text):
+    """청크 계획기가 페이지/슬라이드 경계를 알 수 있도록 표기를 붙인다"""
+    if ext == ".pptx":
+        return f"=== 슬라이드 {number} ===\n{text}"
+    if ext == ".pdf":
+        return f"=== 페이지 {number} ===\n{text}"
+    return text
+
+
+def run_document_extraction(source_path, pages_path, cancel_path=None, **options):
+    """원본 파일을 페이지 단위로 추출해 pages_path(JSONL)에 한 줄씩 덧붙인다 (워커 프로세스에서 실행).
+
+    각 줄은 {"page", "total", "text"}이고 마지막 줄은 {"done", "pages", "elapsed_ms"} 또는 {"error"}.
+    cancel_path 파일이 생기면 다음 페이지로 넘어가기 전에 멈춘다.
+    """
+    started = time.perf_counter()
+    ext = Path(source_path).suffix.lower()
+    count = 0
+    with open(pages_path, "a", encoding="utf-8") as out:
+
+        def write(record):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+        try:
+            data = Path(source_path).read_bytes()
+            for number, total, text in iter_document_pages(data, ext, **options):
+                if cancel_path and os.path.exists(cancel_path):
+                    write({"error": "cancelled"})
+                    return {"ok": False, "pages": count, "error": "cancelled"}
+                write({"page": number, "total": total, "text": format_page(ext, number, text)})
+                count += 1
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            write({"error": error})
+            return {"ok": False, "pages": count, "error": error}
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        write({"done": True, "pages": count, "elapsed_ms": elapsed_ms})
+    return {"ok": True, "pages": count, "elapsed_ms": elapsed_ms}
+
+
+def read_extracted_pages(pages_path, offset=0):
+    """offset 이후 줄바꿈까지 완성된 레코드만 읽는다. Returns: (레코드 목록, 다음 offset)"""
+    try:
+        with open(pages_path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except OSError:
+        return [], offset
+    cut = data.rfind(b"\n")
+    if cut < 0:
+        return [], offset
+    records = [json.loads(line) for line in data[:cut].decode("utf-8").splitlines() if line.strip()]
+    return records, offset + cut + 1
+
+
+def _get_executor():
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            # 추출/OCR이 Streamlit 스크립트 스레드와 GIL을 다투지 않도록 spawn 프로세스에서 실행
+            _EXECUTOR = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max(1, (os.cpu_count() or 2) // 2),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _EXECUTOR
+
+
+def submit_document_extraction(source_path, pages_path, cancel_path=None, executor=None, **options):
+    """문서 추출을 별도 프로세스에 제출하고 Future를 반환 (진행 상황은 pages_path로 확인)"""
+    pool = executor or _get_executor()
+    return pool.submit(run_document_extraction, str(source_path), str(pages_path), str(cancel_path) if cancel_path else None, **options)
@@ -0,0 +1,280 @@
+from bisect import bisect_left, bisect_right, insort
+
+FACET_FIELDS = ("subject", "unit", "type", "difficulty", "batch_id", "wrong", "due")
+POSTING_FIELDS = ("subject", "type", "difficulty", "batch_id", "wrong")
+
+
+def _new_node():
+    return {"total": 0, "wrong": 0, "new": 0, "types": {}, "difficulty": {}, "due": [], "children": {}}
+
+
+def new_facet_index():
+    """빈 facet index.
+
+    rows는 {키: 행}, root는 전체→분과→단원 집계 트리.
+    postings는 {필드: {값: 비트셋}}으로, 각 키는 slots에서 받은 비트 번호를 가진다.
+    """
+    return {
+        "rows": {},
+        "root": _new_node(),
+        "slots": {},
+        "keys": [],
+        "free": [],
+        "postings": {field: {} for field in POSTING_FIELDS + ("subject_unit",)},
+        "due_order": [],
+        "new_bits": 0,
+    }
+
+
+def _bump(counter, key, delta):
+    value = counter.get(key, 0) + delta
+    if value > 0:
+        counter[key] = value
+    else:
+        counter.pop(key, None)
+
+
+def _apply(node, row, delta):
+    node["total"] += delta
+    node["wrong"] += delta if row["wrong"] else 0
+    _bump(node["types"], row["type"], delta)
+    _bump(node["difficulty"], row["difficulty"], delta)
+    due = row["due"]
+    if due is None:
+        node["new"] += delta
+    elif delta > 0:
+        insort(node["due"], due)
+    else:
+        pos = bisect_left(node["due"], due)
+        if pos < len(node["due"]) and node["due"][pos] == due:
+            del node["due"][pos]
+
+
+def _posting_values(row):
+    values = [(field, row[field]) for field in POSTING_FIELDS]
+    values.append(("subject_unit", (row["subject"], row["unit"])))
+    return values
+
+
+def _index_postings(index, key, row):
+    free = index["free"]
+    if free:
+        slot = free.pop()
+        index["keys"][slot] = key
+    else:
+        slot = len(index["keys"])
+        index["keys"].append(key)
+    index["slots"][key] = slot
+    bit = 1 << slot
+    for field, value in _posting_values(row):
+        postings = index["postings"][field]
+        postings[value] = postings.get(value, 0) | bit
+    if row["due"] is None:
+        index["new_bits"] |= bit
+    else:
+        insort(index["due_order"], (row["due"], slot))
+
+
+def _unindex_postings(index, key, row):
+    slot = index["slots"].pop(key)
+    index["keys"][slot] = None
+    index["free"].append(slot)
+    mask = ~(1 << slot)
+    for field, value in _posting_values(row):
+        postings = index["postings"][field]
+        bits = postings.get(value, 0) & mask
+        if bits:
+            postings[value] = bits
+        else:
+            postings.pop(value, None)
+    if row["due"] is None:
+        index["new_bits"] &= mask
+    else:
+        due_order = index["due_order"]
+        pos = bisect_left(due_order, (row["due"], slot))
+        if pos < len(due_order) and due_order[pos] == (row["due"], slot):
+            del due_order[pos]
+
+
+def _path(index, row, create):
+    nodes = [index["root"]]
+    for key in (row["subject"], row["unit"]):
+        children = nodes[-1]["children"]
+        child = children.get(key)
+        if child is None:
+            if not create:
+                break
+            child = children[key] = _new_node()
+        nodes.append(child)
+    return nodes
+
+
+def facet_add(index, key, row):
+    """행 하나를 추가 (같은 키가 있으면 교체)"""
+    if key in index["rows"]:
+        facet_remove(index, key)
+    row = {field: row.get(field) for field in FACET_FIELDS}
+    index["rows"][key] = row
+    for node in _path(index, row, create=True):
+        _apply(node, row, 1)
+    _index_postings(index, key, row)
+
+
+def facet_remove(index, key):
+    row = index["rows"].pop(key, None)
+    if row is None:
+        return False
+    _unindex_postings(index, key, row)
+    nodes = _path(index, row, create=False)
+    for node in nodes:
+        _apply(node, row, -1)
+    # 비어버린 단원/분과 노드 정리
+    if len(nodes) == 3 and nodes[2]["total"] <= 0:
+        nodes[1]["children"].pop(row["unit"], None)
+    if len(nodes) >= 2 and nodes[1]["total"] <= 0:
+        nodes[0]["children"].pop(row["subject"], None)
+    return True
+
+
+def sync_facet_index(index, rows):
+    """새 행 목록({키: 행})과 비교해 바뀐 행만 제거/추가. (추가, 삭제, 변경) 수를 반환"""
+    current = index["rows"]
+    removed = [key for key in current if key not in rows]
+    for key in removed:
+        facet_remove(index, key)
+    added = 0
+    changed = 0
+    for key, row in rows.items():
+        previous = current.get(key)
+        if previous is None:
+            facet_add(index, key, row)
+            added += 1
+        elif any(previous[field] != row.get(field) for field in FACET_FIELDS):
+            facet_add(index, key, row)
+            changed += 1
+    return added, len(removed), changed
+
+
+def _node_for(index, subject=None, unit=None):
+    node = index["root"]
+    for key in (subject, unit):
+        if key is None:
+            break
+        node = node["children"].get(key)
+        if node is None:
+            return None
+    return node
+
+
+def _has_type(node, qtype):
+    return qtype is None or node["types"].get(qtype, 0) > 0
+
+
+def facet_subjects(index, qtype=None):
+    return sorted(k for k, node in index["root"]["children"].items() if _has_type(node, qtype))
+
+
+def facet_subject_unit_map(index, qtype=None):
+    """{분과: [단원, ...]} (qtype을 주면 해당 유형 문항이 있는 분과/단원만)"""
+    out = {}
+    for subject, node in index["root"]["children"].items():
+        if not _has_type(node, qtype):
+            continue
+        out[subject] = sorted(u for u, unit_node in node["children"].items() if _has_type(unit_node, qtype))
+    return out
+
+
+def facet_values(index, field, subject=None):
+    """집계 필드(types/difficulty)의 값 목록"""
+    node = _node_for(index, subject)
+    return sorted((node or {}).get(field, {}))
+
+
+def facet_counts(index, now_epoch, subject=None, unit=None):
+    """노드 집계: total/due/overdue/future/new/wrong. due는 now 이전 예정 + 신규"""
+    node = _node_for(index, subject, unit)
+    if node is None:
+        return {"total": 0, "due": 0, "overdue": 0, "future": 0, "new": 0, "wrong": 0}
+    scheduled = node["due"]
+    due = bisect_right(scheduled, now_epoch)
+    return {
+        "total": node["total"],
+        "due": due + node["new"],
+        "overdue": bisect_left(scheduled, now_epoch),
+        "future": len(scheduled) - due,
+        "new": node["new"],
+        "wrong": node["wrong"],
+    }
+
+
+def _union(postings, values):
+    bits = 0
+    for value in values:
+        bits |= postings.get(value, 0)
+    return bits
+
+
+def _due_bits(index, now_epoch):
+    due_order = index["due_order"]
+    end = bisect_right(due_order, (now_epoch, float("inf")))
+    # 비트를 하나씩 OR하면 큰 정수를 매번 복사하므로 바이트 버퍼에 모아 한 번에 변환
+    buf = bytearray((len(index["keys"]) + 7) // 8)
+    for _, slot in due_order[:end]:
+        buf[slot >> 3] |= 1 << (slot & 7)
+    return index["new_bits"] | int.from_bytes(buf, "little")
+
+
+def _all_bits(index):
+    bits = 0
+    for value in index["postings"]["type"].values():
+        bits |= value
+    return bits
+
+
+def facet_query(index, spec, now_epoch=None):
+    """필터 spec을 비트셋 연산으로 풀어 결과 비트셋을 반환.
+
+    spec의 필드끼리는 AND, 한 필드의 값 목록은 OR.
+    - subject/type/difficulty/batch_id: 값 또는 값 목록
+    - subject_units: {분과: [단원, ...]} (분과별 단원 계층 필터)
+    - wrong: True/False, due: True/False (due는 now_epoch 기준, 신규 포함)
+    - any: [spec, ...] 하위 spec들의 OR
+    """
+    bits = _all_bits(index)
+    postings = index["postings"]
+    for field, wanted in (spec or {}).items():
+        if wanted is None:
+            continue
+        if field == "any":
+            alt = 0
+            for sub in wanted:
+                alt |= facet_query(index, sub, now_epoch=now_epoch)
+            bits &= alt
+        elif field == "subject_units":
+            pairs = [(subject, unit) for subject, units in wanted.items() for unit in units or []]
+            bits &= _union(postings["subject_unit"], pairs)
+        elif field == "due":
+            if now_epoch is None:
+                raise ValueError("due 필터에는 now_epoch가 필요합니다.")
+            due = _due_bits(index, now_epoch)
+            bits &= due if wanted else ~due
+        elif field == "wrong":
+            bits &= postings["wrong"].get(bool(wanted), 0)
+        elif field in postings:
+            values = [wanted] if isinstance(wanted, str) else list(wanted)
+            bits &= _union(postings[field], values)
+        else:
+            raise KeyError(f"지원하지 않는 필터 필드: {field}")
+    return bits
+
+
+def facet_query_keys(index, spec, now_epoch=None):
+    """facet_query 결과를 키 목록으로 변환 (비트 번호 순)"""
+    bits = facet_query(index, spec, now_epoch=now_epoch)
+    keys = index["keys"]
+    out = []
+    while bits:
+        low = bits & -bits
+        out.append(keys[low.bit_length() - 1])
+        bits ^= low
+    return out
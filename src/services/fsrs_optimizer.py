@@ -0,0 +1,200 @@
+import concurrent.futures
+import hashlib
+import json
+import math
+import multiprocessing
+import threading
+import time
+from datetime import datetime, timezone
+
+MIN_REVIEWS_FOR_OPTIMIZATION = 50
+# 카드 5장 중 1장꼴로 학습에서 빼 두고 손실(적합 품질)을 잰다
+HOLDOUT_BUCKETS = 5
+# 카드당 앞쪽 리뷰만 평가 (fsrs Optimizer가 학습에 쓰는 구간과 같다)
+MAX_EVAL_REVIEWS_PER_CARD = 64
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _logs_signature(logs):
+    if not logs:
+        return "0"
+    tail = str(logs[-1]).encode("utf-8")
+    return f"{len(logs)}:{hashlib.sha256(tail).hexdigest()[:12]}"
+
+
+def _parse_review_log(raw):
+    try:
+        data = json.loads(raw) if isinstance(raw, str) else raw
+        if not isinstance(data, dict):
+            return None
+        reviewed = datetime.fromisoformat(str(data["review_datetime"]).replace("Z", "+00:00"))
+        if reviewed.tzinfo is None:
+            reviewed = reviewed.replace(tzinfo=timezone.utc)
+        duration = data.get("review_duration")
+        return [
+            int(data["card_id"]),
+            int(data["rating"]),
+            reviewed.timestamp(),
+            int(duration) if duration is not None else None,
+        ]
+    except Exception:
+        return None
+
+
+def extract_review_rows(questions, cache=None):
+    """문항의 fsrs.logs를 [card_id, rating, epoch, duration] 행으로 변환.
+
+    cache는 이전 추출 결과({문항 id: {"sig", "rows"}})이며, 로그가 바뀌지 않은 문항은
+    다시 파싱하지 않고 재사용한다. 50개 상한으로 밀려난 과거 로그도 cache에 남아 학습에 쓰인다.
+    """
+    previous = cache if isinstance(cache, dict) else {}
+    next_cache = {}
+    rows = []
+    reused = 0
+    parsed = 0
+    for q in questions or []:
+        if not isinstance(q, dict) or not q.get("id"):
+            continue
+        logs = (q.get("fsrs") or {}).get("logs") or []
+        if not logs:
+            continue
+        q_id = str(q["id"])
+        sig = _logs_signature(logs)
+        entry = previous.get(q_id)
+        if isinstance(entry, dict) and entry.get("sig") == sig:
+            item_rows = entry.get("rows") or []
+            reused += 1
+        else:
+            fresh = [row for row in (_parse_review_log(raw) for raw in logs) if row]
+            known = {(row[0], row[2]) for row in fresh}
+            retained = []
+            if isinstance(entry, dict):
+                retained = [row for row in entry.get("rows") or [] if (row[0], row[2]) not in known]
+            item_rows = sorted(retained + fresh, key=lambda row: row[2])
+            parsed += 1
+        next_cache[q_id] = {"sig": sig, "rows": item_rows}
+        rows.extend(item_rows)
+    return rows, next_cache, {"reused": reused, "parsed": parsed, "rows": len(rows)}
+
+
+def _rows_to_review_logs(rows):
+    from fsrs import Rating, ReviewLog
+
+    logs = []
+    for card_id, rating, ts, duration in rows:
+        logs.append(
+            ReviewLog(
+                card_id=int(card_id),
+                rating=Rating(int(rating)),
+                review_datetime=datetime.fromtimestamp(float(ts), tz=timezone.utc),
+                review_duration=duration,
+            )
+        )
+    return logs
+
+
+def _load_optimizer_class():
+    from fsrs.optimizer import Optimizer
+
+    return Optimizer
+
+
+def _is_holdout_card(card_id):
+    digest = hashlib.sha256(str(card_id).encode("utf-8")).digest()
+    return digest[0] % HOLDOUT_BUCKETS == 0
+
+
+def split_holdout_rows(rows):
+    """카드 단위로 (학습 행, 평가 행)으로 나눈다. 어느 한쪽이 비면 평가도 학습 행으로 한다"""
+    train = [row for row in rows if not _is_holdout_card(row[0])]
+    holdout = [row for row in rows if _is_holdout_card(row[0])]
+    if not train or not holdout:
+        return list(rows), list(rows)
+    return train, holdout
+
+
+def review_log_loss(rows, parameters=None):
+    """parameters로 복습 시점의 기억 확률을 예측했을 때 실제 결과(다시=0, 나머지=1)에 대한 평균 BCE 손실.
+
+    fsrs의 공개 Scheduler로 카드마다 리뷰를 순서대로 다시 적용하며, 같은 날 반복한 리뷰는 평가하지 않는다.
+    평가할 리뷰가 없으면 None.
+    """
+    from fsrs import Card, Rating, Scheduler
+
+    scheduler = Scheduler(parameters=parameters, enable_fuzzing=False) if parameters else Scheduler(enable_fuzzing=False)
+    by_card = {}
+    for card_id, rating, ts, _ in sorted(rows, key=lambda row: (row[0], row[2])):
+        by_card.setdefault(int(card_id), []).append((int(rating), datetime.fromtimestamp(float(ts), tz=timezone.utc)))
+    total = 0.0
+    count = 0
+    for card_id, reviews in by_card.items():
+        card = Card(card_id=card_id, due=reviews[0][1])
+        for rating, reviewed in reviews[:MAX_EVAL_REVIEWS_PER_CARD]:
+            if card.last_review and (reviewed - card.last_review).days > 0:
+                predicted = min(max(scheduler.get_card_retrievability(card, reviewed), 1e-7), 1 - 1e-7)
+                total -= math.log(predicted) if rating > Rating.Again else math.log(1 - predicted)
+                count += 1
+            card, _ = scheduler.review_card(card, Rating(rating), review_datetime=reviewed)
+    return total / count if count else None
+
+
+def fit_fsrs_parameters(rows, base_parameters=None, optimizer_factory=None):
+    """리뷰 로그 행으로 FSRS 파라미터를 최적화 (워커 프로세스에서 실행).
+
+    학습에서 빼 둔 카드(split_holdout_rows)의 로그로 잰 평균 BCE 손실을 loss_before/loss_after로 반환해
+    적합 품질 지표로 사용한다.
+    """
+    started = time.perf_counter()
+    rows = list(rows or [])
+    card_count = len({row[0] for row in rows})
+    result = {
+        "ok": False,
+        "review_count": len(rows),
+        "card_count": card_count,
+        "parameters": list(base_parameters or []),
+        "loss_before": None,
+        "loss_after": None,
+        "elapsed_ms": 0,
+        "error": "",
+    }
+    if len(rows) < MIN_REVIEWS_FOR_OPTIMIZATION:
+        result["error"] = f"복습 기록이 부족합니다 ({len(rows)}/{MIN_REVIEWS_FOR_OPTIMIZATION})."
+        return result
+    try:
+        train, holdout = split_holdout_rows(rows)
+        factory = optimizer_factory or _load_optimizer_class()
+        optimizer = factory(_rows_to_review_logs(train))
+        parameters = [float(x) for x in optimizer.compute_optimal_parameters()]
+        try:
+            if base_parameters:
+                result["loss_before"] = review_log_loss(holdout, list(base_parameters))
+            result["loss_after"] = review_log_loss(holdout, parameters)
+        except Exception:
+            pass
+        result.update({"ok": True, "parameters": parameters})
+    except ImportError as exc:
+        result["error"] = str(exc)
+    except Exception as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    result["elapsed_ms"] = int((time.perf_counter() - started) * 1000)
+    return result
+
+
+def _get_executor():
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            # Streamlit 스레드와 fork가 섞이지 않도록 spawn 사용
+            _EXECUTOR = concurrent.futures.ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _EXECUTOR
+
+
+def submit_fsrs_optimization(rows, base_parameters=None, executor=None):
+    """최적화를 별도 프로세스에 제출하고 Future를 반환"""
+    pool = executor or _get_executor()
+    return pool.submit(fit_fsrs_parameters, list(rows or []), list(base_parameters or []))
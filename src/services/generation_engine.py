@@ -0,0 +1,215 @@
+import asyncio
+import collections
+import concurrent.futures
+import random
+import threading
+
+from .rate_limiter import AdaptiveTokenBucket, rate_limit_details
+
+# 제공자별 기본 한도. 실제 계정 한도에 맞춰 환경변수로 덮어쓴다.
+DEFAULT_PROVIDER_LIMITS = {
+    "gemini": {"concurrency": 8, "rpm": 60, "tpm": 1_000_000},
+    "openai": {"concurrency": 8, "rpm": 500, "tpm": 200_000},
+}
+_FALLBACK_LIMIT = {"concurrency": 4, "rpm": 60, "tpm": 100_000}
+CHARS_PER_TOKEN = 2
+
+_ENGINE = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def estimate_tokens(text, output_tokens=0):
+    """요청 토큰 수 추정 (한국어/영어 혼합 기준 2자당 1토큰 + 최대 출력 토큰)"""
+    return len(text or "") // CHARS_PER_TOKEN + int(output_tokens or 0)
+
+
+class _FairGate:
+    """제공자 동시 요청 슬롯을 그룹(작업/파일)마다 돌아가며 내주는 semaphore.
+
+    청크를 많이 넣은 그룹이 먼저 줄을 서도 나중에 온 그룹이 그 뒤에서 기다리지 않고 한 번씩 번갈아 슬롯을 받는다.
+    같은 그룹 안에서는 들어온 순서를 지킨다.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters = collections.OrderedDict()
+
+    async def acquire(self, group=None):
+        if self.in_use < self.limit and not self._waiters:
+            self.in_use += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(group, collections.deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # 슬롯을 넘겨받은 직후 취소됐다면 다음 대기자에게 돌려준다
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            group, waiters = next(iter(self._waiters.items()))
+            waiter = waiters.popleft()
+            if waiters:
+                self._waiters.move_to_end(group)
+            else:
+                del self._waiters[group]
+            if not waiter.done():
+                # 사용 중인 슬롯 수는 그대로 두고 대기자에게 넘긴다
+                waiter.set_result(None)
+                return
+        self.in_use -= 1
+
+
+class GenerationEngine:
+    """프로세스 전체가 공유하는 asyncio 생성 엔진.
+
+    이벤트 루프는 전용 스레드에서 돌고, 제공자별 동시 요청 슬롯과 분당 요청/토큰 버킷을
+    모든 세션이 함께 쓴다. 슬롯은 작업의 group(생성 작업/파일)마다 번갈아 배정된다. 각 작업의 call()은 동기 SDK 호출이라 스레드 풀에서 실행된다.
+    call()이 429 예외를 던지면 버킷 속도를 줄이고 retry_after(없으면 지수 백오프) 뒤 max_retries번까지 다시 보낸다.
+    """
+
+    def __init__(self, limits=None, max_threads=64, window=60.0, max_retries=4, backoff=1.0):
+        self.window = window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._limits = {}
+        self._gates = {}
+        self._buckets = {}
+        self._stats = {}
+        self._loop = asyncio.new_event_loop()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="generation")
+        self._thread = threading.Thread(target=self._loop.run_forever, name="generation-engine", daemon=True)
+        self._thread.start()
+        for provider, limit in (limits or DEFAULT_PROVIDER_LIMITS).items():
+            self.configure(provider, **limit)
+
+    def configure(self, provider, concurrency=None, rpm=None, tpm=None):
+        """제공자 한도 변경. 이미 실행 중인 요청은 이전 한도로 끝나고 새 요청부터 적용"""
+        limit = dict(self._limits.get(provider) or DEFAULT_PROVIDER_LIMITS.get(provider) or _FALLBACK_LIMIT)
+        for key, value in (("concurrency", concurrency), ("rpm", rpm), ("tpm", tpm)):
+            if value:
+                limit[key] = max(1, int(value))
+        self._limits[provider] = limit
+        return dict(limit)
+
+    def limits(self, provider):
+        return dict(self._limits.get(provider) or self.configure(provider))
+
+    def _gate(self, provider):
+        limit = self.limits(provider)
+        gate = self._gates.get(provider)
+        if gate is None or gate.limit != limit["concurrency"]:
+            gate = self._gates[provider] = _FairGate(limit["concurrency"])
+        return gate
+
+    def _bucket(self, provider):
+        limit = self.limits(provider)
+        bucket = self._buckets.get(provider)
+        if bucket is None or (bucket.rpm, bucket.tpm) != (limit["rpm"], limit["tpm"]):
+            bucket = self._buckets[provider] = AdaptiveTokenBucket(limit["rpm"], limit["tpm"], window=self.window)
+        return bucket
+
+    async def _run_one(self, task):
+        provider = task.get("provider") or "default"
+        stats = self._stats.setdefault(provider, {"in_flight": 0, "peak": 0, "completed": 0, "failed": 0, "throttled": 0})
+        tokens = int(task.get("tokens") or 0)
+        attempt = 0
+        while True:
+            bucket = self._bucket(provider)
+            gate = self._gate(provider)
+            await gate.acquire(task.get("group"))
+            try:
+                await bucket.acquire(tokens)
+                stats["in_flight"] += 1
+                stats["peak"] = max(stats["peak"], stats["in_flight"])
+                call = self._loop.run_in_executor(self._executor, task["call"])
+                try:
+                    result = await asyncio.shield(call)
+                except asyncio.CancelledError:
+                    # 이미 나간 요청은 멈출 수 없으므로 끝날 때까지 슬롯을 잡아 두고 결과는 버린다
+                    await asyncio.wait([call])
+                    raise
+                except Exception as e:
+                    details = rate_limit_details(e)
+                    if details is None or attempt >= self.max_retries:
+                        stats["failed"] += 1
+                        raise
+                    # 거절된 요청은 토큰을 쓰지 않은 것으로 보고 돌려준다
+                    bucket.settle(tokens, 0)
+                    wait = details["retry_after"]
+                    if wait is None:
+                        wait = self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+                    bucket.on_throttle(wait)
+                    stats["throttled"] += 1
+                    attempt += 1
+                    continue
+                else:
+                    bucket.on_success()
+                    usage = task.get("usage")
+                    actual = usage(result) if usage else None
+                    if actual is not None:
+                        bucket.settle(tokens, actual)
+                    stats["completed"] += 1
+                    return result
+                finally:
+                    stats["in_flight"] -= 1
+            finally:
+                gate.release()
+
+    async def _run_all(self, tasks, on_progress):
+        results = [None] * len(tasks)
+        done = 0
+
+        async def run(idx, task):
+            nonlocal done
+            error = None
+            try:
+                results[idx] = await self._run_one(task)
+            except Exception as e:
+                error = results[idx] = e
+            done += 1
+            if on_progress is not None:
+                try:
+                    on_progress({"done": done, "total": len(tasks), "index": idx, "result": results[idx], "error": error})
+                except Exception:
+                    pass
+
+        await asyncio.gather(*(run(idx, task) for idx, task in enumerate(tasks)))
+        return results
+
+    def submit(self, tasks, on_progress=None):
+        """작업 목록 [{"provider", "call", "tokens", "usage", "group"}]을 제출하고 concurrent.futures.Future를 반환.
+
+        tokens는 요청 전 추정 토큰 수, usage(result)는 실제 사용 토큰 수(모르면 None)를 돌려주는 선택 함수다.
+        group(선택)이 다른 작업끼리는 동시 요청 슬롯을 번갈아 받는다 (일괄 생성의 파일 간 공정 배분).
+
+        Future 결과는 작업 순서대로의 결과 목록이며 실패한 작업 자리에는 예외 객체가 들어간다.
+        on_progress는 작업이 끝날 때마다 엔진 스레드에서 {"done", "total", "index", "result", "error"}로 호출된다.
+        Future를 cancel()하면 아직 슬롯/예산을 기다리는 작업은 요청하지 않고 버리며, 이미 나간 요청은 끝나는 대로 버린다.
+        """
+        return asyncio.run_coroutine_threadsafe(self._run_all(list(tasks), on_progress), self._loop)
+
+    def stats(self):
+        return {
+            provider: {
+                **dict(values),
+                "limits": self.limits(provider),
+                "rate_scale": round(self._buckets[provider].scale, 3) if provider in self._buckets else 1.0,
+            }
+            for provider, values in self._stats.items()
+        }
+
+
+def get_generation_engine(limits=None):
+    """프로세스 공용 엔진. limits를 주면 해당 제공자 한도를 갱신"""
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            _ENGINE = GenerationEngine()
+        for provider, limit in (limits or {}).items():
+            _ENGINE.configure(provider, **limit)
+        return _ENGINE
@@ -0,0 +1,138 @@
+import concurrent.futures
+import threading
+import uuid
+from datetime import datetime, timezone
+
+JOB_STATUSES = ("pending", "running", "done", "failed", "cancelled")
+ACTIVE_JOB_STATUSES = ("pending", "running")
+MAX_JOB_ATTEMPTS = 3
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+class GenerationCancelled(Exception):
+    """작업 파일이 취소 상태로 바뀌어 워커가 중단할 때"""
+
+
+def _now_iso(now=None):
+    return (now or datetime.now(timezone.utc)).isoformat()
+
+
+def new_generation_job(params, source_name="", now=None):
+    """디스크에 저장할 생성 작업 레코드 (원문 텍스트는 별도 payload 파일)"""
+    created = _now_iso(now)
+    return {
+        "id": f"{(now or datetime.now(timezone.utc)).strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}",
+        "status": "pending",
+        "source_name": str(source_name or ""),
+        "params": dict(params or {}),
+        "created_at": created,
+        "updated_at": created,
+        "attempts": 0,
+        "progress": {"done": 0, "total": 0, "items": 0},
+        "streamed": [],
+        "result": None,
+        "error": "",
+        "saved": False,
+    }
+
+
+def update_generation_job(job, now=None, **fields):
+    job.update(fields)
+    job["updated_at"] = _now_iso(now)
+    return job
+
+
+def new_generation_batch_id(now=None):
+    """여러 파일을 한 번에 올린 일괄 생성 묶음 id (각 작업의 params["batch_id"])"""
+    return f"batch-{(now or datetime.now(timezone.utc)).strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def _job_fraction(job):
+    if job.get("status") not in ACTIVE_JOB_STATUSES:
+        return 1.0
+    progress = job.get("progress") or {}
+    total = int(progress.get("total") or 0)
+    if not total:
+        return 0.0
+    fraction = min(1.0, int(progress.get("done") or 0) / total)
+    pages_total = int(progress.get("pages_total") or 0)
+    if pages_total:
+        # 추출 중에는 청크 수가 아직 늘어나므로 추출된 페이지 비율만큼만 센다
+        fraction *= min(1.0, int(progress.get("pages") or 0) / pages_total)
+    return fraction
+
+
+def summarize_generation_batch(jobs, now=None):
+    """일괄 생성 묶음의 합계 진행 상황과 남은 시간 추정.
+
+    파일별 진행률(끝난 청크 비율, 추출 중이면 추출된 페이지 비율을 곱함)을 원본 크기(params["source_size"])로
+    가중 평균하고, 묶음 시작 후 경과 시간과 진행률로 남은 시간을 잡는다.
+    Returns: {"files", "finished", "failed", "done", "total", "items", "fraction", "elapsed_seconds", "eta_seconds"}
+    """
+    jobs = list(jobs)
+    weights = [max(1, int((job.get("params") or {}).get("source_size") or 0)) for job in jobs]
+    fraction = sum(w * _job_fraction(job) for w, job in zip(weights, jobs)) / max(1, sum(weights))
+    finished = sum(1 for job in jobs if job.get("status") not in ACTIVE_JOB_STATUSES)
+    started = min((job.get("created_at") or "" for job in jobs), default="")
+    elapsed = 0.0
+    if started:
+        elapsed = max(0.0, ((now or datetime.now(timezone.utc)) - datetime.fromisoformat(started)).total_seconds())
+    eta = None
+    if finished < len(jobs) and fraction > 0:
+        eta = elapsed * (1 - fraction) / fraction
+    return {
+        "files": len(jobs),
+        "finished": finished,
+        "failed": sum(1 for job in jobs if job.get("status") in ("failed", "cancelled")),
+        "done": sum(int((job.get("progress") or {}).get("done") or 0) for job in jobs),
+        "total": sum(int((job.get("progress") or {}).get("total") or 0) for job in jobs),
+        "items": sum(len(job.get("result") or []) if job.get("status") == "done" else int((job.get("progress") or {}).get("items") or 0) for job in jobs),
+        "fraction": fraction,
+        "elapsed_seconds": elapsed,
+        "eta_seconds": eta,
+    }
+
+
+def resumable_generation_jobs(jobs, is_active):
+    """이 프로세스에서 돌고 있지 않은 pending/running 작업 (서버 재시작으로 끊긴 작업 포함)"""
+    return [job for job in jobs if job.get("status") in ACTIVE_JOB_STATUSES and not is_active(job["id"])]
+
+
+class GenerationWorkerPool:
+    """프로세스 공용 생성 작업 스레드 풀. 같은 작업 키는 한 번만 실행된다"""
+
+    def __init__(self, max_workers=2):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation-job")
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, **kwargs):
+        with self._lock:
+            if key in self._active:
+                return False
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._active[key] = future
+        future.add_done_callback(lambda _f: self._finish(key))
+        return True
+
+    def _finish(self, key):
+        with self._lock:
+            self._active.pop(key, None)
+
+    def is_active(self, key):
+        with self._lock:
+            return key in self._active
+
+    def active_count(self):
+        with self._lock:
+            return len(self._active)
+
+
+def get_generation_worker_pool(max_workers=2):
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = GenerationWorkerPool(max_workers=max_workers)
+        return _POOL
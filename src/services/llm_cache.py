@@ -0,0 +1,29 @@
+import hashlib
+import json
+
+DEFAULT_LLM_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def llm_cache_key(provider, model, prompt, temperature, seed, prompt_version):
+    """(provider, model, 프롬프트 전체 해시, temperature, seed, 프롬프트 버전) 캐시 키.
+
+    prompt는 문자열 또는 chat messages 목록. 감사 로그의 16자 prompt_hash 대신 전체 sha256을 쓴다.
+    """
+    body = prompt if isinstance(prompt, str) else json.dumps(prompt, ensure_ascii=False, sort_keys=True)
+    payload = {
+        "provider": provider,
+        "model": model,
+        "prompt": hashlib.sha256(body.encode("utf-8")).hexdigest(),
+        "temperature": float(temperature),
+        "seed": seed,
+        "prompt_version": prompt_version,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def is_cacheable_temperature(temperature):
+    """temperature 0 호출만 같은 입력에 같은 응답을 기대할 수 있어 캐시 대상"""
+    try:
+        return float(temperature) == 0.0
+    except (TypeError, ValueError):
+        return False
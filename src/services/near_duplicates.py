@@ -0,0 +1,225 @@
+import concurrent.futures
+import multiprocessing
+import re
+import threading
+import time
+import unicodedata
+import zlib
+
+import numpy as np
+
+from .text_search import text_signature
+
+NEAR_DUPLICATE_INDEX_VERSION = 1
+NUM_PERM = 128
+# 32 band x 4 row: Jaccard 0.5에서 후보 재현율 ≈ 87%, 0.7 이상은 거의 100%.
+# 후보는 서명 비교로 다시 걸러지므로 사용자가 정한 임계값(0.5~0.95)을 그대로 적용할 수 있다.
+LSH_BANDS = 32
+SHINGLE_SIZE = 3
+DEFAULT_NEAR_DUPLICATE_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_PRIME = np.uint64(_MERSENNE_PRIME)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_NON_WORD_RE = re.compile(r"[^0-9a-z가-힣一-鿿]+")
+_PERMUTATIONS = {}
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def normalize_for_shingles(text):
+    """NFC 정규화, 소문자화 후 공백/문장부호 제거 (띄어쓰기만 다른 문장을 같게 취급)"""
+    normalized = unicodedata.normalize("NFC", str(text or "")).lower()
+    return _NON_WORD_RE.sub("", normalized)
+
+
+def _shingle_hashes(text, k=SHINGLE_SIZE):
+    s = normalize_for_shingles(text)
+    if not s:
+        return np.empty(0, dtype=np.uint64)
+    if len(s) <= k:
+        grams = [s]
+    else:
+        grams = [s[i:i + k] for i in range(len(s) - k + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams)))
+
+
+def _permutations(num_perm, seed):
+    key = (num_perm, seed)
+    perms = _PERMUTATIONS.get(key)
+    if perms is None:
+        rng = np.random.RandomState(seed)
+        perms = (
+            rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64),
+            rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64),
+        )
+        _PERMUTATIONS[key] = perms
+    return perms
+
+
+def _permute(hashes, a, b):
+    """(hashes ⊗ a + b) mod (2^61 - 1).
+
+    shingle 해시는 crc32, 계수는 _permutations가 32비트 안에서 뽑으므로
+    (2^32-1)^2 + (2^32-1) < 2^64라 uint64로 바로 계산해도 넘치지 않는다.
+    """
+    low32 = np.uint64(0xFFFFFFFF)
+    assert hashes.max() <= low32 and a.max() <= low32 and b.max() <= low32
+    return (np.outer(hashes, a) + b) % _PRIME
+
+
+def minhash_signature(text, num_perm=NUM_PERM, seed=1):
+    """문자 shingle 집합의 MinHash 서명(uint32 배열). 비어 있는 텍스트는 None"""
+    hashes = _shingle_hashes(text)
+    if not hashes.size:
+        return None
+    a, b = _permutations(num_perm, seed)
+    permuted = _permute(hashes, a, b) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def estimate_jaccard(sig_a, sig_b):
+    return float(np.count_nonzero(sig_a == sig_b)) / float(len(sig_a))
+
+
+def new_near_duplicate_index(num_perm=NUM_PERM, bands=LSH_BANDS, seed=1):
+    """문항별 MinHash 서명과 LSH band 버킷.
+
+    signatures는 {키: 서명 bytes}, text_sigs는 {키: 본문 해시}(백필 시 변경 감지용).
+    buckets는 서명에서 다시 만들 수 있어 디스크에는 저장하지 않는다.
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm은 bands로 나누어떨어져야 합니다.")
+    return {
+        "version": NEAR_DUPLICATE_INDEX_VERSION,
+        "num_perm": num_perm,
+        "bands": bands,
+        "seed": seed,
+        "signatures": {},
+        "text_sigs": {},
+        "buckets": [{} for _ in range(bands)],
+    }
+
+
+def _band_keys(index, raw):
+    step = len(raw) // index["bands"]
+    return [raw[i * step:(i + 1) * step] for i in range(index["bands"])]
+
+
+def _buckets(index):
+    buckets = index.get("buckets")
+    if buckets is None:
+        buckets = index["buckets"] = [{} for _ in range(index["bands"])]
+        for key, raw in index["signatures"].items():
+            for band, band_key in zip(buckets, _band_keys(index, raw)):
+                band.setdefault(band_key, set()).add(key)
+    return buckets
+
+
+def near_duplicate_remove(index, key):
+    raw = index["signatures"].pop(key, None)
+    index["text_sigs"].pop(key, None)
+    if raw is None:
+        return False
+    for band, band_key in zip(_buckets(index), _band_keys(index, raw)):
+        members = band.get(band_key)
+        if members is not None:
+            members.discard(key)
+            if not members:
+                band.pop(band_key, None)
+    return True
+
+
+def near_duplicate_add(index, key, signature, text_sig=None):
+    near_duplicate_remove(index, key)
+    if signature is None:
+        return False
+    raw = np.asarray(signature, dtype=np.uint32).tobytes()
+    index["signatures"][key] = raw
+    if text_sig:
+        index["text_sigs"][key] = text_sig
+    for band, band_key in zip(_buckets(index), _band_keys(index, raw)):
+        band.setdefault(band_key, set()).add(key)
+    return True
+
+
+def near_duplicate_query(index, signature, threshold=DEFAULT_NEAR_DUPLICATE_THRESHOLD, exclude=None):
+    """LSH 후보만 비교해 추정 Jaccard가 threshold 이상인 [(키, 유사도)]를 유사도순으로 반환"""
+    if signature is None:
+        return []
+    sig = np.asarray(signature, dtype=np.uint32)
+    candidates = set()
+    for band, band_key in zip(_buckets(index), _band_keys(index, sig.tobytes())):
+        members = band.get(band_key)
+        if members:
+            candidates |= members
+    if exclude is not None:
+        candidates.discard(exclude)
+    out = []
+    for key in candidates:
+        other = np.frombuffer(index["signatures"][key], dtype=np.uint32)
+        similarity = estimate_jaccard(sig, other)
+        if similarity >= threshold:
+            out.append((key, similarity))
+    out.sort(key=lambda x: (-x[1], str(x[0])))
+    return out
+
+
+def near_duplicate_pending(index, texts):
+    """{키: 본문} 중 서명이 없거나 본문이 바뀐 항목"""
+    text_sigs = index["text_sigs"]
+    return {key: text for key, text in texts.items() if text_sigs.get(key) != text_signature(text)}
+
+
+def compute_minhash_signatures(texts, num_perm=NUM_PERM, seed=1):
+    """{키: 본문} → {"signatures": {키: 서명 bytes 또는 None}, "text_sigs", "elapsed_ms"} (워커 프로세스에서 실행)"""
+    started = time.perf_counter()
+    signatures = {}
+    text_sigs = {}
+    for key, text in (texts or {}).items():
+        sig = minhash_signature(text, num_perm=num_perm, seed=seed)
+        signatures[key] = sig.tobytes() if sig is not None else None
+        text_sigs[key] = text_signature(text)
+    return {
+        "signatures": signatures,
+        "text_sigs": text_sigs,
+        "elapsed_ms": int((time.perf_counter() - started) * 1000),
+    }
+
+
+def apply_minhash_signatures(index, result, live_keys=None):
+    """compute_minhash_signatures 결과를 색인에 반영하고, live_keys에 없는 키는 제거. (반영, 제거) 수"""
+    removed = 0
+    if live_keys is not None:
+        for key in [k for k in index["signatures"] if k not in live_keys]:
+            removed += int(near_duplicate_remove(index, key))
+        for key in [k for k in index["text_sigs"] if k not in live_keys]:
+            index["text_sigs"].pop(key, None)
+    applied = 0
+    text_sigs = result.get("text_sigs") or {}
+    for key, raw in (result.get("signatures") or {}).items():
+        if raw is None:
+            near_duplicate_remove(index, key)
+            index["text_sigs"][key] = text_sigs.get(key)
+            continue
+        near_duplicate_add(index, key, np.frombuffer(raw, dtype=np.uint32), text_sig=text_sigs.get(key))
+        applied += 1
+    return applied, removed
+
+
+def _get_executor():
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = concurrent.futures.ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _EXECUTOR
+
+
+def submit_minhash_backfill(texts, num_perm=NUM_PERM, seed=1, executor=None):
+    """서명 백필을 별도 프로세스에 제출하고 Future를 반환"""
+    pool = executor or _get_executor()
+    return pool.submit(compute_minhash_signatures, dict(texts or {}), num_perm, seed)
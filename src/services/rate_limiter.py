@@ -0,0 +1,155 @@
+import asyncio
+import re
+import time
+from email.utils import parsedate_to_datetime
+
+_RATE_LIMIT_NAMES = {"RateLimitError", "ResourceExhausted", "TooManyRequests"}
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_RETRY_MESSAGE = re.compile(r"(?:retry(?:_delay)?|try again)\s*(?:in|after|\{)?\s*(?:seconds:\s*)?(\d+(?:\.\d+)?)\s*(ms|s)?", re.I)
+
+
+def parse_duration(value):
+    """"1.5", "250ms", "6m0s", "1h2m3s" 형식의 대기 시간을 초로 변환 (해석 불가면 None)"""
+    text = str(value or "").strip().lower()
+    if not text:
+        return None
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(text)
+    if not parts or "".join(n + u for n, u in parts) != text:
+        return None
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(n) * scale[u] for n, u in parts)
+
+
+def _retry_after_header(headers):
+    if not headers:
+        return None
+    get = headers.get
+    if get("retry-after-ms"):
+        seconds = parse_duration(get("retry-after-ms"))
+        return seconds / 1000 if seconds is not None else None
+    raw = get("retry-after")
+    if raw:
+        seconds = parse_duration(raw)
+        if seconds is not None:
+            return seconds
+        try:
+            return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    resets = [parse_duration(get(k)) for k in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens") if get(k)]
+    resets = [s for s in resets if s is not None]
+    return max(resets) if resets else None
+
+
+def rate_limit_details(exc):
+    """429/쿼터 초과 예외면 {"retry_after": 초 또는 None}, 아니면 None.
+
+    OpenAI SDK(RateLimitError, 응답 헤더 retry-after/x-ratelimit-reset-*)와
+    Gemini SDK(ResourceExhausted, 메시지의 retry_delay) 형식을 모두 읽는다.
+    """
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    message = str(exc)
+    lowered = message.lower()
+    if not (
+        status == 429
+        or type(exc).__name__ in _RATE_LIMIT_NAMES
+        or "429" in message
+        or "rate limit" in lowered
+        or "resource has been exhausted" in lowered
+    ):
+        return None
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is None:
+        response = getattr(exc, "response", None)
+        retry_after = _retry_after_header(getattr(response, "headers", None) or getattr(exc, "headers", None))
+    if retry_after is None:
+        match = _RETRY_MESSAGE.search(message)
+        if match:
+            retry_after = float(match.group(1)) * (0.001 if (match.group(2) or "").lower() == "ms" else 1)
+    return {"retry_after": retry_after}
+
+
+class AdaptiveTokenBucket:
+    """요청 수/토큰 수 두 개의 토큰 버킷에 AIMD 속도 조절을 더한 제한기.
+
+    버킷은 window초당 rpm/tpm 속도로 채워지고 최대 burst 비율(기본 10초 분량)까지 쌓인다.
+    429를 받으면 속도 배율을 decrease배로 줄이고 retry_after 동안 모두 멈추며,
+    성공할 때마다 increase씩 원래 한도까지 회복한다.
+    """
+
+    def __init__(self, rpm, tpm, window=60.0, burst=1 / 6, min_scale=0.1, increase=0.05, decrease=0.5):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self.burst = burst
+        self.min_scale = min_scale
+        self.increase = increase
+        self.decrease = decrease
+        self.scale = 1.0
+        self.blocked_until = 0.0
+        self.request_level = self.request_capacity
+        self.token_level = self.token_capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    @property
+    def request_capacity(self):
+        return max(1.0, self.rpm * self.burst)
+
+    @property
+    def token_capacity(self):
+        return max(1.0, self.tpm * self.burst)
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self.updated)
+        self.updated = now
+        factor = elapsed * self.scale / self.window
+        self.request_level = min(self.request_capacity, self.request_level + self.rpm * factor)
+        self.token_level = min(self.token_capacity, self.token_level + self.tpm * factor)
+
+    def reserve(self, tokens, now=None):
+        """지금 보낼 수 있으면 차감하고 0, 아니면 더 기다려야 하는 초를 반환.
+
+        버스트 용량보다 큰 요청은 버킷이 가득 찼을 때 보내고 부족분은 빚으로 남긴다.
+        """
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        needed = min(float(tokens), self.token_capacity)
+        rate = self.scale / self.window
+        delay = max(
+            self.blocked_until - now,
+            (1.0 - self.request_level) / (self.rpm * rate),
+            (needed - self.token_level) / (self.tpm * rate),
+        )
+        if delay > 0:
+            return delay
+        self.request_level -= 1.0
+        self.token_level -= tokens
+        return 0.0
+
+    async def acquire(self, tokens):
+        async with self.lock:
+            while True:
+                delay = self.reserve(tokens)
+                if delay <= 0:
+                    return
+                await asyncio.sleep(delay)
+
+    def settle(self, estimated, actual):
+        """추정 토큰과 실제 사용량(캐시 적중이면 0)의 차이를 돌려주거나 더 차감"""
+        self.token_level = min(self.token_capacity, self.token_level + estimated - actual)
+
+    def on_success(self):
+        self.scale = min(1.0, self.scale + self.increase)
+
+    def on_throttle(self, retry_after=None, now=None):
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.scale = max(self.min_scale, self.scale * self.decrease)
+        self.request_level = min(self.request_level, 0.0)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
@@ -0,0 +1,155 @@
+import math
+from collections import Counter
+
+import numpy as np
+
+from .text_search import text_signature, tokenize
+
+DEFAULT_RELATED_K = 5
+MAX_QUERY_TERMS = 32
+# 전체 재계산 이후 문서 수가 이 비율 이상 바뀌면 idf가 달라졌다고 보고 norm을 다시 계산
+REBUILD_DRIFT = 0.2
+
+
+def new_related_state():
+    """TF-IDF 코사인 유사 문항 상태.
+
+    norms는 검색 색인 slot별 문서 벡터 크기, built_live는 마지막 전체 계산 때의 문서 수,
+    neighbors는 {(키, 본문 서명): ([(키, 유사도), ...], 전체 여부)} 조회 결과 캐시다.
+    """
+    return {"stamp": None, "norms": np.zeros(0), "built_live": 0, "neighbors": {}}
+
+
+def _idf(live, df):
+    return math.log((1.0 + live) / (1.0 + df)) + 1.0
+
+
+def _tf_weight(tfs):
+    return 1.0 + np.log(tfs)
+
+
+def _stamp(index):
+    return (len(index["keys"]), index["live"], index["dead"])
+
+
+def _full_norms(index, batch=2_000_000):
+    """postings를 한 번 훑어 모든 문서의 TF-IDF 벡터 크기를 계산"""
+    size = len(index["keys"])
+    live = index["live"]
+    squared = np.zeros(size, dtype=np.float64)
+    slot_parts = []
+    weight_parts = []
+    pending = 0
+    for slots, tfs in index["postings"].values():
+        slots = np.frombuffer(slots, dtype=np.uintc)
+        weights = _tf_weight(np.frombuffer(tfs, dtype=np.ushort).astype(np.float64)) * _idf(live, len(slots))
+        slot_parts.append(slots)
+        weight_parts.append(weights * weights)
+        pending += len(slots)
+        if pending >= batch:
+            squared += np.bincount(np.concatenate(slot_parts), weights=np.concatenate(weight_parts), minlength=size)
+            slot_parts, weight_parts, pending = [], [], 0
+    if slot_parts:
+        squared += np.bincount(np.concatenate(slot_parts), weights=np.concatenate(weight_parts), minlength=size)
+    return np.sqrt(squared)
+
+
+def _query_vector(index, text):
+    """본문을 {토큰: TF-IDF 가중치}로 (색인에 없는 토큰은 제외)"""
+    live = index["live"]
+    postings = index["postings"]
+    vector = {}
+    for term, tf in Counter(tokenize(text)).items():
+        entry = postings.get(term)
+        if entry is None:
+            continue
+        vector[term] = (1.0 + math.log(tf)) * _idf(live, len(entry[0]))
+    return vector
+
+
+def sync_related_state(state, index, text_for_key):
+    """검색 색인이 바뀌었으면 norm을 갱신.
+
+    새로 추가된 slot만 text_for_key(키)로 norm을 계산하고, compact로 slot 번호가 바뀌었거나
+    문서 수가 REBUILD_DRIFT 이상 달라졌으면 전체를 다시 계산한다. "unchanged"/"extended"/"rebuilt"를 반환.
+    """
+    stamp = _stamp(index)
+    if state["stamp"] == stamp:
+        return "unchanged"
+    size = len(index["keys"])
+    norms = state["norms"]
+    built_live = state["built_live"]
+    drift = abs(index["live"] - built_live) > max(1, built_live) * REBUILD_DRIFT
+    if state["stamp"] is None or size < len(norms) or drift:
+        state["norms"] = _full_norms(index)
+        state["built_live"] = index["live"]
+        outcome = "rebuilt"
+    else:
+        extra = np.zeros(size - len(norms), dtype=np.float64)
+        keys = index["keys"]
+        for offset, slot in enumerate(range(len(norms), size)):
+            if keys[slot] is None:
+                continue
+            weights = np.fromiter(_query_vector(index, text_for_key(keys[slot]) or "").values(), dtype=np.float64)
+            extra[offset] = math.sqrt(float(np.dot(weights, weights)))
+        state["norms"] = np.concatenate([norms, extra])
+        outcome = "extended"
+    state["stamp"] = stamp
+    state["neighbors"] = {}
+    return outcome
+
+
+def related_questions(index, state, key, text, k=DEFAULT_RELATED_K, max_terms=MAX_QUERY_TERMS, exclude=None):
+    """key 문항과 TF-IDF 코사인 유사도가 높은 [(키, 유사도)] 상위 k개 (exclude에 든 키는 건너뜀).
+
+    가중치가 큰 max_terms개 토큰의 postings만 훑으므로 문제은행 전체와 비교하지 않는다.
+    결과는 (키, 본문 서명)별로 색인이 바뀔 때까지 state에 캐시되고, exclude는 캐시된 순위에서 걸러내므로
+    제외 목록이 커도 조회 개수가 늘지 않는다. 걸러낸 뒤 k개가 모자랄 때만 순위를 더 길게 다시 뽑는다.
+    """
+    exclude = exclude or ()
+    cache_key = (key, text_signature(text))
+
+    def pick(ranked):
+        return [hit for hit in ranked if hit[0] not in exclude][:k]
+
+    cached = state["neighbors"].get(cache_key)
+    if cached is not None:
+        ranked, complete = cached
+        picked = pick(ranked)
+        if complete or len(picked) >= k:
+            return picked
+    vector = _query_vector(index, text)
+    if not vector or not index["live"]:
+        return []
+    terms = sorted(vector.items(), key=lambda item: -item[1])[:max_terms]
+    query_norm = math.sqrt(sum(w * w for w in vector.values()))
+    size = len(index["keys"])
+    norms = state["norms"]
+    if len(norms) < size:
+        norms = np.concatenate([norms, np.zeros(size - len(norms))])
+    scores = np.zeros(size, dtype=np.float64)
+    live = index["live"]
+    for term, q_weight in terms:
+        slots_raw, tfs_raw = index["postings"][term]
+        slots = np.frombuffer(slots_raw, dtype=np.uintc)
+        d_weights = _tf_weight(np.frombuffer(tfs_raw, dtype=np.ushort).astype(np.float64)) * _idf(live, len(slots))
+        scores += np.bincount(slots, weights=q_weight * d_weights, minlength=size)
+    valid = norms > 0
+    scores[valid] /= norms[valid] * query_norm
+    scores[~valid] = 0.0
+    entry = index["docs"].get(key)
+    if entry is not None:
+        scores[entry[0]] = 0.0
+    hits = int(np.count_nonzero(scores))
+    keys = index["keys"]
+    top_n = min(max(int(k), DEFAULT_RELATED_K), hits)
+    while True:
+        top = np.argpartition(-scores, top_n - 1)[:top_n] if top_n else np.zeros(0, dtype=np.intp)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        ranked = [(keys[i], float(min(scores[i], 1.0))) for i in top if keys[i] is not None]
+        picked = pick(ranked)
+        if len(picked) >= k or top_n >= hits:
+            break
+        top_n = min(hits, top_n * 4)
+    state["neighbors"][cache_key] = (ranked, top_n >= hits)
+    return picked
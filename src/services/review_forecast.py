@@ -0,0 +1,59 @@
+import numpy as np
+
+SECONDS_PER_DAY = 86400.0
+FORECAST_HORIZONS = (7, 30, 90)
+
+
+def forecast_due_counts(subjects, due_epochs, start_epoch, days=30, next_due_fn=None, max_followups=64):
+    """분과별 일자별 복습 예정 문항 수를 한 번의 벡터 연산으로 계산.
+
+    subjects/due_epochs는 같은 길이의 시퀀스이며, due_epoch가 None이면 신규(오늘 복습)로 본다.
+    start_epoch 이전의 연체 문항은 0일차에 합산된다.
+    next_due_fn(index, due_epoch)를 주면 기간 내 복습 이후 다시 돌아오는 예상 복습도 포함한다.
+    """
+    days = max(1, int(days))
+    subject_list = [str(s or "General") for s in subjects]
+    labels = sorted(set(subject_list))
+    empty = {
+        "start_epoch": float(start_epoch),
+        "days": days,
+        "subjects": {label: [0] * days for label in labels},
+        "total": [0] * days,
+    }
+    if not subject_list:
+        return empty
+
+    code_of = {label: i for i, label in enumerate(labels)}
+    codes = np.fromiter((code_of[s] for s in subject_list), dtype=np.int64, count=len(subject_list))
+    due = np.fromiter(
+        (start_epoch if d is None else float(d) for d in due_epochs),
+        dtype=np.float64,
+        count=len(subject_list),
+    )
+    offsets = np.floor((due - start_epoch) / SECONDS_PER_DAY).astype(np.int64)
+    np.clip(offsets, 0, None, out=offsets)
+    in_range = offsets < days
+    flat = codes[in_range] * days + offsets[in_range]
+
+    if next_due_fn is not None:
+        extra = []
+        horizon_end = start_epoch + days * SECONDS_PER_DAY
+        for idx in np.flatnonzero(in_range):
+            current = max(float(due[idx]), float(start_epoch))
+            for _ in range(max_followups):
+                nxt = next_due_fn(int(idx), current)
+                if nxt is None or nxt >= horizon_end or nxt <= current:
+                    break
+                day = int((nxt - start_epoch) // SECONDS_PER_DAY)
+                extra.append(codes[idx] * days + day)
+                current = nxt
+        if extra:
+            flat = np.concatenate([flat, np.asarray(extra, dtype=np.int64)])
+
+    matrix = np.bincount(flat, minlength=len(labels) * days).reshape(len(labels), days)
+    return {
+        "start_epoch": float(start_epoch),
+        "days": days,
+        "subjects": {label: matrix[i].tolist() for i, label in enumerate(labels)},
+        "total": matrix.sum(axis=0).tolist(),
+    }
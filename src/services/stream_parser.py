@@ -0,0 +1,78 @@
+def new_stream_parser(line_mode=False):
+    """스트리밍 응답 조각에서 완성된 항목 텍스트를 꺼내는 파서 상태.
+
+    line_mode=False면 최상위 JSON 객체({...})가 닫힐 때마다, True면 줄이 끝날 때마다 항목 하나를 낸다.
+    """
+    return {"line_mode": bool(line_mode), "buffer": "", "pos": 0, "depth": 0, "in_string": False, "escape": False, "start": None}
+
+
+def _feed_lines(state):
+    buffer = state["buffer"]
+    cut = buffer.rfind("\n")
+    if cut < 0:
+        return []
+    state["buffer"] = buffer[cut + 1:]
+    return [line.strip() for line in buffer[:cut].split("\n") if line.strip()]
+
+
+def _feed_objects(state):
+    buffer = state["buffer"]
+    depth = state["depth"]
+    in_string = state["in_string"]
+    escape = state["escape"]
+    start = state["start"]
+    out = []
+    consumed = 0
+    for i in range(state["pos"], len(buffer)):
+        ch = buffer[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif depth == 0:
+            # 객체 밖의 배열 괄호, 쉼표, 코드펜스, 설명 문장은 건너뛴다
+            continue
+        elif ch == '"':
+            in_string = True
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                out.append(buffer[start:i + 1])
+                start = None
+                consumed = i + 1
+    # 이미 낸 항목 앞부분은 버려 버퍼가 응답 길이만큼 자라지 않게 한다
+    if start is not None:
+        consumed = start
+    elif depth == 0:
+        consumed = len(buffer)
+    state["buffer"] = buffer[consumed:]
+    state["pos"] = len(buffer) - consumed
+    state["start"] = None if start is None else start - consumed
+    state["depth"] = depth
+    state["in_string"] = in_string
+    state["escape"] = escape
+    return out
+
+
+def feed_stream_parser(state, delta):
+    """응답 조각을 넣고 이번에 완성된 항목 텍스트 목록을 반환"""
+    if not delta:
+        return []
+    state["buffer"] += delta
+    return _feed_lines(state) if state["line_mode"] else _feed_objects(state)
+
+
+def finish_stream_parser(state):
+    """응답이 끝났을 때 남은 항목 (줄 모드의 마지막 줄). 닫히지 않은 JSON 객체는 버린다"""
+    if not state["line_mode"]:
+        return []
+    rest = state["buffer"].strip()
+    state["buffer"] = ""
+    return [rest] if rest else []
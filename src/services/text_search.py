@@ -0,0 +1,193 @@
+import hashlib
+import math
+import re
+import unicodedata
+from array import array
+from collections import Counter
+
+import numpy as np
+
+SEARCH_INDEX_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 한글(음절/자모)·한자는 연속 구간을 문자 bigram으로, 라틴 문자/숫자는 단어 단위로 자른다
+_TOKEN_RE = re.compile(r"[가-힣ㄱ-ㆎ一-鿿]+|[a-z0-9]+")
+_MAX_TF = 0xFFFF
+
+
+def tokenize(text):
+    """혼합 한/영 의학 텍스트 토큰화 (NFC 정규화 + 소문자화)"""
+    normalized = unicodedata.normalize("NFC", str(text or "")).lower()
+    tokens = []
+    for match in _TOKEN_RE.finditer(normalized):
+        run = match.group(0)
+        if run[0] < "\u0080":
+            tokens.append(run)
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def text_signature(text):
+    return hashlib.blake2b(str(text or "").encode("utf-8"), digest_size=8).hexdigest()
+
+
+def new_search_index():
+    """빈 BM25 역색인.
+
+    docs는 {키: (slot, signature)}, postings는 {토큰: (slot 배열, tf 배열)}.
+    삭제/수정된 문서는 slot을 비워 두었다가 compact_search_index에서 정리한다.
+    """
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "docs": {},
+        "keys": [],
+        "lengths": array("I"),
+        "postings": {},
+        "total_length": 0,
+        "live": 0,
+        "dead": 0,
+    }
+
+
+def search_index_remove(index, key):
+    entry = index["docs"].pop(key, None)
+    if entry is None:
+        return False
+    slot = entry[0]
+    index["total_length"] -= index["lengths"][slot]
+    index["lengths"][slot] = 0
+    index["keys"][slot] = None
+    index["live"] -= 1
+    index["dead"] += 1
+    return True
+
+
+def search_index_add(index, key, text, signature=None):
+    """문서 하나를 색인 (같은 키가 있으면 교체)"""
+    search_index_remove(index, key)
+    tokens = tokenize(text)
+    slot = len(index["keys"])
+    index["keys"].append(key)
+    index["lengths"].append(len(tokens))
+    index["docs"][key] = (slot, signature or text_signature(text))
+    postings = index["postings"]
+    for term, tf in Counter(tokens).items():
+        entry = postings.get(term)
+        if entry is None:
+            entry = postings[term] = (array("I"), array("H"))
+        entry[0].append(slot)
+        entry[1].append(min(tf, _MAX_TF))
+    index["total_length"] += len(tokens)
+    index["live"] += 1
+
+
+def sync_search_index(index, texts):
+    """{키: 본문}과 비교해 새로 생기거나 내용이 바뀐 문서만 다시 색인. (추가, 삭제, 변경) 수를 반환"""
+    docs = index["docs"]
+    removed = [key for key in docs if key not in texts]
+    for key in removed:
+        search_index_remove(index, key)
+    added = 0
+    changed = 0
+    for key, text in texts.items():
+        signature = text_signature(text)
+        entry = docs.get(key)
+        if entry is None:
+            search_index_add(index, key, text, signature=signature)
+            added += 1
+        elif entry[1] != signature:
+            search_index_add(index, key, text, signature=signature)
+            changed += 1
+    return added, len(removed), changed
+
+
+def compact_search_index(index, min_dead_ratio=0.25):
+    """삭제된 slot 비율이 기준을 넘으면 slot 번호를 다시 매기고 postings를 정리"""
+    live = index["live"]
+    dead = index["dead"]
+    if not dead or dead < max(1, live) * min_dead_ratio:
+        return False
+    old_keys = index["keys"]
+    remap = np.full(len(old_keys), -1, dtype=np.int64)
+    new_keys = []
+    new_lengths = array("I")
+    for slot, key in enumerate(old_keys):
+        if key is None:
+            continue
+        remap[slot] = len(new_keys)
+        new_keys.append(key)
+        new_lengths.append(index["lengths"][slot])
+    new_postings = {}
+    for term, (slots, tfs) in index["postings"].items():
+        mapped = remap[np.frombuffer(slots, dtype=np.uintc)]
+        keep = mapped >= 0
+        if not keep.any():
+            continue
+        new_postings[term] = (
+            array("I", mapped[keep].astype(np.uintc).tobytes()),
+            array("H", np.frombuffer(tfs, dtype=np.ushort)[keep].tobytes()),
+        )
+    index["docs"] = {key: (int(remap[slot]), sig) for key, (slot, sig) in index["docs"].items()}
+    index["keys"] = new_keys
+    index["lengths"] = new_lengths
+    index["postings"] = new_postings
+    index["dead"] = 0
+    return True
+
+
+def _term_postings(index, term):
+    """질의 토큰의 (slot 배열, tf 배열).
+
+    색인에 없는 토큰(단어 일부)과 한 글자 한글/한자는 그 문자열을 포함하는 색인 토큰들의 posting을
+    한 토큰처럼 합친다 (문서 전체가 아니라 토큰 사전만 훑는 부분 문자열 검색).
+    """
+    postings = index["postings"]
+    entry = postings.get(term)
+    if entry is not None and (len(term) > 1 or term < "\u0080"):
+        return np.frombuffer(entry[0], dtype=np.uintc), np.frombuffer(entry[1], dtype=np.ushort).astype(np.float64)
+    matches = [postings[t] for t in postings if term in t]
+    if not matches:
+        return None
+    if len(matches) == 1:
+        return np.frombuffer(matches[0][0], dtype=np.uintc), np.frombuffer(matches[0][1], dtype=np.ushort).astype(np.float64)
+    slots = np.concatenate([np.frombuffer(m[0], dtype=np.uintc) for m in matches])
+    tfs = np.concatenate([np.frombuffer(m[1], dtype=np.ushort) for m in matches]).astype(np.float64)
+    unique, inverse = np.unique(slots, return_inverse=True)
+    return unique, np.bincount(inverse, weights=tfs)
+
+
+def bm25_search(index, query, limit=20):
+    """BM25 점수 상위 limit개의 (키, 점수) 목록 (limit=None이면 점수가 있는 문서 전부)"""
+    live = index["live"]
+    terms = set(tokenize(query))
+    if not live or not terms:
+        return []
+    size = len(index["keys"])
+    lengths = np.frombuffer(index["lengths"], dtype=np.uintc).astype(np.float64)
+    avgdl = max(index["total_length"] / live, 1.0)
+    norm = BM25_K1 * (1.0 - BM25_B + BM25_B * lengths / avgdl)
+    scores = np.zeros(size, dtype=np.float64)
+    for term in terms:
+        entry = _term_postings(index, term)
+        if entry is None:
+            continue
+        slots, tfs = entry
+        alive = lengths[slots] > 0
+        df = int(np.count_nonzero(alive))
+        if not df:
+            continue
+        idf = math.log(1.0 + (live - df + 0.5) / (df + 0.5))
+        weights = np.where(alive, idf * tfs * (BM25_K1 + 1.0) / (tfs + norm[slots]), 0.0)
+        scores += np.bincount(slots, weights=weights, minlength=size)
+    hits = int(np.count_nonzero(scores))
+    if not hits:
+        return []
+    k = hits if limit is None else min(int(limit), hits)
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    keys = index["keys"]
+    return [(keys[i], float(scores[i])) for i in top]
@@ -0,0 +1,153 @@
+import ast
+import copy
+import random
+import sys
+import unittest
+from difflib import SequenceMatcher
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+APP_PATH = ROOT / "app.py"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services import answer_matcher  # noqa: E402
+
+
+def _levenshtein(a, b):
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def _load_namespace(names, extra=None):
+    source = APP_PATH.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(APP_PATH))
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {
+        "build_answer_keys": answer_matcher.build_answer_keys,
+        "match_answer": answer_matcher.match_answer,
+    }
+    namespace.update(extra or {})
+    exec(compile(module, str(APP_PATH), "exec"), namespace)
+    return namespace
+
+
+class AnswerMatcherTests(unittest.TestCase):
+    def test_bounded_distance_matches_dynamic_programming(self):
+        rng = random.Random(7)
+        for _ in range(3000):
+            a = "".join(rng.choice("ab가나c") for _ in range(rng.randint(0, 40)))
+            b = "".join(rng.choice("ab가나c") for _ in range(rng.randint(0, 40)))
+            limit = rng.randint(0, 20)
+            expected = _levenshtein(a, b)
+            self.assertEqual(
+                answer_matcher.bounded_edit_distance(a, b, limit),
+                expected if expected <= limit else limit + 1,
+            )
+
+    def test_match_normalises_and_accepts_synonyms(self):
+        keys = answer_matcher.build_answer_keys("Guillain-Barré syndrome", ["GBS", "길랭-바레 증후군"])
+        self.assertEqual(keys[1], "gbs")
+        self.assertTrue(answer_matcher.match_answer("guillain barré  Syndrome", keys))
+        self.assertTrue(answer_matcher.match_answer("길랭바레증후군", keys))
+        self.assertTrue(answer_matcher.match_answer("gbs", keys))
+        self.assertFalse(answer_matcher.match_answer("g", keys))
+        self.assertFalse(answer_matcher.match_answer("", keys))
+        # 10글자 정답은 0.8 기준으로 두 글자까지 오타 허용
+        keys = answer_matcher.build_answer_keys("갑상선기능항진증증후")
+        self.assertTrue(answer_matcher.match_answer("갑상선기능저진증증후", keys))
+        self.assertTrue(answer_matcher.match_answer("갑상성기능저진증증후", keys))
+        self.assertFalse(answer_matcher.match_answer("갑상성기능저하증증후", keys))
+
+    def test_missing_or_extra_characters_follow_sequence_matcher_ratio(self):
+        for answer, user in (("신부전", "신부전증"), ("ACE", "ACEI"), ("DKA", "DKA1"), ("심근경색", "급성심근경색"), ("gbs", "gb")):
+            self.assertTrue(answer_matcher.match_answer(user, answer_matcher.build_answer_keys(answer)), (answer, user))
+            self.assertTrue(answer_matcher.match_answer(answer, answer_matcher.build_answer_keys(user)), (user, answer))
+        self.assertFalse(answer_matcher.match_answer("신부", answer_matcher.build_answer_keys("신부전증")))
+        self.assertFalse(answer_matcher.match_answer("심근", answer_matcher.build_answer_keys("급성심근경색")))
+
+        rng = random.Random(11)
+        alphabet = "심근경색신부전abcACE"
+        for _ in range(2000):
+            a = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12))).lower()
+            b = list(a)
+            for _ in range(rng.randint(0, 4)):
+                i = rng.randrange(len(b) + 1)
+                op = rng.randrange(3)
+                if op == 0 and i < len(b):
+                    b[i] = rng.choice(alphabet).lower()
+                elif op == 1 and i < len(b):
+                    del b[i]
+                else:
+                    b.insert(i, rng.choice(alphabet).lower())
+            b = "".join(b)
+            if not b:
+                continue
+            # 정규화 편집 거리 기준으로 통과하거나, 두 기준이 갈리는 구간에서 SequenceMatcher로 통과
+            similarity = 1 - _levenshtein(a, b) / max(len(a), len(b))
+            expected = similarity >= 0.8 - 1e-9 or SequenceMatcher(None, b, a).ratio() >= 0.8
+            self.assertEqual(answer_matcher.match_answer(b, answer_matcher.build_answer_keys(a)), expected, (a, b))
+
+    def test_sequence_matcher_runs_only_where_the_metrics_can_disagree(self):
+        calls = []
+
+        class _CountingMatcher(SequenceMatcher):
+            def ratio(self):
+                calls.append((self.a, self.b))
+                return super().ratio()
+
+        original = answer_matcher.SequenceMatcher
+        answer_matcher.SequenceMatcher = _CountingMatcher
+        try:
+            keys = answer_matcher.build_answer_keys("갑상선기능항진증증후")
+            self.assertTrue(answer_matcher.match_answer("갑상성기능저진증증후", keys))
+            self.assertFalse(answer_matcher.match_answer("부신피질기능저하증", keys))
+            self.assertEqual(calls, [])
+            # 빠진 글자는 편집 거리 유사도(0.75)만으로는 모자라 SequenceMatcher(0.857)로 확인
+            self.assertTrue(answer_matcher.match_answer("신부전", answer_matcher.build_answer_keys("신부전증")))
+            self.assertEqual(len(calls), 1)
+        finally:
+            answer_matcher.SequenceMatcher = original
+        # SequenceMatcher가 긴 블록을 먼저 잡아 놓치는 두 글자 오타도 편집 거리로 통과
+        self.assertLess(SequenceMatcher(None, "a전부부심근ca전부", "a전전부심근전a전부").ratio(), 0.8)
+        self.assertTrue(answer_matcher.match_answer("a전부부심근ca전부", ["a전전부심근전a전부"]))
+
+    def test_accepted_answers_input_parsing(self):
+        self.assertEqual(answer_matcher.parse_accepted_answers("GBS, 길랭바레\n AIDP ,"), ["GBS", "길랭바레", "AIDP"])
+        self.assertEqual(answer_matcher.parse_accepted_answers(["a", " "]), ["a"])
+
+
+class AnswerKeyAppTests(unittest.TestCase):
+    def test_grading_uses_stored_keys_and_edit_refreshes_them(self):
+        bank_ref = {"text": [], "cloze": [{"id": "c1", "front": "{{c1::}}의 원인균", "answer": "폐렴구균"}]}
+        ns = _load_namespace(
+            ["get_answer_keys", "refresh_answer_keys", "grade_short_answer", "is_answer_correct", "update_question_by_id"],
+            extra={
+                "load_questions": lambda: copy.deepcopy(bank_ref),
+                "save_questions": lambda data, change=None: bank_ref.update(data) or True,
+            },
+        )
+        q = {"type": "cloze", "answer": "폐렴구균", "answer_keys": ["폐렴구균", "streptococcuspneumoniae"]}
+        self.assertTrue(ns["is_answer_correct"](q, "Streptococcus pneumoniae"))
+        self.assertFalse(ns["is_answer_correct"](q, "포도상구균"))
+
+        self.assertTrue(ns["update_question_by_id"]("c1", {"accepted_answers": ["S. pneumoniae"]}))
+        saved = bank_ref["cloze"][0]
+        self.assertEqual(saved["answer_keys"], ["폐렴구균", "spneumoniae"])
+        self.assertTrue(ns["grade_short_answer"](saved, "s pneumoniae"))
+
+
+if __name__ == "__main__":
+    unittest.main()
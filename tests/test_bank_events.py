@@ -0,0 +1,221 @@
+import ast
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+APP_PATH = str(ROOT / "app.py")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.repositories import load_bank_event_file, save_bank_event_file, search_index_store  # noqa: E402
+from src.services import bank_events, facet_index, text_search  # noqa: E402
+
+
+class _SessionState(dict):
+    def __getattr__(self, key):
+        return self.get(key)
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def _load_namespace(names, extra=None):
+    source = Path(APP_PATH).read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=APP_PATH)
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {
+        "datetime": datetime,
+        "timezone": timezone,
+        "FSRS_AVAILABLE": False,
+        "_BANK_EVENT_LOCK": threading.Lock(),
+        "st": __import__("types").SimpleNamespace(session_state=_SessionState()),
+        "SEARCH_INDEX_VERSION": text_search.SEARCH_INDEX_VERSION,
+        "SEARCH_TEXT_FIELDS": ("problem", "front", "options", "explanation", "note"),
+        "load_search_index_file": search_index_store.load_search_index_file,
+        "save_search_index_file": search_index_store.save_search_index_file,
+    }
+    for module_ref, names_ in (
+        (bank_events, ("bank_changes_since", "changed_ids", "new_bank_event_log", "record_bank_event")),
+        (facet_index, ("new_facet_index", "sync_facet_index", "facet_add", "facet_remove")),
+        (text_search, ("new_search_index", "sync_search_index", "compact_search_index", "search_index_add", "search_index_remove", "text_signature")),
+    ):
+        for name in names_:
+            namespace[name] = getattr(module_ref, name)
+    namespace.update(extra or {})
+    exec(compile(module, APP_PATH, "exec"), namespace)
+    return namespace
+
+
+class BankEventLogTests(unittest.TestCase):
+    def test_changes_since_merges_events(self):
+        log = bank_events.new_bank_event_log(revision=10)
+        bank_events.record_bank_event(log, {"added": ["a", "b"]})
+        bank_events.record_bank_event(log, {"updated": {"a": ["note"], "c": ["stats"]}})
+        bank_events.record_bank_event(log, {"updated": {"c": ["fsrs"]}, "deleted": ["b", "d"]})
+        self.assertEqual(log["revision"], 13)
+
+        change = bank_events.bank_changes_since(log, 10)
+        # 추가 후 삭제된 b는 없던 일, 추가된 a의 수정은 추가에 포함
+        self.assertEqual(change, {"added": ["a"], "updated": {"c": ["fsrs", "stats"]}, "deleted": ["d"]})
+        self.assertEqual(bank_events.bank_changes_since(log, 13), bank_events.bank_change())
+        self.assertEqual(bank_events.changed_ids(change, ["note"]), {"a"})
+        self.assertEqual(bank_events.changed_ids(change), {"a", "c"})
+
+    def test_reset_or_gap_forces_rebuild(self):
+        log = bank_events.new_bank_event_log()
+        bank_events.record_bank_event(log, {"added": ["a"]})
+        bank_events.record_bank_event(log, None)
+        bank_events.record_bank_event(log, {"deleted": ["a"]})
+        self.assertIsNone(bank_events.bank_changes_since(log, 0))
+        self.assertEqual(bank_events.bank_changes_since(log, 2)["deleted"], ["a"])
+        self.assertIsNone(bank_events.bank_changes_since(log, 5))
+        self.assertIsNone(bank_events.bank_changes_since(log, None))
+
+        for _ in range(5):
+            bank_events.record_bank_event(log, {"added": ["x"]}, limit=3)
+        self.assertEqual(len(log["events"]), 3)
+        self.assertIsNone(bank_events.bank_changes_since(log, 4))
+        self.assertIsNotNone(bank_events.bank_changes_since(log, 5))
+
+    def test_store_round_trip(self):
+        log = bank_events.new_bank_event_log()
+        bank_events.record_bank_event(log, {"updated": {"a": ["note"]}})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bank_events.json"
+            self.assertIsNone(load_bank_event_file(path))
+            self.assertTrue(save_bank_event_file(path, log))
+            self.assertEqual(load_bank_event_file(path), log)
+
+
+class BankEventRecordTests(unittest.TestCase):
+    def test_sessions_append_to_the_shared_log(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            events_file = str(Path(tmp) / "bank_events.json")
+            lock = threading.Lock()
+            sessions = [
+                _load_namespace(
+                    ["get_bank_revision", "get_bank_event_log", "record_bank_change"],
+                    extra={
+                        "_BANK_EVENT_LOCK": lock,
+                        "get_bank_events_file": lambda user_id=None: events_file,
+                        "load_bank_event_file": load_bank_event_file,
+                        "save_bank_event_file": save_bank_event_file,
+                    },
+                )
+                for _ in range(2)
+            ]
+            first, second = sessions
+            first["get_bank_event_log"]()
+            second["get_bank_event_log"]()
+
+            first["record_bank_change"]({"added": ["a"]})
+            second["record_bank_change"]({"added": ["b"]})
+            first["record_bank_change"]({"deleted": ["a"]})
+
+            log = load_bank_event_file(events_file)
+            self.assertEqual(log["revision"], 3)
+            self.assertEqual([e["revision"] for e in log["events"]], [1, 2, 3])
+            self.assertEqual(second["get_bank_revision"](), 2)
+            self.assertEqual(first["get_bank_revision"](), 3)
+            # 다른 세션의 변경도 이어진 이벤트로 보여 전체 재구성 없이 따라잡는다
+            self.assertEqual(
+                bank_events.bank_changes_since(first["get_bank_event_log"](), 0),
+                {"added": ["b"], "updated": {}, "deleted": []},
+            )
+
+
+class BankEventSubscriberTests(unittest.TestCase):
+    def _bank(self):
+        return {
+            "text": [
+                {"id": "m1", "subject": "순환기", "unit": "심장", "problem": "급성 심근경색 진단", "options": ["troponin"]},
+                {"id": "m2", "subject": "내분비", "unit": "당뇨", "problem": "당뇨병 치료", "options": ["metformin"]},
+            ],
+            "cloze": [{"id": "c1", "subject": "소화기", "unit": "췌장", "front": "췌장염의 표지자는 lipase"}],
+        }
+
+    def test_facet_and_search_index_follow_events(self):
+        bank = self._bank()
+        with tempfile.TemporaryDirectory() as tmp:
+            index_file = str(Path(tmp) / "search_index.pkl")
+            events_file = str(Path(tmp) / "bank_events.json")
+            ns = _load_namespace(
+                [
+                    "parse_iso_datetime",
+                    "get_unit_name",
+                    "get_question_due_epoch",
+                    "question_facet_row",
+                    "get_bank_revision",
+                    "get_bank_event_log",
+                    "record_bank_change",
+                    "get_bank_changes",
+                    "question_positions",
+                    "get_facet_index",
+                    "question_search_text",
+                    "get_search_index",
+                ],
+                extra={
+                    "load_questions": lambda: bank,
+                    "get_search_index_file": lambda user_id=None: index_file,
+                    "get_bank_events_file": lambda user_id=None: events_file,
+                    "load_bank_event_file": load_bank_event_file,
+                    "save_bank_event_file": save_bank_event_file,
+                },
+            )
+            ns["get_bank_event_log"]()
+            ns["get_facet_index"]()
+            ns["get_search_index"]()
+
+            # 수정 이벤트에 나오지 않은 문항은 다시 보지 않는다
+            bank["text"][1]["problem"] = "이벤트 없이 바뀐 본문"
+            bank["text"][0]["subject"] = "병리"
+            bank["cloze"].append({"id": "c2", "subject": "신장", "unit": "사구체", "front": "신증후군 단백뇨"})
+            bank["text"][0]["note"] = "심근경색 troponin 상승"
+            ns["record_bank_change"]({"updated": {"m1": ["subject", "note"]}, "added": ["c2"]})
+            self.assertEqual(ns["get_bank_revision"](), 1)
+
+            facets = ns["get_facet_index"]()
+            search = ns["get_search_index"]()
+            self.assertEqual(facets["rows"]["m1"]["subject"], "병리")
+            self.assertIn("c2", facets["rows"])
+            self.assertIn("c2", search["docs"])
+            self.assertEqual(
+                search["docs"]["m1"][1],
+                text_search.text_signature(ns["question_search_text"](bank["text"][0])),
+            )
+            self.assertNotEqual(
+                search["docs"]["m2"][1],
+                text_search.text_signature(ns["question_search_text"](bank["text"][1])),
+            )
+
+            ns["record_bank_change"]({"deleted": ["c1"]})
+            bank["cloze"] = [q for q in bank["cloze"] if q["id"] != "c1"]
+            self.assertNotIn("c1", ns["get_facet_index"]()["rows"])
+            self.assertNotIn("c1", ns["get_search_index"]()["docs"])
+            self.assertEqual(load_bank_event_file(events_file)["revision"], 2)
+
+            # 이유를 모르는 저장(reset)은 전체 비교로 되돌아가 이벤트 없이 바뀐 본문도 반영
+            ns["record_bank_change"](None)
+            search = ns["get_search_index"]()
+            self.assertEqual(
+                search["docs"]["m2"][1],
+                text_search.text_signature(ns["question_search_text"](bank["text"][1])),
+            )
+            fresh = facet_index.new_facet_index()
+            facet_index.sync_facet_index(fresh, dict(ns["get_facet_index"]()["rows"]))
+            self.assertEqual(ns["get_facet_index"]()["root"], fresh["root"])
+
+
+if __name__ == "__main__":
+    unittest.main()
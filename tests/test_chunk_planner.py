@@ -0,0 +1,100 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services.chunk_planner import (  # noqa: E402
+    allocate_items,
+    feed_chunk_stream,
+    finish_chunk_stream,
+    new_chunk_stream,
+    plan_chunks,
+    split_pages,
+    split_sections,
+)
+from src.services.generation_engine import estimate_tokens  # noqa: E402
+
+
+def _lecture():
+    return "\n".join([
+        "=== 슬라이드 1 ===\n목차",
+        "=== 슬라이드 2 ===",
+        "=== 슬라이드 3 ===\n급성 심근경색은 troponin 상승과 ST분절 상승으로 진단한다. 초기 치료는 aspirin이다.",
+        "=== 슬라이드 4 ===\n심방세동 환자는 CHA2DS2-VASc 점수로 항응고 여부를 정한다.\n\nwarfarin 또는 DOAC를 쓴다.",
+    ])
+
+
+class ChunkPlannerTests(unittest.TestCase):
+    def test_sections_follow_extractor_markers(self):
+        sections = split_sections(_lecture())
+        # 본문이 없는 슬라이드 2는 버린다
+        self.assertEqual([s.splitlines()[0] for s in sections], ["=== 슬라이드 1 ===", "=== 슬라이드 3 ===", "=== 슬라이드 4 ==="])
+        self.assertEqual(split_sections("첫 문단\n\n\n둘째 문단"), ["첫 문단", "둘째 문단"])
+
+    def test_whole_slides_are_packed_up_to_budget(self):
+        chunks = plan_chunks(_lecture(), max_tokens=60)
+        for chunk in chunks:
+            self.assertLessEqual(chunk["tokens"], 60)
+            self.assertTrue(chunk["text"].startswith("=== 슬라이드"))
+        self.assertEqual(sum(c["text"].count("=== 슬라이드") for c in chunks), 3)
+        self.assertEqual(len(plan_chunks(_lecture(), max_tokens=10_000)), 1)
+
+    def test_oversized_slide_is_split_at_sentences_with_its_heading(self):
+        sentence = "급성 췌장염은 lipase 상승과 복통으로 진단한다. "
+        text = "=== 페이지 1 ===\n" + sentence * 40
+        chunks = plan_chunks(text, max_tokens=120)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(chunks[0]["text"].startswith("=== 페이지 1 ===\n급성"))
+        for chunk in chunks:
+            self.assertLessEqual(chunk["tokens"], 120)
+            self.assertTrue(chunk["text"].rstrip().endswith("진단한다."))
+        unbroken = plan_chunks("가" * 1000, max_tokens=100)
+        self.assertEqual("".join(c["text"] for c in unbroken), "가" * 1000)
+        self.assertTrue(all(estimate_tokens(c["text"]) <= 100 for c in unbroken))
+
+    def test_overlap_repeats_only_a_small_trailing_unit(self):
+        text = "\n\n".join(["가" * 80, "나" * 80, "다" * 20, "라" * 80])
+        chunks = plan_chunks(text, max_tokens=95, overlap_tokens=15)
+        # 마지막 문단(10토큰)만 다음 청크 앞에 다시 붙고, 40토큰 문단은 반복하지 않는다
+        self.assertEqual([c["text"] for c in chunks[1:]], ["다" * 20 + "\n\n" + "라" * 80])
+        self.assertEqual([c["text"] for c in plan_chunks(text, max_tokens=95)[1:]], ["라" * 80])
+        self.assertEqual(plan_chunks(text, max_tokens=95, overlap_tokens=5)[1]["text"], "라" * 80)
+
+    def test_items_follow_density(self):
+        self.assertEqual(allocate_items([10, 0, 30], 8), [2, 0, 6])
+        self.assertEqual(allocate_items([1, 1, 1], 2), [1, 1, 0])
+        self.assertEqual(allocate_items([0, 0], 3), [2, 1])
+        self.assertEqual(sum(allocate_items([3, 7, 11, 2], 13)), 13)
+        chunks = plan_chunks(_lecture(), max_tokens=40)
+        counts = allocate_items([c["density"] for c in chunks], 4)
+        self.assertEqual(counts[0], 0)
+
+    def test_streamed_pages_match_batch_plan_and_allocate_by_position(self):
+        pages = split_pages(_lecture())
+        # 본문 없는 슬라이드 2도 남겨 전체 페이지 수와 위치가 추출기와 같다
+        self.assertEqual(len(pages), 4)
+        self.assertEqual(split_pages("표기 없는 원문"), ["표기 없는 원문"])
+        state = new_chunk_stream(60, total_items=7)
+        streamed = []
+        for page in pages:
+            streamed.extend(feed_chunk_stream(state, page, total_pages=len(pages)))
+        streamed.extend(finish_chunk_stream(state))
+        self.assertEqual([c["text"] for c in streamed], [c["text"] for c in plan_chunks(_lecture(), max_tokens=60)])
+        self.assertEqual(sum(c["items"] for c in streamed), 7)
+        self.assertTrue(all(c["items"] >= 0 for c in streamed))
+
+        # 페이지가 고르게 길면 문항도 페이지 비율대로 간다
+        state = new_chunk_stream(30, total_items=10)
+        even = []
+        for i in range(1, 11):
+            even.extend(feed_chunk_stream(state, f"=== 페이지 {i} ===\n" + "가나다라" * 10, total_pages=10))
+        even.extend(finish_chunk_stream(state))
+        self.assertEqual([c["items"] for c in even], [1] * 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
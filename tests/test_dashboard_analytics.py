@@ -0,0 +1,82 @@
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services import dashboard_analytics  # noqa: E402
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _ago(days, hours=0):
+    return (NOW - timedelta(days=days, hours=hours)).isoformat()
+
+
+class DashboardSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.bank = {
+            "text": [
+                {
+                    "id": "a",
+                    "stats": {
+                        "right": 3,
+                        "wrong": 2,
+                        "history": [
+                            {"time": _ago(0, 1), "correct": True},
+                            {"time": _ago(3), "correct": False},
+                            {"time": _ago(20), "correct": True},
+                            {"time": _ago(400), "correct": True},
+                            {"time": None, "correct": True},
+                        ],
+                    },
+                },
+                {"id": "b", "stats": {"right": 1, "wrong": 0}},
+            ],
+            "cloze": [
+                {"id": "c", "stats": {"right": 0, "wrong": 4, "history": [{"time": _ago(1), "correct": False}]}},
+            ],
+        }
+        # 분리 저장소 행: (kind, value, ts, _, _) — kind 0이 정오답 기록
+        ts = (NOW - timedelta(days=2)).timestamp()
+        self.log_index = {"b": [(0, 1, ts, 0, 0), (0, 0, ts + 60, 0, 0), (1, 3, ts, 0, 0)]}
+        self.snapshot = dashboard_analytics.build_dashboard_snapshot(self.bank, log_index=self.log_index, now=NOW)
+
+    def test_counts(self):
+        snap = self.snapshot
+        self.assertEqual((snap["total_text"], snap["total_cloze"]), (2, 1))
+        self.assertEqual((snap["wrong"], snap["wrong_items"]), (6, 2))
+        self.assertEqual(
+            dashboard_analytics.dashboard_overall_accuracy(snap),
+            {"correct": 4, "wrong": 6, "total": 10, "accuracy": 40.0},
+        )
+        # 최근 7일: a 1건, b 2건(로그), c 1건, a의 3일 전 1건
+        self.assertEqual((snap["recent"]["correct"], snap["recent"]["total"]), (2, 5))
+
+    def test_heatmap_buckets_embedded_and_stored_history(self):
+        rows = dashboard_analytics.dashboard_heatmap(self.snapshot, days=365)
+        self.assertEqual(len(rows), 365)
+        self.assertEqual(rows[-1]["date"], NOW.date())
+        active = [(r["date"].isoformat(), r["count"], r["accuracy"], r["week_index"]) for r in rows if r["count"]]
+        # 400일 전·시간 없는 기록은 빠지고, b의 로그 2건은 같은 날에 모인다
+        self.assertEqual(active, [
+            ("2026-02-18", 1, 100.0, 49),
+            ("2026-03-07", 1, 0.0, 51),
+            ("2026-03-08", 2, 50.0, 51),
+            ("2026-03-09", 1, 0.0, 51),
+            ("2026-03-10", 1, 100.0, 52),
+        ])
+
+    def test_empty_bank(self):
+        snap = dashboard_analytics.build_dashboard_snapshot({"text": [], "cloze": []}, now=NOW)
+        self.assertIsNone(dashboard_analytics.dashboard_overall_accuracy(snap))
+        self.assertIsNone(snap["recent"]["accuracy"])
+        self.assertEqual(sum(row["count"] for row in dashboard_analytics.dashboard_heatmap(snap)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
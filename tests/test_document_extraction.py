@@ -0,0 +1,167 @@
+import importlib.util
+import io
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services import document_extraction  # noqa: E402
+from src.services.document_extraction import (  # noqa: E402
+    expand_upload_sources,
+    ocr_image_bytes,
+    read_extracted_pages,
+    read_upload_source,
+    run_document_extraction,
+    submit_document_extraction,
+)
+
+DOCX_INSTALLED = importlib.util.find_spec("docx") is not None
+FITZ_INSTALLED = importlib.util.find_spec("fitz") is not None
+
+
+def _docx_bytes(paragraphs):
+    from docx import Document
+
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+class ReadExtractedPagesTests(unittest.TestCase):
+    def test_only_complete_lines_are_consumed(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "job.pages.jsonl"
+            self.assertEqual(read_extracted_pages(path), ([], 0))
+            path.write_text('{"page": 1, "total": 2, "text": "가"}\n{"page": 2, "tot', encoding="utf-8")
+            records, offset = read_extracted_pages(path)
+            self.assertEqual(records, [{"page": 1, "total": 2, "text": "가"}])
+            with open(path, "a", encoding="utf-8") as f:
+                f.write('al": 2, "text": "나"}\n')
+            records, offset = read_extracted_pages(path, offset)
+            self.assertEqual([r["text"] for r in records], ["나"])
+            self.assertEqual(read_extracted_pages(path, offset), ([], offset))
+
+    def test_zip_uploads_are_expanded_to_supported_files(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("2학기/순환기/02_판막.pptx", b"b")
+            zf.writestr("2학기/순환기/01_심부전.pdf", b"a")
+            zf.writestr("2학기/메모.txt", b"x")
+            zf.writestr("__MACOSX/2학기/._01_심부전.pdf", b"x")
+            zf.writestr("2학기/.DS_Store", b"x")
+        files = [("학기.zip", archive.getvalue()), ("단독.docx", b"c"), ("노트.txt", b"d")]
+        sources = expand_upload_sources(files)
+        self.assertEqual(
+            sources,
+            [
+                ("2학기/순환기/01_심부전.pdf", 1, 0, "2학기/순환기/01_심부전.pdf"),
+                ("2학기/순환기/02_판막.pptx", 1, 0, "2학기/순환기/02_판막.pptx"),
+                ("단독.docx", 1, 1, None),
+            ],
+        )
+        self.assertEqual([read_upload_source(files, source) for source in sources], [b"a", b"b", b"c"])
+
+    def test_oversized_zip_uploads_are_rejected_before_reading(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for i in range(3):
+                zf.writestr(f"강의/{i}.pdf", b"\0" * 4096)
+        files = [("강의.zip", archive.getvalue())]
+        self.assertEqual(len(expand_upload_sources(files, max_bytes=3 * 4096)), 3)
+        with self.assertRaises(ValueError):
+            expand_upload_sources(files, max_bytes=3 * 4096 - 1)
+        with self.assertRaises(ValueError):
+            expand_upload_sources(files, max_members=2)
+
+
+@unittest.skipUnless(DOCX_INSTALLED, "python-docx not installed")
+class RunDocumentExtractionTests(unittest.TestCase):
+    def test_docx_is_extracted_in_a_worker_process(self):
+        with tempfile.TemporaryDirectory() as td:
+            source = Path(td) / "job.source.docx"
+            source.write_bytes(_docx_bytes(["심근경색의 진단 기준", "트로포닌 상승"]))
+            pages_path = Path(td) / "job.pages.jsonl"
+            summary = submit_document_extraction(source, pages_path).result(timeout=60)
+            records, _ = read_extracted_pages(pages_path)
+        self.assertTrue(summary["ok"])
+        self.assertEqual(records[0]["text"], "심근경색의 진단 기준\n트로포닌 상승\n")
+        self.assertEqual(records[-1]["pages"], 1)
+        self.assertTrue(records[-1]["done"])
+
+    def test_cancel_file_and_errors_are_reported_in_the_channel(self):
+        with tempfile.TemporaryDirectory() as td:
+            source = Path(td) / "job.source.docx"
+            source.write_bytes(_docx_bytes(["본문"]))
+            cancel = Path(td) / "job.cancel"
+            cancel.touch()
+            pages_path = Path(td) / "job.pages.jsonl"
+            summary = run_document_extraction(str(source), str(pages_path), str(cancel))
+            self.assertEqual(summary["error"], "cancelled")
+            self.assertEqual(read_extracted_pages(pages_path)[0], [{"error": "cancelled"}])
+
+            broken = Path(td) / "broken.source.docx"
+            broken.write_bytes(b"not a zip")
+            broken_pages = Path(td) / "broken.pages.jsonl"
+            self.assertFalse(run_document_extraction(str(broken), str(broken_pages))["ok"])
+            self.assertIn("error", read_extracted_pages(broken_pages)[0][-1])
+
+
+class OcrImageTests(unittest.TestCase):
+    def test_lines_are_read_top_to_bottom_then_left_to_right(self):
+        seen = []
+
+        class _Reader:
+            def readtext(self, path, detail=1, paragraph=False):
+                seen.append(Path(path).read_bytes())
+                return [
+                    ([[50, 40], [90, 40], [90, 60], [50, 60]], "둘째 줄 오른쪽", 0.9),
+                    ([[0, 0], [40, 0], [40, 20], [0, 20]], " 첫 줄 ", 0.9),
+                    ([[0, 40], [40, 40], [40, 60], [0, 60]], "둘째 줄 왼쪽", 0.9),
+                    ([[0, 80], [40, 80], [40, 90], [0, 90]], "  ", 0.1),
+                ]
+
+        langs = ("ko", "test")
+        document_extraction._OCR_READERS[langs] = _Reader()
+        try:
+            self.assertEqual(ocr_image_bytes(b"png", langs=list(langs)), "첫 줄\n둘째 줄 왼쪽\n둘째 줄 오른쪽")
+        finally:
+            document_extraction._OCR_READERS.pop(langs)
+        self.assertEqual(seen, [b"png"])
+
+        document_extraction._OCR_READERS[langs] = None
+        try:
+            with self.assertRaises(ValueError):
+                ocr_image_bytes(b"png", langs=langs)
+        finally:
+            document_extraction._OCR_READERS.pop(langs)
+
+
+@unittest.skipUnless(FITZ_INSTALLED, "PyMuPDF not installed")
+class PdfPageExtractionTests(unittest.TestCase):
+    def test_pdf_pages_carry_page_markers(self):
+        import fitz
+
+        doc = fitz.open()
+        for text in ("first page body " * 10, "second page body " * 10):
+            doc.new_page().insert_text((72, 72), text)
+        with tempfile.TemporaryDirectory() as td:
+            source = Path(td) / "job.source.pdf"
+            source.write_bytes(doc.tobytes())
+            pages_path = Path(td) / "job.pages.jsonl"
+            run_document_extraction(str(source), str(pages_path), ocr=False)
+            records, _ = read_extracted_pages(pages_path)
+        self.assertEqual([r["total"] for r in records[:-1]], [2, 2])
+        self.assertTrue(records[1]["text"].startswith("=== 페이지 2 ===\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import ast
+import copy
+import sys
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+APP_PATH = ROOT / "app.py"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services.duplicate_clusters import find_duplicate_clusters  # noqa: E402
+
+STEM = "50세 남자가 3일 전부터 시작된 발열과 기침, 누런 가래를 주소로 내원하였다. 흉부 X선에서 우하엽 경화 소견이 관찰되었다. 가장 가능성이 높은 원인균은?"
+NEAR = "50세 남자가 3일 전부터 시작된 발열과 기침, 누런 가래를 주소로 내원하였다. 흉부 X선에서 우하엽 경화 소견이 보였다. 가장 가능성이 높은 원인균은?"
+OTHER = "신증후군에서 나타나는 검사 소견으로 옳지 않은 것은? 단백뇨, 저알부민혈증, 고지혈증과 부종을 동반한다."
+
+
+def _load_namespace(names, extra=None):
+    source = APP_PATH.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(APP_PATH))
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {"datetime": datetime, "timezone": timezone}
+    namespace.update(extra or {})
+    exec(compile(module, str(APP_PATH), "exec"), namespace)
+    return namespace
+
+
+class DuplicateClusterTests(unittest.TestCase):
+    def test_clusters_exact_and_near_duplicates_and_keeps_highest_priority(self):
+        texts = {"a": STEM, "b": STEM, "c": NEAR, "d": OTHER, "e": "  "}
+        result = find_duplicate_clusters(texts, priorities={"c": (5,)}, threshold=0.7)
+        self.assertEqual(result["item_count"], 5)
+        self.assertEqual(len(result["clusters"]), 1)
+        cluster = result["clusters"][0]
+        self.assertEqual(cluster["keep"], "c")
+        self.assertEqual(sorted(key for key, _ in cluster["remove"]), ["a", "b"])
+        self.assertTrue(all(sim >= 0.7 for _, sim in cluster["remove"]))
+        self.assertEqual(result["duplicate_count"], 2)
+
+    def test_ties_keep_the_first_item(self):
+        result = find_duplicate_clusters({"x": OTHER, "y": OTHER}, threshold=0.9)
+        self.assertEqual(result["clusters"], [{"keep": "x", "remove": [["y", 1.0]]}])
+        self.assertEqual(find_duplicate_clusters({"x": STEM, "y": OTHER})["clusters"], [])
+
+
+class DuplicateMergeTests(unittest.TestCase):
+    def test_merge_plan_combines_stats_fsrs_and_stored_logs(self):
+        bank_ref = {
+            "text": [
+                {
+                    "id": "keep",
+                    "problem": STEM,
+                    "note": "메모1",
+                    "stats": {"right": 2, "wrong": 1, "last_attempt": "2026-03-01T00:00:00+00:00"},
+                    "fsrs": {"card": "{\"k\": 1}", "last_review": "2026-03-01T00:00:00+00:00"},
+                },
+                {
+                    "id": "dup",
+                    "problem": NEAR,
+                    "note": "메모2",
+                    "stats": {"right": 0, "wrong": 3, "last_attempt": "2026-03-05T00:00:00+00:00"},
+                    "fsrs": {"card": "{\"k\": 2}", "last_review": "2026-03-05T00:00:00+00:00"},
+                },
+                {"id": "other", "problem": OTHER},
+            ],
+            "cloze": [],
+        }
+        rekeyed = []
+        ns = _load_namespace(
+            ["merge_duplicate_items", "apply_duplicate_merge_plan"],
+            extra={
+                "load_questions": lambda: copy.deepcopy(bank_ref),
+                "save_questions": lambda data, change=None: bank_ref.update(data) or True,
+                "rekey_review_log_records": rekeyed.append,
+            },
+        )
+        merged, removed = ns["apply_duplicate_merge_plan"]([
+            {"keep": "keep", "remove": [["dup", 0.9], ["missing", 0.9]]},
+        ])
+        self.assertEqual((merged, removed), (1, 1))
+        self.assertEqual([q["id"] for q in bank_ref["text"]], ["keep", "other"])
+        kept = bank_ref["text"][0]
+        self.assertEqual((kept["stats"]["right"], kept["stats"]["wrong"]), (2, 4))
+        self.assertEqual(kept["stats"]["last_attempt"], "2026-03-05T00:00:00+00:00")
+        self.assertEqual(kept["fsrs"]["card"], "{\"k\": 2}")
+        self.assertEqual(kept["note"], "메모1\n메모2")
+        # 분리 저장된 기록은 복사하지 않고 남긴 문항 id로 옮긴다
+        self.assertEqual(rekeyed, [{"dup": "keep"}])
+
+        # 이미 삭제된 문항은 다시 병합하지 않음
+        self.assertEqual(ns["apply_duplicate_merge_plan"]([{"keep": "keep", "remove": [["dup", 0.9]]}]), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import ast
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+APP_PATH = str(ROOT / "app.py")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services import facet_index  # noqa: E402
+
+
+class _SessionState(dict):
+    def __getattr__(self, key):
+        return self.get(key)
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def _load_namespace(names, extra=None):
+    source = Path(APP_PATH).read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=APP_PATH)
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {
+        "datetime": datetime,
+        "timezone": timezone,
+        "FSRS_AVAILABLE": False,
+        "st": __import__("types").SimpleNamespace(session_state=_SessionState()),
+    }
+    for name in ("new_facet_index", "sync_facet_index", "facet_subjects", "facet_counts", "facet_query_keys"):
+        namespace[name] = getattr(facet_index, name)
+    namespace.update(extra or {})
+    exec(compile(module, APP_PATH, "exec"), namespace)
+    return namespace
+
+
+NOW = datetime(2026, 4, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _bank(n=60, seed=3):
+    rng = random.Random(seed)
+    bank = {"text": [], "cloze": []}
+    for i in range(n):
+        item = {
+            "id": f"q{i}",
+            "subject": rng.choice(["해부", "생리", None]),
+            "unit": rng.choice(["심장", "신장", ""]),
+            "difficulty": rng.choice(["상", "중", None]),
+            "stats": {"wrong": rng.choice([0, 0, 2])},
+            "batch_id": rng.choice(["b1", "b2", None]),
+        }
+        if rng.random() < 0.7:
+            item["srs"] = {"due": (NOW + timedelta(hours=rng.randint(-72, 72))).isoformat()}
+        bank["text" if i % 3 else "cloze"].append(item)
+    return bank
+
+
+NAMES = [
+    "parse_iso_datetime",
+    "get_unit_name",
+    "collect_subject_unit_map",
+    "get_question_due_epoch",
+    "question_facet_row",
+    "get_bank_revision",
+    "question_positions",
+    "get_bank_changes",
+    "get_facet_index",
+    "summarize_subject_review_status_from_index",
+    "select_questions",
+    "filter_questions_by_subject",
+    "filter_questions_by_subject_unit_hierarchy",
+    "simple_srs_due",
+    "srs_due",
+    "collect_export_questions",
+    "select_export_questions",
+]
+
+
+class FacetIndexTests(unittest.TestCase):
+    def test_index_matches_full_scan_helpers(self):
+        bank = _bank()
+        ns = _load_namespace(NAMES, extra={"load_questions": lambda: bank})
+        questions = bank["text"] + bank["cloze"]
+        index = ns["get_facet_index"]()
+        self.assertEqual(facet_index.facet_subject_unit_map(index), ns["collect_subject_unit_map"](questions))
+        self.assertEqual(
+            facet_index.facet_subject_unit_map(index, qtype="cloze"),
+            ns["collect_subject_unit_map"](bank["cloze"]),
+        )
+        self.assertEqual(
+            facet_index.facet_values(index, "difficulty"),
+            sorted({q.get("difficulty") or "미지정" for q in questions}),
+        )
+
+        # 전체 스캔 기준값 (FSRS 없음: 연체/미래/신규는 0)
+        rows = {}
+        for q in questions:
+            subj = q.get("subject") or "General"
+            row = rows.setdefault(subj, {"분과": subj, "총문항": 0, "복습대상": 0, "연체": 0, "미래": 0, "신규": 0, "오답문항": 0})
+            row["총문항"] += 1
+            row["복습대상"] += int(ns["srs_due"](q, now=NOW))
+            row["오답문항"] += int(int((q.get("stats") or {}).get("wrong", 0)) > 0)
+        expected = sorted(rows.values(), key=lambda r: r["분과"])
+        actual = sorted(ns["summarize_subject_review_status_from_index"](index, now=NOW), key=lambda r: r["분과"])
+        self.assertEqual(actual, expected)
+
+    def test_incremental_sync_equals_rebuild(self):
+        bank = _bank()
+        ns = _load_namespace(NAMES, extra={"load_questions": lambda: bank})
+        index = ns["get_facet_index"]()
+        self.assertIs(ns["get_facet_index"](), index)
+
+        bank["text"].pop(0)
+        bank["cloze"][0]["subject"] = "병리"
+        bank["text"].append({"id": "new1", "subject": "해부", "unit": "폐"})
+        ns["st"].session_state["bank_revision"] = 1
+        updated = ns["get_facet_index"]()
+
+        fresh = facet_index.new_facet_index()
+        facet_index.sync_facet_index(fresh, dict(updated["rows"]))
+        self.assertEqual(updated["root"], fresh["root"])
+        self.assertIn("병리", facet_index.facet_subjects(updated))
+        self.assertIn("폐", facet_index.facet_subject_unit_map(updated)["해부"])
+
+    def test_remove_prunes_empty_nodes(self):
+        index = facet_index.new_facet_index()
+        facet_index.facet_add(index, "a", {"subject": "S", "unit": "U", "type": "text", "difficulty": "중", "wrong": True, "due": 5.0})
+        counts = facet_index.facet_counts(index, 10.0, subject="S", unit="U")
+        self.assertEqual((counts["total"], counts["due"], counts["overdue"], counts["wrong"]), (1, 1, 1, 1))
+        self.assertTrue(facet_index.facet_remove(index, "a"))
+        self.assertEqual(facet_index.facet_subjects(index), [])
+        self.assertEqual(index["root"]["total"], 0)
+        self.assertEqual(index["root"]["types"], {})
+
+
+class FacetQueryTests(unittest.TestCase):
+    def _ns(self, bank):
+        class _Now(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return NOW
+
+        return _load_namespace(NAMES, extra={"load_questions": lambda: bank, "datetime": _Now})
+
+    def test_hierarchy_selection_matches_list_filter_in_bank_order(self):
+        bank = _bank(120)
+        ns = self._ns(bank)
+        unit_filter = {"해부": ["심장", "미분류"], "General": ["신장"]}
+        expected = ns["filter_questions_by_subject_unit_hierarchy"](bank["text"], ["해부", "General"], unit_filter)
+        actual = ns["select_questions"]({"type": "text", "subject_units": unit_filter})
+        self.assertEqual([q["id"] for q in actual], [q["id"] for q in expected])
+
+        due_expected = [q for q in expected if ns["srs_due"](q, now=NOW)]
+        due_actual = ns["select_questions"]({"type": "text", "subject_units": unit_filter, "due": True})
+        self.assertEqual([q["id"] for q in due_actual], [q["id"] for q in due_expected])
+
+    def test_and_or_filters_over_postings(self):
+        bank = _bank(120)
+        ns = self._ns(bank)
+        questions = bank["text"] + bank["cloze"]
+        spec = {
+            "batch_id": ["b1", "legacy"],
+            "any": [{"wrong": True}, {"difficulty": "상", "subject": "생리"}],
+        }
+        expected = [
+            q["id"] for q in questions
+            if (q.get("batch_id") or "legacy") in ("b1", "legacy")
+            and (q["stats"]["wrong"] > 0 or ((q.get("difficulty") == "상") and q.get("subject") == "생리"))
+        ]
+        self.assertEqual([q["id"] for q in ns["select_questions"](spec)], expected)
+
+    def test_export_selection_through_index_matches_list_path(self):
+        bank = _bank(90)
+        ns = self._ns(bank)
+        for include_all in (True, False):
+            args = (["해부", "생리"], {"해부": ["심장"], "생리": ["신장", "미분류"]})
+            expected = ns["collect_export_questions"](bank["text"], *args, include_all_units=include_all)
+            actual = ns["select_export_questions"]("text", *args, include_all_units=include_all)
+            self.assertEqual([q["id"] for q in actual], [q["id"] for q in expected])
+
+    def test_freed_slots_are_reused_without_leaking_old_keys(self):
+        index = facet_index.new_facet_index()
+        row = {"subject": "S", "unit": "U", "type": "text", "difficulty": "중", "batch_id": "b", "wrong": False, "due": None}
+        facet_index.facet_add(index, "a", row)
+        facet_index.facet_add(index, "b", {**row, "wrong": True})
+        facet_index.facet_remove(index, "a")
+        facet_index.facet_add(index, "c", {**row, "subject": "T"})
+        self.assertEqual(len(index["keys"]), 2)
+        self.assertEqual(facet_index.facet_query_keys(index, {"subject": "S"}), ["b"])
+        self.assertEqual(sorted(facet_index.facet_query_keys(index, {"due": True}, now_epoch=0.0)), ["b", "c"])
+        self.assertEqual(facet_index.facet_query_keys(index, {"wrong": False}), ["c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services import fsrs_optimizer  # noqa: E402
+
+
+def _log(card_id, rating, when):
+    return json.dumps({
+        "card_id": card_id,
+        "rating": rating,
+        "review_datetime": when.isoformat(),
+        "review_duration": None,
+    })
+
+
+def _question(q_id, card_id, count, start):
+    logs = [_log(card_id, 3, start + timedelta(days=i)) for i in range(count)]
+    return {"id": q_id, "fsrs": {"logs": logs}}
+
+
+class _FakeOptimizer:
+    instances = []
+
+    def __init__(self, review_logs):
+        self.review_logs = list(review_logs)
+        _FakeOptimizer.instances.append(self)
+
+    def compute_optimal_parameters(self):
+        from fsrs.scheduler import DEFAULT_PARAMETERS
+
+        return list(DEFAULT_PARAMETERS)
+
+
+class FsrsOptimizerServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def test_extract_reuses_cached_rows_for_unchanged_items(self):
+        bank = [_question("a", 1, 3, self.start), _question("b", 2, 2, self.start), {"id": "c"}]
+        rows, cache, info = fsrs_optimizer.extract_review_rows(bank)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(info["parsed"], 2)
+
+        bank[1]["fsrs"]["logs"].append(_log(2, 1, self.start + timedelta(days=9)))
+        rows, cache, info = fsrs_optimizer.extract_review_rows(bank, cache=cache)
+        self.assertEqual(info, {"reused": 1, "parsed": 1, "rows": 6})
+        self.assertEqual(rows[-1][1], 1)
+
+    def test_extract_keeps_rows_dropped_by_log_cap(self):
+        bank = [_question("a", 1, 3, self.start)]
+        _, cache, _ = fsrs_optimizer.extract_review_rows(bank)
+        logs = bank[0]["fsrs"]["logs"]
+        logs.append(_log(1, 4, self.start + timedelta(days=5)))
+        bank[0]["fsrs"]["logs"] = logs[-3:]
+        rows, cache, _ = fsrs_optimizer.extract_review_rows(bank, cache=cache)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual([r[2] for r in rows], sorted(r[2] for r in rows))
+
+    def test_extract_drops_cache_for_deleted_items(self):
+        bank = [_question("a", 1, 2, self.start), _question("b", 2, 2, self.start)]
+        _, cache, _ = fsrs_optimizer.extract_review_rows(bank)
+        _, cache, _ = fsrs_optimizer.extract_review_rows(bank[:1], cache=cache)
+        self.assertEqual(set(cache), {"a"})
+
+    def test_fit_requires_minimum_reviews(self):
+        result = fsrs_optimizer.fit_fsrs_parameters([[1, 3, 0.0, None]], base_parameters=[0.1] * 21)
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["parameters"], [0.1] * 21)
+        self.assertIn("부족", result["error"])
+
+    @unittest.skipUnless(__import__("importlib").util.find_spec("fsrs"), "fsrs not installed")
+    def test_fit_reports_parameters_and_quality(self):
+        from fsrs.scheduler import DEFAULT_PARAMETERS
+
+        bank = [_question(f"q{i}", i, 6, self.start) for i in range(10)]
+        rows, _, _ = fsrs_optimizer.extract_review_rows(bank)
+        # 기억이 금방 사라진다고 보는 파라미터: 매일 "좋음"인 기록에서는 손실이 커야 한다
+        forgetful = list(DEFAULT_PARAMETERS)
+        forgetful[:4] = [0.01] * 4
+        result = fsrs_optimizer.fit_fsrs_parameters(
+            rows,
+            base_parameters=forgetful,
+            optimizer_factory=_FakeOptimizer,
+        )
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["parameters"], list(DEFAULT_PARAMETERS))
+        self.assertEqual(result["review_count"], 60)
+        self.assertEqual(result["card_count"], 10)
+        self.assertLess(result["loss_after"], result["loss_before"])
+
+        # 손실은 학습에 넘기지 않은 카드의 기록으로 잰다
+        train, holdout = fsrs_optimizer.split_holdout_rows(rows)
+        self.assertTrue(train and holdout)
+        self.assertFalse({row[0] for row in train} & {row[0] for row in holdout})
+        self.assertEqual(len(_FakeOptimizer.instances[-1].review_logs), len(train))
+        self.assertEqual(result["loss_after"], fsrs_optimizer.review_log_loss(holdout, list(DEFAULT_PARAMETERS)))
+
+
+if __name__ == "__main__":
+    unittest.main()
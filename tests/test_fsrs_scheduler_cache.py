@@ -0,0 +1,128 @@
+import ast
+import hashlib
+import json
+import unittest
+from datetime import timedelta
+from pathlib import Path
+
+
+APP_PATH = "/Users/goyunseong/Documents/AI Projects/Med-Tutor/app.py"
+
+
+class _SessionState(dict):
+    def __getattr__(self, key):
+        return self.get(key)
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+class _FakeScheduler:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+def _load_namespace(settings_ref, counters):
+    source = Path(APP_PATH).read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=APP_PATH)
+    wanted = {
+        "_hash_text",
+        "_steps_to_timedelta",
+        "save_fsrs_settings",
+        "fsrs_settings_fingerprint",
+        "build_fsrs_scheduler",
+        "invalidate_fsrs_scheduler_cache",
+        "get_fsrs_scheduler",
+    }
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+
+    def load_fsrs_settings():
+        counters["load"] += 1
+        return dict(settings_ref)
+
+    def scheduler_factory(**kwargs):
+        counters["build"] += 1
+        return _FakeScheduler(**kwargs)
+
+    user_settings = {}
+    namespace = {
+        "hashlib": hashlib,
+        "json": json,
+        "timedelta": timedelta,
+        "FSRS_AVAILABLE": True,
+        "FSRS_DEFAULT_PARAMETERS": (0.1,) * 21,
+        "_FSRS_SCHEDULER_CACHE": {},
+        "_FSRS_SCHEDULER_CACHE_MAX": 32,
+        "Scheduler": scheduler_factory,
+        "load_fsrs_settings": load_fsrs_settings,
+        "load_user_settings": lambda: user_settings,
+        "save_user_settings": lambda data: True,
+        "st": __import__("types").SimpleNamespace(session_state=_SessionState()),
+    }
+    exec(compile(module, APP_PATH, "exec"), namespace)
+    return namespace
+
+
+BASE_SETTINGS = {
+    "desired_retention": 0.9,
+    "learning_steps": [1, 10],
+    "relearning_steps": [10],
+    "maximum_interval": 36500,
+    "enable_fuzzing": True,
+    "parameters": [0.1] * 21,
+}
+
+
+class FsrsSchedulerCacheTests(unittest.TestCase):
+    def test_repeated_calls_skip_settings_io_and_construction(self):
+        counters = {"load": 0, "build": 0}
+        ns = _load_namespace(dict(BASE_SETTINGS), counters)
+        first = ns["get_fsrs_scheduler"]()
+        for _ in range(20):
+            self.assertIs(ns["get_fsrs_scheduler"](), first)
+        self.assertEqual(counters, {"load": 1, "build": 1})
+
+    def test_save_fsrs_settings_invalidates_and_rebuilds_on_change(self):
+        settings = dict(BASE_SETTINGS)
+        counters = {"load": 0, "build": 0}
+        ns = _load_namespace(settings, counters)
+        first = ns["get_fsrs_scheduler"]()
+
+        settings["desired_retention"] = 0.85
+        ns["save_fsrs_settings"](dict(settings))
+        second = ns["get_fsrs_scheduler"]()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.kwargs["desired_retention"], 0.85)
+        self.assertEqual(counters, {"load": 2, "build": 2})
+
+    def test_unchanged_settings_reuse_scheduler_after_invalidation(self):
+        counters = {"load": 0, "build": 0}
+        ns = _load_namespace(dict(BASE_SETTINGS), counters)
+        first = ns["get_fsrs_scheduler"]()
+        ns["invalidate_fsrs_scheduler_cache"]()
+        self.assertIs(ns["get_fsrs_scheduler"](), first)
+        self.assertEqual(counters, {"load": 2, "build": 1})
+
+    def test_fingerprint_covers_all_scheduler_fields(self):
+        ns = _load_namespace(dict(BASE_SETTINGS), {"load": 0, "build": 0})
+        base = ns["fsrs_settings_fingerprint"](BASE_SETTINGS)
+        for key, value in [
+            ("desired_retention", 0.8),
+            ("learning_steps", [1]),
+            ("relearning_steps", [5]),
+            ("maximum_interval", 365),
+            ("enable_fuzzing", False),
+            ("parameters", [0.2] * 21),
+        ]:
+            changed = {**BASE_SETTINGS, key: value}
+            self.assertNotEqual(ns["fsrs_settings_fingerprint"](changed), base, key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+import json
+import sys
+import threading
+import time
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services.generation_engine import GenerationEngine, estimate_tokens  # noqa: E402
+
+
+class _StubLlmServer:
+    """지연을 주입할 수 있는 로컬 LLM 대역. 동시에 처리 중인 요청 수의 최댓값을 기록"""
+
+    def __init__(self, latency, throttle_first=0, retry_after=None):
+        self.latency = latency
+        self.throttle_first = throttle_first
+        self.retry_after = retry_after
+        self.throttled = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.started = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+                with stub.lock:
+                    throttle = stub.throttled < stub.throttle_first
+                    stub.throttled += int(throttle)
+                if throttle:
+                    self.send_response(429)
+                    if stub.retry_after is not None:
+                        self.send_header("Retry-After", str(stub.retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                with stub.lock:
+                    stub.in_flight += 1
+                    stub.peak = max(stub.peak, stub.in_flight)
+                    stub.started.append(time.monotonic())
+                time.sleep(float(body.get("latency", stub.latency)))
+                with stub.lock:
+                    stub.in_flight -= 1
+                payload = json.dumps({"text": f"문항 {body['prompt']}"}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/generate"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def call(self, prompt, latency=None):
+        body = {"prompt": prompt}
+        if latency is not None:
+            body["latency"] = latency
+
+        def run():
+            request = urllib.request.Request(self.url, data=json.dumps(body).encode("utf-8"), method="POST")
+            with urllib.request.urlopen(request, timeout=10) as resp:
+                return json.loads(resp.read())["text"]
+
+        return run
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class GenerationEngineTests(unittest.TestCase):
+    def setUp(self):
+        self.stub = _StubLlmServer(latency=0.2)
+
+    def tearDown(self):
+        self.stub.close()
+
+    def test_concurrency_limit_is_shared_across_submissions(self):
+        engine = GenerationEngine(limits={"openai": {"concurrency": 2, "rpm": 1000, "tpm": 10**9}})
+        tasks = lambda tag: [{"provider": "openai", "call": self.stub.call(f"{tag}{i}")} for i in range(3)]
+        started = time.monotonic()
+        # 두 세션이 동시에 제출해도 합계 2개까지만 동시에 나간다
+        first = engine.submit(tasks("a"))
+        second = engine.submit(tasks("b"))
+        self.assertEqual(first.result(timeout=10), ["문항 a0", "문항 a1", "문항 a2"])
+        self.assertEqual(second.result(timeout=10), ["문항 b0", "문항 b1", "문항 b2"])
+        elapsed = time.monotonic() - started
+        self.assertEqual(self.stub.peak, 2)
+        self.assertGreaterEqual(elapsed, 0.55)
+        self.assertEqual(engine.stats()["openai"]["completed"], 6)
+
+    def test_groups_take_turns_for_concurrency_slots(self):
+        engine = GenerationEngine(limits={"openai": {"concurrency": 1, "rpm": 10**6, "tpm": 10**9}})
+        order = []
+
+        def call(tag):
+            def run():
+                order.append(tag)
+                time.sleep(0.05)
+                return tag
+            return run
+
+        tasks = lambda group, n: [{"provider": "openai", "group": group, "call": call(f"{group}{i}")} for i in range(n)]
+        # 먼저 청크 4개를 넣은 파일 뒤에 다음 파일이 통째로 줄 서지 않는다
+        first = engine.submit(tasks("a", 4))
+        time.sleep(0.02)
+        second = engine.submit(tasks("b", 2))
+        first.result(timeout=10)
+        second.result(timeout=10)
+        self.assertEqual(order, ["a0", "a1", "b0", "a2", "b1", "a3"])
+        self.assertEqual(engine.stats()["openai"]["peak"], 1)
+
+    def test_cancelled_submission_stops_handing_out_tasks(self):
+        engine = GenerationEngine(limits={"openai": {"concurrency": 1, "rpm": 10**6, "tpm": 10**9}})
+        events = []
+        future = engine.submit(
+            [{"provider": "openai", "call": self.stub.call(f"a{i}", latency=0.3)} for i in range(4)],
+            on_progress=events.append,
+        )
+        time.sleep(0.1)
+        self.assertTrue(future.cancel())
+        started = time.monotonic()
+        # 취소된 제출의 대기 작업은 나가지 않고, 이미 나간 요청은 끝날 때까지 슬롯을 잡는다
+        self.assertEqual(engine.submit([{"provider": "openai", "call": self.stub.call("b", latency=0)}]).result(timeout=10), ["문항 b"])
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+        time.sleep(0.1)
+        self.assertEqual(len(self.stub.started), 2)
+        self.assertEqual(self.stub.peak, 1)
+        self.assertEqual(events, [])
+
+    def test_progress_callback_reports_completion_order_and_errors(self):
+        engine = GenerationEngine(limits={"gemini": {"concurrency": 4, "rpm": 1000, "tpm": 10**9}})
+
+        def fail():
+            raise RuntimeError("quota")
+
+        events = []
+        future = engine.submit(
+            [
+                {"provider": "gemini", "call": self.stub.call("느림", latency=0.4)},
+                {"provider": "gemini", "call": self.stub.call("빠름", latency=0.05)},
+                {"provider": "gemini", "call": fail},
+            ],
+            on_progress=events.append,
+        )
+        results = future.result(timeout=10)
+        self.assertEqual(results[:2], ["문항 느림", "문항 빠름"])
+        self.assertIsInstance(results[2], RuntimeError)
+        self.assertEqual([e["done"] for e in events], [1, 2, 3])
+        self.assertEqual(events[-1]["index"], 0)
+        self.assertEqual([e["index"] for e in events if e["error"]], [2])
+
+    def test_request_and_token_budgets_delay_extra_calls(self):
+        engine = GenerationEngine(limits={"openai": {"concurrency": 8, "rpm": 2, "tpm": 10**9}}, window=0.5)
+        tasks = [{"provider": "openai", "call": self.stub.call(str(i), latency=0)} for i in range(3)]
+        engine.submit(tasks).result(timeout=10)
+        starts = sorted(self.stub.started)
+        self.assertGreaterEqual(starts[2] - starts[0], 0.45)
+
+        self.stub.started.clear()
+        engine.configure("openai", rpm=1000, tpm=100)
+        tasks = [{"provider": "openai", "tokens": 60, "call": self.stub.call(str(i), latency=0)} for i in range(2)]
+        engine.submit(tasks).result(timeout=10)
+        starts = sorted(self.stub.started)
+        # 버킷(10초 분량 = 100/6 토큰)이 60토큰 요청의 빚을 갚을 때까지 200토큰/초로 0.3초
+        self.assertGreaterEqual(starts[1] - starts[0], 0.25)
+
+    def test_throttled_chunks_are_retried_after_retry_after(self):
+        self.stub.close()
+        self.stub = _StubLlmServer(latency=0, throttle_first=2, retry_after=0.3)
+        engine = GenerationEngine(limits={"openai": {"concurrency": 4, "rpm": 10**6, "tpm": 10**9}})
+        tasks = [{"provider": "openai", "call": self.stub.call(str(i))} for i in range(3)]
+        started = time.monotonic()
+        self.assertEqual(engine.submit(tasks).result(timeout=10), ["문항 0", "문항 1", "문항 2"])
+        self.assertGreaterEqual(time.monotonic() - started, 0.28)
+        stats = engine.stats()["openai"]
+        self.assertEqual((stats["throttled"], stats["completed"], stats["failed"]), (2, 3, 0))
+        self.assertLess(stats["rate_scale"], 1.0)
+
+    def test_retries_give_up_after_max_retries(self):
+        self.stub.close()
+        self.stub = _StubLlmServer(latency=0, throttle_first=10)
+        engine = GenerationEngine(limits={"openai": {"concurrency": 1, "rpm": 10**6, "tpm": 10**9}}, max_retries=2, backoff=0.01)
+        result = engine.submit([{"provider": "openai", "call": self.stub.call("x")}]).result(timeout=10)
+        self.assertEqual(getattr(result[0], "code", None), 429)
+        self.assertEqual(self.stub.throttled, 3)
+
+    def test_usage_settles_estimated_tokens(self):
+        engine = GenerationEngine(limits={"openai": {"concurrency": 1, "rpm": 10**6, "tpm": 600}})
+        task = {"provider": "openai", "tokens": 100, "call": self.stub.call("x", latency=0), "usage": lambda result: 0}
+        engine.submit([task]).result(timeout=10)
+        bucket = engine._buckets["openai"]
+        self.assertAlmostEqual(bucket.token_level, bucket.token_capacity, delta=1)
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens("가" * 10, 100), 105)
+        self.assertEqual(estimate_tokens(None), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,544 @@
+import ast
+import functools
+import importlib.util
+import io
+import queue
+import re
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+APP_PATH = str(ROOT / "app.py")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.repositories.generation_job_store import (  # noqa: E402
+    delete_generation_files,
+    delete_generation_job,
+    generation_job_file,
+    list_generation_jobs,
+    load_generation_job,
+    load_generation_payload,
+    save_generation_job,
+    save_generation_payload,
+    save_generation_source,
+)
+from src.services.chunk_planner import (  # noqa: E402
+    allocate_items,
+    chunk_fingerprint,
+    feed_chunk_stream,
+    finish_chunk_stream,
+    new_chunk_stream,
+    plan_chunks,
+    split_pages,
+)
+from src.services.generation_engine import GenerationEngine, estimate_tokens  # noqa: E402
+from src.services.near_duplicates import (  # noqa: E402
+    minhash_signature,
+    near_duplicate_add,
+    near_duplicate_query,
+    new_near_duplicate_index,
+)
+from src.services.document_extraction import read_extracted_pages, submit_document_extraction  # noqa: E402
+from src.services.stream_parser import feed_stream_parser, finish_stream_parser, new_stream_parser  # noqa: E402
+from src.services.generation_pipeline import reconcile_generation_queue_items  # noqa: E402
+from src.services.generation_jobs import (  # noqa: E402
+    ACTIVE_JOB_STATUSES,
+    GenerationCancelled,
+    GenerationWorkerPool,
+    new_generation_batch_id,
+    new_generation_job,
+    resumable_generation_jobs,
+    summarize_generation_batch,
+    update_generation_job,
+)
+
+
+def _load_app_functions(names, namespace):
+    source = Path(APP_PATH).read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=APP_PATH)
+    nodes = [n for n in tree.body if isinstance(n, ast.FunctionDef) and n.name in names]
+    module = ast.Module(body=nodes, type_ignores=[])
+    ast.fix_missing_locations(module)
+    exec(compile(module, APP_PATH, "exec"), namespace)
+    return namespace
+
+
+class _FakeStreamlit:
+    def __init__(self):
+        self.session_state = {}
+
+
+class GenerationJobStoreTests(unittest.TestCase):
+    def test_jobs_round_trip_and_list_oldest_first(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td) / "generation_jobs"
+            first = new_generation_job({"mode": "mcq", "num_items": 5}, "a.pdf")
+            second = new_generation_job({"mode": "mcq"}, "b.pdf")
+            second["created_at"] = "9" + second["created_at"]
+            save_generation_job(root, second)
+            save_generation_job(root, first)
+            save_generation_payload(root, first["id"], "원문")
+            (root / "broken.json").write_text("{", encoding="utf-8")
+
+            self.assertEqual([job["source_name"] for job in list_generation_jobs(root)], ["a.pdf", "b.pdf"])
+            self.assertEqual(load_generation_job(root, first["id"])["params"]["num_items"], 5)
+            self.assertEqual(load_generation_payload(root, first["id"]), "원문")
+            self.assertEqual(list(root.glob("*.tmp")), [])
+
+            self.assertTrue(delete_generation_job(root, first["id"]))
+            self.assertIsNone(load_generation_job(root, first["id"]))
+            self.assertIsNone(load_generation_payload(root, first["id"]))
+            self.assertEqual(list_generation_jobs(Path(td) / "missing"), [])
+
+    def test_resumable_jobs_skip_finished_and_in_process_jobs(self):
+        jobs = [new_generation_job({}, name) for name in ("a", "b", "c", "d")]
+        update_generation_job(jobs[1], status="running")
+        update_generation_job(jobs[2], status="done")
+        running_here = {jobs[0]["id"]}
+        resumable = resumable_generation_jobs(jobs, lambda job_id: job_id in running_here)
+        self.assertEqual([job["source_name"] for job in resumable], ["b", "d"])
+        self.assertIn("pending", ACTIVE_JOB_STATUSES)
+
+    def test_batch_summary_weights_files_by_size_and_estimates_eta(self):
+        start = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+        batch_id = new_generation_batch_id(start)
+        self.assertTrue(batch_id.startswith("batch-20260302-090000-"))
+        small, large, queued = (
+            new_generation_job({"batch_id": batch_id, "source_size": size}, name, now=start)
+            for name, size in (("a.pdf", 100), ("b.pdf", 300), ("c.pdf", 100))
+        )
+        update_generation_job(small, status="done", result=[{"problem": "q"}] * 4)
+        # 절반쯤 생성했지만 아직 페이지 절반만 추출된 파일은 1/4 진행으로 본다
+        update_generation_job(large, status="running", progress={"done": 2, "total": 4, "items": 3, "pages": 5, "pages_total": 10})
+
+        summary = summarize_generation_batch([small, large, queued], now=start + timedelta(minutes=5))
+        self.assertEqual((summary["files"], summary["finished"], summary["failed"]), (3, 1, 0))
+        self.assertEqual((summary["done"], summary["total"], summary["items"]), (2, 4, 7))
+        self.assertAlmostEqual(summary["fraction"], (100 + 300 * 0.25) / 500)
+        self.assertAlmostEqual(summary["eta_seconds"], 300 * (1 - 0.35) / 0.35)
+
+        for job in (large, queued):
+            update_generation_job(job, status="cancelled")
+        finished = summarize_generation_batch([small, large, queued], now=start + timedelta(minutes=6))
+        self.assertEqual((finished["finished"], finished["failed"], finished["fraction"]), (3, 2, 1.0))
+        self.assertIsNone(finished["eta_seconds"])
+        self.assertIsNone(summarize_generation_batch([queued | {"status": "pending"}], now=start)["eta_seconds"])
+
+
+    def test_batch_upload_sources_are_expanded_once_per_upload(self):
+        calls = []
+
+        class _Upload:
+            def __init__(self, file_id, name, data):
+                self.file_id, self.name, self.size, self.data = file_id, name, len(data), data
+
+            def getvalue(self):
+                return self.data
+
+        def expand(files, extensions):
+            calls.append([name for name, _ in files])
+            return [(name, len(data), i, None) for i, (name, data) in enumerate(files) if Path(name).suffix in extensions]
+
+        ns = _load_app_functions(
+            {"get_batch_upload_sources"},
+            {"st": _FakeStreamlit(), "expand_upload_sources": expand, "EXTRACTABLE_EXTENSIONS": (".pdf",)},
+        )
+        files = [_Upload("f1", "a.pdf", b"aa"), _Upload("f2", "b.txt", b"b")]
+        self.assertEqual(ns["get_batch_upload_sources"](files), [("a.pdf", 2, 0, None)])
+        self.assertEqual(ns["get_batch_upload_sources"](list(files)), [("a.pdf", 2, 0, None)])
+        self.assertEqual(len(calls), 1)
+        # 파일 구성이 바뀌면 다시 푼다
+        ns["get_batch_upload_sources"](files[:1])
+        self.assertEqual(calls[-1], ["a.pdf"])
+
+
+    def test_streamed_saving_and_final_result_stay_within_num_items(self):
+        job = new_generation_job({"mode": "cloze", "num_items": 3, "save_streamed": True}, "a.pdf")
+        update_generation_job(job, status="running", streamed=[{"front": "A {{c1::x}}", "answer": "x"}])
+        added = []
+
+        class _State(dict):
+            __getattr__ = dict.get
+
+            def __setattr__(self, key, value):
+                self[key] = value
+
+        st = _FakeStreamlit()
+        st.session_state = _State()
+        ns = _load_app_functions(
+            {"sync_generation_jobs", "build_question_dedupe_key", "_normalize_text_for_dedupe"},
+            {
+                "st": st,
+                "datetime": datetime,
+                "timezone": timezone,
+                "MODE_MCQ": "mcq",
+                "ACTIVE_JOB_STATUSES": ACTIVE_JOB_STATUSES,
+                "get_generation_jobs_dir": lambda: None,
+                "list_generation_jobs": lambda jobs_dir: [job],
+                "save_generation_job": lambda jobs_dir, target: True,
+                "update_generation_job": update_generation_job,
+                "delete_generation_payload": lambda jobs_dir, job_id: None,
+                "prepare_near_duplicate_check": lambda: None,
+                "reconcile_generation_queue_items": reconcile_generation_queue_items,
+                "add_questions_to_bank": lambda items, *args, **kwargs: added.append([q["front"] for q in items]) or len(items),
+            },
+        )
+        ns["sync_generation_jobs"]()
+        self.assertEqual(added, [["A {{c1::x}}"]])
+
+        # 최종 결과에서는 이미 저장한 문항을 빼고 요청 개수(3)까지만 저장
+        fronts = ["A {{c1::x}}", "B {{c1::x}}", "C {{c1::x}}", "D {{c1::x}}"]
+        update_generation_job(job, status="done", result=[{"front": f, "answer": "x"} for f in fronts])
+        ns["sync_generation_jobs"]()
+        self.assertEqual(added[1], ["B {{c1::x}}", "C {{c1::x}}"])
+        self.assertEqual(job["saved_count"], 3)
+
+
+class GenerationWorkerPoolTests(unittest.TestCase):
+    def test_same_key_runs_once_at_a_time(self):
+        pool = GenerationWorkerPool(max_workers=2)
+        release = threading.Event()
+        runs = []
+
+        def work(tag):
+            runs.append(tag)
+            release.wait(5)
+
+        self.assertTrue(pool.submit("job-1", work, "first"))
+        self.assertFalse(pool.submit("job-1", work, "second"))
+        self.assertTrue(pool.is_active("job-1"))
+        release.set()
+        deadline = time.monotonic() + 5
+        while pool.is_active("job-1") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(pool.is_active("job-1"))
+        self.assertTrue(pool.submit("job-1", work, "third"))
+        deadline = time.monotonic() + 5
+        while pool.active_count() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(runs, ["first", "third"])
+
+
+class RunGenerationJobTests(unittest.TestCase):
+    def _namespace(self, generate):
+        namespace = {
+            "threading": threading,
+            "time": time,
+            "re": re,
+            "Path": Path,
+            "st": _FakeStreamlit(),
+            "MODE_MCQ": "mcq",
+            "ACTIVE_JOB_STATUSES": ACTIVE_JOB_STATUSES,
+            "GenerationCancelled": GenerationCancelled,
+            "delete_generation_files": delete_generation_files,
+            "generation_job_file": generation_job_file,
+            "load_generation_job": load_generation_job,
+            "load_generation_payload": load_generation_payload,
+            "read_extracted_pages": read_extracted_pages,
+            "save_generation_job": save_generation_job,
+            "save_generation_payload": save_generation_payload,
+            "split_pages": split_pages,
+            "submit_document_extraction": submit_document_extraction,
+            "update_generation_job": update_generation_job,
+            "generate_content_in_chunks": generate,
+        }
+        _load_app_functions(
+            {
+                "sanitize_user_id",
+                "get_runtime_context",
+                "get_current_user_id",
+                "get_gemini_model_id",
+                "call_with_runtime_context",
+                "generation_job_source_file",
+                "iter_generation_source_pages",
+                "run_generation_job",
+            },
+            namespace,
+        )
+        namespace["_RUNTIME_CONTEXT"] = threading.local()
+        return namespace
+
+    def _enqueue(self, root, params=None):
+        job = new_generation_job(params or {"mode": "mcq", "ai_model": "🟢 OpenAI ChatGPT", "num_items": 2}, "lecture.pdf")
+        save_generation_job(root, job)
+        save_generation_payload(root, job["id"], "강의 원문")
+        return job
+
+    def test_worker_records_progress_result_and_caller_context(self):
+        seen = {}
+
+        def generate(text, mode, ai_model, num_items=5, on_event=None, **kwargs):
+            seen.update(text=text, user=ns["get_current_user_id"](), model=ns["get_gemini_model_id"](), key=kwargs.get("openai_api_key"))
+            on_event({"kind": "items", "chunk": 0, "items": [{"problem": "a"}]})
+            on_event({"kind": "progress", "done": 1, "total": 1})
+            return [{"problem": "a"}, {"problem": "b"}]
+
+        ns = self._namespace(generate)
+        with tempfile.TemporaryDirectory() as td:
+            job = self._enqueue(td)
+            worker = threading.Thread(
+                target=ns["run_generation_job"],
+                args=(td, job["id"], {"user_id": "alice", "gemini_model_id": "gemini-x"}, None, "sk-test"),
+            )
+            worker.start()
+            worker.join(5)
+            saved = load_generation_job(td, job["id"])
+        self.assertEqual(seen, {"text": "강의 원문", "user": "alice", "model": "gemini-x", "key": "sk-test"})
+        self.assertEqual(saved["status"], "done")
+        self.assertEqual(saved["attempts"], 1)
+        self.assertEqual(len(saved["result"]), 2)
+        self.assertEqual(saved["streamed"], [{"problem": "a"}])
+        self.assertEqual(saved["progress"], {"done": 1, "total": 1, "items": 1})
+        self.assertEqual(ns["get_current_user_id"](), "guest")
+
+    def test_cancelled_job_stops_and_keeps_cancelled_status(self):
+        with tempfile.TemporaryDirectory() as td:
+            job = self._enqueue(td)
+            calls = []
+
+            def generate(text, mode, ai_model, num_items=5, on_event=None, **kwargs):
+                cancelled = update_generation_job(load_generation_job(td, job["id"]), status="cancelled")
+                save_generation_job(td, cancelled)
+                for i in range(3):
+                    calls.append(i)
+                    time.sleep(0.55)
+                    on_event({"kind": "progress", "done": i + 1, "total": 3})
+                return [{"problem": "late"}]
+
+            ns = self._namespace(generate)
+            ns["run_generation_job"](td, job["id"], {"user_id": "alice"})
+            saved = load_generation_job(td, job["id"])
+        self.assertEqual(saved["status"], "cancelled")
+        self.assertIsNone(saved["result"])
+        self.assertLess(len(calls), 3)
+
+    @unittest.skipUnless(importlib.util.find_spec("docx"), "python-docx not installed")
+    def test_uploaded_source_is_extracted_out_of_process_once(self):
+        from docx import Document
+
+        doc = Document()
+        doc.add_paragraph("심부전의 NYHA 분류")
+        buf = io.BytesIO()
+        doc.save(buf)
+        seen = []
+
+        def generate(text, mode, ai_model, num_items=5, on_event=None, pages=None, **kwargs):
+            for count, (page, total) in enumerate(pages, 1):
+                seen.append(page)
+                on_event({"kind": "extract", "pages": count, "total": total})
+            return [{"problem": "a"}]
+
+        ns = self._namespace(generate)
+        with tempfile.TemporaryDirectory() as td:
+            job = new_generation_job({"mode": "mcq", "ai_model": "🟢 OpenAI ChatGPT", "num_items": 1}, "lecture.docx")
+            save_generation_job(td, job)
+            save_generation_source(td, job["id"], buf.getvalue(), ".docx")
+            ns["run_generation_job"](td, job["id"], {})
+            saved = load_generation_job(td, job["id"])
+            leftovers = sorted(p.name[len(job["id"]):] for p in Path(td).iterdir())
+            payload = load_generation_payload(td, job["id"])
+        self.assertEqual(saved["status"], "done")
+        self.assertEqual(seen, ["심부전의 NYHA 분류\n"])
+        self.assertEqual(payload, seen[0])
+        self.assertEqual(saved["progress"]["pages_total"], 1)
+        self.assertEqual(leftovers, [".json", ".txt"])
+
+    def test_failures_and_missing_payload_mark_job_failed(self):
+        def generate(*args, **kwargs):
+            raise RuntimeError("quota")
+
+        ns = self._namespace(generate)
+        with tempfile.TemporaryDirectory() as td:
+            job = self._enqueue(td)
+            ns["run_generation_job"](td, job["id"], {})
+            self.assertEqual(load_generation_job(td, job["id"])["status"], "failed")
+            self.assertIn("quota", load_generation_job(td, job["id"])["error"])
+
+            orphan = new_generation_job({}, "lost.pdf")
+            save_generation_job(td, orphan)
+            ns["run_generation_job"](td, orphan["id"], {})
+            self.assertEqual(load_generation_job(td, orphan["id"])["status"], "failed")
+
+
+class ChunkCheckpointTests(unittest.TestCase):
+    PAGES = [
+        "심장 판막 질환과 승모판 협착의 청진 소견",
+        "당뇨병 1차 약제 메트포르민의 금기와 부작용",
+        "급성 신손상의 원인 분류와 전신전 요인 감별",
+    ]
+
+    def setUp(self):
+        self.calls = []
+        self.fail = {"당뇨병"}
+        engine = GenerationEngine(limits={"openai": {"concurrency": 2, "rpm": 10**6, "tpm": 10**9}})
+
+        def generate_content(chunk, mode, ai_model, n, *args, on_delta=None, **kwargs):
+            self.calls.append(chunk)
+            if any(word in chunk for word in self.fail):
+                raise RuntimeError("connection reset")
+            text = chunk.splitlines()[-1] + " 핵심은 {{c1::정답}}\n"
+            on_delta(text)
+            return text
+
+        self.ns = {
+            "sys": sys,
+            "time": time,
+            "queue": queue,
+            "functools": functools,
+            "st": _FakeStreamlit(),
+            "MODE_CLOZE": "cloze",
+            "GENERATION_INPUT_CHARS": 30000,
+            "GENERATION_OUTPUT_TOKENS": 100,
+            "CHARS_PER_TOKEN": 2,
+            "DEFAULT_NEAR_DUPLICATE_THRESHOLD": 0.8,
+            "threading": threading,
+            "plan_chunks": plan_chunks,
+            "new_chunk_stream": new_chunk_stream,
+            "feed_chunk_stream": feed_chunk_stream,
+            "finish_chunk_stream": finish_chunk_stream,
+            "allocate_items": allocate_items,
+            "chunk_fingerprint": chunk_fingerprint,
+            "estimate_tokens": estimate_tokens,
+            "new_stream_parser": new_stream_parser,
+            "feed_stream_parser": feed_stream_parser,
+            "finish_stream_parser": finish_stream_parser,
+            "minhash_signature": minhash_signature,
+            "near_duplicate_add": near_duplicate_add,
+            "near_duplicate_query": near_duplicate_query,
+            "new_near_duplicate_index": new_near_duplicate_index,
+            "parse_generated_text_to_structured": lambda text, mode: [
+                {"front": line.strip(), "answer": "정답"} for line in str(text).splitlines() if "{{c1::" in line
+            ],
+            "generate_content": generate_content,
+            "capture_runtime_context": lambda: {"user_id": "alice", "gemini_model_id": "gemini-x"},
+            "call_with_runtime_context": lambda context, fn, *args, **kwargs: fn(*args, **kwargs),
+            "get_generation_engine": lambda limits=None: engine,
+            "get_provider_limits": lambda: {},
+            "record_debug_timing": lambda name, ms: None,
+        }
+        _load_app_functions({"generate_content_in_chunks", "build_question_dedupe_key", "question_dedupe_text", "_normalize_text_for_dedupe"}, self.ns)
+
+    def _run(self, checkpoint, events):
+        text = "\n\n".join(f"=== 페이지 {i} ===\n{page}" for i, page in enumerate(self.PAGES, 1))
+        return self.ns["generate_content_in_chunks"](
+            text, "cloze", "🟢 OpenAI ChatGPT", num_items=3, chunk_size=60, overlap=0,
+            on_event=events.append, near_dup_threshold=0.8, checkpoint=checkpoint,
+        )
+
+    def test_retry_reissues_only_failed_chunks_and_merges_union(self):
+        checkpoint = {}
+        events = []
+        first = self._run(checkpoint, events)
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(len(checkpoint), 2)
+        self.assertEqual(len(first), 2)
+        self.assertTrue(any(e["kind"] == "warning" and "1/3" in e["message"] for e in events))
+
+        self.calls.clear()
+        self.fail = set()
+        events = []
+        second = self._run(checkpoint, events)
+        self.assertEqual(len(self.calls), 1)
+        self.assertIn("당뇨병", self.calls[0])
+        self.assertIn({"kind": "checkpoint", "reused": 2, "total": 3}, events)
+        self.assertEqual(len(second), 3)
+        self.assertEqual(len(checkpoint), 3)
+        self.assertFalse(any(e["kind"] == "warning" for e in events))
+
+    def test_paged_input_submits_chunks_while_later_pages_extract(self):
+        self.fail = set()
+        first_call = threading.Event()
+        generate_content = self.ns["generate_content"]
+
+        def tracked(chunk, *args, **kwargs):
+            first_call.set()
+            return generate_content(chunk, *args, **kwargs)
+
+        self.ns["generate_content"] = tracked
+        overlapped = []
+
+        def pages():
+            for i, page in enumerate(self.PAGES, 1):
+                if i == 3:
+                    # 세 번째 페이지는 첫 청크 생성이 시작된 뒤에야 "추출"된다
+                    overlapped.append(first_call.wait(5))
+                yield f"=== 페이지 {i} ===\n{page}", len(self.PAGES)
+
+        events = []
+        checkpoint = {}
+        result = self.ns["generate_content_in_chunks"](
+            None, "cloze", "🟢 OpenAI ChatGPT", num_items=3, chunk_size=60, overlap=0,
+            on_event=events.append, near_dup_threshold=0.8, checkpoint=checkpoint, pages=pages(),
+        )
+        self.assertEqual(overlapped, [True])
+        self.assertEqual(len(result), 3)
+        self.assertEqual([e["pages"] for e in events if e["kind"] == "extract"], [1, 2, 3])
+        timings = next(e for e in events if e["kind"] == "timings")
+        self.assertLess(timings["t_first_request_ms"], timings["t_extract_raw_ms"])
+        self.assertGreaterEqual(timings["t_total_ms"], timings["t_extract_raw_ms"])
+
+        # 저장된 원문을 split_pages로 다시 넣으면 같은 청크 계획이 나와 모두 체크포인트에서 재사용된다
+        self.calls.clear()
+        events = []
+        text = "\n".join(f"=== 페이지 {i} ===\n{page}" for i, page in enumerate(self.PAGES, 1))
+        sections = split_pages(text)
+        again = self.ns["generate_content_in_chunks"](
+            text, "cloze", "🟢 OpenAI ChatGPT", num_items=3, chunk_size=60, overlap=0,
+            on_event=events.append, near_dup_threshold=0.8, checkpoint=checkpoint,
+            pages=[(section, len(sections)) for section in sections],
+        )
+        self.assertEqual(self.calls, [])
+        self.assertEqual(len(again), 3)
+
+    def test_cancel_drops_chunks_not_yet_sent(self):
+        self.fail = set()
+        engine = GenerationEngine(limits={"openai": {"concurrency": 1, "rpm": 10**6, "tpm": 10**9}})
+        self.ns["get_generation_engine"] = lambda limits=None: engine
+        generate_content = self.ns["generate_content"]
+
+        def slow(chunk, *args, **kwargs):
+            time.sleep(0.2)
+            return generate_content(chunk, *args, **kwargs)
+
+        self.ns["generate_content"] = slow
+
+        def on_event(event):
+            if event["kind"] == "progress":
+                raise GenerationCancelled("job")
+
+        text = "\n\n".join(f"=== 페이지 {i} ===\n{page}" for i, page in enumerate(self.PAGES, 1))
+        with self.assertRaises(GenerationCancelled):
+            self.ns["generate_content_in_chunks"](
+                text, "cloze", "🟢 OpenAI ChatGPT", num_items=3, chunk_size=60, overlap=0, on_event=on_event, near_dup_threshold=0.8,
+            )
+        time.sleep(0.5)
+        # 첫 청크가 끝난 뒤 이미 나간 두 번째 청크까지만 호출되고 세 번째는 요청하지 않는다
+        self.assertEqual(len(self.calls), 2)
+
+    def test_near_duplicate_filter_follows_sidebar_toggle(self):
+        self.fail = set()
+        self.PAGES = [
+            "급성 신손상의 원인 분류와 신전성 요인 감별 및 검사 소견 정리",
+            "급성 신손상의 원인 분류와 신전성 요인 감별 및 검사 소견을 정리",
+            "당뇨병 1차 약제 메트포르민의 금기와 부작용",
+        ]
+        self.assertEqual(len(self._run({}, [])), 2)
+
+        # 사이드바에서 유사 중복 검사를 끄면 청크 사이의 유사 문항도 남긴다
+        self.ns["st"].session_state["near_dup_enabled"] = False
+        self.assertEqual(len(self._run({}, [])), 3)
+
+    def test_checkpoint_key_changes_with_generation_settings(self):
+        self.assertNotEqual(chunk_fingerprint("본문", 2, "cloze", "openai"), chunk_fingerprint("본문", 3, "cloze", "openai"))
+        self.assertEqual(chunk_fingerprint("본문", 2, "cloze"), chunk_fingerprint("본문", 2, "cloze"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import ast
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+APP_PATH = ROOT / "app.py"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.repositories import llm_cache_counters, load_llm_cache_entry, save_llm_cache_entry  # noqa: E402
+from src.services import llm_cache  # noqa: E402
+
+
+def _load_namespace(names, extra=None):
+    source = APP_PATH.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(APP_PATH))
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {
+        "LLM_TEMPERATURE": 0.0,
+        "PROMPT_VERSION": "v1",
+        "LLM_CACHE_MAX_BYTES": 1024 * 1024,
+        "is_cacheable_temperature": llm_cache.is_cacheable_temperature,
+        "llm_cache_key": llm_cache.llm_cache_key,
+        "llm_cache_counters": llm_cache_counters,
+        "load_llm_cache_entry": load_llm_cache_entry,
+        "save_llm_cache_entry": save_llm_cache_entry,
+    }
+    namespace.update(extra or {})
+    exec(compile(module, str(APP_PATH), "exec"), namespace)
+    return namespace
+
+
+class LlmCacheStoreTests(unittest.TestCase):
+    def test_key_covers_every_input(self):
+        base = ("gemini", "gemini-2.5-flash", "prompt", 0.0, None, "v1")
+        key = llm_cache.llm_cache_key(*base)
+        self.assertEqual(key, llm_cache.llm_cache_key(*base))
+        for pos, value in enumerate(("openai", "gemini-2.5-pro", "prompt!", 0.2, 123, "v2")):
+            changed = list(base)
+            changed[pos] = value
+            self.assertNotEqual(llm_cache.llm_cache_key(*changed), key)
+        messages = [{"role": "user", "content": "prompt"}]
+        self.assertEqual(
+            llm_cache.llm_cache_key("openai", "m", messages, 0, 1, "v1"),
+            llm_cache.llm_cache_key("openai", "m", [dict(messages[0])], 0, 1, "v1"),
+        )
+        self.assertTrue(llm_cache.is_cacheable_temperature(0))
+        self.assertFalse(llm_cache.is_cacheable_temperature(0.2))
+
+    def test_lru_eviction_by_size(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "llm_cache.sqlite3"
+            self.assertIsNone(load_llm_cache_entry(path, "a"))
+            save_llm_cache_entry(path, "a", "x" * 40, max_bytes=100)
+            time.sleep(0.01)
+            save_llm_cache_entry(path, "b", "y" * 40, max_bytes=100)
+            time.sleep(0.01)
+            # a를 다시 읽으면 b가 가장 오래 쓰지 않은 항목이 된다
+            self.assertEqual(load_llm_cache_entry(path, "a"), "x" * 40)
+            time.sleep(0.01)
+            self.assertEqual(save_llm_cache_entry(path, "c", "z" * 40, max_bytes=100), 1)
+            self.assertIsNone(load_llm_cache_entry(path, "b"))
+            self.assertEqual(load_llm_cache_entry(path, "c"), "z" * 40)
+            self.assertEqual(save_llm_cache_entry(path, "huge", "w" * 200, max_bytes=100), 0)
+            self.assertIsNone(load_llm_cache_entry(path, "huge"))
+
+            counters = llm_cache_counters(path)
+            self.assertEqual((counters["hits"], counters["misses"]), (2, 3))
+            self.assertEqual((counters["entries"], counters["bytes"]), (2, 80))
+
+
+class CachedLlmCallTests(unittest.TestCase):
+    def test_second_identical_call_skips_api_and_is_audited(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            audit = []
+            ns = _load_namespace(
+                ["cached_llm_call"],
+                extra={
+                    "get_llm_cache_file": lambda user_id=None: str(Path(tmp) / "llm_cache.sqlite3"),
+                    "append_audit_log": lambda event, payload: audit.append((event, payload)),
+                },
+            )
+            calls = []
+
+            def call():
+                calls.append(1)
+                return "응답", 42
+
+            self.assertEqual(ns["cached_llm_call"]("gen.question", "gemini", "m", "p", call), ("응답", 42, False))
+            self.assertEqual(ns["cached_llm_call"]("gen.question", "gemini", "m", "p", call), ("응답", 0, True))
+            self.assertEqual(len(calls), 1)
+            self.assertEqual([(e, p["hit"], p["hits"], p["misses"]) for e, p in audit], [
+                ("llm.cache", False, 0, 1),
+                ("llm.cache", True, 1, 1),
+            ])
+
+            # 요청 단위 우회, 다른 버전, temperature > 0은 모두 API를 다시 호출
+            self.assertEqual(ns["cached_llm_call"]("gen.question", "gemini", "m", "p", call, use_cache=False)[2], False)
+            self.assertEqual(ns["cached_llm_call"]("grade.essay", "gemini", "m", "p", call, version="g2")[2], False)
+            ns["LLM_TEMPERATURE"] = 0.7
+            self.assertEqual(ns["cached_llm_call"]("gen.question", "gemini", "m", "p", call)[2], False)
+            self.assertEqual(len(calls), 4)
+
+    def test_bypass_skips_the_read_but_refreshes_the_entry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            audit = []
+            ns = _load_namespace(
+                ["cached_llm_call"],
+                extra={
+                    "get_llm_cache_file": lambda user_id=None: str(Path(tmp) / "llm_cache.sqlite3"),
+                    "append_audit_log": lambda event, payload: audit.append((event, payload)),
+                },
+            )
+            complete = lambda text: "{{c1::" in text
+            ns["cached_llm_call"]("gen.question", "gemini", "m", "p", lambda: ("{{c1::예전}}", 3))
+            self.assertEqual(
+                ns["cached_llm_call"]("gen.question", "gemini", "m", "p", lambda: ("{{c1::새 응답}}", 4), use_cache=False),
+                ("{{c1::새 응답}}", 4, False),
+            )
+            # 검증에 실패한 새 응답은 저장된 항목을 덮어쓰지 않는다
+            ns["cached_llm_call"]("gen.question", "gemini", "m", "p", lambda: ("잘린", 2), use_cache=False, validate=complete)
+            self.assertEqual(ns["cached_llm_call"]("gen.question", "gemini", "m", "p", lambda: ("x", 1)), ("{{c1::새 응답}}", 0, True))
+            self.assertEqual([p["hit"] for _, p in audit], [False, True])
+
+    def test_empty_response_is_not_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ns = _load_namespace(
+                ["cached_llm_call"],
+                extra={
+                    "get_llm_cache_file": lambda user_id=None: str(Path(tmp) / "llm_cache.sqlite3"),
+                    "append_audit_log": lambda event, payload: None,
+                },
+            )
+            ns["cached_llm_call"]("parse.block", "openai", "m", [{"role": "user", "content": "p"}], lambda: ("", None))
+            self.assertEqual(ns["cached_llm_call"]("parse.block", "openai", "m", [{"role": "user", "content": "p"}], lambda: ("ok", 1)), ("ok", 1, False))
+
+    def test_rejected_response_is_not_cached_or_reused(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ns = _load_namespace(
+                ["cached_llm_call"],
+                extra={
+                    "get_llm_cache_file": lambda user_id=None: str(Path(tmp) / "llm_cache.sqlite3"),
+                    "append_audit_log": lambda event, payload: None,
+                },
+            )
+            complete = lambda text: "{{c1::" in text
+            # 잘린 응답은 저장하지 않아 재시도 때 API를 다시 부른다
+            self.assertEqual(ns["cached_llm_call"]("gen.question", "gemini", "m", "p", lambda: ("잘린 응답", 5), validate=complete), ("잘린 응답", 5, False))
+            self.assertEqual(ns["cached_llm_call"]("gen.question", "gemini", "m", "p", lambda: ("{{c1::정답}}", 7), validate=complete), ("{{c1::정답}}", 7, False))
+            self.assertEqual(ns["cached_llm_call"]("gen.question", "gemini", "m", "p", lambda: ("x", 1), validate=complete)[2], True)
+
+            # 검증 없이 예전에 저장된 나쁜 응답도 적중으로 보지 않는다
+            ns["cached_llm_call"]("gen.question", "gemini", "m", "q", lambda: ("잘린 응답", 5))
+            self.assertEqual(ns["cached_llm_call"]("gen.question", "gemini", "m", "q", lambda: ("{{c1::새 응답}}", 3), validate=complete), ("{{c1::새 응답}}", 3, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import ast
+import copy
+import sys
+import tempfile
+import unittest
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+APP_PATH = ROOT / "app.py"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.repositories import load_near_duplicate_file, save_near_duplicate_file  # noqa: E402
+from src.services import near_duplicates  # noqa: E402
+from src.services.text_search import text_signature  # noqa: E402
+
+MODE_MCQ = "📝 객관식 문제 (Case Study)"
+STEM = "50세 남자가 3일 전부터 시작된 발열과 기침, 누런 가래를 주소로 내원하였다. 흉부 X선에서 우하엽 경화 소견이 관찰되었다. 가장 가능성이 높은 원인균은?"
+PARAPHRASE = "50세 남자가 3일 전부터 시작된 발열, 기침과 누런 가래로 내원하였다. 흉부 X선에서 우하엽 경화가 관찰되었다. 가장 가능성이 높은 원인균은?"
+UNRELATED = "신증후군에서 나타나는 검사 소견으로 옳지 않은 것은? 단백뇨, 저알부민혈증, 고지혈증과 부종을 동반한다."
+
+
+def _load_namespace(names, extra=None):
+    source = APP_PATH.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(APP_PATH))
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {
+        "datetime": datetime,
+        "uuid": uuid,
+        "MODE_MCQ": MODE_MCQ,
+        "minhash_signature": near_duplicates.minhash_signature,
+        "near_duplicate_add": near_duplicates.near_duplicate_add,
+        "near_duplicate_query": near_duplicates.near_duplicate_query,
+        "text_signature": text_signature,
+    }
+    namespace.update(extra or {})
+    exec(compile(module, str(APP_PATH), "exec"), namespace)
+    return namespace
+
+
+class NearDuplicateIndexTests(unittest.TestCase):
+    def test_paraphrase_is_close_and_unrelated_text_is_far(self):
+        a = near_duplicates.minhash_signature(STEM)
+        b = near_duplicates.minhash_signature(PARAPHRASE)
+        c = near_duplicates.minhash_signature(UNRELATED)
+        self.assertGreater(near_duplicates.estimate_jaccard(a, b), 0.6)
+        self.assertLess(near_duplicates.estimate_jaccard(a, c), 0.2)
+        self.assertIsNone(near_duplicates.minhash_signature("  ...  "))
+        # 공백/문장부호만 다른 문장은 같은 서명
+        self.assertTrue((a == near_duplicates.minhash_signature(STEM.replace(" ", "  ") + "!")).all())
+
+    def test_permutation_matches_exact_modular_arithmetic(self):
+        np = near_duplicates.np
+        prime = (1 << 61) - 1
+        rng = np.random.RandomState(7)
+        # crc32 범위의 끝값까지 넘치지 않고 정수 연산과 같아야 한다
+        top = (1 << 32) - 1
+        hashes = np.append(rng.randint(0, 1 << 32, size=40, dtype=np.uint64), np.uint64(top))
+        a = np.append(rng.randint(1, 1 << 32, size=16, dtype=np.uint64), np.uint64(top))
+        b = np.append(rng.randint(0, 1 << 32, size=16, dtype=np.uint64), np.uint64(top))
+        expected = [[(int(x) * int(m) + int(c)) % prime for m, c in zip(a, b)] for x in hashes]
+        self.assertEqual(near_duplicates._permute(hashes, a, b).tolist(), expected)
+        with self.assertRaises(AssertionError):
+            near_duplicates._permute(hashes + np.uint64(1 << 32), a, b)
+
+    def test_query_add_and_remove(self):
+        index = near_duplicates.new_near_duplicate_index()
+        near_duplicates.near_duplicate_add(index, "q1", near_duplicates.minhash_signature(STEM))
+        near_duplicates.near_duplicate_add(index, "q2", near_duplicates.minhash_signature(UNRELATED))
+
+        hits = near_duplicates.near_duplicate_query(index, near_duplicates.minhash_signature(PARAPHRASE), threshold=0.6)
+        self.assertEqual([key for key, _ in hits], ["q1"])
+        self.assertEqual(near_duplicates.near_duplicate_query(index, near_duplicates.minhash_signature(STEM), exclude="q1"), [])
+
+        self.assertTrue(near_duplicates.near_duplicate_remove(index, "q1"))
+        self.assertEqual(near_duplicates.near_duplicate_query(index, near_duplicates.minhash_signature(STEM), threshold=0.6), [])
+        self.assertFalse(any("q1" in members for band in index["buckets"] for members in band.values()))
+
+    def test_backfill_round_trip_through_store(self):
+        index = near_duplicates.new_near_duplicate_index()
+        texts = {"q1": STEM, "q2": UNRELATED}
+        pending = near_duplicates.near_duplicate_pending(index, texts)
+        self.assertEqual(sorted(pending), ["q1", "q2"])
+
+        result = near_duplicates.compute_minhash_signatures(pending)
+        self.assertEqual(near_duplicates.apply_minhash_signatures(index, result, live_keys=set(texts)), (2, 0))
+        self.assertEqual(near_duplicates.near_duplicate_pending(index, texts), {})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "near_duplicates.pkl"
+            self.assertTrue(save_near_duplicate_file(path, index))
+            loaded = load_near_duplicate_file(path, near_duplicates.NEAR_DUPLICATE_INDEX_VERSION)
+            self.assertNotIn("buckets", loaded)
+            hits = near_duplicates.near_duplicate_query(loaded, near_duplicates.minhash_signature(PARAPHRASE), threshold=0.6)
+            self.assertEqual([key for key, _ in hits], ["q1"])
+            self.assertIsNone(load_near_duplicate_file(path, near_duplicates.NEAR_DUPLICATE_INDEX_VERSION + 1))
+
+        # 삭제된 문항은 live_keys 기준으로 정리
+        applied, removed = near_duplicates.apply_minhash_signatures(index, {}, live_keys={"q2"})
+        self.assertEqual((applied, removed), (0, 1))
+        self.assertEqual(sorted(index["signatures"]), ["q2"])
+
+
+class NearDuplicateInsertTests(unittest.TestCase):
+    def _insert_ns(self, bank_ref):
+        def fake_load():
+            return copy.deepcopy(bank_ref)
+
+        def fake_save(updated, change=None):
+            bank_ref.clear()
+            bank_ref.update(updated)
+            return True
+
+        saved = []
+        ns = _load_namespace(
+            [
+                "_normalize_text_for_dedupe",
+                "build_question_dedupe_key",
+                "question_dedupe_text",
+                "screen_near_duplicate",
+                "add_questions_to_bank",
+            ],
+            extra={
+                "load_questions": fake_load,
+                "save_questions": fake_save,
+                "parse_generated_text_to_structured": lambda text, mode: [],
+                "commit_near_duplicate_check": saved.append,
+            },
+        )
+        return ns, saved
+
+    def _check(self, action):
+        return {
+            "index": near_duplicates.new_near_duplicate_index(),
+            "threshold": 0.6,
+            "action": action,
+            "live_ids": None,
+            "hits": [],
+        }
+
+    def _mcq(self, problem):
+        return {"type": "mcq", "problem": problem, "options": ["A", "B", "C", "D", "E"], "answer": 1, "explanation": "x"}
+
+    def test_paraphrase_is_skipped_when_action_is_skip(self):
+        bank_ref = {"text": [], "cloze": []}
+        ns, saved = self._insert_ns(bank_ref)
+        check = self._check("skip")
+        added = ns["add_questions_to_bank"](
+            [self._mcq(STEM), self._mcq(PARAPHRASE), self._mcq(UNRELATED)],
+            MODE_MCQ,
+            quality_filter=False,
+            near_dup=check,
+        )
+        self.assertEqual(added, 2)
+        self.assertEqual([q["problem"] for q in bank_ref["text"]], [STEM, UNRELATED])
+        self.assertEqual(len(check["hits"]), 1)
+        self.assertTrue(check["hits"][0]["skipped"])
+        self.assertEqual(check["hits"][0]["match_id"], bank_ref["text"][0]["id"])
+        self.assertEqual(sorted(check["index"]["signatures"]), sorted(q["id"] for q in bank_ref["text"]))
+        self.assertEqual(saved, [check])
+
+    def test_report_mode_keeps_item_and_ignores_deleted_matches(self):
+        bank_ref = {"text": [], "cloze": []}
+        ns, _ = self._insert_ns(bank_ref)
+        check = self._check("report")
+        # 색인에는 남아 있지만 문항 은행에서 삭제된 문항은 비교 대상이 아님
+        near_duplicates.near_duplicate_add(check["index"], "deleted", near_duplicates.minhash_signature(STEM))
+        self.assertEqual(ns["add_questions_to_bank"]([self._mcq(STEM)], MODE_MCQ, quality_filter=False, near_dup=check), 1)
+        self.assertEqual(check["hits"], [])
+
+        check = self._check("report")
+        check["index"] = near_duplicates.new_near_duplicate_index()
+        near_duplicates.near_duplicate_add(check["index"], bank_ref["text"][0]["id"], near_duplicates.minhash_signature(STEM))
+        self.assertEqual(ns["add_questions_to_bank"]([self._mcq(PARAPHRASE)], MODE_MCQ, quality_filter=False, near_dup=check), 1)
+        self.assertEqual(len(bank_ref["text"]), 2)
+        self.assertFalse(check["hits"][0]["skipped"])
+
+
+if __name__ == "__main__":
+    unittest.main()
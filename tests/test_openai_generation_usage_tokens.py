@@ -26,6 +26,7 @@ def _load_functions():
         "_hash_text": lambda t: "hash",
         "build_style_instructions": lambda style_text: "",
         "convert_json_mcq_to_text": lambda txt, n: txt,
+        "cached_llm_call": lambda kind, provider, model, prompt, call, **kwargs: (*call(), False),
     }
     exec(compile(module, APP_PATH, "exec"), namespace)
     return namespace["_openai_usage_tokens"], namespace["generate_content_openai"], namespace
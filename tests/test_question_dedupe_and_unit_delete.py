@@ -38,7 +38,7 @@ class QuestionDedupeAndUnitDeleteTests(unittest.TestCase):
         def fake_load():
             return copy.deepcopy(bank_ref)
 
-        def fake_save(updated):
+        def fake_save(updated, change=None):
             bank_ref.clear()
             bank_ref.update(updated)
             return True
@@ -97,7 +97,7 @@ class QuestionDedupeAndUnitDeleteTests(unittest.TestCase):
         def fake_load():
             return copy.deepcopy(bank_ref)
 
-        def fake_save(updated):
+        def fake_save(updated, change=None):
             bank_ref.clear()
             bank_ref.update(updated)
             return True
@@ -138,7 +138,7 @@ class QuestionDedupeAndUnitDeleteTests(unittest.TestCase):
         def fake_load():
             return copy.deepcopy(bank_ref)
 
-        def fake_save(updated):
+        def fake_save(updated, change=None):
             bank_ref.clear()
             bank_ref.update(updated)
             return True
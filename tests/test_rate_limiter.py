@@ -0,0 +1,83 @@
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services.rate_limiter import AdaptiveTokenBucket, parse_duration, rate_limit_details  # noqa: E402
+
+
+class RateLimitErrorTests(unittest.TestCase):
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("1.5"), 1.5)
+        self.assertEqual(parse_duration("250ms"), 0.25)
+        self.assertEqual(parse_duration("6m0s"), 360)
+        self.assertIsNone(parse_duration("soon"))
+
+    def test_openai_and_gemini_errors(self):
+        class RateLimitError(Exception):
+            status_code = 429
+
+        err = RateLimitError("Rate limit reached")
+        err.response = SimpleNamespace(headers={"retry-after-ms": "1500"})
+        self.assertEqual(rate_limit_details(err), {"retry_after": 1.5})
+        err.response = SimpleNamespace(headers={"x-ratelimit-reset-requests": "2s", "x-ratelimit-reset-tokens": "6m0s"})
+        self.assertEqual(rate_limit_details(err), {"retry_after": 360})
+        err.response = SimpleNamespace(headers={})
+        self.assertEqual(rate_limit_details(err), {"retry_after": None})
+
+        class ResourceExhausted(Exception):
+            code = 429
+
+        gemini = ResourceExhausted("429 Quota exceeded. Please retry in 12.5s. retry_delay { seconds: 12 }")
+        self.assertEqual(rate_limit_details(gemini), {"retry_after": 12.5})
+        self.assertEqual(rate_limit_details(Exception("Please try again in 20ms (rate limit)")), {"retry_after": 0.02})
+        self.assertIsNone(rate_limit_details(ValueError("invalid api key")))
+
+
+class AdaptiveTokenBucketTests(unittest.TestCase):
+    def test_refill_rate_and_large_request_debt(self):
+        bucket = AdaptiveTokenBucket(rpm=60, tpm=600, window=60.0)
+        bucket.updated = 0.0
+        # 10초 분량(10요청, 100토큰)까지 버스트
+        self.assertEqual(bucket.reserve(50, now=0.0), 0.0)
+        self.assertEqual(bucket.reserve(50, now=0.0), 0.0)
+        self.assertAlmostEqual(bucket.reserve(10, now=0.0), 1.0)
+        # 용량보다 큰 요청은 가득 찼을 때 보내고 빚을 남긴다
+        self.assertAlmostEqual(bucket.reserve(300, now=1.0), 9.0)
+        self.assertEqual(bucket.reserve(300, now=10.0), 0.0)
+        self.assertAlmostEqual(bucket.reserve(100, now=10.0), 30.0)
+
+    def test_aimd_backoff_and_recovery(self):
+        bucket = AdaptiveTokenBucket(rpm=60, tpm=10**6, window=60.0)
+        bucket.updated = 0.0
+        bucket.on_throttle(retry_after=5.0, now=0.0)
+        self.assertEqual(bucket.scale, 0.5)
+        self.assertAlmostEqual(bucket.reserve(1, now=1.0), 4.0)
+        # 차단 동안 절반 속도(0.5요청/초)로 2.5요청이 쌓이고, 남은 0.5요청을 채우는 데 1초
+        self.assertEqual(bucket.reserve(1, now=5.0), 0.0)
+        self.assertEqual(bucket.reserve(1, now=5.0), 0.0)
+        self.assertAlmostEqual(bucket.reserve(1, now=5.0), 1.0)
+        for _ in range(4):
+            bucket.on_throttle(now=5.0)
+        self.assertEqual(bucket.scale, bucket.min_scale)
+        for _ in range(30):
+            bucket.on_success()
+        self.assertEqual(bucket.scale, 1.0)
+
+    def test_settle_refunds_cache_hits(self):
+        bucket = AdaptiveTokenBucket(rpm=60, tpm=600, window=60.0)
+        bucket.updated = 0.0
+        bucket.reserve(80, now=0.0)
+        bucket.settle(80, 0)
+        self.assertEqual(bucket.token_level, 100)
+        bucket.settle(0, 150)
+        self.assertEqual(bucket.token_level, -50)
+
+
+if __name__ == "__main__":
+    unittest.main()
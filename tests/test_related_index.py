@@ -0,0 +1,94 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services import related_index as rq  # noqa: E402
+from src.services.text_search import (  # noqa: E402
+    compact_search_index,
+    new_search_index,
+    search_index_add,
+    search_index_remove,
+    sync_search_index,
+)
+
+TEXTS = {
+    "mi1": "급성 심근경색 환자에서 troponin 상승과 ST 분절 상승이 관찰되었다. 가장 적절한 치료는?",
+    "mi2": "ST 분절 상승 심근경색으로 내원한 환자에게 우선 시행할 치료는? troponin 상승 동반",
+    "pna": "발열과 기침을 주소로 내원한 환자의 흉부 X선에서 폐렴 소견이 관찰되었다.",
+    "dm": "당뇨병 환자에서 metformin 투여 전 확인해야 할 검사는?",
+}
+
+
+def _brute_force_cosine(index, a, b):
+    va = rq._query_vector(index, TEXTS[a])
+    vb = rq._query_vector(index, TEXTS[b])
+    dot = sum(w * vb.get(t, 0.0) for t, w in va.items())
+    return dot / (np.sqrt(sum(w * w for w in va.values())) * np.sqrt(sum(w * w for w in vb.values())))
+
+
+class RelatedQuestionTests(unittest.TestCase):
+    def setUp(self):
+        self.index = new_search_index()
+        sync_search_index(self.index, TEXTS)
+        self.state = rq.new_related_state()
+        self.assertEqual(rq.sync_related_state(self.state, self.index, TEXTS.get), "rebuilt")
+
+    def test_nearest_neighbour_matches_brute_force_cosine(self):
+        hits = rq.related_questions(self.index, self.state, "mi1", TEXTS["mi1"], k=3)
+        self.assertEqual(hits[0][0], "mi2")
+        self.assertNotIn("mi1", [key for key, _ in hits])
+        self.assertAlmostEqual(hits[0][1], _brute_force_cosine(self.index, "mi1", "mi2"), places=6)
+        self.assertEqual([key for key, _ in self.state["neighbors"]], ["mi1"])
+        self.assertEqual(rq.sync_related_state(self.state, self.index, TEXTS.get), "unchanged")
+
+    def test_exclusions_are_filtered_from_the_cached_ranking(self):
+        fillers = {f"f{i}": f"급성 심근경색 troponin 상승 {i}" for i in range(12)}
+        texts = dict(TEXTS, **fillers)
+        sync_search_index(self.index, texts)
+        rq.sync_related_state(self.state, self.index, texts.get)
+        full = rq.related_questions(self.index, self.state, "mi1", texts["mi1"], k=2)
+        ranked, _ = self.state["neighbors"][("mi1", rq.text_signature(texts["mi1"]))]
+        self.assertEqual(len(ranked), rq.DEFAULT_RELATED_K)
+
+        # 캐시된 순위 안에서 걸러지면 다시 계산하지 않는다
+        self.assertEqual(rq.related_questions(self.index, self.state, "mi1", texts["mi1"], k=1, exclude={full[0][0]}), full[1:2])
+        # 순위 밖까지 제외되면 더 길게 다시 뽑고, 제외 목록이 커도 k개만 돌려준다
+        exclude = {key for key, _ in ranked}
+        hits = rq.related_questions(self.index, self.state, "mi1", texts["mi1"], k=2, exclude=exclude)
+        self.assertEqual(len(hits), 2)
+        self.assertFalse(exclude & {key for key, _ in hits})
+        # 본문이 바뀌면 같은 문항이라도 따로 조회한다
+        rq.related_questions(self.index, self.state, "mi1", texts["mi1"] + " 수정", k=2)
+        self.assertEqual(len(self.state["neighbors"]), 2)
+
+    def test_new_documents_extend_norms_and_clear_cache(self):
+        # 문서 수 변화가 REBUILD_DRIFT보다 작으면 새 문서의 norm만 계산
+        fillers = {f"f{i}": f"갑상선 기능 검사 TSH 수치 {i} 해석" for i in range(20)}
+        sync_search_index(self.index, dict(TEXTS, **fillers))
+        rq.sync_related_state(self.state, self.index, dict(TEXTS, **fillers).get)
+        rq.related_questions(self.index, self.state, "mi1", TEXTS["mi1"])
+        texts = dict(TEXTS, mi3="troponin 상승을 동반한 급성 심근경색 환자의 ST 분절 상승 치료", **fillers)
+        search_index_add(self.index, "mi3", texts["mi3"])
+        self.assertEqual(rq.sync_related_state(self.state, self.index, texts.get), "extended")
+        self.assertEqual(self.state["neighbors"], {})
+        self.assertEqual(len(self.state["norms"]), len(self.index["keys"]))
+        hits = rq.related_questions(self.index, self.state, "mi1", texts["mi1"], k=2)
+        self.assertEqual(sorted(key for key, _ in hits), ["mi2", "mi3"])
+
+    def test_compaction_triggers_full_rebuild(self):
+        search_index_remove(self.index, "pna")
+        search_index_remove(self.index, "dm")
+        self.assertTrue(compact_search_index(self.index))
+        self.assertEqual(rq.sync_related_state(self.state, self.index, TEXTS.get), "rebuilt")
+        self.assertEqual(rq.related_questions(self.index, self.state, "mi2", TEXTS["mi2"])[0][0], "mi1")
+
+
+if __name__ == "__main__":
+    unittest.main()
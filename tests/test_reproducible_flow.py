@@ -1,10 +1,16 @@
 import ast
 import copy
+import sys
 import unittest
 from pathlib import Path
 
 
 APP_PATH = "/Users/goyunseong/Documents/AI Projects/Med-Tutor/app.py"
+ROOT = str(Path(APP_PATH).parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.services import facet_index  # noqa: E402
 
 
 def _load_functions(names):
@@ -234,7 +240,7 @@ class ReproducibleFlowTests(unittest.TestCase):
         def fake_load():
             return copy.deepcopy(bank_ref)
 
-        def fake_save(updated):
+        def fake_save(updated, change=None):
             bank_ref.clear()
             bank_ref.update(updated)
 
@@ -272,7 +278,7 @@ class ReproducibleFlowTests(unittest.TestCase):
         def fake_load():
             return copy.deepcopy(bank_ref)
 
-        def fake_save(updated):
+        def fake_save(updated, change=None):
             bank_ref.clear()
             bank_ref.update(updated)
 
@@ -300,20 +306,25 @@ class ReproducibleFlowTests(unittest.TestCase):
         self.assertFalse(summary["last_correct"])
 
     def test_subject_review_summary_without_fsrs(self):
-        namespace = _load_namespace(["summarize_subject_review_status", "srs_due"])
+        namespace = _load_namespace(
+            ["parse_iso_datetime", "get_unit_name", "get_question_due_epoch", "question_facet_row", "summarize_subject_review_status_from_index"],
+            extra={"facet_subjects": facet_index.facet_subjects, "facet_counts": facet_index.facet_counts},
+        )
         namespace["FSRS_AVAILABLE"] = False
-        namespace["datetime"] = __import__("datetime").datetime
-        namespace["timezone"] = __import__("datetime").timezone
 
-        summary = namespace["summarize_subject_review_status"]([
+        questions = [
             {"id": "q1", "subject": "심장", "stats": {"wrong": 1}, "srs": {"due": ""}},
             {"id": "q2", "subject": "신경", "stats": {"wrong": 0}, "srs": {"due": "2024-01-01T00:00:00+00:00"}},
             {"id": "q3", "subject": "심장", "stats": {"wrong": 0}, "srs": {}},
-        ])
+        ]
+        index = facet_index.new_facet_index()
+        facet_index.sync_facet_index(index, {q["id"]: namespace["question_facet_row"](q, "text") for q in questions})
+        summary = namespace["summarize_subject_review_status_from_index"](index)
 
         self.assertEqual(summary[0]["분과"], "심장")
         self.assertEqual(summary[0]["총문항"], 2)
         self.assertGreaterEqual(summary[0]["복습대상"], 1)
+        self.assertEqual(summary[0]["오답문항"], 1)
         self.assertEqual(summary[1]["분과"], "신경")
 
     def test_safe_dataframe_fallback_markdown(self):
@@ -0,0 +1,207 @@
+import ast
+import copy
+import unittest
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+try:
+    from fsrs import Scheduler, Card, Rating, ReviewLog
+    FSRS_INSTALLED = True
+except Exception:
+    FSRS_INSTALLED = False
+
+
+APP_PATH = "/Users/goyunseong/Documents/AI Projects/Med-Tutor/app.py"
+
+FIXED_NOW = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return FIXED_NOW if tz else FIXED_NOW.replace(tzinfo=None)
+
+
+class _SessionState(dict):
+    def __getattr__(self, key):
+        return self.get(key)
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def _load_namespace(names, extra=None):
+    source = Path(APP_PATH).read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=APP_PATH)
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {
+        "datetime": _FrozenDatetime,
+        "timezone": timezone,
+        "timedelta": timedelta,
+        "time": __import__("time"),
+        "GRADER_VERSION": "v1",
+        "REVIEW_BUFFER_FLUSH_SECONDS": 120,
+        "FSRS_AVAILABLE": FSRS_INSTALLED,
+        "st": __import__("types").SimpleNamespace(session_state=_SessionState()),
+    }
+    if FSRS_INSTALLED:
+        namespace.update({"Scheduler": Scheduler, "Card": Card, "Rating": Rating, "ReviewLog": ReviewLog})
+    namespace.update(extra or {})
+    exec(compile(module, APP_PATH, "exec"), namespace)
+    return namespace
+
+
+REVIEW_FUNCTIONS = [
+    "parse_iso_datetime",
+    "_answer_log_record",
+    "_fsrs_log_record",
+    "_apply_answer_to_item",
+    "_grade_audit_payload",
+    "update_question_stats",
+    "_apply_simple_srs_to_item",
+    "apply_simple_srs_rating",
+    "_apply_fsrs_review_to_item",
+    "apply_fsrs_rating",
+    "record_review_event",
+    "apply_review_events",
+    "commit_review_buffer",
+    "maybe_commit_review_buffer",
+]
+
+
+def _make_bank(n=6):
+    return {
+        "text": [{"id": f"m{i}", "problem": f"문항 {i}", "subject": "S"} for i in range(n)],
+        "cloze": [{"id": "c0", "front": "빈칸", "answer": "x"}],
+    }
+
+
+def _bind_store(ns, bank_ref, counters):
+    def fake_load():
+        counters["load"] += 1
+        return bank_ref
+
+    def fake_save(updated, change=None):
+        counters["save"] += 1
+        return True
+
+    ns["load_questions"] = fake_load
+    ns["save_questions"] = fake_save
+    ns["append_audit_log"] = lambda event, payload: counters["audit_rows"].append((event, payload))
+    ns["append_audit_logs"] = lambda event, payloads: counters["audit_batches"].append((event, list(payloads)))
+    ns["use_review_log_store"] = lambda user_id=None: False
+    ns["append_review_log_records"] = lambda records, user_id=None: len(records)
+    if FSRS_INSTALLED:
+        ns["get_fsrs_scheduler"] = lambda: Scheduler(enable_fuzzing=False)
+
+
+def _new_counters():
+    return {"load": 0, "save": 0, "audit_rows": [], "audit_batches": []}
+
+
+class ReviewBufferCommitTests(unittest.TestCase):
+    def test_buffered_answers_match_per_answer_path_with_single_save(self):
+        answers = [("m0", True), ("m1", False), ("m0", False), ("c0", True), ("missing", True)]
+
+        direct_bank = _make_bank()
+        direct_counters = _new_counters()
+        direct = _load_namespace(REVIEW_FUNCTIONS)
+        _bind_store(direct, direct_bank, direct_counters)
+        for q_id, ok in answers:
+            direct["update_question_stats"](q_id, ok)
+
+        buffered_bank = _make_bank()
+        buffered_counters = _new_counters()
+        buffered = _load_namespace(REVIEW_FUNCTIONS)
+        _bind_store(buffered, buffered_bank, buffered_counters)
+        for q_id, ok in answers:
+            buffered["record_review_event"](q_id, is_correct=ok)
+        committed = buffered["commit_review_buffer"]()
+
+        self.assertEqual(committed, len(answers))
+        self.assertEqual(buffered_bank, direct_bank)
+        self.assertEqual(buffered_counters["load"], 1)
+        self.assertEqual(buffered_counters["save"], 1)
+        self.assertEqual(direct_counters["save"], 4)
+        self.assertEqual(len(buffered_counters["audit_batches"]), 1)
+        self.assertEqual(
+            buffered_counters["audit_batches"][0][1],
+            [payload for _, payload in direct_counters["audit_rows"]],
+        )
+        self.assertEqual(buffered["st"].session_state["review_buffer"], [])
+
+    @unittest.skipUnless(FSRS_INSTALLED, "fsrs not installed")
+    def test_buffered_ratings_match_apply_fsrs_rating(self):
+        ratings = [("m0", Rating.Good), ("m1", Rating.Again), ("m0", Rating.Easy), ("m2", Rating.Hard)]
+        seed_card = Card(card_id=1, due=FIXED_NOW - timedelta(days=3))
+
+        direct_bank = _make_bank()
+        direct_bank["text"][2]["fsrs"] = {"card": seed_card.to_json(), "logs": []}
+        direct = _load_namespace(REVIEW_FUNCTIONS)
+        _bind_store(direct, direct_bank, _new_counters())
+        for q_id, rating in ratings:
+            direct["apply_fsrs_rating"](q_id, rating)
+
+        buffered_bank = _make_bank()
+        buffered_bank["text"][2]["fsrs"] = {"card": seed_card.to_json(), "logs": []}
+        buffered = _load_namespace(REVIEW_FUNCTIONS)
+        counters = _new_counters()
+        _bind_store(buffered, buffered_bank, counters)
+        scheduler_calls = {"count": 0}
+
+        def counting_scheduler():
+            scheduler_calls["count"] += 1
+            return Scheduler(enable_fuzzing=False)
+
+        buffered["get_fsrs_scheduler"] = counting_scheduler
+        for q_id, rating in ratings:
+            buffered["record_review_event"](q_id, rating=rating)
+        buffered["commit_review_buffer"]()
+
+        def strip_card_ids(bank):
+            out = copy.deepcopy(bank)
+            for item in out["text"]:
+                fsrs = item.get("fsrs")
+                if not fsrs:
+                    continue
+                card = Card.from_json(fsrs["card"]).to_dict()
+                card.pop("card_id")
+                fsrs["card"] = card
+                fsrs["logs"] = [{k: v for k, v in ReviewLog.from_json(x).to_dict().items() if k != "card_id"} for x in fsrs["logs"]]
+            return out
+
+        self.assertEqual(strip_card_ids(buffered_bank), strip_card_ids(direct_bank))
+        self.assertEqual(scheduler_calls["count"], 1)
+        self.assertEqual(counters["save"], 1)
+
+    def test_periodic_commit_respects_interval(self):
+        ns = _load_namespace(REVIEW_FUNCTIONS)
+        counters = _new_counters()
+        _bind_store(ns, _make_bank(), counters)
+        ns["record_review_event"]("m0", is_correct=True)
+        since = ns["st"].session_state["review_buffer_since"]
+        self.assertEqual(ns["maybe_commit_review_buffer"](interval_seconds=60, now_ts=since + 10), 0)
+        self.assertEqual(counters["save"], 0)
+        self.assertEqual(ns["maybe_commit_review_buffer"](interval_seconds=60, now_ts=since + 61), 1)
+        self.assertEqual(counters["save"], 1)
+        self.assertIsNone(ns["st"].session_state["review_buffer_since"])
+
+    def test_failed_save_keeps_buffer_for_retry(self):
+        ns = _load_namespace(REVIEW_FUNCTIONS)
+        counters = _new_counters()
+        _bind_store(ns, _make_bank(), counters)
+        ns["save_questions"] = lambda updated, change=None: False
+        ns["record_review_event"]("m0", is_correct=False)
+        self.assertEqual(ns["commit_review_buffer"](), 0)
+        self.assertEqual(len(ns["st"].session_state["review_buffer"]), 1)
+        self.assertEqual(counters["audit_batches"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import ast
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+try:
+    from fsrs import Scheduler, Card, Rating
+    FSRS_INSTALLED = True
+except Exception:
+    FSRS_INSTALLED = False
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+APP_PATH = str(ROOT / "app.py")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services.review_forecast import forecast_due_counts  # noqa: E402
+
+
+class _SessionState(dict):
+    def __getattr__(self, key):
+        return self.get(key)
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def _load_namespace(names, extra=None):
+    source = Path(APP_PATH).read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=APP_PATH)
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {
+        "datetime": datetime,
+        "timezone": timezone,
+        "timedelta": timedelta,
+        "forecast_due_counts": forecast_due_counts,
+        "FSRS_AVAILABLE": FSRS_INSTALLED,
+        "st": __import__("types").SimpleNamespace(session_state=_SessionState()),
+    }
+    if FSRS_INSTALLED:
+        namespace.update({"Scheduler": Scheduler, "Card": Card, "Rating": Rating})
+    namespace.update(extra or {})
+    exec(compile(module, APP_PATH, "exec"), namespace)
+    return namespace
+
+
+DAY = 86400.0
+
+
+class ReviewForecastEngineTests(unittest.TestCase):
+    def test_counts_per_subject_and_day_with_overdue_folded_into_today(self):
+        start = 1_000_000.0
+        result = forecast_due_counts(
+            ["A", "A", "B", "B", "B"],
+            [start - 3 * DAY, start + 2 * DAY + 5, None, start + 6 * DAY, start + 40 * DAY],
+            start,
+            days=7,
+        )
+        self.assertEqual(result["subjects"]["A"], [1, 0, 1, 0, 0, 0, 0])
+        self.assertEqual(result["subjects"]["B"], [1, 0, 0, 0, 0, 0, 1])
+        self.assertEqual(result["total"], [2, 0, 1, 0, 0, 0, 1])
+
+    def test_followups_added_until_horizon(self):
+        start = 0.0
+        result = forecast_due_counts(
+            ["A"],
+            [start],
+            start,
+            days=10,
+            next_due_fn=lambda idx, at: at + 3 * DAY,
+        )
+        self.assertEqual(result["subjects"]["A"], [1, 0, 0, 1, 0, 0, 1, 0, 0, 1])
+
+    def test_empty_input(self):
+        result = forecast_due_counts([], [], 0.0, days=7)
+        self.assertEqual(result["total"], [0] * 7)
+        self.assertEqual(result["subjects"], {})
+
+
+@unittest.skipUnless(FSRS_INSTALLED, "fsrs not installed")
+class ReviewForecastAppTests(unittest.TestCase):
+    NAMES = [
+        "parse_iso_datetime",
+        "fsrs_due",
+        "_steps_to_timedelta",
+        "build_fsrs_scheduler",
+        "get_bank_revision",
+        "get_question_due_epoch",
+        "get_fsrs_forecast",
+        "get_review_forecast",
+    ]
+
+    def _bank(self, now):
+        items = []
+        for i in range(40):
+            due = now + timedelta(hours=7 * i - 30)
+            card = Card(card_id=i + 1, due=due)
+            items.append({
+                "id": f"q{i}",
+                "subject": "해부" if i % 2 else "생리",
+                "fsrs": {"card": card.to_json(), "due": due.isoformat()},
+            })
+        items.append({"id": "new", "subject": "생리"})
+        return items
+
+    def test_matches_per_day_fsrs_due_scan(self):
+        now = datetime(2026, 5, 4, 15, 0, tzinfo=timezone.utc)
+        ns = _load_namespace(self.NAMES, extra={"FSRS_DEFAULT_PARAMETERS": Scheduler().parameters})
+        bank = self._bank(now)
+        forecast = ns["get_fsrs_forecast"](bank, days=7, now=now)
+        start = datetime(2026, 5, 4, tzinfo=timezone.utc)
+        cumulative_prev = 0
+        for day in range(7):
+            end_of_day = start + timedelta(days=day + 1) - timedelta(microseconds=1)
+            cumulative = sum(1 for q in bank if ns["fsrs_due"](q, now=end_of_day))
+            self.assertEqual(forecast["total"][day], cumulative - cumulative_prev, day)
+            cumulative_prev = cumulative
+        self.assertEqual(forecast["dates"][0], "2026-05-04")
+
+    def test_cached_until_bank_revision_changes(self):
+        now = datetime(2026, 5, 4, 15, 0, tzinfo=timezone.utc)
+        calls = {"load": 0}
+        bank = {"text": self._bank(now), "cloze": []}
+
+        def fake_load():
+            calls["load"] += 1
+            return bank
+
+        ns = _load_namespace(self.NAMES, extra={"load_questions": fake_load})
+        first = ns["get_review_forecast"](days=30, now=now)
+        self.assertIs(ns["get_review_forecast"](days=30, now=now), first)
+        self.assertEqual(calls["load"], 1)
+        ns["st"].session_state["bank_revision"] = 5
+        ns["get_review_forecast"](days=30, now=now)
+        self.assertEqual(calls["load"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import ast
+import json
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+APP_PATH = ROOT / "app.py"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.repositories import review_log_store  # noqa: E402
+
+try:
+    from fsrs import ReviewLog
+    FSRS_INSTALLED = True
+except Exception:
+    FSRS_INSTALLED = False
+
+
+START = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def _load_namespace(names, extra=None):
+    source = APP_PATH.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(APP_PATH))
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {
+        "datetime": datetime,
+        "timezone": timezone,
+        "json": json,
+        "sys": sys,
+        "append_review_records": review_log_store.append_review_records,
+        "load_review_index": review_log_store.load_review_index,
+    }
+    if FSRS_INSTALLED:
+        namespace["ReviewLog"] = ReviewLog
+    namespace.update(extra or {})
+    exec(compile(module, str(APP_PATH), "exec"), namespace)
+    return namespace
+
+
+class ReviewLogStoreTests(unittest.TestCase):
+    def test_append_and_read_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "review_log.bin"
+            written = review_log_store.append_review_records(path, [
+                {"id": "q1", "kind": "answer", "value": 1, "time": START.isoformat()},
+                {"id": "q2", "kind": "fsrs", "value": 3, "time": START.isoformat(), "card_id": 42, "duration": 1500},
+                {"id": "q1", "kind": "answer", "value": 0, "time": (START + timedelta(hours=1)).isoformat()},
+                {"id": "", "kind": "answer", "value": 1, "time": START.isoformat()},
+                {"id": "q3", "kind": "answer", "value": 1, "time": "not-a-date"},
+            ])
+            self.assertEqual(written, 3)
+            self.assertEqual(path.stat().st_size, 3 * review_log_store.RECORD_SIZE)
+
+            q1 = review_log_store.read_review_records(path, q_id="q1")
+            self.assertEqual([r[1] for r in q1], [1, 0])
+            self.assertEqual(q1[0][2], START.timestamp())
+            self.assertEqual(review_log_store.iter_review_rows(path, kind="fsrs"), [[42, 3, START.timestamp(), 1500]])
+            self.assertEqual(review_log_store.read_review_records(path, kind="fsrs")["q1"], [])
+
+    def test_new_appends_are_picked_up_from_the_tail(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "review_log.bin"
+            review_log_store.append_review_records(path, [{"id": "q1", "kind": "answer", "value": 1, "time": START.isoformat()}])
+            self.assertEqual(len(review_log_store.load_review_index(path)["q1"]), 1)
+            offset = review_log_store._CACHE[str(path)]["offset"]
+
+            review_log_store.append_review_records(path, [{"id": "q2", "kind": "answer", "value": 0, "time": START.isoformat()}])
+            index = review_log_store.load_review_index(path)
+            self.assertEqual(sorted(index), ["q1", "q2"])
+            self.assertEqual(review_log_store._CACHE[str(path)]["offset"], offset + review_log_store.RECORD_SIZE)
+
+            # 다른 프로세스가 캐시 없이 읽어도 같은 결과
+            review_log_store._CACHE.pop(str(path))
+            self.assertEqual(review_log_store.load_review_index(path), index)
+
+    def test_rekey_moves_records_without_duplicating_them(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "review_log.bin"
+            review_log_store.append_review_records(path, [
+                {"id": "keep", "kind": "fsrs", "value": 3, "time": START.isoformat(), "card_id": 1, "duration": 100},
+                {"id": "dup", "kind": "fsrs", "value": 1, "time": START.isoformat(), "card_id": 2, "duration": 200},
+                {"id": "dup2", "kind": "answer", "value": 0, "time": START.isoformat()},
+            ])
+            self.assertEqual(review_log_store.load_review_index(path).keys(), {"keep", "dup", "dup2"})
+
+            # dup2→dup→keep 처럼 이어진 병합도 최종 문항으로 모인다
+            self.assertEqual(review_log_store.rekey_review_records(path, {"dup": "keep", "dup2": "dup"}), 2)
+            index = review_log_store.load_review_index(path)
+            self.assertEqual(list(index), ["keep"])
+            self.assertEqual([r[0] for r in index["keep"]], [1, 1, 0])
+            self.assertEqual(len(review_log_store.iter_review_rows(path)), 2)
+
+            # 옮긴 뒤에 붙는 기록도 같은 문항으로 읽힌다
+            review_log_store.append_review_records(path, [{"id": "keep", "kind": "answer", "value": 1, "time": START.isoformat()}])
+            review_log_store._CACHE.pop(str(path))
+            self.assertEqual(len(review_log_store.load_review_index(path)["keep"]), 4)
+            self.assertEqual(review_log_store.rekey_review_records(path, {"missing": "keep"}), 0)
+
+    def test_rekey_io_error_leaves_ids_untouched(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "review_log.bin"
+            review_log_store.append_review_records(path, [{"id": "dup", "kind": "answer", "value": 1, "time": START.isoformat()}])
+            with mock.patch.object(review_log_store.os, "replace", side_effect=OSError("disk full")):
+                self.assertEqual(review_log_store.rekey_review_records(path, {"dup": "keep"}), 0)
+            self.assertEqual(list(review_log_store.load_review_index(path)), ["dup"])
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ["review_log.bin", "review_log_ids.txt"])
+
+    def test_history_accessor_merges_embedded_and_stored_records(self):
+        ns = _load_namespace(["get_question_history"])
+        q = {"id": "q1", "stats": {"history": [{"time": START.isoformat(), "correct": True}]}}
+        index = {"q1": [(0, 0, (START + timedelta(days=1)).timestamp(), 0, -1)]}
+        hist = ns["get_question_history"](q, log_index=index)
+        self.assertEqual([e["correct"] for e in hist], [True, False])
+        self.assertEqual(hist[1]["time"], (START + timedelta(days=1)).isoformat())
+
+    @unittest.skipUnless(FSRS_INSTALLED, "fsrs not installed")
+    def test_migration_moves_logs_out_of_items_once(self):
+        log = json.dumps({
+            "card_id": 7,
+            "rating": 3,
+            "review_datetime": START.isoformat(),
+            "review_duration": None,
+        })
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = str(Path(tmp) / "review_log.bin")
+            bank_path = str(Path(tmp) / "questions.json")
+
+            saves = {"ok": True, "changes": []}
+
+            def save_questions(data, user_id=None, change=None):
+                saves["changes"].append(change)
+                if not saves["ok"]:
+                    return False
+                with open(bank_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                return True
+
+            def make_bank():
+                return {
+                    "text": [{
+                        "id": "q1",
+                        "stats": {"right": 1, "wrong": 0, "history": [{"time": START.isoformat(), "correct": True}]},
+                        "fsrs": {"card": "{}", "due": START.isoformat(), "logs": [log]},
+                    }],
+                    "cloze": [],
+                }
+
+            ns = _load_namespace(
+                [
+                    "parse_iso_datetime",
+                    "_answer_log_record",
+                    "_fsrs_log_record",
+                    "get_question_history",
+                    "get_question_fsrs_logs",
+                    "has_embedded_review_logs",
+                    "migrate_embedded_review_logs",
+                ],
+                extra={
+                    "get_review_log_file": lambda user_id=None: log_path,
+                    "save_questions": save_questions,
+                },
+            )
+            # 문항 저장이 실패하면 내장 기록을 그대로 둔다
+            saves["ok"] = False
+            original = make_bank()
+            self.assertIs(ns["migrate_embedded_review_logs"](original), original)
+            self.assertTrue(ns["has_embedded_review_logs"](original))
+            self.assertFalse(Path(bank_path).exists())
+
+            saves["ok"] = True
+            bank = ns["migrate_embedded_review_logs"](make_bank())
+            self.assertEqual(saves["changes"][-1], {"updated": {"q1": ["stats", "fsrs"]}})
+            item = bank["text"][0]
+            self.assertNotIn("history", item["stats"])
+            self.assertNotIn("logs", item["fsrs"])
+            self.assertEqual(item["stats"]["right"], 1)
+            self.assertFalse(ns["has_embedded_review_logs"](bank))
+            with open(bank_path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f), bank)
+
+            # 같은 기록이 다시 들어와도 중복 저장하지 않음
+            ns["migrate_embedded_review_logs"](make_bank())
+            index = review_log_store.load_review_index(log_path)
+            self.assertEqual(len(index["q1"]), 2)
+            self.assertEqual(len(ns["get_question_history"](item, log_index=index)), 1)
+            self.assertEqual(
+                ns["get_question_fsrs_logs"](item, log_index=index),
+                [{"card_id": 7, "rating": 3, "review_datetime": START.isoformat(), "review_duration": None}],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
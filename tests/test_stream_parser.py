@@ -0,0 +1,94 @@
+import ast
+import json
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+APP_PATH = str(ROOT / "app.py")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.services.stream_parser import feed_stream_parser, finish_stream_parser, new_stream_parser  # noqa: E402
+
+
+def _feed_all(parser, text, step):
+    out = []
+    for i in range(0, len(text), step):
+        out.extend(feed_stream_parser(parser, text[i:i + step]))
+    return out + finish_stream_parser(parser)
+
+
+class StreamParserTests(unittest.TestCase):
+    def test_json_objects_are_emitted_as_soon_as_they_close(self):
+        items = [
+            {"problem": "[문제] 흉통 {ST 상승} \"급성\"", "options": ["a", "b"], "answer": 1},
+            {"front": "중괄호 } 가 든 문항", "answer": "x", "meta": {"k": [1, {"j": "}"}]}},
+        ]
+        text = "```json\n" + json.dumps(items, ensure_ascii=False, indent=2) + "\n```"
+        for step in (1, 5, 64, len(text)):
+            parser = new_stream_parser()
+            self.assertEqual([json.loads(piece) for piece in _feed_all(parser, text, step)], items)
+            self.assertEqual(parser["buffer"], "")
+
+        parser = new_stream_parser()
+        first_close = text.index("},\n") + 1
+        self.assertEqual(len(feed_stream_parser(parser, text[:first_close - 1])), 0)
+        self.assertEqual(len(feed_stream_parser(parser, text[first_close - 1:first_close])), 1)
+
+    def test_unclosed_object_is_dropped(self):
+        parser = new_stream_parser()
+        self.assertEqual(_feed_all(parser, '[{"front": "a", "answer": "b"}, {"front": "잘린', 4), ['{"front": "a", "answer": "b"}'])
+
+    def test_line_mode(self):
+        parser = new_stream_parser(line_mode=True)
+        text = "심근경색 표지자는 {{c1::troponin}}\n\n당뇨 1차 약제는 {{c1::metformin}}"
+        self.assertEqual(_feed_all(parser, text, 3), ["심근경색 표지자는 {{c1::troponin}}", "당뇨 1차 약제는 {{c1::metformin}}"])
+
+
+class OpenAIStreamingTests(unittest.TestCase):
+    def test_deltas_are_forwarded_and_usage_read_from_final_event(self):
+        source = Path(APP_PATH).read_text(encoding="utf-8")
+        tree = ast.parse(source, filename=APP_PATH)
+        nodes = [n for n in tree.body if isinstance(n, ast.FunctionDef) and n.name in {"_openai_usage_tokens", "generate_content_openai"}]
+        module = ast.Module(body=nodes, type_ignores=[])
+        ast.fix_missing_locations(module)
+        events = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))], usage=None)
+            for piece in ("front\t", "answer", None)
+        ] + [SimpleNamespace(choices=[], usage=SimpleNamespace(total_tokens=31))]
+        calls = []
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            return iter(events)
+
+        usage = {}
+        namespace = {
+            "PROMPT_MCQ": "MCQ 5문제",
+            "PROMPT_CLOZE": "CLOZE",
+            "LLM_SEED": 123,
+            "LLM_TEMPERATURE": 0.0,
+            "PROMPT_VERSION": "v1",
+            "_hash_text": lambda t: "hash",
+            "build_style_instructions": lambda style_text: "",
+            "convert_json_mcq_to_text": lambda txt, n: txt,
+            "cached_llm_call": lambda kind, provider, model, prompt, call, **kwargs: (*call(), False),
+            "append_audit_log": lambda event, payload: None,
+            "OpenAI": lambda api_key: SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+        }
+        exec(compile(module, APP_PATH, "exec"), namespace)
+        deltas = []
+        result = namespace["generate_content_openai"](
+            "충분한 강의록 텍스트 " * 10, "🧠 단답형 문제", openai_api_key="sk-test", usage_out=usage, on_delta=deltas.append,
+        )
+        self.assertEqual(result, "front\tanswer")
+        self.assertEqual(deltas, ["front\t", "answer"])
+        self.assertEqual(usage, {"tokens": 31})
+        self.assertTrue(calls[0]["stream"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import ast
+import sys
+import tempfile
+import unicodedata
+import unittest
+from pathlib import Path
+
+
+ROOT = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor")
+APP_PATH = str(ROOT / "app.py")
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.repositories import search_index_store  # noqa: E402
+from src.services import facet_index, text_search  # noqa: E402
+
+
+class _SessionState(dict):
+    def __getattr__(self, key):
+        return self.get(key)
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def _load_namespace(names, extra=None):
+    source = Path(APP_PATH).read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=APP_PATH)
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {
+        "FSRS_AVAILABLE": False,
+        "st": __import__("types").SimpleNamespace(session_state=_SessionState()),
+        "SEARCH_INDEX_VERSION": text_search.SEARCH_INDEX_VERSION,
+        "new_search_index": text_search.new_search_index,
+        "sync_search_index": text_search.sync_search_index,
+        "compact_search_index": text_search.compact_search_index,
+        "bm25_search": text_search.bm25_search,
+        "load_search_index_file": search_index_store.load_search_index_file,
+        "save_search_index_file": search_index_store.save_search_index_file,
+        "new_facet_index": facet_index.new_facet_index,
+        "sync_facet_index": facet_index.sync_facet_index,
+    }
+    namespace.update(extra or {})
+    exec(compile(module, APP_PATH, "exec"), namespace)
+    return namespace
+
+
+class TokenizeTests(unittest.TestCase):
+    def test_hangul_bigrams_and_latin_words(self):
+        self.assertEqual(
+            text_search.tokenize("급성 심근경색에서 Troponin-I 상승"),
+            ["급성", "심근", "근경", "경색", "색에", "에서", "troponin", "i", "상승"],
+        )
+
+    def test_nfc_normalisation(self):
+        decomposed = unicodedata.normalize("NFD", "심근경색")
+        self.assertEqual(text_search.tokenize(decomposed), text_search.tokenize("심근경색"))
+
+
+class Bm25IndexTests(unittest.TestCase):
+    def _texts(self):
+        return {
+            "a": "급성 심근경색 환자에서 troponin 상승",
+            "b": "만성 심부전 환자의 치료",
+            "c": "급성 췌장염의 CT 소견",
+            "d": "심근경색 후 심근경색 재발 위험",
+        }
+
+    def test_ranking_prefers_matching_terms(self):
+        index = text_search.new_search_index()
+        text_search.sync_search_index(index, self._texts())
+        hits = [key for key, _ in text_search.bm25_search(index, "심근경색 troponin")]
+        self.assertEqual(hits[0], "a")
+        self.assertEqual(set(hits), {"a", "d"})
+        self.assertEqual(text_search.bm25_search(index, "없는단어"), [])
+
+    def test_single_syllables_and_partial_words_match_through_the_vocabulary(self):
+        index = text_search.new_search_index()
+        texts = {**self._texts(), "e": "췌 단독 표기"}
+        text_search.sync_search_index(index, texts)
+        self.assertEqual({key for key, _ in text_search.bm25_search(index, "췌")}, {"c", "e"})
+        self.assertEqual({key for key, _ in text_search.bm25_search(index, "심")}, {"a", "b", "d"})
+        self.assertEqual([key for key, _ in text_search.bm25_search(index, "tropo")], ["a"])
+
+    def test_incremental_sync_and_compaction_match_rebuild(self):
+        texts = self._texts()
+        index = text_search.new_search_index()
+        text_search.sync_search_index(index, texts)
+        texts["b"] = "급성 심근경색 의심"
+        del texts["c"]
+        texts["e"] = "췌장염 amylase"
+        self.assertEqual(text_search.sync_search_index(index, texts), (1, 1, 1))
+        self.assertEqual(text_search.sync_search_index(index, texts), (0, 0, 0))
+
+        fresh = text_search.new_search_index()
+        text_search.sync_search_index(fresh, texts)
+        query = "급성 심근경색 췌장염"
+        expected = text_search.bm25_search(fresh, query)
+        self.assertEqual(text_search.bm25_search(index, query), expected)
+        self.assertTrue(text_search.compact_search_index(index))
+        self.assertEqual(len(index["keys"]), len(texts))
+        self.assertEqual(text_search.bm25_search(index, query), expected)
+
+    def test_store_round_trip(self):
+        index = text_search.new_search_index()
+        text_search.sync_search_index(index, self._texts())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "search_index.pkl"
+            self.assertTrue(search_index_store.save_search_index_file(path, index))
+            loaded = search_index_store.load_search_index_file(path, text_search.SEARCH_INDEX_VERSION)
+            self.assertEqual(text_search.bm25_search(loaded, "심근경색"), text_search.bm25_search(index, "심근경색"))
+            self.assertIsNone(search_index_store.load_search_index_file(path, text_search.SEARCH_INDEX_VERSION + 1))
+
+
+class SearchQuestionsAppTests(unittest.TestCase):
+    def test_search_questions_returns_bank_items_and_persists_index(self):
+        bank = {
+            "text": [
+                {"id": "m1", "problem": "급성 심근경색 진단", "options": ["troponin", "CK"], "explanation": ""},
+                {"id": "m2", "problem": "당뇨병 치료", "options": ["metformin"], "note": "심근경색 위험 증가"},
+            ],
+            "cloze": [{"id": "c1", "front": "췌장염의 표지자는 {{c1::lipase}}"}],
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            index_file = str(Path(tmp) / "search_index.pkl")
+            ns = _load_namespace(
+                [
+                    "parse_iso_datetime",
+                    "get_unit_name",
+                    "get_question_due_epoch",
+                    "question_facet_row",
+                    "get_bank_revision",
+                    "question_positions",
+                    "get_bank_changes",
+                    "get_facet_index",
+                    "question_search_text",
+                    "get_search_index",
+                    "search_questions",
+                ],
+                extra={"load_questions": lambda: bank, "get_search_index_file": lambda user_id=None: index_file},
+            )
+            results = ns["search_questions"]("심근경색 troponin")
+            self.assertEqual([q["id"] for q, _ in results], ["m1", "m2"])
+            self.assertIs(results[0][0], bank["text"][0])
+            self.assertEqual([q["id"] for q, _ in ns["search_questions"]("lipase")], ["c1"])
+            self.assertTrue(Path(index_file).exists())
+
+            # 조건 필터는 자르기 전에 적용된다
+            only_cloze = ns["search_questions"]("심근경색 lipase", limit=1, predicate=lambda q: q["id"] == "c1")
+            self.assertEqual([q["id"] for q, _ in only_cloze], ["c1"])
+            # 한 글자 한글·단어 일부는 부분 문자열로 찾는다
+            self.assertEqual([q["id"] for q, _ in ns["search_questions"]("췌")], ["c1"])
+            self.assertEqual([q["id"] for q, _ in ns["search_questions"]("metfor")], ["m2"])
+            self.assertEqual([q["id"] for q, _ in ns["search_questions"]("심근경색 tropo")], ["m1", "m2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
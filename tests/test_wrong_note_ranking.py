@@ -0,0 +1,113 @@
+import ast
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+APP_PATH = Path("/Users/goyunseong/Documents/AI Projects/Med-Tutor/app.py")
+NOW = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _load_namespace(names, extra=None):
+    source = APP_PATH.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(APP_PATH))
+    wanted = set(names)
+    selected = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if len(selected) != len(wanted):
+        missing = sorted(wanted - {node.name for node in selected})
+        raise RuntimeError(f"required functions not found in app.py: {missing}")
+    module = ast.Module(body=selected, type_ignores=[])
+    ast.fix_missing_locations(module)
+    namespace = {
+        "datetime": datetime,
+        "timezone": timezone,
+        "heapq": __import__("heapq"),
+        "get_review_log_index": lambda: {},
+        "_answer_log_record": lambda q_id, is_correct, now_iso: None,
+    }
+    namespace.update(extra or {})
+    exec(compile(module, str(APP_PATH), "exec"), namespace)
+    return namespace
+
+
+NAMES = [
+    "parse_iso_datetime",
+    "get_question_history",
+    "question_wrong_aggregate",
+    "sort_wrong_first",
+    "_apply_answer_to_item",
+]
+
+
+def _bank(size, seed=3):
+    rng = random.Random(seed)
+    out = []
+    for i in range(size):
+        wrong = rng.randint(1, 6)
+        right = rng.randint(0, 6)
+        stats = {"wrong": wrong, "right": right}
+        last = NOW - timedelta(days=rng.randint(0, 30), hours=rng.randint(0, 23))
+        if i % 2:
+            stats["last_wrong"] = last.isoformat()
+        else:
+            # last_wrong 필드가 생기기 전 문항은 이력에서 계산
+            stats["history"] = [
+                {"time": (last - timedelta(days=3)).isoformat(), "correct": False},
+                {"time": last.isoformat(), "correct": False},
+                {"time": (last + timedelta(hours=1)).isoformat(), "correct": True},
+            ]
+        out.append({"id": f"q{i}", "stats": stats})
+    return out
+
+
+class WrongNoteRankingTests(unittest.TestCase):
+    def test_grading_maintains_last_wrong(self):
+        ns = _load_namespace(NAMES)
+        item = {"id": "q1"}
+        ns["_apply_answer_to_item"](item, False, NOW.isoformat())
+        ns["_apply_answer_to_item"](item, True, (NOW + timedelta(days=1)).isoformat())
+        self.assertEqual(item["stats"]["last_wrong"], NOW.isoformat())
+        self.assertEqual(item["stats"]["last_wrong_ts"], NOW.timestamp())
+        self.assertEqual(ns["question_wrong_aggregate"](item), (1, 0.5, NOW.timestamp()))
+
+    def test_history_fallback_matches_stored_last_wrong(self):
+        ns = _load_namespace(NAMES)
+        last = NOW - timedelta(days=2)
+        legacy = {"stats": {"wrong": 2, "right": 1, "history": [
+            {"time": (last - timedelta(days=1)).isoformat(), "correct": False},
+            {"time": last.isoformat(), "correct": False},
+            {"time": NOW.isoformat(), "correct": True},
+        ]}}
+        self.assertEqual(ns["question_wrong_aggregate"](legacy)[2], last.timestamp())
+        self.assertIsNone(ns["question_wrong_aggregate"](legacy, with_last_wrong=False)[2])
+
+    def test_top_k_matches_full_sort_for_every_mode(self):
+        ns = _load_namespace(NAMES)
+        bank = _bank(300)
+        for mode in ("오답 횟수", "오답률", "최근 오답"):
+            full = ns["sort_wrong_first"](bank, mode=mode, now=NOW)
+            top = ns["sort_wrong_first"](bank, mode=mode, now=NOW, limit=25)
+            self.assertEqual([q["id"] for q in top], [q["id"] for q in full[:25]], mode)
+        recent = ns["sort_wrong_first"](bank, mode="최근 오답", weight_recent=1.0, weight_count=0.0, now=NOW, limit=1)[0]
+        days = lambda q: int((NOW.timestamp() - ns["question_wrong_aggregate"](q)[2]) // 86400)
+        self.assertEqual(days(recent), min(days(q) for q in bank))
+
+    def test_related_items_exclude_the_whole_wrong_pool(self):
+        ns = _load_namespace(NAMES)
+        bank = _bank(40)
+        excluded = []
+
+        def find_related_questions(q, k=0, bank=None, exclude_ids=None):
+            excluded.append(set(exclude_ids))
+            return [({"id": f"rel-{q['id']}"}, 0.9)]
+
+        ns["find_related_questions"] = find_related_questions
+        out = ns["sort_wrong_first"](bank, related_k=1, bank={"text": bank, "cloze": []}, limit=5, now=NOW)
+        self.assertEqual(len(out), 10)
+        self.assertTrue({q["id"] for q in bank} <= excluded[0])
+        self.assertIn("rel-" + out[0]["id"], excluded[1])
+
+
+if __name__ == "__main__":
+    unittest.main()